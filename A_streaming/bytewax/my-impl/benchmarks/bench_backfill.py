@@ -0,0 +1,59 @@
+"""백필 벤치마크: 거래별 process() 대비 BackfillCandleGenerator 처리 시간
+
+같은 시간순 거래를 interval마다 CandleGenerator로 처리한 시간과
+BackfillCandleGenerator가 chunk 단위로 모든 interval을 처리한 시간을 비교한다.
+(입력 컬럼은 미리 TradeBatch로 만들어 두고 집계 시간만 잰다)
+
+실행:
+    python -m benchmarks.bench_backfill
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.backfill import BackfillCandleGenerator
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.columns import TradeBatch
+
+BASE = datetime(2026, 1, 26, tzinfo=timezone.utc)
+SYMBOLS = [f"SYM{i}USDT" for i in range(50)]
+SIZES = [timedelta(minutes=1), timedelta(minutes=5), timedelta(hours=1)]
+
+
+def make_trades(n: int, seed: int = 1) -> list[Trade]:
+    rng = random.Random(seed)
+    trades = []
+    t = BASE
+    for _ in range(n):
+        t += timedelta(microseconds=rng.randint(0, 20_000))
+        trades.append(Trade(rng.choice(SYMBOLS), 100.0 + rng.random(), rng.random(), t))
+    return trades
+
+
+def main(n_trades: int = 500_000, chunk_size: int = 100_000) -> None:
+    trades = make_trades(n_trades)
+    batches = [TradeBatch(trades[i : i + chunk_size]) for i in range(0, n_trades, chunk_size)]
+
+    start = time.perf_counter()
+    for size in SIZES:
+        generator = CandleGenerator(window_size=size)
+        for trade in trades:
+            generator.process(trade)
+        generator.flush()
+    streaming = time.perf_counter() - start
+
+    start = time.perf_counter()
+    BackfillCandleGenerator(SIZES).run(batches)
+    backfill = time.perf_counter() - start
+
+    per_trade = 1e9 / n_trades
+    print(f"{'path':>10} {'seconds':>9} {'ns/trade':>10}")
+    print(f"{'process':>10} {streaming:>9.3f} {streaming * per_trade:>10.0f}")
+    print(f"{'backfill':>10} {backfill:>9.3f} {backfill * per_trade:>10.0f}")
+    print(f"speedup: {streaming / backfill:.0f}x ({len(SIZES)} intervals)")
+
+
+if __name__ == "__main__":
+    main()
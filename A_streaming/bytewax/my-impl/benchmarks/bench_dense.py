@@ -0,0 +1,97 @@
+"""Dense 상태 벤치마크: CandleGenerator 대비 DenseCandleGenerator
+
+- 거래당 처리 시간: 같은 시간순 거래를 process_values()로 처리 (dense는 process_id도)
+- 상태 메모리: 심볼마다 열린 윈도우 하나를 만든 뒤 tracemalloc으로 잰 심볼당 bytes
+
+실행:
+    python -m benchmarks.bench_dense
+"""
+
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from src.candle_generator import CandleGenerator
+from src.dense import DenseCandleGenerator
+from src.window import to_epoch_ns
+
+BASE_NS = to_epoch_ns(datetime(2026, 1, 26, tzinfo=timezone.utc))
+SYMBOLS = [f"SYM{i}USDT" for i in range(50)]
+
+
+def make_rows(n: int, seed: int = 1) -> list[tuple[str, float, float, int]]:
+    rng = random.Random(seed)
+    rows = []
+    ts_ns = BASE_NS
+    for _ in range(n):
+        ts_ns += rng.randint(0, 20_000) * 1000
+        rows.append((rng.choice(SYMBOLS), 100.0 + rng.random(), rng.random(), ts_ns))
+    return rows
+
+
+def best_of(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def state_bytes_per_symbol(cls, n_symbols: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    generator = cls()
+    for i in range(n_symbols):
+        generator.process_values(f"SYM{i}", 1.0, 1.0, BASE_NS + i * 1000)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / n_symbols
+
+
+def main(n_trades: int = 200_000, n_symbols: int = 20_000, repeat: int = 5) -> None:
+    rows = make_rows(n_trades)
+
+    def run_generator():
+        process_values = CandleGenerator().process_values
+        for row in rows:
+            process_values(*row)
+
+    def run_dense():
+        process_values = DenseCandleGenerator().process_values
+        for row in rows:
+            process_values(*row)
+
+    interned = DenseCandleGenerator()
+    id_rows = [(interned.intern(symbol), *values) for symbol, *values in rows]
+
+    def run_dense_ids():
+        generator = DenseCandleGenerator()
+        for symbol in interned.symbols:
+            generator.intern(symbol)
+        process_id = generator.process_id
+        for row in id_rows:
+            process_id(*row)
+
+    per_trade = 1e9 / n_trades
+    baseline = best_of(run_generator, repeat)
+    print(f"{'path':>22} {'ns/trade':>10} {'speedup':>8}")
+    for name, run in [
+        ("CandleGenerator", run_generator),
+        ("Dense process_values", run_dense),
+        ("Dense process_id", run_dense_ids),
+    ]:
+        seconds = baseline if run is run_generator else best_of(run, repeat)
+        print(f"{name:>22} {seconds * per_trade:>10.0f} {baseline / seconds:>7.2f}x")
+
+    generator_bytes = state_bytes_per_symbol(CandleGenerator, n_symbols)
+    dense_bytes = state_bytes_per_symbol(DenseCandleGenerator, n_symbols)
+    print(f"state bytes / symbol (1 open window): {generator_bytes:.0f} → {dense_bytes:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""캔들 파이프라인 벤치마크: 처리량, 거래당 지연, 메모리
+
+합성 거래 스트림으로 CandleGenerator.process를 측정하고 결과를 JSON으로 저장한다.
+시나리오마다 새 프로세스에서 실행하므로 peak RSS가 시나리오끼리 섞이지 않는다.
+
+측정 항목:
+    trades_per_sec        : 타이머 없이 전체 스트림 처리 (flush 포함)
+    latency_ns p50/p99    : 별도 실행에서 process() 호출별 perf_counter_ns
+    peak_rss_bytes        : 시나리오 프로세스의 최대 RSS
+    state_bytes_per_window: tracemalloc으로 잰 생성기 상태 / 열린 윈도우 수
+    state_bytes_per_symbol: tracemalloc으로 잰 생성기 상태 / 심볼 수
+
+실행:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --scenario out_of_order --trades 500000
+    python -m benchmarks.bench_pipeline --output new.json --compare old.json
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.window import from_epoch_ns, to_epoch_ns
+
+BASE_NS = to_epoch_ns(datetime(2026, 1, 26, tzinfo=timezone.utc))
+
+
+@dataclass
+class Scenario:
+    """벤치마크 시나리오
+
+    Attributes:
+        name: 시나리오 이름 (결과 비교 키)
+        n_trades: 거래 수
+        n_symbols: 심볼 수 (거래는 심볼에 균등 분배)
+        event_rate: 이벤트 시간 기준 초당 거래 수 (전체 심볼 합)
+        out_of_order_ratio: watermark_delay 안에서 순서가 뒤섞인 거래 비율
+        late_ratio: watermark 이전으로 도착하는 (Late) 거래 비율
+        window_ms: 윈도우 크기 (ms)
+        watermark_delay_ms: Watermark 지연 (ms)
+        seed: 난수 시드
+    """
+
+    name: str
+    n_trades: int = 200_000
+    n_symbols: int = 10
+    event_rate: int = 1_000
+    out_of_order_ratio: float = 0.0
+    late_ratio: float = 0.0
+    window_ms: int = 60_000
+    watermark_delay_ms: int = 5_000
+    seed: int = 42
+
+
+SCENARIOS = [
+    Scenario("baseline"),
+    Scenario("many_symbols", n_symbols=2_000),
+    Scenario("out_of_order", out_of_order_ratio=0.2, late_ratio=0.01),
+    Scenario("many_open_windows", window_ms=1_000, watermark_delay_ms=300_000),
+]
+
+
+def synthetic_trades(scenario: Scenario) -> list[Trade]:
+    """시나리오 설정으로 재현 가능한 거래 스트림 생성
+
+    이벤트 시간은 event_rate 간격으로 증가하고,
+    - out_of_order_ratio 비율의 거래는 [0, watermark_delay) 만큼 과거로 (제때 도착)
+    - late_ratio 비율의 거래는 watermark_delay + [0, window) 만큼 과거로 (Late)
+    이동한다.
+    """
+    rng = random.Random(scenario.seed)
+    symbols = [f"SYM{i:04d}USDT" for i in range(scenario.n_symbols)]
+    step_ns = 1_000_000_000 // scenario.event_rate
+    delay_ns = scenario.watermark_delay_ms * 1_000_000
+    window_ns = scenario.window_ms * 1_000_000
+
+    trades = []
+    for i in range(scenario.n_trades):
+        ts_ns = BASE_NS + i * step_ns
+        r = rng.random()
+        if r < scenario.late_ratio:
+            ts_ns -= delay_ns + step_ns + rng.randrange(window_ns)
+        elif r < scenario.late_ratio + scenario.out_of_order_ratio:
+            ts_ns -= rng.randrange(delay_ns)
+        trades.append(
+            Trade(
+                symbol=symbols[i % scenario.n_symbols],
+                price=round(100.0 + rng.gauss(0, 1), 2),
+                quantity=round(rng.uniform(0.001, 2.0), 3),
+                timestamp=from_epoch_ns(ts_ns),
+            )
+        )
+    return trades
+
+
+def _new_generator(scenario: Scenario) -> CandleGenerator:
+    return CandleGenerator(
+        window_size=timedelta(milliseconds=scenario.window_ms),
+        watermark_delay=timedelta(milliseconds=scenario.watermark_delay_ms),
+        on_late=lambda late: None,
+    )
+
+
+def _percentile(sorted_values: list[int], q: float) -> int:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_scenario(scenario: Scenario) -> dict:
+    """시나리오 하나를 측정해 결과 dict 반환"""
+    trades = synthetic_trades(scenario)
+
+    # 처리량
+    generator = _new_generator(scenario)
+    process = generator.process
+    start = time.perf_counter()
+    for trade in trades:
+        process(trade)
+    generator.flush()
+    elapsed = time.perf_counter() - start
+
+    # 거래당 지연
+    generator = _new_generator(scenario)
+    process = generator.process
+    clock = time.perf_counter_ns
+    latencies = [0] * len(trades)
+    for i, trade in enumerate(trades):
+        t0 = clock()
+        process(trade)
+        latencies[i] = clock() - t0
+    latencies.sort()
+
+    # 열린 윈도우당 상태 크기 (flush 전)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    generator = _new_generator(scenario)
+    for trade in trades:
+        generator.process(trade)
+    state_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    open_windows = sum(len(m.windows) for m in generator.window_managers.values())
+
+    return {
+        **asdict(scenario),
+        "trades_per_sec": len(trades) / elapsed,
+        "latency_ns": {
+            "p50": _percentile(latencies, 0.50),
+            "p99": _percentile(latencies, 0.99),
+            "max": latencies[-1],
+        },
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "open_windows": open_windows,
+        "state_bytes": state_bytes,
+        "state_bytes_per_window": state_bytes / open_windows if open_windows else None,
+        "state_bytes_per_symbol": state_bytes / len(generator.window_managers),
+    }
+
+
+def _run_isolated(scenario: Scenario) -> dict:
+    """새 프로세스에서 시나리오 실행 (peak RSS 분리)"""
+    with mp.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run_scenario, (scenario,))
+
+
+def _environment() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _print_table(results: list[dict], baseline: Optional[dict] = None) -> None:
+    header = (
+        f"{'scenario':<20} {'trades/sec':>12} {'p50 ns':>8} {'p99 ns':>8} "
+        f"{'peak RSS MB':>12} {'B/window':>9} {'B/symbol':>9}"
+    )
+    if baseline:
+        header += f" {'vs trades/sec':>14} {'vs p99':>8}"
+    print(header)
+    for r in results:
+        per_window = r["state_bytes_per_window"]
+        line = (
+            f"{r['name']:<20} {r['trades_per_sec']:>12,.0f} "
+            f"{r['latency_ns']['p50']:>8} {r['latency_ns']['p99']:>8} "
+            f"{r['peak_rss_bytes'] / 2**20:>12.1f} "
+            f"{per_window if per_window is None else round(per_window):>9} "
+            f"{round(r['state_bytes_per_symbol']):>9}"
+        )
+        old = (baseline or {}).get(r["name"])
+        if old:
+            line += (
+                f" {r['trades_per_sec'] / old['trades_per_sec'] - 1:>+14.1%}"
+                f" {r['latency_ns']['p99'] / old['latency_ns']['p99'] - 1:>+8.1%}"
+            )
+        print(line)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[s.name for s in SCENARIOS],
+        help="실행할 시나리오 (반복 가능, 기본: 전체)",
+    )
+    parser.add_argument("--trades", type=int, help="거래 수")
+    parser.add_argument("--symbols", type=int, help="심볼 수")
+    parser.add_argument("--rate", type=int, help="초당 거래 수 (이벤트 시간)")
+    parser.add_argument("--out-of-order", type=float, help="순서가 뒤섞인 거래 비율")
+    parser.add_argument("--late", type=float, help="Late 거래 비율")
+    parser.add_argument("--window-ms", type=int, help="윈도우 크기 (ms)")
+    parser.add_argument("--delay-ms", type=int, help="Watermark 지연 (ms)")
+    parser.add_argument("--seed", type=int, help="난수 시드")
+    parser.add_argument("--output", default="bench_pipeline.json", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    overrides = {
+        field: value
+        for field, value in (
+            ("n_trades", args.trades),
+            ("n_symbols", args.symbols),
+            ("event_rate", args.rate),
+            ("out_of_order_ratio", args.out_of_order),
+            ("late_ratio", args.late),
+            ("window_ms", args.window_ms),
+            ("watermark_delay_ms", args.delay_ms),
+            ("seed", args.seed),
+        )
+        if value is not None
+    }
+    selected = [
+        replace(s, **overrides)
+        for s in SCENARIOS
+        if not args.scenario or s.name in args.scenario
+    ]
+
+    results = [_run_isolated(scenario) for scenario in selected]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+    _print_table(results, baseline)
+
+    with open(args.output, "w") as f:
+        json.dump({"environment": _environment(), "results": results}, f, indent=2)
+    print(f"\nwrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
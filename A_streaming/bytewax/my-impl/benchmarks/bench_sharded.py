@@ -0,0 +1,56 @@
+"""샤딩 실행기 처리량 벤치마크: worker 수 대비 trades/sec
+
+실행:
+    python -m benchmarks.bench_sharded
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+
+from src.candle_generator import CandleGenerator
+from src.sharded import ShardedCandleGenerator
+from src.window import to_epoch_ns
+
+N_TRADES = 400_000
+N_SYMBOLS = 500
+BASE_NS = to_epoch_ns(datetime(2026, 1, 26, tzinfo=timezone.utc))
+
+
+def make_trades() -> list[tuple[str, float, float, int]]:
+    symbols = [f"SYM{i}USDT" for i in range(N_SYMBOLS)]
+    return [
+        (symbols[i % N_SYMBOLS], 100.0 + i % 17, 0.1, BASE_NS + i * 2_000_000)
+        for i in range(N_TRADES)
+    ]
+
+
+def run_single(trades) -> float:
+    generator = CandleGenerator()
+    start = time.perf_counter()
+    for trade in trades:
+        generator.process_values(*trade)
+    generator.flush()
+    return N_TRADES / (time.perf_counter() - start)
+
+
+def run_sharded(trades, num_workers: int) -> float:
+    with ShardedCandleGenerator(num_workers=num_workers) as generator:
+        start = time.perf_counter()
+        for trade in trades:
+            generator.process_values(*trade)
+        generator.flush()
+        return N_TRADES / (time.perf_counter() - start)
+
+
+def main() -> None:
+    trades = make_trades()
+    print(f"cpus: {os.cpu_count()}")
+    print(f"{'workers':>8} {'trades/sec':>12}")
+    print(f"{'single':>8} {run_single(trades):>12,.0f}")
+    for num_workers in (1, 2, 4, 8):
+        print(f"{num_workers:>8} {run_sharded(trades, num_workers):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""watermark 진행 비용 벤치마크: 열린 윈도우 수 대비 거래당 처리 시간
+
+1초 윈도우에서 watermark_delay를 늘려 심볼당 열린 윈도우 수를 키운다.
+heap 기반 만료에서는 열린 윈도우 수와 무관하게 거래당 비용이 일정해야 한다.
+
+실행:
+    python -m benchmarks.bench_watermark
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+
+BASE = datetime(2026, 1, 26, tzinfo=timezone.utc)
+
+
+def run(delay_seconds: int, n_trades: int = 200_000) -> tuple[int, float]:
+    """(최대 열린 윈도우 수, 거래당 ns) 측정"""
+    # 초당 20건, 1초 윈도우 → 열린 윈도우 ≈ delay_seconds
+    trades = [
+        Trade("BTCUSDT", 50000.0 + i % 13, 0.1, BASE + timedelta(milliseconds=50 * i))
+        for i in range(n_trades)
+    ]
+    generator = CandleGenerator(
+        window_size=timedelta(seconds=1),
+        watermark_delay=timedelta(seconds=delay_seconds),
+    )
+
+    # 워밍업: 열린 윈도우를 정상 상태까지 채움
+    warmup = min(n_trades // 2, delay_seconds * 20 * 2)
+    for trade in trades[:warmup]:
+        generator.process(trade)
+    open_windows = len(generator.window_managers["BTCUSDT"].windows)
+
+    start = time.perf_counter()
+    for trade in trades[warmup:]:
+        generator.process(trade)
+    elapsed = time.perf_counter() - start
+
+    return open_windows, elapsed / (n_trades - warmup) * 1e9
+
+
+def main() -> None:
+    print(f"{'delay':>8} {'open windows':>14} {'ns/trade':>10}")
+    for delay in (1, 10, 100, 1000, 5000):
+        open_windows, ns_per_trade = run(delay)
+        print(f"{delay:>7}s {open_windows:>14} {ns_per_trade:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,65 @@
 """Crypto Candle Generator - bytewax my-impl"""
 
 from .candle import Trade, Candle, LateData
-from .window import TumblingWindow
+from .columns import TradeBatch, CandleBatch
+from .window import SlidingWindow, TumblingWindow
 from .candle_generator import CandleGenerator, CandleAggregator, WindowManager
+from .rollup import MultiIntervalCandleGenerator, RollupWindowManager
+from .sliding import SlidingCandleGenerator, SlidingWindowManager
+from .sharded import ShardedCandleGenerator
+from .aio import AsyncCandleGenerator
+from .metrics import GeneratorMetrics
+from .eviction import EvictionPolicy
+from .sink import BufferedCandleSink
+from .store import CandleStore
+from .history import CandleHistory
+from .dense import DenseCandleGenerator
+from .kernels import (
+    PRICE_QUANTILES,
+    SIZE_QUANTILES,
+    TAKER_VOLUME,
+    TURNOVER,
+    VWAP,
+    Kernel,
+    quantile_kernel,
+)
+from .sketch import QuantileSketch
+from .dedup import DedupPolicy
+from .partitions import FilePartitionSource, MemoryPartitionSource, PartitionedIngestor
 
 __all__ = [
     "Trade",
     "Candle",
     "LateData",
+    "TradeBatch",
+    "CandleBatch",
     "TumblingWindow",
+    "SlidingWindow",
     "CandleGenerator",
     "CandleAggregator",
     "WindowManager",
+    "MultiIntervalCandleGenerator",
+    "RollupWindowManager",
+    "SlidingCandleGenerator",
+    "SlidingWindowManager",
+    "ShardedCandleGenerator",
+    "AsyncCandleGenerator",
+    "GeneratorMetrics",
+    "EvictionPolicy",
+    "BufferedCandleSink",
+    "CandleStore",
+    "CandleHistory",
+    "DenseCandleGenerator",
+    "Kernel",
+    "VWAP",
+    "TURNOVER",
+    "TAKER_VOLUME",
+    "PRICE_QUANTILES",
+    "SIZE_QUANTILES",
+    "quantile_kernel",
+    "QuantileSketch",
+    "DedupPolicy",
+    "PartitionedIngestor",
+    "MemoryPartitionSource",
+    "FilePartitionSource",
 ]
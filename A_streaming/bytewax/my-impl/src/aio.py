@@ -0,0 +1,124 @@
+"""asyncio 스트리밍 인터페이스: AsyncCandleGenerator
+
+AsyncIterable[Trade]를 받아 캔들/Late 이벤트를 async iterator로 내보낸다.
+
+    trades (websocket, Kafka ...) ──▶ producer task ──▶ bounded queue ──▶ async for event
+                                      CandleGenerator
+
+- 큐가 가득 차면 producer가 멈추고 더 이상 거래를 읽지 않는다 (backpressure).
+  소비자가 느려도 메모리는 max_pending 개 이벤트로 제한된다.
+- watermark가 크게 진행되어 캔들이 한꺼번에 나와도 yield_every 개마다
+  이벤트 루프에 제어를 넘긴다.
+"""
+
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Optional, Union
+
+from .candle import Candle, LateData, Trade
+from .candle_generator import CandleGenerator
+
+CandleEvent = Union[Candle, LateData]
+
+_DONE = object()
+
+
+class AsyncCandleGenerator:
+    """CandleGenerator의 asyncio 래퍼
+
+    사용 예시:
+        stream = AsyncCandleGenerator(
+            CandleGenerator(window_size=timedelta(minutes=1)),
+            max_pending=1000,
+        )
+        async for event in stream.stream(trades):
+            if isinstance(event, Candle):
+                await sink.write(event)
+            else:
+                log_late(event)
+
+    Attributes:
+        generator: 감싼 CandleGenerator (on_candle / on_late를 교체함)
+        max_pending: 큐에 쌓일 수 있는 최대 이벤트 수
+        yield_every: 이 개수의 거래/이벤트마다 이벤트 루프에 양보
+    """
+
+    def __init__(
+        self,
+        generator: Optional[CandleGenerator] = None,
+        max_pending: int = 1000,
+        yield_every: int = 256,
+    ):
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self.generator = generator or CandleGenerator()
+        self.max_pending = max_pending
+        self.yield_every = yield_every
+
+        # 동기 콜백은 버퍼에 모으고, producer가 큐로 옮긴다
+        self._events: list[CandleEvent] = []
+        self.generator.on_candle = self._events.append
+        self.generator.on_late = self._events.append
+
+    async def stream(
+        self, trades: AsyncIterable[Trade], flush: bool = True
+    ) -> AsyncIterator[CandleEvent]:
+        """거래 스트림을 처리하며 캔들/Late 이벤트를 순서대로 내보냄
+
+        Args:
+            trades: 거래 async iterable
+            flush: 입력이 끝나면 열린 윈도우를 flush 할지 여부
+
+        Yields:
+            Candle 또는 LateData
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        producer = asyncio.create_task(self._produce(trades, queue, flush))
+        try:
+            while True:
+                event = await queue.get()
+                if event is _DONE:
+                    break
+                if isinstance(event, BaseException):
+                    raise event
+                yield event
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+
+    async def _produce(
+        self, trades: AsyncIterable[Trade], queue: asyncio.Queue, flush: bool
+    ) -> None:
+        """거래를 읽어 CandleGenerator로 처리하고 이벤트를 큐에 넣음"""
+        try:
+            count = 0
+            async for trade in trades:
+                self.generator.process(trade)
+                if self._events:
+                    await self._drain(queue)
+                count += 1
+                if count % self.yield_every == 0:
+                    await asyncio.sleep(0)
+
+            if flush:
+                self.generator.flush()
+                await self._drain(queue)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            await queue.put(exc)
+            return
+        await queue.put(_DONE)
+
+    async def _drain(self, queue: asyncio.Queue) -> None:
+        """버퍼의 이벤트를 큐로 옮김 (가득 차면 대기, 주기적으로 양보)"""
+        events = self._events[:]
+        self._events.clear()
+        for i, event in enumerate(events, 1):
+            await queue.put(event)
+            if i % self.yield_every == 0:
+                await asyncio.sleep(0)
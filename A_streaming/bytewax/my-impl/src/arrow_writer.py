@@ -0,0 +1,316 @@
+"""컬럼 파일 출력: ArrowCandleWriter (Arrow IPC stream / Parquet)
+
+닫힌 윈도우 (집계 상태 또는 캔들)를 CandleBatch (typed array 컬럼)에 모았다가
+row group (Arrow IPC는 record batch) 하나로 파일에 추가한다.
+캔들마다 dict를 만들지 않고, 숫자 컬럼은 typed array buffer를 복사 없이 Arrow 배열로 넘긴다.
+집계 커널 필드 (vwap, 분위수 등)는 nullable 컬럼이다 (커널을 쓰지 않으면 모두 null).
+
+- 파일: {root}/{interval}/{partition 시작 UTC}.parquet (또는 .arrow)
+  interval과 시간 partition (기본 1일)마다 파일 하나
+- row group: max_rows개가 모이거나 첫 캔들 이후 max_delay가 지나면 기록
+  (경과 시간은 캔들이 들어올 때와 poll()에서만 검사)
+- interval마다 최근 open_partitions개의 partition 파일만 열어 두고, 더 오래된 partition은
+  새 partition이 시작될 때 닫는다. 닫힌 partition에 캔들이 다시 오면 "-1", "-2" ... 접미사 파일에 쓴다.
+
+입력은 두 가지다:
+- CandleGenerator(column_writer=writer): 워터마크로 닫힌 윈도우의 CandleAggregator를
+  write_windows()로 받아 Candle 객체 / datetime 없이 집계 상태에서 바로 컬럼에 넣는다.
+  한도 (eviction)로 일찍 닫힌 윈도우만 Candle 묶음으로 들어온다.
+- on_candles=writer (또는 on_candle=writer.append): 다른 콜백 / store와 함께 쓰거나 롤업 /
+  sliding / 전역 watermark 생성기에서 쓸 때. 캔들마다 Candle 객체를 거친다.
+
+Parquet 파일은 close() 후에 footer가 기록되어 읽을 수 있다.
+CandleGenerator.flush()는 버퍼를 row group으로 기록하지만 파일은 닫지 않는다.
+
+    with ArrowCandleWriter("candles", max_rows=50_000) as writer:
+        generator = CandleGenerator(column_writer=writer)
+        ...
+        generator.flush()
+
+PyArrow는 이 모듈에서만 사용하는 선택 의존성이다.
+"""
+
+import os
+from array import array
+from datetime import timedelta, timezone
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+from .candle import KERNEL_FIELDS, QUANTILE_FIELDS, Candle
+from .columns import CandleBatch
+from .window import from_epoch_ns, timedelta_to_ns, to_epoch_ns
+
+if TYPE_CHECKING:
+    from .candle_generator import CandleAggregator
+
+# 시간은 UTC epoch ns, 원래 timezone은 utc_offset(초)으로 보존
+CANDLE_SCHEMA = pa.schema(
+    [
+        ("symbol", pa.string()),
+        ("interval", pa.string()),
+        ("open_time", pa.timestamp("ns", tz="UTC")),
+        ("close_time", pa.timestamp("ns", tz="UTC")),
+        ("utc_offset", pa.int32()),
+        ("open", pa.float64()),
+        ("high", pa.float64()),
+        ("low", pa.float64()),
+        ("close", pa.float64()),
+        ("volume", pa.float64()),
+        ("trade_count", pa.int64()),
+    ]
+    + [
+        (name, pa.map_(pa.string(), pa.float64()) if name in QUANTILE_FIELDS else pa.float64())
+        for name in KERNEL_FIELDS
+    ]
+)
+
+# 파일 확장자이기도 함
+FORMATS = ("parquet", "arrow")
+
+# (interval, partition 번호)
+PartitionKey = tuple[str, int]
+
+
+def _column(values: array, type: pa.DataType) -> pa.Array:
+    """typed array → Arrow 배열 (buffer 공유, 복사 없음)"""
+    return pa.Array.from_buffers(type, len(values), [None, pa.py_buffer(values)])
+
+
+def candle_batch_to_arrow(batch: CandleBatch) -> pa.RecordBatch:
+    """CandleBatch → Arrow RecordBatch (CANDLE_SCHEMA)
+
+    숫자 / 시간 컬럼은 CandleBatch의 buffer를 그대로 쓰므로, 반환값을 쓰는 동안
+    batch에 캔들을 추가하거나 clear()할 수 없다.
+    """
+    strings = pa.array(batch.strings, pa.string())
+    timestamp = CANDLE_SCHEMA.field("open_time").type
+    kernels = [_kernel_column(batch, name) for name in KERNEL_FIELDS]
+    return pa.RecordBatch.from_arrays(
+        [
+            strings.take(_column(batch.symbol_ids, pa.uint32())),
+            strings.take(_column(batch.interval_ids, pa.uint32())),
+            _column(batch.open_times, timestamp),
+            _column(batch.close_times, timestamp),
+            _column(batch.utc_offsets, pa.int32()),
+            _column(batch.opens, pa.float64()),
+            _column(batch.highs, pa.float64()),
+            _column(batch.lows, pa.float64()),
+            _column(batch.closes, pa.float64()),
+            _column(batch.volumes, pa.float64()),
+            _column(batch.trade_counts, pa.int64()),
+            *kernels,
+        ],
+        schema=CANDLE_SCHEMA,
+    )
+
+
+def _kernel_column(batch: CandleBatch, name: str) -> pa.Array:
+    """집계 커널 필드 컬럼 (None / NaN → null)"""
+    type = CANDLE_SCHEMA.field(name).type
+    values = batch.kernel_columns.get(name)
+    if values is None:
+        return pa.nulls(len(batch), type)
+    if name in QUANTILE_FIELDS:
+        return pa.array(values, type)
+    column = _column(values, type)
+    return pc.if_else(pc.is_nan(column), pa.scalar(None, type), column)
+
+
+class _IpcFile:
+    """Arrow IPC stream 파일 (파일 핸들과 writer를 함께 닫음)"""
+
+    def __init__(self, path: str, compression: Optional[str]):
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pa.ipc.new_stream(
+            self._sink, CANDLE_SCHEMA, options=pa.ipc.IpcWriteOptions(compression=compression)
+        )
+
+    def write_batch(self, batch: pa.RecordBatch) -> None:
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+        self._sink.close()
+
+
+class ArrowCandleWriter:
+    """캔들을 interval / 시간 partition별 컬럼 파일에 추가하는 sink
+
+    CandleGenerator(column_writer=writer)로 쓰거나 on_candles 콜백으로 사용한다 (writer(candles)).
+
+    Attributes:
+        root: 출력 디렉터리
+        format: "parquet" 또는 "arrow" (Arrow IPC stream)
+        partition: 파일 하나가 담는 시간 범위 (캔들 open_time 기준, UTC 정렬)
+        max_rows: row group 하나의 최대 캔들 수
+        max_delay: 버퍼의 첫 캔들 이후 이 시간이 지나면 row group 기록 (None이면 제한 없음)
+        open_partitions: interval마다 열어 두는 최근 partition 파일 수
+        compression: 압축 코덱 (Parquet / Arrow IPC 코덱 이름, None이면 압축 안 함)
+        paths: 생성한 파일 경로 (생성 순서)
+        rows_written: 기록한 캔들 수
+    """
+
+    def __init__(
+        self,
+        root: str,
+        format: str = "parquet",
+        partition: timedelta = timedelta(days=1),
+        max_rows: int = 10_000,
+        max_delay: Optional[timedelta] = None,
+        open_partitions: int = 2,
+        compression: Optional[str] = "zstd",
+        clock: Callable[[], float] = monotonic,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"unknown format: {format}")
+        if partition <= timedelta(0):
+            raise ValueError("partition must be positive")
+        if max_rows < 1:
+            raise ValueError("max_rows must be >= 1")
+        if max_delay is not None and max_delay < timedelta(0):
+            raise ValueError("max_delay must not be negative")
+        if open_partitions < 1:
+            raise ValueError("open_partitions must be >= 1")
+        self.root = root
+        self.format = format
+        self.partition = partition
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.open_partitions = open_partitions
+        self.compression = compression
+        self._partition_ns = timedelta_to_ns(partition)
+        self._max_delay_s = None if max_delay is None else max_delay.total_seconds()
+        self._clock = clock
+
+        self.paths: list[str] = []
+        self.rows_written = 0
+        # 기록 대기 중인 캔들과 첫 캔들이 들어온 시각
+        self._buffers: dict[PartitionKey, CandleBatch] = {}
+        self._first_at: dict[PartitionKey, float] = {}
+        # 열린 파일, partition별 생성한 파일 수, interval별 최신 partition
+        self._files: dict[PartitionKey, Any] = {}
+        self._parts: dict[PartitionKey, int] = {}
+        self._latest: dict[str, int] = {}
+
+    def __call__(self, candles: list[Candle]) -> None:
+        """캔들 묶음 추가 (on_candles 콜백)"""
+        partition_ns = self._partition_ns
+        buffers = self._buffers
+        max_rows = self.max_rows
+        for candle in candles:
+            key = (candle.interval, to_epoch_ns(candle.open_time) // partition_ns)
+            batch = buffers.get(key)
+            if batch is None:
+                batch = self._open_buffer(key)
+            batch.append(candle)
+            if len(batch) >= max_rows:
+                self._write(key)
+        if self._max_delay_s is not None:
+            self.poll()
+
+    def write_windows(
+        self, symbol: str, interval: str, aggregators: list["CandleAggregator"]
+    ) -> None:
+        """닫힌 윈도우들의 집계 상태 추가 (CandleGenerator(column_writer=...) 경로)
+
+        Args:
+            symbol: 심볼
+            interval: 캔들 interval 문자열
+            aggregators: 닫힌 윈도우의 CandleAggregator (시간순, 빈 윈도우 제외)
+        """
+        partition_ns = self._partition_ns
+        buffers = self._buffers
+        max_rows = self.max_rows
+        for aggregator in aggregators:
+            key = (interval, aggregator.start_ns // partition_ns)
+            batch = buffers.get(key)
+            if batch is None:
+                batch = self._open_buffer(key)
+            batch.append_window(symbol, interval, aggregator)
+            if len(batch) >= max_rows:
+                self._write(key)
+        if self._max_delay_s is not None:
+            self.poll()
+
+    def append(self, candle: Candle) -> None:
+        """캔들 하나 추가 (on_candle 콜백)"""
+        self([candle])
+
+    def poll(self) -> bool:
+        """max_delay가 지난 버퍼를 row group으로 기록
+
+        Returns:
+            기록했으면 True
+        """
+        if self._max_delay_s is None or not self._first_at:
+            return False
+        deadline = self._clock() - self._max_delay_s
+        due = [key for key, first_at in self._first_at.items() if first_at <= deadline]
+        for key in due:
+            self._write(key)
+        return bool(due)
+
+    def flush(self) -> None:
+        """버퍼된 캔들을 모두 row group으로 기록 (파일은 열어 둠)"""
+        for key in list(self._buffers):
+            self._write(key)
+
+    def close(self) -> None:
+        """버퍼를 기록하고 모든 파일을 닫음"""
+        self.flush()
+        for key in list(self._files):
+            self._files.pop(key).close()
+
+    def __enter__(self) -> "ArrowCandleWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _open_buffer(self, key: PartitionKey) -> CandleBatch:
+        interval, partition = key
+        latest = self._latest.get(interval)
+        if latest is None or partition > latest:
+            self._latest[interval] = partition
+            self._close_before(interval, partition - self.open_partitions + 1)
+        batch = self._buffers[key] = CandleBatch()
+        self._first_at[key] = self._clock()
+        return batch
+
+    def _close_before(self, interval: str, partition: int) -> None:
+        """interval의 partition 번호가 partition보다 작은 파일을 닫음"""
+        for key in [k for k in self._buffers if k[0] == interval and k[1] < partition]:
+            self._write(key)
+        for key in [k for k in self._files if k[0] == interval and k[1] < partition]:
+            self._files.pop(key).close()
+
+    def _write(self, key: PartitionKey) -> None:
+        """key의 버퍼를 row group 하나로 기록"""
+        batch = self._buffers.pop(key)
+        del self._first_at[key]
+        file = self._files.get(key)
+        if file is None:
+            file = self._files[key] = self._open_file(key)
+        file.write_batch(candle_batch_to_arrow(batch))
+        self.rows_written += len(batch)
+
+    def _open_file(self, key: PartitionKey):
+        interval, partition = key
+        part = self._parts.get(key, 0)
+        self._parts[key] = part + 1
+
+        start = from_epoch_ns(partition * self._partition_ns, timezone.utc)
+        name = start.strftime("%Y%m%dT%H%M%SZ") + (f"-{part}" if part else "")
+        directory = os.path.join(self.root, interval)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.{self.format}")
+        self.paths.append(path)
+
+        if self.format == "parquet":
+            return pq.ParquetWriter(path, CANDLE_SCHEMA, compression=self.compression)
+        return _IpcFile(path, self.compression)
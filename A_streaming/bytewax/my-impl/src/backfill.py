@@ -0,0 +1,360 @@
+"""오프라인 백필: BackfillCandleGenerator
+
+정렬된 과거 거래 파일을 chunk 단위로 읽어 (심볼, interval)별 캔들을 벡터화 집계한다.
+입력이 심볼별로 시간순이면 Late 거래가 없으므로 watermark / Late 처리를 건너뛴다.
+
+- chunk마다 윈도우 버킷 계산과 (심볼, 버킷) group-by를 NumPy로 한 번에 수행
+- 심볼의 마지막 (아직 열려 있을 수 있는) 윈도우만 부분 집계로 다음 chunk에 넘기고
+  나머지 캔들은 chunk마다 바로 emit
+- volume은 거래별 경로와 같은 순서로 더해 (batch.segment_sums) 캔들이 비트 단위로 같다
+
+interval마다 CandleGenerator(window_size=interval)에 같은 거래를 process()한 것과
+심볼별 캔들 내용과 순서가 같다. 캔들 시간의 timezone은 tz 하나로 고정한다.
+
+    generator = BackfillCandleGenerator(
+        window_sizes=[timedelta(minutes=1), timedelta(hours=1)],
+        on_candles=writer,
+    )
+    generator.run(read_json_lines("trades-2025-01.jsonl"))
+
+NumPy는 이 모듈에서만 사용하는 선택 의존성이다.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import timedelta, timezone, tzinfo
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from .batch import _segment_starts, segment_sums
+from .candle import Candle
+from .candle_generator import format_interval
+from .columns import TradeBatch
+from .decode import TradeDecoder
+from .window import WINDOW_END_OFFSET_NS, timedelta_to_ns, window_time
+
+
+@dataclass
+class _Groups:
+    """(심볼, 버킷)별 부분 집계 컬럼
+
+    Attributes:
+        symbol: 심볼 id (생성기 전체 기준)
+        bucket: 윈도우 버킷 (window_start_ns // window_size_ns)
+        first_ts / open: 가장 이른 타임스탬프와 그 가격
+        high / low: 고가 / 저가
+        last_ts / close: 가장 늦은 타임스탬프와 그 가격 (동률이면 먼저 온 거래)
+        volume / count: 거래량 / 거래 수
+    """
+
+    symbol: np.ndarray
+    bucket: np.ndarray
+    first_ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    last_ts: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    count: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "_Groups":
+        ints = np.zeros(0, dtype=np.int64)
+        floats = np.zeros(0, dtype=np.float64)
+        return cls(ints, ints, ints, floats, floats, floats, ints, floats, floats, ints)
+
+    def take(self, index: np.ndarray) -> "_Groups":
+        return _Groups(*(getattr(self, f.name)[index] for f in fields(self)))
+
+    def insert(self, position: np.ndarray, other: "_Groups") -> "_Groups":
+        """position 앞에 other의 행을 삽입 (np.insert)"""
+        return _Groups(
+            *(
+                np.insert(getattr(self, f.name), position, getattr(other, f.name))
+                for f in fields(self)
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+
+def aggregate_sorted(
+    symbol_ids: np.ndarray,
+    prices: np.ndarray,
+    quantities: np.ndarray,
+    timestamps: np.ndarray,
+    window_size_ns: int,
+    carry: _Groups,
+) -> tuple[_Groups, _Groups]:
+    """심볼 순으로 묶인 chunk를 (심볼, 버킷)별로 집계
+
+    carry (이전 chunk에서 넘어온 심볼별 마지막 윈도우)는 같은 윈도우의 첫 그룹에 병합한다.
+    volume은 carry의 volume에서 이어 더하므로 거래별 경로와 합산 순서가 같다.
+
+    Args:
+        symbol_ids: 심볼 id 배열 (int64, 오름차순 - 같은 심볼 안에서는 도착 순)
+        prices: 가격 배열 (float64)
+        quantities: 수량 배열 (float64)
+        timestamps: epoch-ns 타임스탬프 배열 (int64, 심볼별 오름차순)
+        window_size_ns: 윈도우 크기 (ns)
+        carry: 이전 chunk의 미완료 윈도우 (심볼 순)
+
+    Returns:
+        (완료된 윈도우, 다음 chunk로 넘길 심볼별 마지막 윈도우) - 둘 다 (심볼, 버킷) 순
+
+    Raises:
+        ValueError: 심볼별 타임스탬프가 시간순이 아닌 경우
+    """
+    if np.any((symbol_ids[1:] == symbol_ids[:-1]) & (timestamps[1:] < timestamps[:-1])):
+        raise ValueError("timestamps must be sorted per symbol")
+
+    bucket = timestamps // window_size_ns
+    starts = _segment_starts(symbol_ids, bucket)
+    ends = np.append(starts[1:], len(timestamps))
+    # close: 마지막 타임스탬프 구간의 첫 거래 (동률이면 먼저 온 거래)
+    ts_starts = _segment_starts(symbol_ids, bucket, timestamps)
+    close_index = ts_starts[np.searchsorted(ts_starts, ends) - 1]
+
+    groups = _Groups(
+        symbol=symbol_ids[starts],
+        bucket=bucket[starts],
+        first_ts=timestamps[starts],
+        open=prices[starts],
+        high=np.maximum.reduceat(prices, starts),
+        low=np.minimum.reduceat(prices, starts),
+        last_ts=timestamps[ends - 1],
+        close=prices[close_index],
+        volume=np.zeros(len(starts), dtype=np.float64),
+        count=ends - starts,
+    )
+
+    # carry 심볼의 첫 그룹
+    first = np.searchsorted(groups.symbol, carry.symbol)
+    clipped = np.minimum(first, len(groups) - 1)
+    present = (first < len(groups)) & (groups.symbol[clipped] == carry.symbol)
+    if np.any(present & (groups.first_ts[clipped] < carry.last_ts)):
+        raise ValueError("timestamps must be sorted per symbol")
+
+    merge = present & (groups.bucket[clipped] == carry.bucket)
+    target = first[merge]
+    merged = carry.take(merge)
+    groups.volume[target] = merged.volume
+    groups.volume = segment_sums(quantities, starts, groups.volume)
+    groups.first_ts[target] = merged.first_ts
+    groups.open[target] = merged.open
+    np.maximum.at(groups.high, target, merged.high)
+    np.minimum.at(groups.low, target, merged.low)
+    # 마지막 타임스탬프가 carry와 같으면 먼저 온 carry의 close
+    tie = groups.last_ts[target] == merged.last_ts
+    groups.close[target[tie]] = merged.close[tie]
+    groups.count[target] += merged.count
+
+    # 병합되지 않은 carry는 그 심볼의 그룹들 앞에 (심볼에 거래가 없었으면 그대로 carry)
+    rest = ~merge
+    if np.any(rest):
+        groups = groups.insert(first[rest], carry.take(rest))
+
+    # 심볼별 마지막 윈도우는 다음 chunk에서 거래가 더 올 수 있음
+    is_last = np.ones(len(groups), dtype=bool)
+    is_last[:-1] = groups.symbol[1:] != groups.symbol[:-1]
+    return groups.take(~is_last), groups.take(is_last)
+
+
+def read_json_lines(
+    path: str,
+    chunk_lines: int = 100_000,
+    decoder: Optional[TradeDecoder] = None,
+) -> Iterator[TradeBatch]:
+    """JSON-lines 거래 파일을 chunk_lines줄씩 TradeBatch로 읽음
+
+    Args:
+        path: 파일 경로 (한 줄에 Trade.from_dict 형식 JSON 하나)
+        chunk_lines: chunk 하나의 줄 수
+        decoder: JSON 디코더 (None이면 TradeDecoder())
+    """
+    decoder = decoder or TradeDecoder()
+    with open(path, "rb") as f:
+        while True:
+            lines = list(islice(f, chunk_lines))
+            if not lines:
+                return
+            batch = TradeBatch()
+            append = batch.append_values
+            # TradeBatch에는 is_buyer_maker / trade_id 컬럼이 없음
+            for values in decoder.decode_lines(b"".join(lines)):
+                append(*values[:5])
+            yield batch
+
+
+class BackfillCandleGenerator:
+    """정렬된 과거 거래의 오프라인 캔들 생성기 (NumPy 필요)
+
+    사용 예시:
+        generator = BackfillCandleGenerator(on_candles=store.insert_many)
+        for batch in read_json_lines("trades.jsonl"):
+            generator.process_trades(batch)
+        generator.flush()
+
+    Attributes:
+        window_sizes: 생성할 interval 목록 (오름차순)
+        tz: 캔들 시간의 timezone
+        on_candle: 캔들 완성 시 콜백
+        on_candles: 한 번에 완성된 캔들 묶음 콜백 (chunk / flush마다 한 번)
+    """
+
+    def __init__(
+        self,
+        window_sizes: Sequence[timedelta] = (timedelta(minutes=1),),
+        on_candle: Optional[Callable[[Candle], None]] = None,
+        on_candles: Optional[Callable[[list[Candle]], None]] = None,
+        tz: tzinfo = timezone.utc,
+    ):
+        if not window_sizes or min(window_sizes) <= timedelta(0):
+            raise ValueError("window sizes must be positive")
+        self.window_sizes = sorted(set(window_sizes))
+        self.tz = tz
+        self.on_candle = on_candle or (lambda c: None)
+        self.on_candles = on_candles
+
+        self._sizes_ns = [timedelta_to_ns(size) for size in self.window_sizes]
+        self._intervals = [format_interval(size) for size in self.window_sizes]
+        self._carry = [_Groups.empty() for _ in self.window_sizes]
+        # 심볼 테이블 (chunk별 심볼 id → 전체 id)
+        self._symbols: list[str] = []
+        self._symbol_ids: dict[str, int] = {}
+
+    def process_batch(
+        self,
+        symbol_ids: Sequence[int],
+        prices: Sequence[float],
+        quantities: Sequence[float],
+        timestamps: Sequence[int],
+        symbols: Sequence[str],
+    ) -> list[Candle]:
+        """컬럼 chunk 처리 (CandleGenerator.process_batch와 같은 입력)
+
+        Args:
+            symbol_ids: 거래별 심볼 id (symbols의 인덱스)
+            prices: 거래별 가격
+            quantities: 거래별 수량
+            timestamps: 거래별 epoch-ns 타임스탬프 (int64, 심볼별 오름차순)
+            symbols: 심볼 id → 심볼 문자열 테이블
+
+        Returns:
+            이 chunk에서 완성된 캔들 (interval 오름차순, 각 interval 내 심볼별 시간순)
+
+        Raises:
+            ValueError: 심볼별 타임스탬프가 시간순이 아닌 경우 (상태는 바뀌지 않음)
+        """
+        if len(timestamps) == 0:
+            return []
+        remap = np.array([self._symbol_id(symbol) for symbol in symbols], dtype=np.int64)
+        sym = remap[np.asarray(symbol_ids, dtype=np.int64)]
+
+        # 심볼 순 정렬은 interval과 무관하므로 한 번만 (심볼 수가 적으면 radix sort)
+        key = sym.astype(np.uint16) if len(self._symbols) <= 1 << 16 else sym
+        order = np.argsort(key, kind="stable")
+        sym = sym[order]
+        price = np.asarray(prices, dtype=np.float64)[order]
+        qty = np.asarray(quantities, dtype=np.float64)[order]
+        # Trade.timestamp(datetime)와 같은 마이크로초 해상도로 맞춘다
+        ts = np.asarray(timestamps, dtype=np.int64)[order] // 1000 * 1000
+
+        results = [
+            aggregate_sorted(sym, price, qty, ts, size_ns, carry)
+            for size_ns, carry in zip(self._sizes_ns, self._carry)
+        ]
+        candles: list[Candle] = []
+        for i, (done, carry) in enumerate(results):
+            self._carry[i] = carry
+            candles.extend(self._to_candles(i, done))
+        self._emit(candles)
+        return candles
+
+    def process_trades(self, batch: TradeBatch) -> list[Candle]:
+        """TradeBatch chunk 처리 (컬럼을 복사 없이 사용)"""
+        return self.process_batch(
+            np.frombuffer(batch.symbol_ids, dtype=np.uint32),
+            np.frombuffer(batch.prices, dtype=np.float64),
+            np.frombuffer(batch.quantities, dtype=np.float64),
+            np.frombuffer(batch.timestamps, dtype=np.int64),
+            batch.symbols,
+        )
+
+    def run(self, batches: Iterable[TradeBatch]) -> int:
+        """모든 chunk를 처리하고 flush
+
+        Returns:
+            생성한 캔들 수
+        """
+        count = 0
+        for batch in batches:
+            count += len(self.process_trades(batch))
+        return count + len(self.flush())
+
+    def flush(self) -> list[Candle]:
+        """남은 (심볼별 마지막) 윈도우를 모두 캔들로 emit
+
+        on_candles에 flush()가 있으면 (예: BufferedCandleSink) 이어서 호출한다.
+        """
+        candles: list[Candle] = []
+        for i, carry in enumerate(self._carry):
+            candles.extend(self._to_candles(i, carry))
+            self._carry[i] = _Groups.empty()
+        self._emit(candles)
+        flush = getattr(self.on_candles, "flush", None)
+        if flush is not None:
+            flush()
+        return candles
+
+    def _symbol_id(self, symbol: str) -> int:
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = self._symbol_ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return sid
+
+    def _to_candles(self, index: int, groups: _Groups) -> list[Candle]:
+        """부분 집계 → Candle (CandleAggregator.to_candle과 같은 값)"""
+        size_ns = self._sizes_ns[index]
+        interval = self._intervals[index]
+        end_offset = size_ns - WINDOW_END_OFFSET_NS
+        symbols = self._symbols
+        tz = self.tz
+        return [
+            Candle(
+                symbol=symbols[sym],
+                interval=interval,
+                open_time=window_time(bucket * size_ns, tz),
+                close_time=window_time(bucket * size_ns + end_offset, tz),
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+                trade_count=count,
+            )
+            for sym, bucket, open_, high, low, close, volume, count in zip(
+                groups.symbol.tolist(),
+                groups.bucket.tolist(),
+                groups.open.tolist(),
+                groups.high.tolist(),
+                groups.low.tolist(),
+                groups.close.tolist(),
+                groups.volume.tolist(),
+                groups.count.tolist(),
+            )
+        ]
+
+    def _emit(self, candles: list[Candle]) -> None:
+        """캔들 emit: on_candle (캔들마다) 후 on_candles (묶음 한 번)"""
+        if not candles:
+            return
+        on_candle = self.on_candle
+        for candle in candles:
+            on_candle(candle)
+        if self.on_candles is not None:
+            self.on_candles(candles)
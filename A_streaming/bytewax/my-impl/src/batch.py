@@ -0,0 +1,252 @@
+"""컬럼 배치 집계: NumPy 벡터화 group-by
+
+CandleGenerator.process_batch()의 내부 구현.
+Trade 객체 없이 컬럼 배열(심볼 id, 가격, 수량, epoch-ns 타임스탬프)을 받아
+- Late 판별 (심볼별 watermark 누적)
+- (심볼, 윈도우 버킷)별 OHLCV 부분 집계
+를 한 번에 계산한다.
+
+NumPy는 이 모듈에서만 사용하는 선택 의존성이다.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+# watermark가 아직 없는 심볼의 초기값 (모든 타임스탬프보다 작음)
+NO_WATERMARK = np.iinfo(np.int64).min
+
+
+@dataclass
+class BatchResult:
+    """배치 집계 결과
+
+    Attributes:
+        late_index: Late 거래의 원본 인덱스 (도착 순서)
+        group_symbol: 그룹별 심볼 id
+        group_bucket: 그룹별 윈도우 버킷 (window_start_ns // window_size_ns)
+        group_first_ts / group_open: 가장 이른 타임스탬프와 그 가격
+        group_last_ts / group_close: 가장 늦은 타임스탬프와 그 가격
+        group_high / group_low / group_count: 그룹별 집계값
+        group_volume: 그룹별 volume. 기존 윈도우 volume (initial_volumes)에서 시작해
+            도착 순으로 한 거래씩 더한 합계 (거래별 경로와 비트 단위로 같음)
+        symbol_ids: 정상 거래가 있는 심볼 id
+        symbol_max_ts: 심볼별 정상 거래의 최대 타임스탬프 (watermark 진행용)
+    """
+
+    late_index: np.ndarray
+    group_symbol: np.ndarray
+    group_bucket: np.ndarray
+    group_first_ts: np.ndarray
+    group_open: np.ndarray
+    group_last_ts: np.ndarray
+    group_close: np.ndarray
+    group_high: np.ndarray
+    group_low: np.ndarray
+    group_volume: np.ndarray
+    group_count: np.ndarray
+    symbol_ids: np.ndarray
+    symbol_max_ts: np.ndarray
+
+
+def _segment_starts(*keys: np.ndarray) -> np.ndarray:
+    """정렬된 키 배열에서 각 구간의 시작 인덱스"""
+    n = len(keys[0])
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    change = np.zeros(n, dtype=bool)
+    change[0] = True
+    for key in keys:
+        change[1:] |= key[1:] != key[:-1]
+    return np.flatnonzero(change)
+
+
+def segment_sums(
+    values: np.ndarray,
+    starts: np.ndarray,
+    initial: Optional[np.ndarray] = None,
+    long_segment: int = 256,
+) -> np.ndarray:
+    """구간별 순차 합 (initial에 앞에서부터 한 원소씩 더함)
+
+    거래별 경로의 volume += quantity와 부동소수 결과가 같다.
+    np.add.reduceat은 pairwise 합산이라 구간이 길면 마지막 비트가 달라질 수 있다.
+
+    짧은 구간은 구간 내 위치별로 (모든 구간을 한 번에) 더하고,
+    long_segment 이상인 구간은 순차 누적인 np.cumsum으로 더한다.
+
+    Args:
+        values: 구간별로 연속 배치된 값 (float64)
+        starts: 구간 시작 인덱스 (오름차순, 첫 값은 0)
+        initial: 구간별 초기값 (None이면 0.0)
+        long_segment: 구간별 cumsum으로 처리할 최소 구간 길이
+
+    Returns:
+        구간별 합
+    """
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.float64)
+    lengths = np.diff(np.append(starts, len(values)))
+    sums = values[starts].astype(np.float64)
+    if initial is not None:
+        sums = initial + sums
+
+    short = np.flatnonzero(lengths < long_segment)
+    # 길이 내림차순: 위치 k를 더할 구간이 항상 앞부분에 모임
+    short = short[np.argsort(-lengths[short], kind="stable")]
+    short_starts = starts[short]
+    short_lengths = lengths[short]
+    active = len(short)
+    for k in range(1, int(short_lengths[0]) if active else 0):
+        while short_lengths[active - 1] <= k:
+            active -= 1
+        sums[short[:active]] += values[short_starts[:active] + k]
+
+    for i in np.flatnonzero(lengths >= long_segment).tolist():
+        start = int(starts[i])
+        segment = values[start : start + int(lengths[i])].copy()
+        segment[0] = sums[i]
+        sums[i] = np.cumsum(segment)[-1]
+    return sums
+
+
+def classify_late(
+    symbol_ids: np.ndarray,
+    timestamps: np.ndarray,
+    watermarks: np.ndarray,
+    watermark_delay_ns: int,
+) -> np.ndarray:
+    """거래별 Late 여부 계산
+
+    거래별 처리 경로와 동일한 규칙:
+    거래 i 직전의 watermark = max(초기 watermark, 같은 심볼 이전 거래의 최대 ts - delay)
+    이며 ts < watermark 이면 Late.
+
+    Late 거래는 ts < watermark 이므로 watermark를 진행시키지 않는다.
+    따라서 이전 거래 전체의 누적 최대값을 그대로 사용해도 결과가 같다.
+
+    Args:
+        symbol_ids: 심볼 id 배열
+        timestamps: epoch-ns 타임스탬프 배열
+        watermarks: 심볼 id별 초기 watermark (없으면 NO_WATERMARK)
+        watermark_delay_ns: watermark 지연 (ns)
+
+    Returns:
+        Late 여부 bool 배열 (원본 순서)
+    """
+    n = len(timestamps)
+    order = np.argsort(symbol_ids, kind="stable")
+    s_sym = symbol_ids[order]
+    s_ts = timestamps[order]
+
+    # 심볼 구간별 누적 최대: 타임스탬프를 dense rank로 바꾸고
+    # 심볼 id * n 오프셋을 더하면 전체 누적 최대가 구간별 누적 최대가 된다
+    uniq, rank = np.unique(s_ts, return_inverse=True)
+    offset = s_sym.astype(np.int64) * n
+    running = np.maximum.accumulate(offset + rank) - offset
+
+    # 직전 거래까지의 최대 (exclusive)
+    prev_max = np.empty(n, dtype=np.int64)
+    prev_max[1:] = uniq[running[:-1]] - watermark_delay_ns
+    starts = _segment_starts(s_sym)
+    prev_max[starts] = NO_WATERMARK
+
+    watermark_before = np.maximum(watermarks[s_sym], prev_max)
+
+    late = np.empty(n, dtype=bool)
+    late[order] = s_ts < watermark_before
+    return late
+
+
+def aggregate_batch(
+    symbol_ids: Sequence[int],
+    prices: Sequence[float],
+    quantities: Sequence[float],
+    timestamps: Sequence[int],
+    watermarks: np.ndarray,
+    window_size_ns: int,
+    watermark_delay_ns: int,
+    global_watermark: Optional[int] = None,
+    initial_volumes: Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]] = None,
+) -> BatchResult:
+    """컬럼 배치의 Late 판별 및 (심볼, 버킷)별 OHLCV 부분 집계
+
+    open/close 동률 처리도 거래별 경로와 같다:
+    같은 타임스탬프가 여러 개면 먼저 도착한 거래의 가격을 사용한다.
+
+    Args:
+        symbol_ids: 심볼 id 배열
+        prices: 가격 배열
+        quantities: 수량 배열
+        timestamps: epoch-ns 타임스탬프 배열 (int64)
+        watermarks: 심볼 id별 초기 watermark (없으면 NO_WATERMARK)
+        window_size_ns: 윈도우 크기 (ns)
+        watermark_delay_ns: watermark 지연 (ns)
+        global_watermark: 전역 watermark 모드의 초기 watermark (없으면 NO_WATERMARK).
+            주면 모든 심볼의 이전 거래로 누적한 watermark 기준으로도 Late를 판별한다.
+        initial_volumes: (group_symbol, group_bucket) → 그룹별 기존 윈도우 volume
+            (없는 윈도우는 0.0). None이면 모두 0.0에서 시작한다.
+
+    Returns:
+        BatchResult
+    """
+    sym = np.asarray(symbol_ids, dtype=np.int64)
+    price = np.asarray(prices, dtype=np.float64)
+    qty = np.asarray(quantities, dtype=np.float64)
+    # Trade.timestamp(datetime)와 같은 마이크로초 해상도로 맞춘다
+    ts = np.asarray(timestamps, dtype=np.int64) // 1000 * 1000
+
+    late = classify_late(sym, ts, watermarks, watermark_delay_ns)
+    if global_watermark is not None:
+        late |= classify_late(
+            np.zeros_like(sym),
+            ts,
+            np.array([global_watermark], dtype=np.int64),
+            watermark_delay_ns,
+        )
+    late_index = np.flatnonzero(late)
+
+    ok = ~late
+    sym, price, qty, ts = sym[ok], price[ok], qty[ok], ts[ok]
+    if len(ts) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return BatchResult(late_index, *([empty] * 12))
+
+    bucket = ts // window_size_ns
+
+    # open: (심볼, 버킷, ts) 오름차순 — lexsort는 안정 정렬이므로 동률은 도착 순
+    by_first = np.lexsort((ts, bucket, sym))
+    # close: ts 내림차순으로 정렬하면 구간 첫 원소가 가장 늦은 거래
+    by_last = np.lexsort((-ts, bucket, sym))
+
+    # volume: 그룹 내 도착 순서대로 합산
+    by_arrival = np.lexsort((bucket, sym))
+
+    starts = _segment_starts(sym[by_first], bucket[by_first])
+    first = by_first[starts]
+    last = by_last[starts]
+    counts = np.diff(np.append(starts, len(ts)))
+
+    sym_sorted = sym[by_first]
+    sym_starts = _segment_starts(sym_sorted)
+    s_price = price[by_first]
+    group_symbol = sym[first]
+    group_bucket = bucket[first]
+    initial = None if initial_volumes is None else initial_volumes(group_symbol, group_bucket)
+
+    return BatchResult(
+        late_index=late_index,
+        group_symbol=group_symbol,
+        group_bucket=group_bucket,
+        group_first_ts=ts[first],
+        group_open=price[first],
+        group_last_ts=ts[last],
+        group_close=price[last],
+        group_high=np.maximum.reduceat(s_price, starts),
+        group_low=np.minimum.reduceat(s_price, starts),
+        group_volume=segment_sums(qty[by_arrival], starts, initial),
+        group_count=counts,
+        symbol_ids=sym_sorted[sym_starts],
+        symbol_max_ts=np.maximum.reduceat(ts[by_first], sym_starts),
+    )
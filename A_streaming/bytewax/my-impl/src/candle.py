@@ -1,11 +1,17 @@
-"""데이터 모델: Trade, Candle, LateData"""
+"""데이터 모델: Trade, Candle, LateData
+
+모두 __slots__ dataclass다 (인스턴스 __dict__ 없음).
+많은 레코드를 보관할 때는 src.columns의 TradeBatch / CandleBatch를 사용한다.
+"""
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
+
+from .window import from_epoch_ns
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """개별 거래 데이터"""
 
@@ -13,43 +19,86 @@ class Trade:
     price: float  # 50000.0
     quantity: float  # 0.1
     timestamp: datetime  # UTC
+    is_buyer_maker: Optional[bool] = None  # True면 taker 매도 (Binance "m"), 없으면 None
+    trade_id: Optional[int] = None  # 거래소 거래 id (Binance "t", 중복 제거용), 없으면 None
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Trade":
         """JSON dict → Trade 변환
 
         Args:
-            data: {"symbol": str, "price": float, "quantity": float, "timestamp": str}
+            data: {"symbol": str, "price": float, "quantity": float,
+                   "timestamp": ISO 8601 str 또는 epoch 밀리초 (int / float),
+                   "is_buyer_maker": bool (선택), "trade_id": int (선택)}
 
         Returns:
             Trade 인스턴스
         """
         ts_str = data["timestamp"]
-        # ISO 8601 형식 지원 (Z → +00:00)
-        if ts_str.endswith("Z"):
-            ts_str = ts_str[:-1] + "+00:00"
-        timestamp = datetime.fromisoformat(ts_str)
+        if isinstance(ts_str, (int, float)):
+            # epoch 밀리초 (마이크로초로 반올림)
+            timestamp = from_epoch_ns(round(ts_str * 1000) * 1000)
+        else:
+            # ISO 8601 형식 지원 (Z → +00:00)
+            if ts_str.endswith("Z"):
+                ts_str = ts_str[:-1] + "+00:00"
+            timestamp = datetime.fromisoformat(ts_str)
 
         return cls(
             symbol=data["symbol"],
             price=float(data["price"]),
             quantity=float(data["quantity"]),
             timestamp=timestamp,
+            is_buyer_maker=data.get("is_buyer_maker"),
+            trade_id=data.get("trade_id"),
         )
 
     def to_dict(self) -> dict[str, Any]:
-        """Trade → JSON dict 변환"""
-        return {
+        """Trade → JSON dict 변환 (is_buyer_maker / trade_id는 있을 때만)"""
+        data = {
             "symbol": self.symbol,
             "price": self.price,
             "quantity": self.quantity,
             "timestamp": self.timestamp.isoformat(),
         }
-
-
-@dataclass
+        if self.is_buyer_maker is not None:
+            data["is_buyer_maker"] = self.is_buyer_maker
+        if self.trade_id is not None:
+            data["trade_id"] = self.trade_id
+        return data
+
+
+# 집계 커널이 채우는 Candle 필드
+KERNEL_FIELDS = (
+    "vwap",
+    "turnover",
+    "buy_volume",
+    "sell_volume",
+    "price_quantiles",
+    "size_quantiles",
+)
+# KERNEL_FIELDS 중 분위수 dict 필드 (나머지는 float)
+QUANTILE_FIELDS = ("price_quantiles", "size_quantiles")
+
+
+def has_kernel_fields(candle: "Candle") -> bool:
+    """집계 커널 필드가 하나라도 채워진 캔들인지 확인"""
+    return (
+        candle.vwap is not None
+        or candle.turnover is not None
+        or candle.buy_volume is not None
+        or candle.sell_volume is not None
+        or candle.price_quantiles is not None
+        or candle.size_quantiles is not None
+    )
+
+
+@dataclass(slots=True)
 class Candle:
-    """OHLCV 캔들 데이터"""
+    """OHLCV 캔들 데이터
+
+    vwap 이하 필드는 해당 집계 커널을 켰을 때만 채워진다 (src.kernels 참고).
+    """
 
     symbol: str  # "BTCUSDT"
     interval: str  # "1m", "5m"
@@ -61,10 +110,16 @@ class Candle:
     close: float  # 종가
     volume: float  # 총 거래량
     trade_count: int  # 거래 수
+    vwap: Optional[float] = None  # 거래량 가중 평균 가격
+    turnover: Optional[float] = None  # 거래대금 (Σ 가격 × 수량)
+    buy_volume: Optional[float] = None  # taker 매수 거래량
+    sell_volume: Optional[float] = None  # taker 매도 거래량
+    price_quantiles: Optional[dict[str, float]] = None  # 가격 분위수 {"p5": ..., "p50": ...}
+    size_quantiles: Optional[dict[str, float]] = None  # 거래 크기 분위수
 
     def to_dict(self) -> dict[str, Any]:
-        """Candle → JSON dict 변환"""
-        return {
+        """Candle → JSON dict 변환 (커널 필드는 값이 있을 때만)"""
+        data = {
             "symbol": self.symbol,
             "interval": self.interval,
             "open_time": self.open_time.isoformat(),
@@ -76,9 +131,14 @@ class Candle:
             "volume": self.volume,
             "trade_count": self.trade_count,
         }
+        for name in KERNEL_FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
 
 
-@dataclass
+@dataclass(slots=True)
 class LateData:
     """Late 데이터 정보
 
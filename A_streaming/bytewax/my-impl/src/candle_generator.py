@@ -1,31 +1,94 @@
 """캔들 생성기: CandleAggregator, WindowManager, CandleGenerator"""
 
-from datetime import datetime, timedelta
-from typing import Callable, Optional
+import heapq
+from datetime import datetime, timedelta, timezone, tzinfo
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Union
 
 from .candle import Candle, LateData, Trade
-from .window import TumblingWindow
+from .decode import TradeDecoder
+from .eviction import EvictionPolicy, WindowBudget
+from .window import (
+    WINDOW_END_OFFSET_NS,
+    TumblingWindow,
+    from_epoch_ns,
+    timedelta_to_ns,
+    to_epoch_ns,
+    window_time,
+)
+
+if TYPE_CHECKING:
+    from .arrow_writer import ArrowCandleWriter
+    from .clock import EventClock
+    from .dedup import DedupPolicy, SymbolDedup
+    from .kernels import Kernel
+    from .metrics import GeneratorMetrics
+    from .store import CandleStore
+
+# 자동 idle 검사 없음
+NO_SWEEP = 2**63 - 1
+# 거래를 받은 적 없는 WindowManager.last_trade_ns
+NO_TRADE = -(2**63)
+
+
+def format_interval(window_size: timedelta) -> str:
+    """윈도우 크기를 interval 문자열로 변환 (예: 1분 → "1m")"""
+    seconds = int(window_size.total_seconds())
+    if seconds < 60:
+        return f"{seconds}s"
+    elif seconds < 3600:
+        return f"{seconds // 60}m"
+    elif seconds < 86400:
+        return f"{seconds // 3600}h"
+    else:
+        return f"{seconds // 86400}d"
 
 
 class CandleAggregator:
     """단일 윈도우 내 OHLCV 집계
 
     윈도우 내의 모든 거래를 받아 OHLCV 캔들을 생성한다.
+    시간은 내부적으로 epoch 나노초 정수로 다루고,
+    datetime은 캔들을 만들 때만 생성한다.
 
     Attributes:
-        open_time: 윈도우 시작 시간
-        close_time: 윈도우 종료 시간
+        start_ns: 윈도우 시작 (epoch ns)
+        end_ns: 윈도우 종료 (epoch ns)
+        tz: 캔들 시간에 사용할 timezone
         open: 시가 (첫 번째 거래)
         high: 고가
         low: 저가
         close: 종가 (마지막 거래)
         volume: 총 거래량
         trade_count: 거래 수
+        dirty: 마지막 체크포인트 이후 변경 여부 (생성 / add / merge가 켜고 snapshot()이 끔)
+        sum_names: 집계 커널 누적값 이름 (클래스 속성, compile_aggregator가 채움)
+        sketch_specs: 집계 커널 스케치 (이름, relative_accuracy, max_bins) (클래스 속성)
     """
 
+    sum_names: tuple[str, ...] = ()
+    sketch_specs: tuple[tuple[str, float, int], ...] = ()
+
     def __init__(self, open_time: datetime, close_time: datetime):
-        self.open_time = open_time
-        self.close_time = close_time
+        self._init(
+            to_epoch_ns(open_time),
+            to_epoch_ns(close_time),
+            open_time.tzinfo or timezone.utc,
+        )
+
+    @classmethod
+    def from_ns(
+        cls, start_ns: int, end_ns: int, tz: Optional[tzinfo] = None
+    ) -> "CandleAggregator":
+        """epoch 나노초 경계로 생성 (datetime 변환 없음)"""
+        aggregator = cls.__new__(cls)
+        aggregator._init(start_ns, end_ns, tz or timezone.utc)
+        return aggregator
+
+    def _init(self, start_ns: int, end_ns: int, tz: tzinfo) -> None:
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.tz = tz
 
         # OHLCV
         self.open: Optional[float] = None
@@ -35,9 +98,22 @@ class CandleAggregator:
         self.volume: float = 0.0
         self.trade_count: int = 0
 
-        # 타임스탬프 추적 (open/close 결정용)
-        self._first_timestamp: Optional[datetime] = None
-        self._last_timestamp: Optional[datetime] = None
+        # 타임스탬프 추적 (open/close 결정용, epoch ns)
+        self._first_timestamp: Optional[int] = None
+        self._last_timestamp: Optional[int] = None
+
+        # 증분 체크포인트용 변경 표시
+        self.dirty = True
+
+    @property
+    def open_time(self) -> datetime:
+        """윈도우 시작 시간"""
+        return window_time(self.start_ns, self.tz)
+
+    @property
+    def close_time(self) -> datetime:
+        """윈도우 종료 시간"""
+        return window_time(self.end_ns, self.tz)
 
     def add_trade(self, trade: Trade) -> None:
         """거래 추가 및 집계 업데이트
@@ -50,27 +126,129 @@ class CandleAggregator:
             - close: 가장 늦은 타임스탬프의 가격
             - 순서가 뒤섞여 도착해도 정확히 계산됨
         """
-        price = trade.price
-        quantity = trade.quantity
-        ts = trade.timestamp
+        self.add(
+            trade.price, trade.quantity, to_epoch_ns(trade.timestamp), trade.is_buyer_maker
+        )
+
+    def add(
+        self,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        is_buyer_maker: Optional[bool] = None,
+    ) -> None:
+        """거래 추가 (hot path: Trade 객체 없이 값만 전달)
 
+        Args:
+            price: 가격
+            quantity: 수량
+            ts_ns: 거래 시간 (epoch ns)
+            is_buyer_maker: taker 방향 (집계 커널용, OHLCV 집계에서는 사용하지 않음)
+        """
         # Open: 가장 이른 타임스탬프의 가격
-        if self._first_timestamp is None or ts < self._first_timestamp:
-            self._first_timestamp = ts
+        if self._first_timestamp is None or ts_ns < self._first_timestamp:
+            self._first_timestamp = ts_ns
             self.open = price
 
         # High/Low 업데이트
-        self.high = max(self.high, price)
-        self.low = min(self.low, price)
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
 
         # Close: 가장 늦은 타임스탬프의 가격
-        if self._last_timestamp is None or ts > self._last_timestamp:
-            self._last_timestamp = ts
+        if self._last_timestamp is None or ts_ns > self._last_timestamp:
+            self._last_timestamp = ts_ns
             self.close = price
 
         # Volume & Count 누적
         self.volume += quantity
         self.trade_count += 1
+        self.dirty = True
+
+    def state(self) -> tuple:
+        """집계값 튜플 (first_ts, open, high, low, last_ts, close, volume, trade_count)
+
+        윈도우 경계 없이 집계값만 담은 compact 표현. from_state()로 복원한다.
+        """
+        return (
+            self._first_timestamp,
+            self.open,
+            self.high,
+            self.low,
+            self._last_timestamp,
+            self.close,
+            self.volume,
+            self.trade_count,
+        )
+
+    @classmethod
+    def from_state(
+        cls, start_ns: int, end_ns: int, tz: Optional[tzinfo], state: tuple
+    ) -> "CandleAggregator":
+        """state() 튜플과 윈도우 경계로 복원"""
+        aggregator = cls.from_ns(start_ns, end_ns, tz)
+        aggregator._merge(*state)
+        return aggregator
+
+    def copy(self) -> "CandleAggregator":
+        """같은 윈도우 경계와 집계값을 가진 복사본"""
+        aggregator = type(self).from_ns(self.start_ns, self.end_ns, self.tz)
+        aggregator.merge(self)
+        return aggregator
+
+    def merge(self, other: "CandleAggregator") -> None:
+        """다른 집계 결과 병합
+
+        OHLCV는 병합 가능하다: open/close는 타임스탬프 비교,
+        high/low는 max/min, volume/trade_count는 합.
+        other는 self 이후에 도착한 거래의 집계로 간주한다
+        (타임스탬프 동률이면 self의 open/close 유지).
+
+        Args:
+            other: 병합할 집계 (같은 윈도우)
+        """
+        if other.is_empty():
+            return
+        self._merge(
+            other._first_timestamp,
+            other.open,
+            other.high,
+            other.low,
+            other._last_timestamp,
+            other.close,
+            other.volume,
+            other.trade_count,
+        )
+
+    def _merge(
+        self,
+        first_timestamp: int,
+        open_: float,
+        high: float,
+        low: float,
+        last_timestamp: int,
+        close: float,
+        volume: float,
+        trade_count: int,
+    ) -> None:
+        """부분 집계값 병합 (merge / 배치 처리 공용)"""
+        if self._first_timestamp is None or first_timestamp < self._first_timestamp:
+            self._first_timestamp = first_timestamp
+            self.open = open_
+
+        if high > self.high:
+            self.high = high
+        if low < self.low:
+            self.low = low
+
+        if self._last_timestamp is None or last_timestamp > self._last_timestamp:
+            self._last_timestamp = last_timestamp
+            self.close = close
+
+        self.volume += volume
+        self.trade_count += trade_count
+        self.dirty = True
 
     def to_candle(self, symbol: str, interval: str) -> Candle:
         """Candle 객체 생성
@@ -95,6 +273,10 @@ class CandleAggregator:
             trade_count=self.trade_count,
         )
 
+    def kernel_fields(self) -> dict:
+        """집계 커널 필드 값 (Candle 필드 이름 → 값, 커널이 없으면 빈 dict)"""
+        return {}
+
     def is_empty(self) -> bool:
         """거래가 없는 빈 윈도우인지 확인"""
         return self.trade_count == 0
@@ -109,12 +291,30 @@ class WindowManager:
     - Late 데이터 판별
     - 윈도우 닫기 및 캔들 emit
 
+    시간은 epoch 나노초 정수로 다루며, 윈도우는 버킷 인덱스
+    (window_start_ns // window_size_ns)로 식별한다.
+    열린 윈도우의 버킷은 min-heap에도 보관한다. 버킷 순서 = 종료 시간 순서이므로
+    watermark 진행 시 실제로 만료된 윈도우만 순서대로 꺼낸다.
+
+    allowed_lateness가 있으면 닫힌 윈도우를 종료 후 그 기간 동안 state() 튜플로
+    보관하고, 그 사이 도착한 Late 거래는 amend()로 반영해 수정된 캔들을 만든다.
+
     Attributes:
         symbol: 관리하는 심볼
         window_size: 윈도우 크기
         watermark_delay: Watermark 지연
-        windows: 열린 윈도우들 (시작시간 → CandleAggregator)
-        watermark: 현재 Watermark
+        allowed_lateness: 닫힌 윈도우를 수정할 수 있는 기간 (윈도우 종료 ~ watermark)
+        windows: 열린 윈도우들 (버킷 인덱스 → CandleAggregator)
+        retained: 닫혔지만 수정 가능한 윈도우들 (버킷 인덱스 → (tz, state()))
+        budget: 여러 심볼이 공유하는 열린 윈도우 수 한도 (없으면 None)
+        aggregator: 윈도우 집계 클래스 (집계 커널을 쓰면 compile_aggregator 결과)
+        dedup: 거래 id 중복 검사 (None이면 검사 안 함, src.dedup 참고)
+        sink: 닫힌 윈도우를 캔들 대신 받는 콜백 (symbol, interval, aggregators).
+            있으면 advance_watermark_ns() / flush()는 sink로 보내고 []를 반환한다
+        watermark_ns: 현재 Watermark (epoch ns)
+        last_trade_ns: 받은 거래의 최대 이벤트 시간 (epoch ns, idle_ttl / LRU 제거 기준).
+            add()에서만 갱신한다 (수동 watermark 진행과 무관). 거래 전에는 NO_TRADE
+        interval: 캔들 interval 문자열 (예: "1m")
     """
 
     def __init__(
@@ -122,16 +322,54 @@ class WindowManager:
         symbol: str,
         window_size: timedelta,
         watermark_delay: timedelta,
+        allowed_lateness: timedelta = timedelta(0),
+        budget: Optional[WindowBudget] = None,
+        aggregator: type[CandleAggregator] = CandleAggregator,
+        dedup: Optional["SymbolDedup"] = None,
+        sink: Optional[Callable[[str, str, list[CandleAggregator]], None]] = None,
     ):
         self.symbol = symbol
         self.window_size = window_size
         self.watermark_delay = watermark_delay
-
-        # 윈도우 상태 (window_start → aggregator)
-        self.windows: dict[datetime, CandleAggregator] = {}
+        self.allowed_lateness = allowed_lateness
+        self.window_size_ns = timedelta_to_ns(window_size)
+        self.watermark_delay_ns = timedelta_to_ns(watermark_delay)
+        self.allowed_lateness_ns = timedelta_to_ns(allowed_lateness)
+        self.budget = budget
+        self.aggregator = aggregator
+        self.dedup = dedup
+        self.interval = self._format_interval()
+
+        # 컬럼 출력: 닫힌 윈도우를 Candle 객체 없이 집계 상태 그대로 sink로 보냄
+        self.sink = sink
+        if sink is not None:
+            self.advance_watermark_ns = self._advance_watermark_ns_to_sink
+            self.flush = self._flush_to_sink
+
+        # 윈도우 상태 (bucket → aggregator)
+        self.windows: dict[int, CandleAggregator] = {}
+
+        # 만료 순서 (열린 윈도우 bucket의 min-heap)
+        self._expiry: list[int] = []
+
+        # 닫힌 윈도우 보관 (allowed_lateness > 0 일 때만 사용)
+        self.retained: dict[int, tuple[tzinfo, tuple]] = {}
+        self._retained_expiry: list[int] = []
+        # 마지막 체크포인트 이후 변경된 보관 윈도우 (닫힐 때 dirty였거나 amend됨)
+        self._dirty_retained: set[int] = set()
 
         # Watermark (이 시간 이전 데이터는 Late)
-        self.watermark: Optional[datetime] = None
+        self.watermark_ns: Optional[int] = None
+
+        # 마지막 거래 시간 (심볼 제거 기준)
+        self.last_trade_ns = NO_TRADE
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """현재 Watermark (datetime, UTC)"""
+        if self.watermark_ns is None:
+            return None
+        return from_epoch_ns(self.watermark_ns)
 
     def add_trade(self, trade: Trade) -> Optional[LateData]:
         """거래 추가
@@ -142,33 +380,148 @@ class WindowManager:
         Returns:
             Late 데이터면 LateData 반환, 아니면 None
         """
+        ts = trade.timestamp
+        if not self.add(
+            trade.price,
+            trade.quantity,
+            to_epoch_ns(ts),
+            ts.tzinfo,
+            trade.is_buyer_maker,
+            trade.trade_id,
+        ):
+            return self.late_data(trade)
+        return None
+
+    def add(
+        self,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        is_buyer_maker: Optional[bool] = None,
+        trade_id: Optional[int] = None,
+    ) -> bool:
+        """거래 추가 (hot path)
+
+        Args:
+            price: 가격
+            quantity: 수량
+            ts_ns: 거래 시간 (epoch ns)
+            tz: 새 윈도우의 캔들 시간에 사용할 timezone (기본 UTC)
+            is_buyer_maker: taker 방향 (집계 커널용)
+            trade_id: 거래 id (dedup이 있으면 중복 검사)
+
+        Returns:
+            집계되었거나 중복이라 버렸으면 True, Late 데이터면 False
+        """
+        bucket = ts_ns // self.window_size_ns
+        if ts_ns > self.last_trade_ns:
+            self.last_trade_ns = ts_ns
+
+        # 중복 거래 (재연결 재전송): 집계 / Late 처리 없이 버림
+        # 같은 버킷의 연속 id는 구간 끝만 올림 (그 밖의 id만 seen() 호출, src.dedup 참고)
+        if trade_id is not None:
+            dedup = self.dedup
+            if dedup is not None:
+                if trade_id == dedup.next_id and bucket == dedup.run_bucket:
+                    dedup.next_id = trade_id + 1
+                elif dedup.seen(trade_id, ts_ns, self.watermark_ns):
+                    return True
+
         # Late 데이터 체크
-        if self.watermark and trade.timestamp < self.watermark:
-            window_start = TumblingWindow.get_window_start(
-                trade.timestamp, self.window_size
-            )
-            window_end = TumblingWindow.get_window_end(window_start, self.window_size)
-            return LateData(
-                trade=trade,
-                window_start=window_start,
-                window_end=window_end,
-            )
+        if self.watermark_ns is not None and ts_ns < self.watermark_ns:
+            return False
+
+        # 윈도우 찾기/생성 및 집계
+        self.get_or_create_window(bucket, tz).add(price, quantity, ts_ns, is_buyer_maker)
+        return True
+
+    def get_window(self, bucket: int) -> Optional[CandleAggregator]:
+        """버킷 인덱스의 열린 윈도우 (없으면 None, 생성하지 않음)"""
+        return self.windows.get(bucket)
+
+    def get_or_create_window(
+        self, bucket: int, tz: Optional[tzinfo] = None
+    ) -> CandleAggregator:
+        """버킷 인덱스로 CandleAggregator 조회/생성"""
+        aggregator = self.windows.get(bucket)
+        if aggregator is None:
+            aggregator = self._open_window(bucket, tz)
+        return aggregator
+
+    def _open_window(self, bucket: int, tz: Optional[tzinfo]) -> CandleAggregator:
+        """새 윈도우 생성 및 만료 heap 등록 (윈도우마다 한 번)"""
+        if self.budget is not None:
+            self.budget.reserve(self, bucket)
+        start_ns = bucket * self.window_size_ns
+        aggregator = self.aggregator.from_ns(
+            start_ns,
+            start_ns + self.window_size_ns - WINDOW_END_OFFSET_NS,
+            tz,
+        )
+        self.windows[bucket] = aggregator
+        heapq.heappush(self._expiry, bucket)
+        return aggregator
 
-        # 윈도우 찾기/생성
+    def amend(
+        self,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        is_buyer_maker: Optional[bool] = None,
+    ) -> Optional[list[Candle]]:
+        """Late 거래를 allowed_lateness 안의 윈도우에 반영
+
+        add()가 False를 반환한 거래에 대해 호출한다.
+        거래가 없어 캔들이 emit되지 않은 윈도우는 수정 대상이 아니다.
+
+        Args:
+            price: 가격
+            quantity: 수량
+            ts_ns: 거래 시간 (epoch ns)
+            tz: 새 윈도우의 캔들 시간에 사용할 timezone (기본 UTC)
+            is_buyer_maker: taker 방향 (집계 커널용)
+
+        Returns:
+            - None: 반영할 수 없는 거래 (LateData로 처리)
+            - []: 아직 열린 윈도우에 집계됨 (캔들은 윈도우가 닫힐 때 emit)
+            - [candle]: 이미 emit된 윈도우의 수정된 캔들
+        """
+        if not self.allowed_lateness_ns or self.watermark_ns is None:
+            return None
+
+        bucket = ts_ns // self.window_size_ns
+        start_ns = bucket * self.window_size_ns
+        end_ns = start_ns + self.window_size_ns - WINDOW_END_OFFSET_NS
+
+        # watermark는 지났지만 윈도우는 아직 열려 있음
+        if end_ns >= self.watermark_ns:
+            self.get_or_create_window(bucket, tz).add(price, quantity, ts_ns, is_buyer_maker)
+            return []
+
+        retained = self.retained.get(bucket)
+        if retained is None or end_ns + self.allowed_lateness_ns < self.watermark_ns:
+            return None
+
+        window_tz, state = retained
+        aggregator = self.aggregator.from_state(start_ns, end_ns, window_tz, state)
+        aggregator.add(price, quantity, ts_ns, is_buyer_maker)
+        self.retained[bucket] = (window_tz, aggregator.state())
+        self._dirty_retained.add(bucket)
+        return [aggregator.to_candle(self.symbol, self.interval)]
+
+    def late_data(self, trade: Trade) -> LateData:
+        """Late 거래의 LateData 생성 (속했어야 할 윈도우 계산)"""
         window_start = TumblingWindow.get_window_start(
             trade.timestamp, self.window_size
         )
-
-        if window_start not in self.windows:
-            window_end = TumblingWindow.get_window_end(window_start, self.window_size)
-            self.windows[window_start] = CandleAggregator(
-                open_time=window_start,
-                close_time=window_end,
-            )
-
-        # 집계
-        self.windows[window_start].add_trade(trade)
-        return None
+        window_end = TumblingWindow.get_window_end(window_start, self.window_size)
+        return LateData(
+            trade=trade,
+            window_start=window_start,
+            window_end=window_end,
+        )
 
     def advance_watermark(self, timestamp: datetime) -> list[Candle]:
         """Watermark 진행 및 닫힌 윈도우의 캔들 반환
@@ -179,36 +532,159 @@ class WindowManager:
         Returns:
             닫힌 윈도우들의 캔들 리스트 (시간순 정렬)
         """
+        return self.advance_watermark_ns(to_epoch_ns(timestamp))
+
+    def advance_watermark_ns(self, ts_ns: int) -> list[Candle]:
+        """Watermark 진행 (epoch ns)
+
+        Args:
+            ts_ns: 새로운 watermark 기준 시간 (epoch ns)
+
+        Returns:
+            닫힌 윈도우들의 캔들 리스트 (시간순 정렬)
+        """
+        return [
+            aggregator.to_candle(self.symbol, self.interval)
+            for aggregator in self.close_windows_ns(ts_ns)
+        ]
+
+    def _advance_watermark_ns_to_sink(self, ts_ns: int) -> list[Candle]:
+        """advance_watermark_ns() sink 버전 (닫힌 윈도우를 sink로 보내고 [] 반환)"""
+        closed = self.close_windows_ns(ts_ns)
+        if closed:
+            self.sink(self.symbol, self.interval, closed)
+        return []
+
+    def close_windows_ns(self, ts_ns: int) -> list[CandleAggregator]:
+        """Watermark 진행 및 닫힌 윈도우의 CandleAggregator 반환
+
+        캔들 대신 집계 상태가 필요한 경우 (롤업 병합 등) 사용
+
+        Args:
+            ts_ns: 새로운 watermark 기준 시간 (epoch ns)
+
+        Returns:
+            닫힌 윈도우들의 CandleAggregator 리스트 (시간순 정렬)
+        """
         # watermark = 현재 시간 - delay
-        new_watermark = timestamp - self.watermark_delay
+        new_watermark = ts_ns - self.watermark_delay_ns
 
         # Watermark가 후퇴하면 무시
-        if self.watermark and new_watermark <= self.watermark:
+        if self.watermark_ns is not None and new_watermark <= self.watermark_ns:
             return []
 
-        self.watermark = new_watermark
+        self.watermark_ns = new_watermark
+        closed = self.pop_expired(new_watermark)
+        if self.retained:
+            self._purge_retained(new_watermark)
+        return closed
+
+    def pop_expired(self, watermark_ns: int) -> list[CandleAggregator]:
+        """주어진 watermark 이전에 종료된 윈도우를 꺼냄 (watermark는 갱신하지 않음)
+
+        Args:
+            watermark_ns: 기준 watermark (epoch ns)
 
-        # 닫힌 윈도우 찾기
-        closed_candles: list[Candle] = []
-        closed_windows: list[datetime] = []
+        Returns:
+            종료된 윈도우들의 CandleAggregator 리스트 (시간순, 빈 윈도우 제외)
+        """
+        # 만료된 윈도우만 heap에서 꺼냄 (이미 시간순)
+        # 종료 시간 < watermark
+        #   ⇔ (bucket + 1) * size - offset < watermark
+        #   ⇔ bucket < (watermark + offset - 1) // size
+        expiry = self._expiry
+        if not expiry:
+            return []
+        limit = (watermark_ns + WINDOW_END_OFFSET_NS - 1) // self.window_size_ns
+        if expiry[0] >= limit:
+            return []
 
-        for window_start, aggregator in self.windows.items():
-            # 윈도우 종료 시간이 watermark 이전이면 닫기
-            if aggregator.close_time < self.watermark:
-                if not aggregator.is_empty():
-                    interval = self._format_interval()
-                    candle = aggregator.to_candle(self.symbol, interval)
-                    closed_candles.append(candle)
-                closed_windows.append(window_start)
+        closed: list[CandleAggregator] = []
+        windows = self.windows
+        popped = len(windows)
+        while expiry and expiry[0] < limit:
+            aggregator = windows.pop(heapq.heappop(expiry))
+            if not aggregator.is_empty():
+                closed.append(aggregator)
+        if self.budget is not None:
+            self.budget.release(popped - len(windows))
+
+        if self.allowed_lateness_ns:
+            self._retain(closed)
+        return closed
+
+    def _retain(self, closed: list[CandleAggregator]) -> None:
+        """닫힌 윈도우를 allowed_lateness 동안 compact 튜플로 보관"""
+        retained = self.retained
+        for aggregator in closed:
+            bucket = aggregator.start_ns // self.window_size_ns
+            retained[bucket] = (aggregator.tz, aggregator.state())
+            heapq.heappush(self._retained_expiry, bucket)
+            if aggregator.dirty:
+                self._dirty_retained.add(bucket)
+
+    def _purge_retained(self, watermark_ns: int) -> None:
+        """종료 시간 + allowed_lateness < watermark 인 보관 윈도우 제거"""
+        expiry = self._retained_expiry
+        limit = (
+            watermark_ns - self.allowed_lateness_ns + WINDOW_END_OFFSET_NS - 1
+        ) // self.window_size_ns
+        while expiry and expiry[0] < limit:
+            bucket = heapq.heappop(expiry)
+            self.retained.pop(bucket, None)
+            self._dirty_retained.discard(bucket)
+
+    def reindex(self) -> None:
+        """windows를 직접 변경한 뒤 (체크포인트 복원 등) 만료 순서를 다시 구성
+
+        watermark 기준으로 이미 닫혔어야 할 윈도우는 allowed_lateness 안이면
+        retained로 옮기고, 아니면 버린다.
+        """
+        if self.watermark_ns is not None:
+            limit = (
+                self.watermark_ns + WINDOW_END_OFFSET_NS - 1
+            ) // self.window_size_ns
+            closed = sorted(bucket for bucket in self.windows if bucket < limit)
+            aggregators = [self.windows.pop(bucket) for bucket in closed]
+            if self.allowed_lateness_ns:
+                self._retain([a for a in aggregators if not a.is_empty()])
+
+        self._expiry = list(self.windows)
+        heapq.heapify(self._expiry)
+        self._retained_expiry = list(self.retained)
+        heapq.heapify(self._retained_expiry)
+        if self.watermark_ns is not None and self.retained:
+            self._purge_retained(self.watermark_ns)
+
+    def open_window_count(self) -> int:
+        """열린 윈도우 수"""
+        return len(self.windows)
+
+    def close_oldest(self) -> list[CandleAggregator]:
+        """종료 시간이 가장 이른 열린 윈도우를 강제로 닫음
+
+        watermark를 그 윈도우 종료 직후로 올리므로,
+        이후 그 윈도우에 도착하는 거래는 Late가 된다.
 
-        # 닫힌 윈도우 제거
-        for ws in closed_windows:
-            del self.windows[ws]
+        Returns:
+            닫힌 윈도우의 CandleAggregator 리스트 (빈 윈도우면 [])
+        """
+        end_ns = self.next_close_ns()
+        if end_ns is None:
+            return []
+        watermark_ns = end_ns + 1
+        if self.watermark_ns is None or watermark_ns > self.watermark_ns:
+            self.watermark_ns = watermark_ns
+        return self.pop_expired(watermark_ns)
 
-        # 시간순 정렬
-        closed_candles.sort(key=lambda c: c.open_time)
+    def next_close_ns(self) -> Optional[int]:
+        """가장 먼저 닫힐 열린 윈도우의 종료 시간 (epoch ns, 없으면 None)
 
-        return closed_candles
+        watermark가 이 시간을 넘어야 다음 윈도우가 닫힌다.
+        """
+        if not self._expiry:
+            return None
+        return self.windows[self._expiry[0]].end_ns
 
     def flush(self) -> list[Candle]:
         """모든 열린 윈도우 강제 닫기
@@ -218,32 +694,43 @@ class WindowManager:
         Returns:
             모든 열린 윈도우의 캔들 리스트 (시간순 정렬)
         """
-        candles: list[Candle] = []
-        interval = self._format_interval()
+        return [
+            aggregator.to_candle(self.symbol, self.interval)
+            for aggregator in self.drain()
+        ]
 
-        for aggregator in self.windows.values():
-            if not aggregator.is_empty():
-                candle = aggregator.to_candle(self.symbol, interval)
-                candles.append(candle)
+    def _flush_to_sink(self) -> list[Candle]:
+        """flush() sink 버전 (열린 윈도우를 sink로 보내고 [] 반환)"""
+        drained = self.drain()
+        if drained:
+            self.sink(self.symbol, self.interval, drained)
+        return []
 
-        self.windows.clear()
+    def drain(self) -> list[CandleAggregator]:
+        """모든 열린 윈도우를 꺼냄
 
-        # 시간순 정렬
-        candles.sort(key=lambda c: c.open_time)
+        Returns:
+            열린 윈도우들의 CandleAggregator 리스트 (시간순, 빈 윈도우 제외)
+        """
+        aggregators = [
+            self.windows[bucket]
+            for bucket in sorted(self.windows)
+            if not self.windows[bucket].is_empty()
+        ]
+
+        if self.budget is not None:
+            self.budget.release(len(self.windows))
+        self.windows.clear()
+        self._expiry.clear()
+        self.retained.clear()
+        self._retained_expiry.clear()
+        self._dirty_retained.clear()
 
-        return candles
+        return aggregators
 
     def _format_interval(self) -> str:
         """윈도우 크기를 interval 문자열로 변환"""
-        seconds = int(self.window_size.total_seconds())
-        if seconds < 60:
-            return f"{seconds}s"
-        elif seconds < 3600:
-            return f"{seconds // 60}m"
-        elif seconds < 86400:
-            return f"{seconds // 3600}h"
-        else:
-            return f"{seconds // 86400}d"
+        return format_interval(self.window_size)
 
 
 class CandleGenerator:
@@ -257,6 +744,33 @@ class CandleGenerator:
             on_late=lambda late: print(f"Late: {late}"),
         )
 
+        # 캔들을 묶음으로 받아 bulk write (flush() 시 남은 버퍼도 write)
+        sink = BufferedCandleSink(db.insert_many, max_count=5000, max_delay=timedelta(seconds=1))
+        generator = CandleGenerator(on_candles=sink)
+
+        # 심볼 / interval별 최근 캔들을 링 버퍼에 보관하고 조회
+        store = CandleStore(capacity=1440)
+        generator = CandleGenerator(store=store)
+        closes = np.frombuffer(store.last("BTCUSDT", "1m", 60).closes)
+
+        # VWAP / 거래대금 / taker 매수·매도 거래량을 같은 거래 처리 단계에서 집계
+        generator = CandleGenerator(kernels=[VWAP, TURNOVER, TAKER_VOLUME])
+
+        # 모든 심볼이 watermark를 공유: 거래가 드문 심볼의 윈도우도 제때 닫힘
+        generator = CandleGenerator(global_watermark=True, on_candle=store.insert)
+
+        # 재연결로 다시 온 거래 (같은 trade_id)는 한 번만 집계
+        generator = CandleGenerator(dedup=DedupPolicy())
+
+        # 캔들은 제때 emit하고, 10초 안의 Late 거래는 수정된 캔들로 반영
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=1),
+            allowed_lateness=timedelta(seconds=10),
+            on_candle=store.insert,
+            on_update=store.upsert,
+        )
+
         # Trade 처리
         for trade in trades:
             generator.process(trade)
@@ -268,7 +782,20 @@ class CandleGenerator:
         window_size: 윈도우 크기 (기본 1분)
         watermark_delay: Watermark 지연 (기본 5초)
         on_candle: 캔들 생성 시 콜백
+        on_candles: 한 번에 닫힌 캔들 묶음 콜백 (on_candle 다음에 호출, src.sink 참고)
         on_late: Late 데이터 발생 시 콜백
+        on_update: allowed_lateness 안의 Late 거래로 캔들이 수정될 때 콜백
+        allowed_lateness: 이미 emit된 캔들을 수정할 수 있는 기간 (기본 0 = 수정 안 함)
+        metrics: 계측 (None이면 계측 없음, src.metrics 참고)
+        eviction: 심볼 / 열린 윈도우 한도 (None이면 한도 없음, src.eviction 참고)
+        clock: 전역 watermark / 윈도우 만료 타이머 (global_watermark=True일 때, src.clock 참고)
+        store: 최근 캔들 저장소 (None이면 저장 안 함, src.store 참고)
+        kernels: OHLCV 외 집계 커널 (src.kernels 참고, 생성 시 집계 클래스로 컴파일)
+        dedup: 거래 id 중복 제거 설정 (None이면 검사 안 함, src.dedup 참고)
+        column_writer: 닫힌 윈도우를 Candle 객체 없이 집계 상태에서 바로 기록하는 컬럼 파일
+            출력 (src.arrow_writer 참고). on_candle / on_candles / store 대신 사용한다
+        trade_id_filter: 심볼들이 공유하는 정리된 거래 id 보관소 / 중복 수 (dedup이 있을 때)
+        decoder: process_dict / process_json 메시지 디코더 (src.decode 참고)
         window_managers: 심볼별 WindowManager
     """
 
@@ -278,61 +805,654 @@ class CandleGenerator:
         watermark_delay: timedelta = timedelta(seconds=5),
         on_candle: Optional[Callable[[Candle], None]] = None,
         on_late: Optional[Callable[[LateData], None]] = None,
+        on_update: Optional[Callable[[Candle], None]] = None,
+        allowed_lateness: timedelta = timedelta(0),
+        metrics: Optional["GeneratorMetrics"] = None,
+        eviction: Optional[EvictionPolicy] = None,
+        global_watermark: bool = False,
+        on_candles: Optional[Callable[[list[Candle]], None]] = None,
+        store: Optional["CandleStore"] = None,
+        kernels: Sequence["Kernel"] = (),
+        dedup: Optional["DedupPolicy"] = None,
+        column_writer: Optional["ArrowCandleWriter"] = None,
     ):
         self.window_size = window_size
         self.watermark_delay = watermark_delay
         self.on_candle = on_candle or (lambda c: None)
+        self.on_candles = on_candles
         self.on_late = on_late
+        self.on_update = on_update or (lambda c: None)
+        self.allowed_lateness = allowed_lateness
+        # 최근 캔들 저장소: emit / 수정된 캔들을 콜백보다 먼저 반영
+        self.store = store
+        if store is not None:
+            store.attach(self)
+        self._allowed_lateness_ns = timedelta_to_ns(allowed_lateness)
+
+        # 집계 커널: 생성 시 한 번 윈도우 집계 클래스로 컴파일 (거래마다 분기하지 않음)
+        self.kernels = tuple(kernels)
+        self._aggregator = CandleAggregator
+        if self.kernels:
+            from .kernels import compile_aggregator
+
+            self._aggregator = compile_aggregator(self.kernels)
+
+        # 거래 id 중복 제거: 심볼별 정확한 집합 + 공유 fingerprint 보관소
+        self.dedup = dedup
+        self.trade_id_filter = None
+        if dedup is not None:
+            from .dedup import TradeIdFilter
+
+            self.trade_id_filter = TradeIdFilter(dedup)
 
         # 심볼별 WindowManager
         self.window_managers: dict[str, WindowManager] = {}
 
+        # JSON 메시지 → 값 디코더 (Trade 객체 없이 process_values로 전달)
+        self.decoder = TradeDecoder()
+
+        # 직전 체크포인트에 있던 심볼별 윈도우 버킷 (증분 체크포인트의 제거 판별용)
+        self._checkpoint_windows: dict[str, set[int]] = {}
+
+        # 전역 watermark: 모든 심볼이 하나의 watermark와 만료 타이머를 공유
+        self.clock: Optional["EventClock"] = None
+        if global_watermark:
+            from .clock import EventClock
+
+            self.clock = EventClock(window_size, watermark_delay)
+
+        # 계측: 켜면 hot path 메서드를 계측 버전으로 교체한다
+        # (끄면 원래 메서드를 그대로 사용하므로 비용이 없음)
+        self.metrics = metrics
+        if metrics is not None:
+            self.process = self._process_with_metrics
+            self.process_values = self._process_values_with_metrics
+            self.add_trade = self._add_trade_with_metrics
+            self.advance_watermark_ns = self._advance_watermark_ns_with_metrics
+            self.flush = self._flush_with_metrics
+
+        # 컬럼 출력: 워터마크로 닫힌 윈도우는 WindowManager.sink로 집계 상태를 바로 기록하고,
+        # 한도 때문에 일찍 닫힌 윈도우 (드묾)만 Candle 묶음으로 on_candles를 거쳐 기록
+        self.column_writer = column_writer
+        if column_writer is not None:
+            if on_candle is not None or on_candles is not None or store is not None:
+                raise TypeError("column_writer cannot be combined with on_candle/on_candles/store")
+            own_managers = type(self)._create_manager is CandleGenerator._create_manager
+            if global_watermark or not own_managers:
+                raise TypeError("column_writer requires per-symbol tumbling window managers")
+            if eviction is not None and eviction.idle_ttl is not None:
+                raise TypeError("column_writer does not support idle_ttl eviction")
+            self.on_candles = column_writer
+
+        # 심볼 / 열린 윈도우 한도
+        self.eviction = eviction
+        self._max_symbols: Optional[int] = None
+        self._idle_ttl_ns: Optional[int] = None
+        self._window_budget: Optional[WindowBudget] = None
+        # 이 이벤트 시간 이후 캔들이 emit되면 idle 심볼 검사
+        self._next_sweep_ns = NO_SWEEP
+        if eviction is not None:
+            self._max_symbols = eviction.max_symbols
+            if eviction.idle_ttl is not None:
+                self._idle_ttl_ns = timedelta_to_ns(eviction.idle_ttl)
+                self._next_sweep_ns = -NO_SWEEP
+            if eviction.max_open_windows is not None:
+                self._window_budget = WindowBudget(
+                    eviction.max_open_windows, self._close_oldest_windows
+                )
+
     def _get_manager(self, symbol: str) -> WindowManager:
         """심볼별 WindowManager 조회/생성"""
-        if symbol not in self.window_managers:
-            self.window_managers[symbol] = WindowManager(
+        manager = self.window_managers.get(symbol)
+        if manager is None:
+            manager = self._add_manager(symbol)
+        return manager
+
+    def _add_manager(self, symbol: str, evict: bool = True) -> WindowManager:
+        """새 심볼의 WindowManager 등록 (max_symbols를 넘으면 LRU 제거)"""
+        manager = self._create_manager(symbol)
+        self.window_managers[symbol] = manager
+        if evict and self._max_symbols is not None:
+            self._evict_lru(keep=(symbol,))
+        return manager
+
+    def _create_manager(self, symbol: str) -> WindowManager:
+        """새 심볼의 WindowManager 생성 (하위 클래스에서 교체 가능)"""
+        if self.clock is not None:
+            from .clock import ClockedWindowManager
+
+            return ClockedWindowManager(
                 symbol=symbol,
                 window_size=self.window_size,
                 watermark_delay=self.watermark_delay,
+                clock=self.clock,
+                allowed_lateness=self.allowed_lateness,
+                budget=self._window_budget,
+                aggregator=self._aggregator,
+                dedup=self._create_dedup(),
             )
-        return self.window_managers[symbol]
+        return WindowManager(
+            symbol=symbol,
+            window_size=self.window_size,
+            watermark_delay=self.watermark_delay,
+            allowed_lateness=self.allowed_lateness,
+            budget=self._window_budget,
+            aggregator=self._aggregator,
+            dedup=self._create_dedup(),
+            sink=None if self.column_writer is None else self._emit_windows,
+        )
+
+    def _emit_windows(
+        self, symbol: str, interval: str, aggregators: list[CandleAggregator]
+    ) -> None:
+        """닫힌 윈도우를 Candle 없이 column_writer에 기록 (WindowManager.sink)"""
+        if self.metrics is not None:
+            self.metrics.candles += len(aggregators)
+        self.column_writer.write_windows(symbol, interval, aggregators)
+
+    def _create_dedup(self) -> Optional["SymbolDedup"]:
+        """새 심볼의 거래 id 중복 검사 (dedup이 없으면 None)"""
+        if self.trade_id_filter is None:
+            return None
+        from .dedup import SymbolDedup
+
+        return SymbolDedup(
+            self.trade_id_filter,
+            timedelta_to_ns(self.window_size),
+            self._allowed_lateness_ns,
+        )
 
     def process(self, trade: Trade) -> None:
         """Trade 처리
 
         1. 해당 심볼의 WindowManager로 전달
-        2. Late 데이터 처리
+        2. Late 데이터 처리 (allowed_lateness 안이면 캔들 수정)
         3. Watermark 진행 및 캔들 emit
 
         Args:
             trade: 처리할 Trade
         """
         manager = self._get_manager(trade.symbol)
+        ts = trade.timestamp
+        ts_ns = to_epoch_ns(ts)
+
+        # 거래 추가 / Late 데이터 처리
+        if not manager.add(
+            trade.price, trade.quantity, ts_ns, ts.tzinfo, trade.is_buyer_maker, trade.trade_id
+        ):
+            self._handle_late(
+                manager, trade.price, trade.quantity, ts_ns, ts.tzinfo, trade
+            )
+            return
+
+        # Watermark 진행 및 캔들 emit
+        candles = manager.advance_watermark_ns(ts_ns)
+        if candles:
+            self._emit(candles)
+            if ts_ns >= self._next_sweep_ns:
+                self.evict_idle(ts_ns)
+
+    def add_trade(self, trade: Trade) -> None:
+        """watermark를 진행하지 않고 Trade 처리 (외부 watermark용, src.partitions 참고)
 
-        # 거래 추가
-        late_data = manager.add_trade(trade)
+        Late 판별은 현재 watermark 기준이고, 윈도우는 advance_watermark_ns()로만 닫힌다.
 
-        # Late 데이터 처리
-        if late_data:
-            if self.on_late:
-                self.on_late(late_data)
+        Args:
+            trade: 처리할 Trade
+        """
+        manager = self._get_manager(trade.symbol)
+        ts = trade.timestamp
+        ts_ns = to_epoch_ns(ts)
+        if not manager.add(
+            trade.price, trade.quantity, ts_ns, ts.tzinfo, trade.is_buyer_maker, trade.trade_id
+        ):
+            self._handle_late(manager, trade.price, trade.quantity, ts_ns, ts.tzinfo, trade)
+
+    def process_values(
+        self,
+        symbol: str,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        is_buyer_maker: Optional[bool] = None,
+        trade_id: Optional[int] = None,
+    ) -> None:
+        """값으로 Trade 처리 (Trade 객체 없이, 시간은 epoch ns)
+
+        Trade 객체는 Late 데이터가 발생해 on_late를 호출할 때만 만든다.
+
+        Args:
+            symbol: 심볼
+            price: 가격
+            quantity: 수량
+            ts_ns: 거래 시간 (epoch ns)
+            tz: 캔들 시간에 사용할 timezone (기본 UTC)
+            is_buyer_maker: taker 방향 (True면 매도, 집계 커널용)
+            trade_id: 거래 id (dedup이 있으면 중복 검사)
+        """
+        manager = self._get_manager(symbol)
+
+        if not manager.add(price, quantity, ts_ns, tz, is_buyer_maker, trade_id):
+            self._handle_late(
+                manager, price, quantity, ts_ns, tz, None, is_buyer_maker, trade_id
+            )
             return
 
-        # Watermark 진행 및 캔들 emit
-        candles = manager.advance_watermark(trade.timestamp)
+        candles = manager.advance_watermark_ns(ts_ns)
+        if candles:
+            self._emit(candles)
+            if ts_ns >= self._next_sweep_ns:
+                self.evict_idle(ts_ns)
+
+    def _handle_late(
+        self,
+        manager: WindowManager,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        trade: Optional[Trade] = None,
+        is_buyer_maker: Optional[bool] = None,
+        trade_id: Optional[int] = None,
+    ) -> None:
+        """Late 거래 처리: allowed_lateness 안이면 캔들 수정, 아니면 on_late
+
+        Args:
+            manager: 거래 심볼의 WindowManager
+            price: 가격
+            quantity: 수량
+            ts_ns: 거래 시간 (epoch ns)
+            tz: 거래 timezone
+            trade: 원본 Trade (없으면 on_late 호출 시에만 값으로 생성)
+            is_buyer_maker: taker 방향 (trade가 있으면 trade의 값을 사용)
+            trade_id: 거래 id (on_late의 Trade에 사용)
+        """
+        if trade is not None:
+            is_buyer_maker = trade.is_buyer_maker
+        if self._allowed_lateness_ns:
+            amended = manager.amend(price, quantity, ts_ns, tz, is_buyer_maker)
+            if amended is not None:
+                for candle in amended:
+                    if self.store is not None:
+                        self.store.update(candle)
+                    self.on_update(candle)
+                return
+
+        if self.on_late:
+            if trade is None:
+                trade = Trade(
+                    manager.symbol,
+                    price,
+                    quantity,
+                    from_epoch_ns(ts_ns, tz or timezone.utc),
+                    is_buyer_maker,
+                    trade_id,
+                )
+            self.on_late(manager.late_data(trade))
+
+    def _process_with_metrics(self, trade: Trade) -> None:
+        """process() 계측 버전 (샘플이 아닌 거래는 카운터만 갱신)"""
+        metrics = self.metrics
+        metrics.trades += 1
+        if metrics.trades % metrics.sample_every == 0:
+            start = perf_counter_ns()
+            ts = trade.timestamp
+            self._process_sampled(
+                self._get_manager(trade.symbol),
+                trade.price,
+                trade.quantity,
+                to_epoch_ns(ts),
+                ts.tzinfo,
+                trade,
+                trade.is_buyer_maker,
+                trade.trade_id,
+                start,
+            )
+            return
+
+        manager = self._get_manager(trade.symbol)
+        ts = trade.timestamp
+        ts_ns = to_epoch_ns(ts)
+        if not manager.add(
+            trade.price, trade.quantity, ts_ns, ts.tzinfo, trade.is_buyer_maker, trade.trade_id
+        ):
+            self._late_measured(
+                manager, trade.price, trade.quantity, ts_ns, ts.tzinfo, trade
+            )
+            return
+
+        candles = manager.advance_watermark_ns(ts_ns)
+        if candles:
+            self._emit_measured(candles)
+            if ts_ns >= self._next_sweep_ns:
+                self.evict_idle(ts_ns)
+
+    def _add_trade_with_metrics(self, trade: Trade) -> None:
+        """add_trade() 계측 버전 (watermark 진행 시간은 advance_watermark_ns()에서 기록)"""
+        metrics = self.metrics
+        metrics.trades += 1
+        start = perf_counter_ns() if metrics.trades % metrics.sample_every == 0 else 0
+        manager = self._get_manager(trade.symbol)
+        ts = trade.timestamp
+        ts_ns = to_epoch_ns(ts)
+        if not manager.add(
+            trade.price, trade.quantity, ts_ns, ts.tzinfo, trade.is_buyer_maker, trade.trade_id
+        ):
+            self._late_measured(manager, trade.price, trade.quantity, ts_ns, ts.tzinfo, trade)
+        if start:
+            metrics.process_ns.record(perf_counter_ns() - start)
+
+    def _process_values_with_metrics(
+        self,
+        symbol: str,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        is_buyer_maker: Optional[bool] = None,
+        trade_id: Optional[int] = None,
+    ) -> None:
+        """process_values() 계측 버전"""
+        metrics = self.metrics
+        metrics.trades += 1
+        if metrics.trades % metrics.sample_every == 0:
+            start = perf_counter_ns()
+            self._process_sampled(
+                self._get_manager(symbol),
+                price,
+                quantity,
+                ts_ns,
+                tz,
+                None,
+                is_buyer_maker,
+                trade_id,
+                start,
+            )
+            return
+
+        manager = self._get_manager(symbol)
+        if not manager.add(price, quantity, ts_ns, tz, is_buyer_maker, trade_id):
+            self._late_measured(
+                manager, price, quantity, ts_ns, tz, None, is_buyer_maker, trade_id
+            )
+            return
+
+        candles = manager.advance_watermark_ns(ts_ns)
+        if candles:
+            self._emit_measured(candles)
+            if ts_ns >= self._next_sweep_ns:
+                self.evict_idle(ts_ns)
+
+    def _process_sampled(
+        self,
+        manager: WindowManager,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo],
+        trade: Optional[Trade],
+        is_buyer_maker: Optional[bool],
+        trade_id: Optional[int],
+        start: int,
+    ) -> None:
+        """샘플 거래 처리: 처리 시간 / watermark 진행 시간 / lag 기록
+
+        Args:
+            start: 처리 시작 시간 (perf_counter_ns)
+        """
+        metrics = self.metrics
+        if not manager.add(price, quantity, ts_ns, tz, is_buyer_maker, trade_id):
+            self._late_measured(
+                manager, price, quantity, ts_ns, tz, trade, is_buyer_maker, trade_id
+            )
+            metrics.process_ns.record(perf_counter_ns() - start)
+            return
+
+        t = perf_counter_ns()
+        candles = manager.advance_watermark_ns(ts_ns)
+        metrics.advance_watermark_ns.record(perf_counter_ns() - t)
+        metrics.watermark_lag_ns.record(ts_ns - manager.watermark_ns)
+        if candles:
+            self._emit_measured(candles)
+            if ts_ns >= self._next_sweep_ns:
+                self.evict_idle(ts_ns)
+        metrics.process_ns.record(perf_counter_ns() - start)
+
+    def _late_measured(
+        self,
+        manager: WindowManager,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        trade: Optional[Trade] = None,
+        is_buyer_maker: Optional[bool] = None,
+        trade_id: Optional[int] = None,
+    ) -> None:
+        """Late 거래 처리 + Late 수 / 콜백 시간 기록"""
+        metrics = self.metrics
+        metrics.late_trades += 1
+        t = perf_counter_ns()
+        self._handle_late(manager, price, quantity, ts_ns, tz, trade, is_buyer_maker, trade_id)
+        metrics.callback_ns.record(perf_counter_ns() - t)
+
+    def _emit_measured(self, candles: list[Candle]) -> None:
+        """캔들 emit + 캔들 수 / 콜백 시간 기록"""
+        metrics = self.metrics
+        metrics.candles += len(candles)
+        t = perf_counter_ns()
+        self._emit(candles)
+        metrics.callback_ns.record(perf_counter_ns() - t)
+
+    def _emit(self, candles: list[Candle]) -> None:
+        """캔들 emit: store 반영 후 on_candle (캔들마다), on_candles (묶음 한 번)"""
+        if self.store is not None:
+            self.store.extend(candles)
+        on_candle = self.on_candle
         for candle in candles:
-            self.on_candle(candle)
+            on_candle(candle)
+        if self.on_candles is not None:
+            self.on_candles(candles)
 
     def process_dict(self, data: dict) -> None:
         """dict 형식 Trade 처리
 
-        JSON에서 파싱된 dict를 바로 처리
+        JSON에서 파싱된 dict를 Trade 객체 없이 바로 처리
 
         Args:
-            data: Trade dict
+            data: Trade dict (timestamp는 ISO 8601 문자열 또는 epoch 밀리초)
         """
-        trade = Trade.from_dict(data)
-        self.process(trade)
+        self.process_values(*self.decoder.decode_dict(data))
+
+    def process_json(self, data: Union[bytes, str]) -> None:
+        """JSON 메시지 하나 처리 (dict / Trade 객체를 거치지 않음)
+
+        Args:
+            data: Trade JSON (process_dict와 같은 필드)
+        """
+        self.process_values(*self.decoder.decode(data))
+
+    def process_json_lines(self, buffer: Union[bytes, str]) -> int:
+        """JSON-lines 버퍼 처리 (한 줄에 Trade JSON 하나)
+
+        버퍼 전체를 한 번에 파싱한 뒤 순서대로 처리한다.
+
+        Args:
+            buffer: 줄바꿈으로 구분된 Trade JSON들
+
+        Returns:
+            처리한 거래 수
+        """
+        process_values = self.process_values
+        count = 0
+        for values in self.decoder.decode_lines(buffer):
+            process_values(*values)
+            count += 1
+        return count
+
+    def process_batch(
+        self,
+        symbol_ids: Sequence[int],
+        prices: Sequence[float],
+        quantities: Sequence[float],
+        timestamps: Sequence[int],
+        symbols: Sequence[str],
+    ) -> None:
+        """컬럼 배치 Trade 처리 (NumPy 필요)
+
+        배치 안에서 Late 판별과 (심볼, 윈도우)별 OHLCV 집계를 벡터화하고,
+        부분 집계를 기존 윈도우의 CandleAggregator에 병합한 뒤
+        심볼별로 watermark를 한 번만 진행한다.
+
+        거래별 process()를 순서대로 호출한 것과 같은 결과를 낸다:
+        - 같은 거래가 Late로 분류됨
+        - 심볼별 캔들 내용과 순서가 같음 (volume도 같은 순서로 더해 비트 단위로 같음)
+        단, 콜백 순서는 on_late(도착 순) → on_candle(심볼 첫 등장 순)로 묶인다.
+
+        metrics가 있으면 거래 / Late / 캔들 카운터와 콜백 시간, watermark 진행 시간을
+        배치마다 기록한다 (거래별 처리 시간 / lag 샘플은 없음).
+
+        allowed_lateness가 있으면 Late 거래는 배치의 캔들을 emit한 뒤 도착 순으로
+        amend / on_late 처리하며, 수정 가능 여부는 배치 끝의 watermark로 판단한다.
+
+        global_watermark 모드에서는 Late를 전역 watermark (모든 심볼의 이전 거래) 기준으로
+        판별하고, 배치 끝에 전역 watermark를 한 번 진행한다.
+
+        Args:
+            symbol_ids: 거래별 심볼 id (symbols의 인덱스)
+            prices: 거래별 가격
+            quantities: 거래별 수량
+            timestamps: 거래별 epoch-ns 타임스탬프 (int64, UTC)
+            symbols: 심볼 id → 심볼 문자열 테이블
+
+        Raises:
+            TypeError: 집계 커널을 쓰는 생성기인 경우 (배치 부분 집계는 OHLCV만 계산),
+                dedup을 쓰는 생성기인 경우 (배치에는 거래 id 컬럼이 없음)
+        """
+        import numpy as np
+
+        from .batch import NO_WATERMARK, aggregate_batch
+
+        if self.kernels:
+            raise TypeError("process_batch does not support aggregation kernels")
+        if self.dedup is not None:
+            raise TypeError("process_batch does not support trade id dedup")
+        if len(timestamps) == 0:
+            return
+
+        # 계측: 배치마다 한 번 고르므로 거래별 비용은 없음
+        metrics = self.metrics
+        emit, handle_late = self._emit, self._handle_late
+        if metrics is not None:
+            metrics.trades += len(timestamps)
+            emit, handle_late = self._emit_measured, self._late_measured
+
+        # 배치 도중 다른 배치 심볼이 LRU로 제거되지 않도록 제거는 배치 끝에 한 번
+        window_managers = self.window_managers
+        managers = [
+            window_managers.get(symbol) or self._add_manager(symbol, evict=False)
+            for symbol in symbols
+        ]
+        clock = self.clock
+        global_watermark = None
+        if clock is not None:
+            for manager in managers:
+                clock.sync(manager)
+            global_watermark = NO_WATERMARK if clock.watermark_ns is None else clock.watermark_ns
+        watermarks = np.array(
+            [NO_WATERMARK if m.watermark_ns is None else m.watermark_ns for m in managers],
+            dtype=np.int64,
+        )
+
+        def initial_volumes(group_symbol, group_bucket):
+            # 기존 윈도우 volume에서 이어 더해야 거래별 volume += quantity와 같음
+            volumes = []
+            for sym, bucket in zip(group_symbol.tolist(), group_bucket.tolist()):
+                window = managers[sym].get_window(bucket)
+                volumes.append(0.0 if window is None else window.volume)
+            return np.array(volumes, dtype=np.float64)
+
+        result = aggregate_batch(
+            symbol_ids,
+            prices,
+            quantities,
+            timestamps,
+            watermarks,
+            window_size_ns=timedelta_to_ns(self.window_size),
+            watermark_delay_ns=timedelta_to_ns(self.watermark_delay),
+            global_watermark=global_watermark,
+            initial_volumes=initial_volumes,
+        )
+
+        late_index = result.late_index.tolist()
+
+        # Late 데이터 처리 (도착 순)
+        if not self._allowed_lateness_ns:
+            if self.on_late:
+                for i in late_index:
+                    handle_late(
+                        managers[int(symbol_ids[i])],
+                        float(prices[i]),
+                        float(quantities[i]),
+                        int(timestamps[i]),
+                    )
+            elif metrics is not None:
+                metrics.late_trades += len(late_index)
+            late_index = []
+
+        # 부분 집계를 윈도우별 CandleAggregator에 병합
+        for sym, bucket, first_ts, open_, high, low, last_ts, close, volume, count in zip(
+            result.group_symbol.tolist(),
+            result.group_bucket.tolist(),
+            result.group_first_ts.tolist(),
+            result.group_open.tolist(),
+            result.group_high.tolist(),
+            result.group_low.tolist(),
+            result.group_last_ts.tolist(),
+            result.group_close.tolist(),
+            result.group_volume.tolist(),
+            result.group_count.tolist(),
+        ):
+            window = managers[sym].get_or_create_window(bucket)
+            window._merge(first_ts, open_, high, low, last_ts, close, 0.0, count)
+            # volume은 기존 윈도우 volume을 포함한 합계
+            window.volume = volume
+
+        # 심볼별 마지막 거래 시간 / watermark 진행 및 캔들 emit (배치 전체를 한 묶음으로)
+        batch_max_ts = -NO_SWEEP
+        candles: list[Candle] = []
+        symbol_max_ts = list(zip(result.symbol_ids.tolist(), result.symbol_max_ts.tolist()))
+        for sym, max_ts in symbol_max_ts:
+            manager = managers[sym]
+            if max_ts > manager.last_trade_ns:
+                manager.last_trade_ns = max_ts
+            batch_max_ts = max(batch_max_ts, max_ts)
+        start = perf_counter_ns()
+        if clock is not None:
+            if symbol_max_ts:
+                candles = clock.advance(batch_max_ts)
+        else:
+            for sym, max_ts in symbol_max_ts:
+                candles.extend(managers[sym].advance_watermark_ns(max_ts))
+        if metrics is not None:
+            metrics.advance_watermark_ns.record(perf_counter_ns() - start)
+        if candles:
+            emit(candles)
+
+        # allowed_lateness: 닫힌 윈도우에 Late 거래 반영 (도착 순)
+        for i in late_index:
+            handle_late(
+                managers[int(symbol_ids[i])],
+                float(prices[i]),
+                float(quantities[i]),
+                int(timestamps[i]),
+            )
+
+        if self._max_symbols is not None:
+            self._evict_lru(keep=symbols)
+        if batch_max_ts >= self._next_sweep_ns:
+            self.evict_idle(batch_max_ts)
 
     def advance_watermark(self, timestamp: datetime) -> None:
         """수동 watermark 진행
@@ -342,17 +1462,218 @@ class CandleGenerator:
         Args:
             timestamp: 새로운 watermark 기준 시간
         """
-        for manager in self.window_managers.values():
-            candles = manager.advance_watermark(timestamp)
-            for candle in candles:
-                self.on_candle(candle)
+        self.advance_watermark_ns(to_epoch_ns(timestamp))
+
+    def advance_watermark_ns(self, ts_ns: int) -> None:
+        """수동 watermark 진행 (epoch ns)
+
+        global_watermark 모드에서는 심볼을 순회하지 않고 만료된 윈도우만 닫는다.
+
+        Args:
+            ts_ns: 새로운 watermark 기준 시간 (epoch ns)
+        """
+        if self.clock is not None:
+            candles = self.clock.advance(ts_ns)
+        else:
+            candles = []
+            for manager in self.window_managers.values():
+                candles.extend(manager.advance_watermark_ns(ts_ns))
+        if candles:
+            self._emit(candles)
+        if ts_ns >= self._next_sweep_ns:
+            self.evict_idle(ts_ns)
+
+    def _advance_watermark_ns_with_metrics(self, ts_ns: int) -> None:
+        """advance_watermark_ns() 계측 버전"""
+        metrics = self.metrics
+        if self.clock is not None:
+            t = perf_counter_ns()
+            candles = self.clock.advance(ts_ns)
+            metrics.advance_watermark_ns.record(perf_counter_ns() - t)
+        else:
+            candles = []
+            for manager in self.window_managers.values():
+                t = perf_counter_ns()
+                candles.extend(manager.advance_watermark_ns(ts_ns))
+                metrics.advance_watermark_ns.record(perf_counter_ns() - t)
+        if candles:
+            self._emit_measured(candles)
+        if ts_ns >= self._next_sweep_ns:
+            self.evict_idle(ts_ns)
+
+    def evict(self, symbol: str) -> None:
+        """심볼 제거 (열린 윈도우는 flush하여 on_candle로 emit)
+
+        제거 후 같은 심볼의 거래가 오면 새 심볼처럼 처리된다.
+        """
+        manager = self.window_managers.pop(symbol)
+        self._emit_evicted(manager.flush())
+
+    def evict_idle(self, now_ns: int) -> list[str]:
+        """마지막 거래가 idle_ttl보다 오래된 심볼 제거
+
+        캔들 emit 시 자동으로 호출되며 (이벤트 시간 기준 idle_ttl / 4 간격),
+        외부 시계로 직접 호출할 수도 있다.
+
+        Args:
+            now_ns: 현재 이벤트 시간 (epoch ns)
+
+        Returns:
+            제거된 심볼 리스트
+        """
+        if self._idle_ttl_ns is None:
+            return []
+        self._next_sweep_ns = now_ns + max(1, self._idle_ttl_ns // 4)
+
+        # 수동 watermark 진행 (advance_watermark / 파티션 입력 등)과 무관한 마지막 거래 시간 기준
+        horizon = now_ns - self._idle_ttl_ns
+        idle = [
+            symbol
+            for symbol, manager in self.window_managers.items()
+            if manager.last_trade_ns < horizon
+        ]
+        for symbol in idle:
+            self.evict(symbol)
+        return idle
+
+    def _evict_lru(self, keep: Sequence[str]) -> None:
+        """심볼 수가 max_symbols 이하가 될 때까지 마지막 거래가 가장 오래된 심볼 제거
+
+        Args:
+            keep: 제거하지 않을 심볼 (방금 추가된 심볼 등)
+        """
+        overflow = len(self.window_managers) - self._max_symbols
+        if overflow <= 0:
+            return
+        protected = set(keep)
+        candidates = (
+            (manager.last_trade_ns, symbol)
+            for symbol, manager in self.window_managers.items()
+            if symbol not in protected
+        )
+        for _, symbol in heapq.nsmallest(overflow, candidates):
+            self.evict(symbol)
+
+    def _close_oldest_windows(self, reserving: WindowManager, bucket: int) -> None:
+        """열린 윈도우 한도 초과: 종료 시간이 가장 이른 윈도우부터 강제로 닫음
+
+        WindowBudget이 새 윈도우를 만들기 직전에 호출한다.
+        새 윈도우를 여는 심볼은 그 윈도우보다 이른 윈도우만 닫는다
+        (더 늦은 윈도우를 닫으면 watermark가 새 윈도우를 지나쳐 캔들 순서가 깨짐).
+
+        Args:
+            reserving: 새 윈도우를 여는 WindowManager
+            bucket: 새 윈도우의 버킷 인덱스
+        """
+        budget = self._window_budget
+        # reserving 심볼은 종료 시간이 새 윈도우 시작 전인 윈도우만 닫을 수 있음
+        reserving_limit_ns = bucket * reserving.window_size_ns
+
+        def head(manager: WindowManager) -> Optional[int]:
+            end_ns = manager.next_close_ns()
+            if end_ns is not None and manager is reserving and end_ns >= reserving_limit_ns:
+                return None
+            return end_ns
+
+        heads = [
+            (end_ns, symbol)
+            for symbol, manager in self.window_managers.items()
+            if (end_ns := head(manager)) is not None
+        ]
+        heapq.heapify(heads)
+        while budget.open > budget.target and heads:
+            _, symbol = heapq.heappop(heads)
+            manager = self.window_managers[symbol]
+            self._emit_evicted(
+                [
+                    aggregator.to_candle(symbol, manager.interval)
+                    for aggregator in manager.close_oldest()
+                ]
+            )
+            end_ns = head(manager)
+            if end_ns is not None:
+                heapq.heappush(heads, (end_ns, symbol))
+
+    def _emit_evicted(self, candles: list[Candle]) -> None:
+        """한도 때문에 일찍 닫힌 윈도우의 캔들 emit"""
+        if not candles:
+            return
+        if self.metrics is not None:
+            self.metrics.candles += len(candles)
+        self._emit(candles)
+
+    def snapshot(self, incremental: bool = False) -> bytes:
+        """watermark와 열린 윈도우 상태를 바이너리 체크포인트로 직렬화
+
+        열린 윈도우 하나당 고정 폭 레코드 하나를 기록한다.
+        집계 커널의 누적값 / 스케치 버킷은 그 뒤에 윈도우별로 덧붙인다.
+        incremental=True면 직전 snapshot()/restore() 이후 변경되거나
+        닫힌 윈도우만 기록한다.
+
+        Args:
+            incremental: 증분 체크포인트 여부
+
+        Returns:
+            체크포인트 bytes
+
+        Raises:
+            TypeError: 롤업 / 슬라이딩 윈도우 관리자를 쓰는 생성기인 경우
+        """
+        from .checkpoint import encode_snapshot
+
+        if self.clock is not None:
+            # 전역 watermark를 심볼별 watermark로 기록
+            for manager in self.window_managers.values():
+                self.clock.sync(manager)
+        return encode_snapshot(self, incremental)
+
+    def restore(self, data: bytes) -> None:
+        """체크포인트로 상태 복원
+
+        전체 체크포인트는 현재 상태를 대체하고, 증분 체크포인트는
+        현재 상태 위에 적용한다 (전체 → 증분 → 증분 ... 순서로 호출).
+
+        Args:
+            data: snapshot()이 만든 bytes
+
+        Raises:
+            ValueError: 포맷이나 윈도우 설정이 맞지 않는 경우
+        """
+        from .checkpoint import apply_snapshot
+
+        apply_snapshot(self, data)
+        if self.clock is not None:
+            self.clock.rebuild(self.window_managers.values())
+        if self._window_budget is not None:
+            self._window_budget.open = sum(
+                len(manager.windows) for manager in self.window_managers.values()
+            )
 
     def flush(self) -> None:
         """모든 열린 윈도우 강제 닫기
 
-        종료 시 호출하여 남은 데이터 처리
+        종료 시 호출하여 남은 데이터 처리.
+        남은 캔들은 한 묶음으로 emit하고, on_candles에 flush()가 있으면
+        (BufferedCandleSink 등) 이어서 호출한다.
         """
+        candles: list[Candle] = []
+        for manager in self.window_managers.values():
+            candles.extend(manager.flush())
+        if candles:
+            self._emit(candles)
+        self._flush_sink()
+
+    def _flush_with_metrics(self) -> None:
+        """flush() 계측 버전"""
+        candles: list[Candle] = []
         for manager in self.window_managers.values():
-            candles = manager.flush()
-            for candle in candles:
-                self.on_candle(candle)
+            candles.extend(manager.flush())
+        if candles:
+            self._emit_measured(candles)
+        self._flush_sink()
+
+    def _flush_sink(self) -> None:
+        """on_candles 버퍼 flush (flush()가 있는 경우)"""
+        flush = getattr(self.on_candles, "flush", None)
+        if flush is not None:
+            flush()
@@ -0,0 +1,369 @@
+"""윈도우 상태 체크포인트: 고정 폭 바이너리 snapshot / restore
+
+CandleGenerator.snapshot() / restore()의 내부 구현.
+
+포맷 (little endian):
+
+    header   : magic "CNDL", version u16, flags u16,
+               window_size_ns i64, watermark_delay_ns i64,
+               n_symbols u32, n_windows u32, n_removed u32
+    symbols  : n_symbols × (name_len u16, name utf-8, watermark_ns i64)
+    windows  : n_windows × WINDOW_RECORD (고정 폭 80 bytes)
+               캔들 timezone은 UTC offset(초)로만 저장한다
+    removed  : n_removed × REMOVED_RECORD (증분 체크포인트에서 닫힌 윈도우)
+    kernels  : 집계 커널을 쓰는 생성기만 (flags에 FLAG_KERNELS)
+               layout: n_sums u16, n_sketches u16,
+                       n_sums × (name_len u16, name),
+                       n_sketches × (name_len u16, name, relative_accuracy f64, max_bins u32)
+               windows 레코드 순서대로 윈도우마다 n_sums × 누적값 f64,
+               n_sketches × (zero_count i64, n_bins u32, n_bins × (key i32, count i64))
+
+watermark가 없고 윈도우도 없는 심볼은 제거(evict)된 심볼로 보고 복원 시 삭제한다.
+allowed_lateness로 보관 중인 닫힌 윈도우도 같은 레코드로 기록한다.
+복원 시 watermark보다 먼저 끝난 윈도우는 다시 보관 윈도우가 된다.
+
+증분 체크포인트는 직전 체크포인트 이후 변경된 윈도우만 기록한다.
+열린 윈도우는 CandleAggregator.dirty (생성 / add / merge가 켬),
+보관 윈도우는 WindowManager._dirty_retained (dirty인 채로 닫혔거나 amend됨)로
+변경을 판별하고, 체크포인트를 만들거나 적용하면 표시를 지운다.
+trade_count로 판별하면 제거 후 다시 만들어져 같은 수가 된 윈도우를 놓친다.
+직전 체크포인트에 있던 버킷은 제거(닫힘) 기록을 위해 따로 기억한다.
+
+커널 layout (누적값 / 스케치 이름과 설정)이 생성기와 다르면 복원하지 않는다.
+누적값은 f64, 스케치는 버킷 개수 그대로 기록하므로 복원한 윈도우의 커널 필드
+(vwap, 분위수 등)는 원본과 정확히 같다.
+"""
+
+import struct
+from datetime import timedelta, timezone, tzinfo
+from typing import TYPE_CHECKING
+
+from .candle_generator import CandleAggregator, WindowManager
+from .window import WINDOW_END_OFFSET_NS, timedelta_to_ns
+
+if TYPE_CHECKING:
+    from .candle_generator import CandleGenerator
+
+MAGIC = b"CNDL"
+VERSION = 1
+
+FLAG_FULL = 0
+FLAG_INCREMENTAL = 1
+FLAG_KERNELS = 2
+
+# OHLCV state() 튜플 길이 (커널 누적값 / 스케치 state()는 그 뒤에 붙음)
+BASE_STATE_SIZE = 8
+
+# watermark가 없는 심볼
+NO_WATERMARK = -(2**63)
+
+HEADER = struct.Struct("<4sHHqqIII")
+SYMBOL = struct.Struct("<H")
+WATERMARK = struct.Struct("<q")
+# symbol_id, bucket, first_ts, open, high, low, last_ts, close, volume, trade_count, utc_offset_s
+WINDOW_RECORD = struct.Struct("<Iqqdddqddqi")
+# symbol_id, bucket
+REMOVED_RECORD = struct.Struct("<Iq")
+# 커널 section: n_sums, n_sketches / 스케치 relative_accuracy, max_bins
+KERNEL_LAYOUT = struct.Struct("<HH")
+SKETCH_SPEC = struct.Struct("<dI")
+# 윈도우별 누적값 / 스케치 zero_count, n_bins / 버킷 key, count
+SUM = struct.Struct("<d")
+SKETCH = struct.Struct("<qI")
+SKETCH_BIN = struct.Struct("<iq")
+
+
+def encode_snapshot(generator: "CandleGenerator", incremental: bool) -> bytes:
+    """CandleGenerator의 watermark와 열린 윈도우를 바이너리로 직렬화
+
+    Args:
+        generator: 대상 생성기 (윈도우 변경 표시와 generator._checkpoint_windows를 갱신함)
+        incremental: True면 직전 체크포인트 이후 변경분만 기록
+
+    Returns:
+        체크포인트 bytes
+    """
+    previous = generator._checkpoint_windows if incremental else {}
+    current: dict[str, set[int]] = {}
+
+    names: list[bytes] = []
+    watermarks: list[int] = []
+    records: list[tuple] = []
+    removed: list[tuple[int, int]] = []
+
+    for sid, (symbol, manager) in enumerate(generator.window_managers.items()):
+        if not isinstance(manager, WindowManager):
+            raise TypeError(f"snapshot is not supported for {type(manager).__name__}")
+        names.append(symbol.encode())
+        watermarks.append(NO_WATERMARK if manager.watermark_ns is None else manager.watermark_ns)
+
+        buckets = set(manager.windows)
+        buckets.update(manager.retained)
+        for bucket, agg in manager.windows.items():
+            if (agg.dirty or not incremental) and not agg.is_empty():
+                records.append((sid, bucket, agg.state(), _utc_offset(agg.tz)))
+            agg.dirty = False
+        dirty = manager._dirty_retained
+        for bucket, (tz, state) in manager.retained.items():
+            if bucket in dirty or not incremental:
+                records.append((sid, bucket, state, _utc_offset(tz)))
+        dirty.clear()
+        seen = previous.get(symbol, ())
+        removed.extend((sid, bucket) for bucket in seen if bucket not in buckets)
+        current[symbol] = buckets
+
+    # 직전 체크포인트 이후 제거(evict)된 심볼: watermark 없이 모든 윈도우 제거로 기록
+    for symbol, seen in previous.items():
+        if symbol in generator.window_managers:
+            continue
+        sid = len(names)
+        names.append(symbol.encode())
+        watermarks.append(NO_WATERMARK)
+        removed.extend((sid, bucket) for bucket in seen)
+
+    aggregator = generator._aggregator
+    kernels = b""
+    if aggregator.sum_names or aggregator.sketch_specs:
+        kernels = _encode_kernels(aggregator, [state for _, _, state, _ in records])
+    flags = FLAG_INCREMENTAL if incremental else FLAG_FULL
+    if kernels:
+        flags |= FLAG_KERNELS
+
+    size = (
+        HEADER.size
+        + sum(SYMBOL.size + len(name) + WATERMARK.size for name in names)
+        + len(records) * WINDOW_RECORD.size
+        + len(removed) * REMOVED_RECORD.size
+        + len(kernels)
+    )
+    buf = bytearray(size)
+    HEADER.pack_into(
+        buf,
+        0,
+        MAGIC,
+        VERSION,
+        flags,
+        timedelta_to_ns(generator.window_size),
+        timedelta_to_ns(generator.watermark_delay),
+        len(names),
+        len(records),
+        len(removed),
+    )
+    pos = HEADER.size
+    for name, watermark in zip(names, watermarks):
+        SYMBOL.pack_into(buf, pos, len(name))
+        pos += SYMBOL.size
+        buf[pos : pos + len(name)] = name
+        pos += len(name)
+        WATERMARK.pack_into(buf, pos, watermark)
+        pos += WATERMARK.size
+
+    pack_window = WINDOW_RECORD.pack_into
+    for sid, bucket, state, utc_offset in records:
+        pack_window(buf, pos, sid, bucket, *state[:BASE_STATE_SIZE], utc_offset)
+        pos += WINDOW_RECORD.size
+    for record in removed:
+        REMOVED_RECORD.pack_into(buf, pos, *record)
+        pos += REMOVED_RECORD.size
+    buf[pos:] = kernels
+
+    generator._checkpoint_windows = current
+    return bytes(buf)
+
+
+def _encode_kernels(aggregator: type[CandleAggregator], states: list[tuple]) -> bytes:
+    """커널 layout과 윈도우별 커널 state (누적값, 스케치 버킷)를 직렬화"""
+    buf = bytearray(KERNEL_LAYOUT.pack(len(aggregator.sum_names), len(aggregator.sketch_specs)))
+    for name in aggregator.sum_names:
+        _pack_name(buf, name)
+    for name, accuracy, max_bins in aggregator.sketch_specs:
+        _pack_name(buf, name)
+        buf += SKETCH_SPEC.pack(accuracy, max_bins)
+
+    sketch_offset = BASE_STATE_SIZE + len(aggregator.sum_names)
+    for state in states:
+        for value in state[BASE_STATE_SIZE:sketch_offset]:
+            buf += SUM.pack(value)
+        for zero_count, bins in state[sketch_offset:]:
+            buf += SKETCH.pack(zero_count, len(bins))
+            for key, count in bins:
+                buf += SKETCH_BIN.pack(key, count)
+    return bytes(buf)
+
+
+def _pack_name(buf: bytearray, name: str) -> None:
+    encoded = name.encode()
+    buf += SYMBOL.pack(len(encoded))
+    buf += encoded
+
+
+def _decode_kernels(
+    aggregator: type[CandleAggregator], view: memoryview, pos: int, n_windows: int
+) -> list[tuple]:
+    """커널 section을 윈도우별 커널 state 튜플 목록으로 복원
+
+    Raises:
+        ValueError: 잘렸거나 layout이 생성기의 커널과 다른 경우
+    """
+    reader = _Reader(view, pos)
+    n_sums, n_sketches = reader.unpack(KERNEL_LAYOUT)
+    sums = tuple(reader.name() for _ in range(n_sums))
+    sketches = tuple(
+        (reader.name(), *reader.unpack(SKETCH_SPEC)) for _ in range(n_sketches)
+    )
+    if sums != aggregator.sum_names or sketches != aggregator.sketch_specs:
+        raise ValueError("checkpoint kernels do not match the generator")
+
+    states = []
+    for _ in range(n_windows):
+        state = tuple(reader.unpack(SUM)[0] for _ in sums)
+        for _ in sketches:
+            zero_count, n_bins = reader.unpack(SKETCH)
+            bins = tuple(SKETCH_BIN.iter_unpack(reader.take(n_bins * SKETCH_BIN.size)))
+            state += ((zero_count, bins),)
+        states.append(state)
+    return states
+
+
+class _Reader:
+    """길이를 확인하며 읽는 커서 (잘린 체크포인트는 ValueError)"""
+
+    def __init__(self, view: memoryview, pos: int):
+        self.view = view
+        self.pos = pos
+
+    def take(self, size: int) -> memoryview:
+        end = self.pos + size
+        if len(self.view) < end:
+            raise ValueError("checkpoint is truncated")
+        chunk = self.view[self.pos : end]
+        self.pos = end
+        return chunk
+
+    def unpack(self, record: struct.Struct) -> tuple:
+        return record.unpack(self.take(record.size))
+
+    def name(self) -> str:
+        (length,) = self.unpack(SYMBOL)
+        return bytes(self.take(length)).decode()
+
+
+def _utc_offset(tz: tzinfo) -> int:
+    """timezone의 UTC offset (초)"""
+    offset = tz.utcoffset(None)
+    return int(offset.total_seconds()) if offset is not None else 0
+
+
+def apply_snapshot(generator: "CandleGenerator", data: bytes) -> None:
+    """체크포인트를 CandleGenerator에 적용
+
+    전체 체크포인트는 기존 상태를 대체하고,
+    증분 체크포인트는 현재 상태 위에 변경/닫힌 윈도우를 반영한다.
+
+    Raises:
+        ValueError: 포맷이 다르거나 윈도우 설정이 맞지 않는 경우
+    """
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise ValueError("checkpoint is truncated")
+    (
+        magic,
+        version,
+        flags,
+        window_size_ns,
+        delay_ns,
+        n_symbols,
+        n_windows,
+        n_removed,
+    ) = HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a candle checkpoint (or unsupported version)")
+    if window_size_ns != timedelta_to_ns(generator.window_size) or delay_ns != timedelta_to_ns(
+        generator.watermark_delay
+    ):
+        raise ValueError("checkpoint window settings do not match the generator")
+
+    # 길이를 모두 확인한 뒤 상태를 바꿈 (잘린 체크포인트로 상태가 반쯤 바뀌지 않도록)
+    pos = HEADER.size
+    symbols: list[tuple[str, int]] = []
+    for _ in range(n_symbols):
+        if len(view) < pos + SYMBOL.size:
+            raise ValueError("checkpoint is truncated")
+        (length,) = SYMBOL.unpack_from(view, pos)
+        pos += SYMBOL.size
+        if len(view) < pos + length + WATERMARK.size:
+            raise ValueError("checkpoint is truncated")
+        symbol = bytes(view[pos : pos + length]).decode()
+        pos += length
+        (watermark,) = WATERMARK.unpack_from(view, pos)
+        pos += WATERMARK.size
+        symbols.append((symbol, watermark))
+    kernels_pos = pos + n_windows * WINDOW_RECORD.size + n_removed * REMOVED_RECORD.size
+    if len(view) < kernels_pos:
+        raise ValueError("checkpoint is truncated")
+    aggregator = generator._aggregator
+    kernel_states = None
+    if flags & FLAG_KERNELS:
+        kernel_states = _decode_kernels(aggregator, view, kernels_pos, n_windows)
+    elif aggregator.sum_names or aggregator.sketch_specs:
+        raise ValueError("checkpoint kernels do not match the generator")
+
+    if not flags & FLAG_INCREMENTAL:
+        generator.window_managers.clear()
+        generator._checkpoint_windows = {}
+
+    managers: list[WindowManager] = []
+    for symbol, watermark in symbols:
+        # 복원 중에는 max_symbols 제거를 하지 않음
+        manager = generator.window_managers.get(symbol) or generator._add_manager(
+            symbol, evict=False
+        )
+        manager.watermark_ns = None if watermark == NO_WATERMARK else watermark
+        if manager.watermark_ns is not None:
+            # 마지막 거래 시간은 기록하지 않으므로 watermark + delay로 추정 (idle_ttl / LRU 기준)
+            manager.last_trade_ns = max(
+                manager.last_trade_ns, manager.watermark_ns + manager.watermark_delay_ns
+            )
+        managers.append(manager)
+
+        # 보관 중인 닫힌 윈도우도 windows에 모아 변경분을 적용한 뒤 reindex()로 되돌림
+        for bucket, (tz, state) in manager.retained.items():
+            start_ns = bucket * manager.window_size_ns
+            end_ns = start_ns + manager.window_size_ns - WINDOW_END_OFFSET_NS
+            manager.windows[bucket] = manager.aggregator.from_state(start_ns, end_ns, tz, state)
+        manager.retained.clear()
+
+    end = pos + n_windows * WINDOW_RECORD.size
+    timezones: dict[int, timezone] = {0: timezone.utc}
+    for i, record in enumerate(WINDOW_RECORD.iter_unpack(view[pos:end])):
+        sid, bucket, utc_offset = record[0], record[1], record[-1]
+        state = record[2:-1]
+        if kernel_states is not None:
+            state += kernel_states[i]
+        tz = timezones.get(utc_offset)
+        if tz is None:
+            tz = timezones[utc_offset] = timezone(timedelta(seconds=utc_offset))
+        manager = managers[sid]
+        start_ns = bucket * manager.window_size_ns
+        end_ns = start_ns + manager.window_size_ns - WINDOW_END_OFFSET_NS
+        manager.windows[bucket] = manager.aggregator.from_state(start_ns, end_ns, tz, state)
+
+    pos = end
+    end = pos + n_removed * REMOVED_RECORD.size
+    for sid, bucket in REMOVED_RECORD.iter_unpack(view[pos:end]):
+        managers[sid].windows.pop(bucket, None)
+
+    # 만료 순서 재구성 및 체크포인트 기준 갱신
+    for manager in managers:
+        if manager.watermark_ns is None and not manager.windows and not manager.retained:
+            # 원본에서 제거된 심볼
+            generator.window_managers.pop(manager.symbol, None)
+            generator._checkpoint_windows.pop(manager.symbol, None)
+            continue
+        manager.reindex()
+        for agg in manager.windows.values():
+            agg.dirty = False
+        manager._dirty_retained.clear()
+        buckets = set(manager.windows)
+        buckets.update(manager.retained)
+        generator._checkpoint_windows[manager.symbol] = buckets
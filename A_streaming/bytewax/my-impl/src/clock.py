@@ -0,0 +1,303 @@
+"""전역 이벤트 시간 시계: TimerWheel, EventClock, ClockedWindowManager
+
+CandleGenerator(global_watermark=True)로 켠다.
+
+기본 모드에서는 심볼마다 watermark가 따로 있어서, 같은 심볼의 거래가 와야
+그 심볼의 윈도우가 닫힌다. 거래가 드문 심볼은 끝난 캔들을 오래 붙잡고 있게 된다.
+
+전역 모드에서는 모든 심볼이 하나의 watermark (전체 거래의 최대 이벤트 시간 - delay)를
+공유한다. 윈도우가 생길 때 그 종료 시점을 계층형 timer wheel에 등록하고,
+watermark가 진행되면 실제로 만료된 윈도우의 WindowManager만 깨운다.
+따라서 watermark 진행 비용은 심볼 수가 아니라 만료되는 윈도우 수에 비례한다.
+
+- Late 판별도 전역 watermark 기준이다 (다른 심볼이 진행시킨 watermark 이전 거래는 Late)
+- WindowManager.watermark_ns는 거래 / 만료 시에만 전역 값으로 맞춘다 (lazy)
+- 닫히거나 flush / evict된 윈도우의 타이머는 취소하지 않는다.
+  만료 시점에 깨어나도 꺼낼 윈도우가 없으면 아무것도 하지 않는다.
+"""
+
+from datetime import timedelta, tzinfo
+from typing import TYPE_CHECKING, Hashable, Iterable, Optional
+
+from .candle import Candle
+from .candle_generator import CandleAggregator, WindowManager
+from .eviction import WindowBudget
+from .window import WINDOW_END_OFFSET_NS, timedelta_to_ns
+
+if TYPE_CHECKING:
+    from .dedup import SymbolDedup
+
+
+class TimerWheel:
+    """계층형 timer wheel (정수 tick)
+
+    level L의 slot은 tick의 L번째 digit (bits 비트씩)으로 고른다.
+    항목은 현재 tick(now)과 처음 달라지는 가장 높은 digit의 level에 들어가고,
+    now가 그 digit에 도달하면 (cascade) 더 낮은 level로 다시 배치된다.
+    가장 높은 level보다 먼 항목은 overflow에 두었다가 최상위 digit이 바뀔 때 다시 배치한다.
+
+    advance()는 tick을 하나씩 세지 않고, 비어 있지 않은 가장 낮은 level의
+    다음 digit 경계로 바로 건너뛴다.
+
+    Attributes:
+        now: 현재 tick (이 tick 이하의 항목은 만료됨)
+        levels: level 수
+        bits: level당 digit 비트 수 (slot 수 = 2**bits)
+    """
+
+    def __init__(self, now: int = 0, levels: int = 4, bits: int = 6):
+        if levels < 1 or bits < 1:
+            raise ValueError("levels and bits must be >= 1")
+        self.now = now
+        self.levels = levels
+        self.bits = bits
+        self._mask = (1 << bits) - 1
+        self._slots: list[list[list[tuple[int, Hashable]]]] = [
+            [[] for _ in range(1 << bits)] for _ in range(levels)
+        ]
+        self._counts = [0] * levels
+        self._overflow: list[tuple[int, Hashable]] = []
+        # 이미 만료된 항목 (다음 advance()에서 반환)
+        self._due: list[Hashable] = []
+
+    def __len__(self) -> int:
+        return sum(self._counts) + len(self._overflow) + len(self._due)
+
+    def schedule(self, tick: int, item: Hashable) -> None:
+        """tick에 만료되는 항목 등록 (tick <= now면 다음 advance()에서 바로 반환)"""
+        if tick <= self.now:
+            self._due.append(item)
+            return
+        level = ((tick ^ self.now).bit_length() - 1) // self.bits
+        if level >= self.levels:
+            self._overflow.append((tick, item))
+            return
+        self._slots[level][(tick >> (level * self.bits)) & self._mask].append((tick, item))
+        self._counts[level] += 1
+
+    def advance(self, target: int) -> list[Hashable]:
+        """now를 target까지 진행하고 만료된 항목 반환 (만료 순)
+
+        Args:
+            target: 새 tick (now 이하면 진행하지 않음)
+
+        Returns:
+            tick <= target 인 항목 리스트
+        """
+        counts = self._counts
+        while self.now < target:
+            level = next((i for i, count in enumerate(counts) if count), None)
+            if level is None:
+                if not self._overflow:
+                    self.now = target
+                    break
+                level = self.levels
+            shift = level * self.bits
+            # level 아래는 비어 있으므로 다음 항목은 이 digit 경계 이후
+            boundary = ((self.now >> shift) + 1) << shift
+            if boundary > target:
+                self.now = target
+                break
+            self._move(boundary)
+
+        fired = self._due
+        self._due = []
+        return fired
+
+    def _move(self, now: int) -> None:
+        """now를 digit 경계로 옮기고 바뀐 digit의 slot을 cascade"""
+        bits = self.bits
+        changed = ((self.now ^ now).bit_length() - 1) // bits
+        self.now = now
+
+        if changed >= self.levels:
+            overflow = self._overflow
+            self._overflow = []
+            for tick, item in overflow:
+                self.schedule(tick, item)
+            changed = self.levels - 1
+
+        for level in range(changed, 0, -1):
+            slot = self._slots[level][(now >> (level * bits)) & self._mask]
+            if slot:
+                entries = slot[:]
+                slot.clear()
+                self._counts[level] -= len(entries)
+                for tick, item in entries:
+                    self.schedule(tick, item)
+
+        slot = self._slots[0][now & self._mask]
+        if slot:
+            self._due.extend(item for _, item in slot)
+            self._counts[0] -= len(slot)
+            slot.clear()
+
+
+class EventClock:
+    """여러 WindowManager가 공유하는 전역 watermark와 윈도우 만료 타이머
+
+    tick은 윈도우 버킷 인덱스다. 버킷 b의 윈도우는 expiry limit
+    ((watermark + offset - 1) // size)가 b + 1에 도달하면 닫히므로 tick b + 1에 등록한다.
+    첫 watermark가 정해지기 전에 등록된 타이머는 모아 두었다가 wheel을 만들 때 넣는다.
+
+    Attributes:
+        window_size_ns: 윈도우 크기 (ns)
+        watermark_delay_ns: Watermark 지연 (ns)
+        watermark_ns: 전역 Watermark (epoch ns, 거래 전에는 None)
+        wheel: 만료 타이머 (첫 watermark 전에는 None)
+    """
+
+    def __init__(
+        self,
+        window_size: timedelta,
+        watermark_delay: timedelta,
+        levels: int = 4,
+        bits: int = 6,
+    ):
+        self.window_size_ns = timedelta_to_ns(window_size)
+        self.watermark_delay_ns = timedelta_to_ns(watermark_delay)
+        self.watermark_ns: Optional[int] = None
+        self.wheel: Optional[TimerWheel] = None
+        self._levels = levels
+        self._bits = bits
+        self._pending: list[tuple[int, WindowManager]] = []
+
+    def schedule(self, bucket: int, manager: WindowManager) -> None:
+        """manager의 버킷 윈도우 만료 타이머 등록"""
+        if self.wheel is None:
+            self._pending.append((bucket + 1, manager))
+        else:
+            self.wheel.schedule(bucket + 1, manager)
+
+    def advance(self, ts_ns: int) -> list[Candle]:
+        """전역 watermark 진행 및 만료된 윈도우의 캔들 반환
+
+        Args:
+            ts_ns: 새로운 watermark 기준 시간 (epoch ns)
+
+        Returns:
+            닫힌 윈도우들의 캔들 리스트 (심볼별로는 시간순, 여러 심볼 포함)
+        """
+        new_watermark = ts_ns - self.watermark_delay_ns
+        if self.watermark_ns is not None and new_watermark <= self.watermark_ns:
+            return []
+        self.watermark_ns = new_watermark
+
+        limit = (new_watermark + WINDOW_END_OFFSET_NS - 1) // self.window_size_ns
+        if self.wheel is None:
+            self._start(limit)
+        fired = self.wheel.advance(limit)
+        if not fired:
+            return []
+
+        candles: list[Candle] = []
+        # 한 manager에 여러 윈도우가 만료되어도 한 번만 깨운다 (만료 순서 유지)
+        for manager in dict.fromkeys(fired):
+            self.sync(manager)
+            closed = manager.pop_expired(manager.watermark_ns)
+            candles.extend(
+                aggregator.to_candle(manager.symbol, manager.interval)
+                for aggregator in closed
+            )
+        return candles
+
+    def sync(self, manager: WindowManager) -> None:
+        """manager의 watermark를 전역 watermark로 올림 (보관 윈도우 정리 포함)"""
+        watermark_ns = self.watermark_ns
+        if watermark_ns is None:
+            return
+        if manager.watermark_ns is None or watermark_ns > manager.watermark_ns:
+            manager.watermark_ns = watermark_ns
+            if manager.retained:
+                manager._purge_retained(watermark_ns)
+
+    def rebuild(self, managers: Iterable[WindowManager]) -> None:
+        """manager 상태를 직접 바꾼 뒤 (체크포인트 복원 등) watermark와 타이머를 다시 구성
+
+        전역 watermark는 manager watermark의 최대값이 된다.
+        """
+        managers = list(managers)
+        watermarks = [m.watermark_ns for m in managers if m.watermark_ns is not None]
+        self.watermark_ns = max(watermarks) if watermarks else None
+        self.wheel = None
+        self._pending = [
+            (bucket + 1, manager) for manager in managers for bucket in manager.windows
+        ]
+        if self.watermark_ns is not None:
+            self._start((self.watermark_ns + WINDOW_END_OFFSET_NS - 1) // self.window_size_ns)
+
+    def _start(self, limit: int) -> None:
+        """첫 watermark로 wheel 생성 및 모아 둔 타이머 등록"""
+        self.wheel = TimerWheel(limit, self._levels, self._bits)
+        for tick, manager in self._pending:
+            self.wheel.schedule(tick, manager)
+        self._pending = []
+
+
+class ClockedWindowManager(WindowManager):
+    """전역 EventClock을 사용하는 WindowManager
+
+    - 윈도우를 만들 때 만료 타이머를 clock에 등록
+    - Late 판별 전에 watermark를 전역 watermark로 맞춤
+    - advance_watermark_ns()는 전역 watermark를 진행하고
+      만료된 모든 심볼의 캔들을 반환
+
+    Attributes:
+        clock: 공유 EventClock
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        window_size: timedelta,
+        watermark_delay: timedelta,
+        clock: EventClock,
+        allowed_lateness: timedelta = timedelta(0),
+        budget: Optional[WindowBudget] = None,
+        aggregator: type[CandleAggregator] = CandleAggregator,
+        dedup: Optional["SymbolDedup"] = None,
+    ):
+        super().__init__(
+            symbol, window_size, watermark_delay, allowed_lateness, budget, aggregator, dedup
+        )
+        self.clock = clock
+
+    def add(
+        self,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        is_buyer_maker: Optional[bool] = None,
+        trade_id: Optional[int] = None,
+    ) -> bool:
+        """거래 추가 (전역 watermark 기준 Late / 중복 판별)"""
+        self.clock.sync(self)
+        return super().add(price, quantity, ts_ns, tz, is_buyer_maker, trade_id)
+
+    def amend(
+        self,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        is_buyer_maker: Optional[bool] = None,
+    ) -> Optional[list[Candle]]:
+        """Late 거래 반영 (전역 watermark 기준)"""
+        self.clock.sync(self)
+        return super().amend(price, quantity, ts_ns, tz, is_buyer_maker)
+
+    def _open_window(self, bucket: int, tz: Optional[tzinfo]) -> CandleAggregator:
+        aggregator = super()._open_window(bucket, tz)
+        self.clock.schedule(bucket, self)
+        return aggregator
+
+    def advance_watermark_ns(self, ts_ns: int) -> list[Candle]:
+        """전역 watermark 진행
+
+        Returns:
+            닫힌 윈도우들의 캔들 리스트 (이 심볼뿐 아니라 만료된 모든 심볼)
+        """
+        candles = self.clock.advance(ts_ns)
+        self.clock.sync(self)
+        return candles
@@ -0,0 +1,340 @@
+"""컬럼 배치 컨테이너: TradeBatch, CandleBatch
+
+많은 Trade / Candle을 보관할 때 레코드마다 객체와 datetime을 만들지 않고
+typed array 컬럼 (array 모듈)에 저장한다. 문자열(심볼, interval)은 테이블에 한 번만
+저장하고 컬럼에는 id를 넣는다. 시간은 epoch ns 정수, timezone은 UTC offset(초)이다.
+
+레코드가 필요할 때만 batch[i] / iter(batch)로 Trade / Candle 뷰를 만든다.
+집계 커널 필드 (vwap, 분위수 등)는 그런 캔들이 처음 들어올 때 컬럼을 만든다
+(float 필드는 float64 컬럼에 None을 NaN으로, 분위수 dict는 list에 보관).
+
+    batch = CandleBatch()
+    generator = CandleGenerator(on_candle=batch.append)
+    ...
+    rows = batch.to_dicts()          # Candle.to_dict()와 같은 형식
+
+닫힌 윈도우의 CandleAggregator는 append_window()로 Candle 객체 없이 바로 추가한다
+(ArrowCandleWriter.write_windows 경로).
+
+TradeBatch 컬럼은 process_batch()에 그대로 넘길 수 있다 (NumPy가 buffer로 읽음):
+
+    generator.process_batch(
+        trades.symbol_ids, trades.prices, trades.quantities, trades.timestamps, trades.symbols
+    )
+"""
+
+from array import array
+from datetime import timedelta, timezone, tzinfo
+from functools import partial
+from math import isnan, nan
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional, Union
+
+from .candle import KERNEL_FIELDS, QUANTILE_FIELDS, Candle, Trade, has_kernel_fields
+from .window import from_epoch_ns, to_epoch_ns, window_time
+
+if TYPE_CHECKING:
+    from .candle_generator import CandleAggregator
+
+
+class _StringTable:
+    """문자열 ↔ id 테이블"""
+
+    __slots__ = ("values", "_ids")
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def id(self, value: str) -> int:
+        sid = self._ids.get(value)
+        if sid is None:
+            sid = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return sid
+
+
+class _TimezoneTable:
+    """UTC offset(초) ↔ timezone 변환 (offset별 timezone 객체 하나)"""
+
+    __slots__ = ("_by_offset", "_by_tz")
+
+    def __init__(self) -> None:
+        self._by_offset: dict[int, tzinfo] = {0: timezone.utc}
+        self._by_tz: dict[tzinfo, int] = {timezone.utc: 0}
+
+    def offset(self, tz: Optional[tzinfo]) -> int:
+        if tz is None:
+            return 0
+        offset = self._by_tz.get(tz)
+        if offset is None:
+            delta = tz.utcoffset(None)
+            offset = self._by_tz[tz] = int(delta.total_seconds()) if delta else 0
+        return offset
+
+    def tz(self, offset: int) -> tzinfo:
+        tz = self._by_offset.get(offset)
+        if tz is None:
+            tz = self._by_offset[offset] = timezone(timedelta(seconds=offset))
+        return tz
+
+
+class TradeBatch:
+    """Trade 컬럼 저장소
+
+    Attributes:
+        symbols: 심볼 테이블 (symbol id → 심볼)
+        symbol_ids: 심볼 id 컬럼 (uint32)
+        prices: 가격 컬럼 (float64)
+        quantities: 수량 컬럼 (float64)
+        timestamps: epoch ns 컬럼 (int64)
+        utc_offsets: timestamp의 UTC offset(초) 컬럼 (int32)
+    """
+
+    __slots__ = (
+        "_symbols",
+        "_timezones",
+        "symbol_ids",
+        "prices",
+        "quantities",
+        "timestamps",
+        "utc_offsets",
+    )
+
+    def __init__(self, trades: Iterable[Trade] = ()):
+        self._symbols = _StringTable()
+        self._timezones = _TimezoneTable()
+        self.symbol_ids = array("I")
+        self.prices = array("d")
+        self.quantities = array("d")
+        self.timestamps = array("q")
+        self.utc_offsets = array("i")
+        for trade in trades:
+            self.append(trade)
+
+    @property
+    def symbols(self) -> list[str]:
+        return self._symbols.values
+
+    def append(self, trade: Trade) -> None:
+        """Trade 추가"""
+        ts = trade.timestamp
+        self.append_values(
+            trade.symbol, trade.price, trade.quantity, to_epoch_ns(ts), ts.tzinfo
+        )
+
+    def append_values(
+        self,
+        symbol: str,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+    ) -> None:
+        """값으로 추가 (Trade 객체 없이)"""
+        self.symbol_ids.append(self._symbols.id(symbol))
+        self.prices.append(price)
+        self.quantities.append(quantity)
+        self.timestamps.append(ts_ns)
+        self.utc_offsets.append(self._timezones.offset(tz))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index: int) -> Trade:
+        """index번째 Trade 뷰 (새 Trade 객체)"""
+        return Trade(
+            symbol=self._symbols.values[self.symbol_ids[index]],
+            price=self.prices[index],
+            quantity=self.quantities[index],
+            timestamp=from_epoch_ns(
+                self.timestamps[index], self._timezones.tz(self.utc_offsets[index])
+            ),
+        )
+
+    def __iter__(self) -> Iterator[Trade]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Trade.to_dict() 리스트"""
+        return [trade.to_dict() for trade in self]
+
+    def clear(self) -> None:
+        """모든 거래 제거 (심볼 테이블은 유지)"""
+        for name in self.__slots__[2:]:
+            del getattr(self, name)[:]
+
+    @property
+    def nbytes(self) -> int:
+        """컬럼 데이터 크기 (bytes, 심볼 테이블 제외)"""
+        return sum(
+            getattr(self, name).itemsize * len(self) for name in self.__slots__[2:]
+        )
+
+
+class CandleBatch:
+    """Candle 컬럼 저장소
+
+    Attributes:
+        strings: 문자열 테이블 (심볼과 interval 공용)
+        symbol_ids / interval_ids: 문자열 테이블 id 컬럼 (uint32)
+        open_times / close_times: epoch ns 컬럼 (int64)
+        utc_offsets: 캔들 시간의 UTC offset(초) 컬럼 (int32)
+        opens / highs / lows / closes / volumes: OHLCV 컬럼 (float64)
+        trade_counts: 거래 수 컬럼 (int64)
+        kernel_columns: 집계 커널 필드 이름 → 컬럼 (float64 array는 None을 NaN으로,
+            분위수는 dict list). 커널 필드가 있는 캔들이 들어오기 전에는 비어 있음
+    """
+
+    __slots__ = (
+        "_strings",
+        "_timezones",
+        "kernel_columns",
+        "symbol_ids",
+        "interval_ids",
+        "open_times",
+        "close_times",
+        "utc_offsets",
+        "opens",
+        "highs",
+        "lows",
+        "closes",
+        "volumes",
+        "trade_counts",
+    )
+
+    def __init__(self, candles: Iterable[Candle] = ()):
+        self._strings = _StringTable()
+        self._timezones = _TimezoneTable()
+        self.symbol_ids = array("I")
+        self.interval_ids = array("I")
+        self.open_times = array("q")
+        self.close_times = array("q")
+        self.utc_offsets = array("i")
+        self.opens = array("d")
+        self.highs = array("d")
+        self.lows = array("d")
+        self.closes = array("d")
+        self.volumes = array("d")
+        self.trade_counts = array("q")
+        self.kernel_columns: dict[str, Union[array, list]] = {}
+        for candle in candles:
+            self.append(candle)
+
+    @property
+    def strings(self) -> list[str]:
+        """문자열 테이블 (symbol_ids / interval_ids → 문자열)"""
+        return self._strings.values
+
+    def append(self, candle: Candle) -> None:
+        """Candle 추가 (on_candle 콜백으로 바로 사용 가능)"""
+        strings = self._strings
+        self.symbol_ids.append(strings.id(candle.symbol))
+        self.interval_ids.append(strings.id(candle.interval))
+        self.open_times.append(to_epoch_ns(candle.open_time))
+        self.close_times.append(to_epoch_ns(candle.close_time))
+        self.utc_offsets.append(self._timezones.offset(candle.open_time.tzinfo))
+        self.opens.append(candle.open)
+        self.highs.append(candle.high)
+        self.lows.append(candle.low)
+        self.closes.append(candle.close)
+        self.volumes.append(candle.volume)
+        self.trade_counts.append(candle.trade_count)
+        if self.kernel_columns or has_kernel_fields(candle):
+            self._append_kernel_fields(candle)
+
+    def append_window(self, symbol: str, interval: str, aggregator: "CandleAggregator") -> None:
+        """닫힌 윈도우의 집계 상태를 Candle 객체 없이 추가 (비어 있지 않은 윈도우)
+
+        Args:
+            symbol: 심볼
+            interval: 캔들 interval 문자열
+            aggregator: 닫힌 윈도우의 CandleAggregator
+        """
+        strings = self._strings
+        self.symbol_ids.append(strings.id(symbol))
+        self.interval_ids.append(strings.id(interval))
+        self.open_times.append(aggregator.start_ns)
+        self.close_times.append(aggregator.end_ns)
+        self.utc_offsets.append(self._timezones.offset(aggregator.tz))
+        self.opens.append(aggregator.open)
+        self.highs.append(aggregator.high)
+        self.lows.append(aggregator.low)
+        self.closes.append(aggregator.close)
+        self.volumes.append(aggregator.volume)
+        self.trade_counts.append(aggregator.trade_count)
+        fields = aggregator.kernel_fields()
+        if self.kernel_columns or fields:
+            self._append_kernel_values(fields.get)
+
+    def _append_kernel_fields(self, candle: Candle) -> None:
+        self._append_kernel_values(partial(getattr, candle))
+
+    def _append_kernel_values(self, get: Callable[[str], Any]) -> None:
+        """커널 필드 값 추가 (get: 필드 이름 → 값, 없으면 None)"""
+        columns = self.kernel_columns
+        if not columns:
+            # 이전 캔들은 커널 필드가 없음
+            n = len(self) - 1
+            for name in KERNEL_FIELDS:
+                columns[name] = [None] * n if name in QUANTILE_FIELDS else array("d", [nan] * n)
+        for name, column in columns.items():
+            value = get(name)
+            if value is None and name not in QUANTILE_FIELDS:
+                value = nan
+            column.append(value)
+
+    def extend(self, candles: Iterable[Candle]) -> None:
+        """여러 Candle 추가"""
+        for candle in candles:
+            self.append(candle)
+
+    def __len__(self) -> int:
+        return len(self.open_times)
+
+    def __getitem__(self, index: int) -> Candle:
+        """index번째 Candle 뷰 (새 Candle 객체)"""
+        strings = self._strings.values
+        tz = self._timezones.tz(self.utc_offsets[index])
+        candle = Candle(
+            symbol=strings[self.symbol_ids[index]],
+            interval=strings[self.interval_ids[index]],
+            open_time=window_time(self.open_times[index], tz),
+            close_time=window_time(self.close_times[index], tz),
+            open=self.opens[index],
+            high=self.highs[index],
+            low=self.lows[index],
+            close=self.closes[index],
+            volume=self.volumes[index],
+            trade_count=self.trade_counts[index],
+        )
+        for name, column in self.kernel_columns.items():
+            value = column[index]
+            if value is not None and (name in QUANTILE_FIELDS or not isnan(value)):
+                setattr(candle, name, value)
+        return candle
+
+    def __iter__(self) -> Iterator[Candle]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """Candle.to_dict() 리스트"""
+        return [candle.to_dict() for candle in self]
+
+    def clear(self) -> None:
+        """모든 캔들 제거 (문자열 테이블은 유지)"""
+        for name in self.__slots__[3:]:
+            del getattr(self, name)[:]
+        self.kernel_columns.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """컬럼 데이터 크기 (bytes, 문자열 테이블과 분위수 dict 제외)"""
+        return sum(
+            getattr(self, name).itemsize * len(self) for name in self.__slots__[3:]
+        ) + sum(
+            column.itemsize * len(column)
+            for column in self.kernel_columns.values()
+            if isinstance(column, array)
+        )
@@ -0,0 +1,137 @@
+"""거래 메시지 디코딩: TradeDecoder, parse_timestamp_ns
+
+JSON bytes / JSON-lines 버퍼를 Trade 객체 없이
+(symbol, price, quantity, ts_ns, tz, is_buyer_maker, trade_id) 값으로 바로 디코딩한다.
+순서는 CandleGenerator.process_values() 인자와 같다 (process_dict / process_json /
+process_json_lines가 사용). is_buyer_maker / trade_id는 없으면 None이다.
+
+- JSON 파서는 orjson이 있으면 orjson, 없으면 표준 json (선택 의존성)
+- JSON-lines 버퍼는 줄마다 파싱하지 않고 하나의 JSON 배열로 묶어 한 번에 파싱
+- timestamp는 ISO 8601 문자열 또는 epoch 밀리초 숫자
+- ISO 문자열은 datetime.fromisoformat (C 구현)으로 파싱하고 epoch ns는 timedelta
+  정수 나눗셈으로 구한다. 분 단위 앞부분을 캐시하고 나머지를 Python에서 파싱하는
+  방식보다 CPython 3.11에서 약 2배 빠르다.
+
+시간 해상도는 Trade.timestamp(datetime)와 같은 마이크로초다.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Callable, Iterator, Optional, Union
+
+from .window import EPOCH
+
+# (symbol, price, quantity, ts_ns, tz, is_buyer_maker, trade_id)
+TradeValues = tuple[str, float, float, int, Optional[tzinfo], Optional[bool], Any]
+
+_MICROSECOND = timedelta(microseconds=1)
+_fromisoformat = datetime.fromisoformat
+
+
+def parse_timestamp_ns(value: Union[str, int, float]) -> tuple[int, Optional[tzinfo]]:
+    """timestamp → (epoch ns, timezone)
+
+    ISO 문자열은 C 구현인 datetime.fromisoformat으로 파싱하고,
+    epoch 차이를 timedelta 정수 나눗셈 한 번으로 마이크로초로 바꾼다.
+
+    Args:
+        value: ISO 8601 문자열 또는 epoch 밀리초 (int / float / 숫자 문자열)
+
+    Returns:
+        (epoch ns, timezone) - 숫자는 UTC, timezone 없는 ISO 문자열은 (UTC 기준, None)
+    """
+    if value.__class__ is str:
+        try:
+            timestamp = _fromisoformat(value)
+        except ValueError:
+            if value.isdigit():
+                return int(value) * 1_000_000, timezone.utc
+            # Python 3.10 이하: "Z" 접미사 미지원
+            if not value.endswith("Z"):
+                raise
+            timestamp = _fromisoformat(value[:-1] + "+00:00")
+        tz = timestamp.tzinfo
+        if tz is None:
+            return (timestamp.replace(tzinfo=timezone.utc) - EPOCH) // _MICROSECOND * 1000, None
+        return (timestamp - EPOCH) // _MICROSECOND * 1000, tz
+    if isinstance(value, int):
+        return value * 1_000_000, timezone.utc
+    # float 밀리초: 마이크로초로 반올림
+    return round(value * 1000) * 1000, timezone.utc
+
+
+def _json_loads(backend: Optional[str]) -> Callable[[Union[bytes, str]], Any]:
+    """JSON 파서 선택 (None이면 orjson이 있으면 orjson)"""
+    if backend in (None, "orjson"):
+        try:
+            import orjson
+        except ImportError:
+            if backend == "orjson":
+                raise
+        else:
+            return orjson.loads
+    if backend not in (None, "json"):
+        raise ValueError(f"unknown JSON backend: {backend}")
+    return json.loads
+
+
+class TradeDecoder:
+    """JSON 거래 메시지 디코더
+
+    사용 예시:
+        decoder = TradeDecoder()
+        symbol, price, quantity, ts_ns, tz, is_buyer_maker, trade_id = decoder.decode(message)
+        for values in decoder.decode_lines(buffer):
+            generator.process_values(*values)
+
+    메시지 형식은 Trade.from_dict와 같다:
+        {"symbol": str, "price": number|str, "quantity": number|str,
+         "timestamp": ISO 8601 문자열 | epoch 밀리초,
+         "is_buyer_maker": bool (선택), "trade_id": int (선택)}
+
+    Attributes:
+        backend: 사용 중인 JSON 파서 모듈 이름 ("orjson" 또는 "json")
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        self._loads = _json_loads(backend)
+        self.backend = self._loads.__module__.split(".")[0]
+
+    def decode(self, data: Union[bytes, str]) -> TradeValues:
+        """JSON 메시지 하나 디코딩"""
+        return self.decode_dict(self._loads(data))
+
+    def decode_dict(self, data: dict[str, Any]) -> TradeValues:
+        """파싱된 dict 디코딩 (Trade 객체 없이)"""
+        ts_ns, tz = parse_timestamp_ns(data["timestamp"])
+        return (
+            data["symbol"],
+            float(data["price"]),
+            float(data["quantity"]),
+            ts_ns,
+            tz,
+            data.get("is_buyer_maker"),
+            data.get("trade_id"),
+        )
+
+    def decode_lines(self, buffer: Union[bytes, str]) -> Iterator[TradeValues]:
+        """JSON-lines 버퍼 디코딩 (빈 줄은 무시)
+
+        줄들을 하나의 JSON 배열로 묶어 파서를 한 번만 호출한다.
+        """
+        if isinstance(buffer, str):
+            buffer = buffer.encode()
+        lines = [line for line in buffer.splitlines() if line.strip()]
+        if not lines:
+            return
+        for data in self._loads(b"[" + b",".join(lines) + b"]"):
+            ts_ns, tz = parse_timestamp_ns(data["timestamp"])
+            yield (
+                data["symbol"],
+                float(data["price"]),
+                float(data["quantity"]),
+                ts_ns,
+                tz,
+                data.get("is_buyer_maker"),
+                data.get("trade_id"),
+            )
@@ -0,0 +1,212 @@
+"""거래 id 중복 제거: DedupPolicy, TradeIdFilter, SymbolDedup
+
+CandleGenerator(dedup=DedupPolicy())로 켠다. trade_id가 있는 거래만 검사한다
+(Trade.trade_id / process_values(trade_id=...)).
+
+거래소 websocket 재연결 후 겹쳐서 다시 오는 거래가 volume / trade_count에 두 번 더해지지
+않도록, WindowManager.add가 집계 전에 심볼별로 검사한다. 중복 거래는 집계도 on_late도 없이
+버린다.
+
+- 정확한 집합: 아직 집계 / 수정될 수 있는 윈도우 (종료 + allowed_lateness >= watermark)의
+  거래 id를 윈도우 버킷별 set으로 보관한다. 캔들에 더해질 수 있는 거래는 모두 여기서 검사한다.
+- 확률 fallback: 수정 기간까지 지난 버킷의 id set은 32bit fingerprint (hash(id)의 하위 32bit)
+  정렬 배열로 바꿔 TradeIdFilter에 넣는다 (id당 4 bytes). 정리는 심볼에 새 버킷이 생길 때
+  한 번 한다 (거래마다가 아님). 그보다 오래된 거래는 어차피 집계되지 않는 Late다.
+  그 버킷 배열에 fingerprint가 있으면 중복으로 버린다. 오탐 (버킷 id 수 / 2**32)은 처음 온
+  Late 거래를 on_late에 알리지 못하는 것뿐이고 캔들 값에는 영향이 없다.
+- 연속 id 구간: 거래소 id는 보통 심볼마다 1씩 증가한다. 마지막 기록 id + 1이 같은 버킷에
+  오면 set에 넣지 않고 구간 끝 (next_id)만 올린다 (WindowManager.add 인라인). 구간은 그
+  버킷에 기록한 가장 큰 id 뒤에서만 열므로 구간 안의 id는 set에 없다. 구간은 다른
+  id가 오면 (seen() 호출) set.update(range(...))로 한 번에 옮긴 뒤 검사하므로 판정은 같다.
+  정수가 아닌 id는 구간 없이 set만 쓴다.
+
+비용: 연속 id 스트림에서 process_values 거래당 추가 비용은 비교 두 번과 덧셈 하나다
+(20 심볼 5만 거래, 반복 40회 최솟값 7번 측정: 중앙값 +3%, 범위 -1~+11%).
+id가 연속이 아닌 스트림은 거래마다 seen() 호출 (set 검사 + 추가)이라 +10~30%가 든다.
+
+메모리: 정확한 집합은 심볼마다 watermark 지연 + allowed_lateness 동안의 거래 수로 제한되고,
+fallback은 모든 심볼 합쳐 max_pruned_ids × 4 bytes 이하다 (넘으면 오래된 버킷부터 버림).
+체크포인트 (snapshot / restore)에는 중복 제거 상태를 저장하지 않는다.
+컬럼 배치 (process_batch)에는 id 컬럼이 없으므로 dedup을 쓰는 생성기에서는 TypeError를 낸다.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass
+from itertools import repeat
+from operator import and_
+from typing import Hashable, Optional
+
+from .window import WINDOW_END_OFFSET_NS
+
+_FINGERPRINT_MASK = 0xFFFF_FFFF
+
+
+@dataclass
+class DedupPolicy:
+    """거래 id 중복 제거 설정
+
+    Attributes:
+        max_pruned_ids: 정리된 버킷 fingerprint를 보관할 최대 id 수 (모든 심볼 합계)
+    """
+
+    max_pruned_ids: int = 1 << 21
+
+    def __post_init__(self) -> None:
+        if self.max_pruned_ids < 0:
+            raise ValueError("max_pruned_ids must be >= 0")
+
+
+class TradeIdFilter:
+    """정리된 버킷의 거래 id fingerprint 보관소 (모든 심볼 공유)
+
+    버킷마다 정렬된 array("I")를 심볼의 SymbolDedup.pruned에 두고, 보관 순서와
+    전체 id 수만 여기서 관리한다. 합계가 max_ids를 넘으면 가장 먼저 정리된 버킷부터 버린다.
+
+    Attributes:
+        max_ids: 최대 보관 id 수
+        count: 현재 보관 id 수
+        duplicates: 중복으로 버린 거래 수 (모든 심볼, 정확한 집합에서 찾은 것 포함)
+    """
+
+    def __init__(self, policy: DedupPolicy):
+        self.max_ids = policy.max_pruned_ids
+        self.count = 0
+        self.duplicates = 0
+        self._order: deque[tuple[dict[int, array], int]] = deque()
+
+    def add(self, pruned: dict[int, array], bucket: int, trade_ids: set) -> None:
+        """버킷 하나의 id를 fingerprint 배열로 바꿔 보관 (C 수준 map / sort)"""
+        if not self.max_ids:
+            return
+        fingerprints = array(
+            "I", sorted(map(and_, map(hash, trade_ids), repeat(_FINGERPRINT_MASK)))
+        )
+        pruned[bucket] = fingerprints
+        self._order.append((pruned, bucket))
+        self.count += len(fingerprints)
+        while self.count > self.max_ids:
+            owner, old = self._order.popleft()
+            self.count -= len(owner.pop(old, ()))
+
+    def state_bytes(self) -> int:
+        """fingerprint 메모리 (bytes)"""
+        return self.count * 4
+
+
+class SymbolDedup:
+    """심볼 하나의 거래 id 중복 검사 (WindowManager.dedup)
+
+    Attributes:
+        filter: 정리된 id 보관 순서 / 한도를 관리하는 공유 TradeIdFilter
+        buckets: 윈도우 버킷 → 그 윈도우 거래 id 집합 (정확)
+        pruned: 정리된 윈도우 버킷 → 정렬된 fingerprint 배열
+        floor: 이보다 작은 버킷은 정리됨 (fingerprint로만 검사)
+        highs: 버킷 → 기록한 가장 큰 정수 id (연속 id 구간은 이보다 큰 id에서만 시작)
+        run_bucket: 연속 id 구간의 버킷
+        run_lo: 연속 id 구간 시작 (이 id부터 set에 아직 없음)
+        next_id: 연속 id 구간 끝 (다음에 올 것으로 기대하는 id, 구간이 없으면 None)
+    """
+
+    __slots__ = (
+        "filter",
+        "buckets",
+        "pruned",
+        "floor",
+        "highs",
+        "run_bucket",
+        "run_lo",
+        "next_id",
+        "_window_size_ns",
+        "_allowed_lateness_ns",
+    )
+
+    def __init__(
+        self,
+        id_filter: TradeIdFilter,
+        window_size_ns: int,
+        allowed_lateness_ns: int = 0,
+    ):
+        self.filter = id_filter
+        self.buckets: dict[int, set] = {}
+        self.pruned: dict[int, array] = {}
+        self.floor = -(2**63)
+        self.highs: dict[int, int] = {}
+        self.run_bucket: Optional[int] = None
+        self.run_lo = 0
+        self.next_id: Optional[int] = None
+        self._window_size_ns = window_size_ns
+        self._allowed_lateness_ns = allowed_lateness_ns
+
+    def seen(self, trade_id: Hashable, ts_ns: int, watermark_ns: Optional[int]) -> bool:
+        """중복 거래인지 검사하고, 처음 본 id면 기록
+
+        Args:
+            trade_id: 거래 id
+            ts_ns: 거래 시간 (epoch ns)
+            watermark_ns: 심볼의 현재 watermark (없으면 None)
+
+        Returns:
+            중복이면 True (정리된 구간은 fingerprint 판정이므로 오탐 가능)
+        """
+        self._flush_run()
+        bucket = ts_ns // self._window_size_ns
+        ids = self.buckets.get(bucket)
+        if ids is None:
+            if watermark_ns is not None:
+                self._prune(watermark_ns)
+            if bucket < self.floor:
+                if self._seen_pruned(trade_id, bucket):
+                    self.filter.duplicates += 1
+                    return True
+                return False
+            ids = self.buckets[bucket] = set()
+        elif trade_id in ids:
+            self.filter.duplicates += 1
+            return True
+        ids.add(trade_id)
+        # 버킷의 최대 id 뒤에서만 구간을 연다 (그보다 작은 id 뒤는 이미 set에 있을 수 있음)
+        if type(trade_id) is int:
+            high = self.highs.get(bucket)
+            if high is None or trade_id > high:
+                self.highs[bucket] = trade_id
+                self.run_bucket = bucket
+                self.run_lo = self.next_id = trade_id + 1
+        return False
+
+    def _flush_run(self) -> None:
+        """연속 id 구간을 버킷 set으로 옮기고 구간을 닫음"""
+        next_id = self.next_id
+        if next_id is None:
+            return
+        if next_id > self.run_lo:
+            self.buckets[self.run_bucket].update(range(self.run_lo, next_id))
+            self.highs[self.run_bucket] = next_id - 1
+        self.run_bucket = self.next_id = None
+
+    def _seen_pruned(self, trade_id: Hashable, bucket: int) -> bool:
+        fingerprints = self.pruned.get(bucket)
+        if not fingerprints:
+            return False
+        fingerprint = hash(trade_id) & _FINGERPRINT_MASK
+        i = bisect_left(fingerprints, fingerprint)
+        return i < len(fingerprints) and fingerprints[i] == fingerprint
+
+    def _prune(self, watermark_ns: int) -> None:
+        """종료 + allowed_lateness < watermark 인 버킷의 id를 fingerprint 배열로 옮김"""
+        limit = (
+            watermark_ns - self._allowed_lateness_ns + WINDOW_END_OFFSET_NS - 1
+        ) // self._window_size_ns
+        if limit <= self.floor:
+            return
+        self.floor = limit
+        buckets = self.buckets
+        for bucket in sorted(b for b in buckets if b < limit):
+            self.filter.add(self.pruned, bucket, buckets.pop(bucket))
+            self.highs.pop(bucket, None)
+
+    def id_count(self) -> int:
+        """정확한 집합에 보관 중인 id 수 (연속 id 구간 포함)"""
+        run = 0 if self.next_id is None else self.next_id - self.run_lo
+        return sum(map(len, self.buckets.values())) + run
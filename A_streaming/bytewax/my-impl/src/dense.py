@@ -0,0 +1,349 @@
+"""Dense 상태 캔들 생성기: DenseCandleGenerator
+
+심볼은 처음 볼 때 한 번 작은 정수 id로 intern하고, 열린 윈도우의 OHLCV 상태는
+CandleAggregator 객체 대신 typed array 컬럼 (array 모듈)에 보관한다.
+
+- 심볼 id마다 slots개의 슬롯 (버킷 ring)을 연속으로 할당하고,
+  버킷 b는 슬롯 (id * slots + b % slots)에 둔다
+- 한 심볼에서 동시에 열려 있을 수 있는 버킷은 watermark ~ 마지막 거래 사이이므로
+  watermark_delay // window_size + 2개를 넘지 않는다 (slots, 슬롯이 겹치지 않음)
+- 거래 하나는 dict / 객체 없이 배열 인덱싱만으로 처리한다 (process_id, process_trades).
+  열린 윈도우 하나의 상태는 컬럼 9개 × 8 bytes = 72 bytes
+
+CandleGenerator(window_size, watermark_delay)에 같은 거래를 process()한 것과
+같은 캔들 / Late 데이터를 같은 순서로 낸다. 캔들 시간의 timezone은 tz 하나로 고정하고,
+allowed_lateness / eviction / global_watermark / 체크포인트는 지원하지 않는다.
+
+    generator = DenseCandleGenerator(on_candles=sink)
+    btc = generator.intern("BTCUSDT")
+    generator.process_id(btc, price, quantity, ts_ns)
+"""
+
+from array import array
+from datetime import timedelta, timezone, tzinfo
+from typing import Callable, Optional
+
+from .candle import Candle, LateData, Trade
+from .candle_generator import format_interval
+from .columns import TradeBatch
+from .window import (
+    WINDOW_END_OFFSET_NS,
+    TumblingWindow,
+    from_epoch_ns,
+    timedelta_to_ns,
+    to_epoch_ns,
+    window_time,
+)
+
+# 빈 슬롯의 버킷 / 아직 watermark가 없는 심볼 (모든 타임스탬프보다 작음)
+EMPTY = -(2**63)
+# 열린 윈도우가 없는 심볼의 close_at (모든 watermark보다 큼)
+NO_OPEN = 2**63 - 1
+
+
+class DenseCandleGenerator:
+    """심볼 id × 버킷 슬롯 배열에 윈도우 상태를 두는 캔들 생성기
+
+    Attributes:
+        window_size: 윈도우 크기 (기본 1분)
+        watermark_delay: Watermark 지연 (기본 5초)
+        interval: 캔들 interval 문자열 (예: "1m")
+        slots: 심볼당 버킷 슬롯 수
+        tz: 캔들 시간의 timezone
+        on_candle: 캔들 생성 시 콜백
+        on_candles: 한 번에 닫힌 캔들 묶음 콜백 (on_candle 다음에 호출)
+        on_late: Late 데이터 발생 시 콜백
+        symbols: 심볼 id → 심볼 (intern 순서)
+    """
+
+    def __init__(
+        self,
+        window_size: timedelta = timedelta(minutes=1),
+        watermark_delay: timedelta = timedelta(seconds=5),
+        on_candle: Optional[Callable[[Candle], None]] = None,
+        on_late: Optional[Callable[[LateData], None]] = None,
+        on_candles: Optional[Callable[[list[Candle]], None]] = None,
+        tz: tzinfo = timezone.utc,
+    ):
+        if window_size <= timedelta(0):
+            raise ValueError("window_size must be positive")
+        if watermark_delay < timedelta(0):
+            raise ValueError("watermark_delay must be >= 0")
+        self.window_size = window_size
+        self.watermark_delay = watermark_delay
+        self.interval = format_interval(window_size)
+        self.tz = tz
+        self.on_candle = on_candle or (lambda c: None)
+        self.on_candles = on_candles
+        self.on_late = on_late
+
+        self._size_ns = timedelta_to_ns(window_size)
+        self._delay_ns = timedelta_to_ns(watermark_delay)
+        self._end_offset_ns = self._size_ns - WINDOW_END_OFFSET_NS
+        self.slots = self._delay_ns // self._size_ns + 2
+
+        # 심볼 테이블
+        self.symbols: list[str] = []
+        self._ids: dict[str, int] = {}
+
+        # 심볼별: watermark, 가장 이른 열린 윈도우의 종료 시간 (watermark가 넘으면 닫음),
+        # 가장 늦게 연 버킷
+        self._watermarks = array("q")
+        self._close_at = array("q")
+        self._hi = array("q")
+
+        # 슬롯별: 버킷 (빈 슬롯은 EMPTY)과 OHLCV 집계
+        self._buckets = array("q")
+        self._first_ts = array("q")
+        self._last_ts = array("q")
+        self._opens = array("d")
+        self._highs = array("d")
+        self._lows = array("d")
+        self._closes = array("d")
+        self._volumes = array("d")
+        self._counts = array("q")
+        self._open_windows = 0
+
+        # 새 심볼에 붙일 슬롯 초기값
+        self._empty_slots = array("q", [EMPTY]) * self.slots
+        self._zero_bytes = bytes(8 * self.slots)
+
+    def intern(self, symbol: str) -> int:
+        """심볼 → id (처음 보면 슬롯 할당)"""
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = self._ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self._watermarks.append(EMPTY)
+            self._close_at.append(NO_OPEN)
+            self._hi.append(EMPTY)
+            self._buckets.extend(self._empty_slots)
+            for column in self._slot_columns():
+                column.frombytes(self._zero_bytes)
+        return sid
+
+    def process(self, trade: Trade) -> None:
+        """Trade 처리 (CandleGenerator.process와 같은 결과)"""
+        self.process_id(
+            self.intern(trade.symbol),
+            trade.price,
+            trade.quantity,
+            to_epoch_ns(trade.timestamp),
+            trade,
+        )
+
+    def process_values(self, symbol: str, price: float, quantity: float, ts_ns: int) -> None:
+        """값으로 Trade 처리 (Trade 객체 없이, 시간은 epoch ns)"""
+        self.process_id(self.intern(symbol), price, quantity, ts_ns)
+
+    def process_id(
+        self,
+        symbol_id: int,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        trade: Optional[Trade] = None,
+    ) -> None:
+        """intern된 심볼 id로 Trade 처리 (hot path)
+
+        Args:
+            symbol_id: intern()이 돌려준 심볼 id
+            price: 가격
+            quantity: 수량
+            ts_ns: 거래 시간 (epoch ns)
+            trade: 원본 Trade (Late면 on_late에 그대로 전달, 없으면 값으로 생성)
+        """
+        watermark = self._watermarks[symbol_id]
+        if ts_ns < watermark:
+            self._late(symbol_id, price, quantity, ts_ns, trade)
+            return
+
+        # 거래의 윈도우보다 이른 만료 윈도우는 슬롯에 쓰기 전에 닫는다 (같은 슬롯을 비움)
+        candles = None
+        bucket = ts_ns // self._size_ns
+        new_watermark = ts_ns - self._delay_ns
+        limit = 0
+        if new_watermark > watermark:
+            self._watermarks[symbol_id] = new_watermark
+            limit = (new_watermark + WINDOW_END_OFFSET_NS - 1) // self._size_ns
+            if new_watermark > self._close_at[symbol_id]:
+                candles = self._close(symbol_id, min(limit, bucket))
+
+        slot = symbol_id * self.slots + bucket % self.slots
+        if self._buckets[slot] == bucket:
+            # first_ts <= last_ts, low <= high 이므로 각각 한쪽만 바뀔 수 있음
+            if ts_ns > self._last_ts[slot]:
+                self._last_ts[slot] = ts_ns
+                self._closes[slot] = price
+            elif ts_ns < self._first_ts[slot]:
+                self._first_ts[slot] = ts_ns
+                self._opens[slot] = price
+            if price > self._highs[slot]:
+                self._highs[slot] = price
+            elif price < self._lows[slot]:
+                self._lows[slot] = price
+            self._volumes[slot] += quantity
+            self._counts[slot] += 1
+        else:
+            self._open(symbol_id, slot, bucket, price, quantity, ts_ns)
+
+        if limit > bucket:
+            # watermark_delay < 1ms면 거래의 윈도우도 바로 닫힘 (CandleGenerator처럼 더한 뒤)
+            closed = self._close(symbol_id, limit)
+            candles = candles + closed if candles else closed
+
+        if candles:
+            self._emit(candles)
+
+    def process_trades(self, batch: TradeBatch) -> None:
+        """TradeBatch 처리 (배치 심볼 테이블을 한 번 intern한 뒤 id로 처리)"""
+        ids = [self.intern(symbol) for symbol in batch.symbols]
+        process_id = self.process_id
+        for index, price, quantity, ts_ns in zip(
+            batch.symbol_ids, batch.prices, batch.quantities, batch.timestamps
+        ):
+            process_id(ids[index], price, quantity, ts_ns)
+
+    def advance_watermark_ns(self, ts_ns: int) -> None:
+        """모든 심볼의 watermark 진행 (epoch ns, 닫힌 캔들은 한 묶음으로 emit)"""
+        new_watermark = ts_ns - self._delay_ns
+        limit = (new_watermark + WINDOW_END_OFFSET_NS - 1) // self._size_ns
+        candles: list[Candle] = []
+        for sid, watermark in enumerate(self._watermarks):
+            if new_watermark > watermark:
+                self._watermarks[sid] = new_watermark
+                if new_watermark > self._close_at[sid]:
+                    candles.extend(self._close(sid, limit))
+        if candles:
+            self._emit(candles)
+
+    def watermark_ns(self, symbol: str) -> Optional[int]:
+        """심볼의 현재 watermark (epoch ns, 없으면 None)"""
+        sid = self._ids.get(symbol)
+        if sid is None or self._watermarks[sid] == EMPTY:
+            return None
+        return self._watermarks[sid]
+
+    def open_window_count(self) -> int:
+        """열린 윈도우 수"""
+        return self._open_windows
+
+    def state_bytes(self) -> int:
+        """윈도우 / watermark 상태 배열의 크기 (bytes, 심볼 테이블 제외)"""
+        columns = (self._watermarks, self._close_at, self._hi, self._buckets, *self._slot_columns())
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def flush(self) -> None:
+        """모든 열린 윈도우 강제 닫기
+
+        남은 캔들은 (심볼 id 순, 심볼 안에서 시간순) 한 묶음으로 emit하고,
+        on_candles에 flush()가 있으면 이어서 호출한다.
+        """
+        candles: list[Candle] = []
+        for sid, close_at in enumerate(self._close_at):
+            if close_at != NO_OPEN:
+                candles.extend(self._close(sid, self._hi[sid] + 1))
+        if candles:
+            self._emit(candles)
+        flush = getattr(self.on_candles, "flush", None)
+        if flush is not None:
+            flush()
+
+    def _open(
+        self, sid: int, slot: int, bucket: int, price: float, quantity: float, ts_ns: int
+    ) -> None:
+        """빈 슬롯에 새 윈도우를 열고 첫 거래 기록"""
+        self._buckets[slot] = bucket
+        self._first_ts[slot] = self._last_ts[slot] = ts_ns
+        self._opens[slot] = self._highs[slot] = self._lows[slot] = price
+        self._closes[slot] = price
+        self._volumes[slot] = 0.0 + quantity
+        self._counts[slot] = 1
+        self._open_windows += 1
+        end_ns = bucket * self._size_ns + self._end_offset_ns
+        if end_ns < self._close_at[sid]:
+            self._close_at[sid] = end_ns
+        if bucket > self._hi[sid]:
+            self._hi[sid] = bucket
+
+    def _close(self, sid: int, limit: int) -> list[Candle]:
+        """심볼의 limit 미만 버킷을 닫고 캔들 반환 (시간순)"""
+        slots = self.slots
+        hi = self._hi[sid]
+        buckets = self._buckets
+        base = sid * slots
+        # 열린 버킷은 모두 가장 이른 열린 버킷 이상, hi - slots + 1 이상
+        lo = max((self._close_at[sid] - self._end_offset_ns) // self._size_ns, hi - slots + 1)
+
+        candles = []
+        close_at = NO_OPEN
+        for bucket in range(lo, hi + 1):
+            slot = base + bucket % slots
+            if buckets[slot] != bucket:
+                continue
+            if bucket >= limit:
+                close_at = bucket * self._size_ns + self._end_offset_ns
+                break
+            buckets[slot] = EMPTY
+            candles.append(self._candle(sid, slot, bucket))
+        self._close_at[sid] = close_at
+        self._open_windows -= len(candles)
+        return candles
+
+    def _candle(self, sid: int, slot: int, bucket: int) -> Candle:
+        """슬롯 집계 → Candle (CandleAggregator.to_candle과 같은 값)"""
+        start_ns = bucket * self._size_ns
+        return Candle(
+            symbol=self.symbols[sid],
+            interval=self.interval,
+            open_time=window_time(start_ns, self.tz),
+            close_time=window_time(start_ns + self._end_offset_ns, self.tz),
+            open=self._opens[slot],
+            high=self._highs[slot],
+            low=self._lows[slot],
+            close=self._closes[slot],
+            volume=self._volumes[slot],
+            trade_count=self._counts[slot],
+        )
+
+    def _late(
+        self,
+        sid: int,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        trade: Optional[Trade],
+    ) -> None:
+        """Late 거래의 LateData를 on_late로 전달"""
+        if self.on_late is None:
+            return
+        if trade is None:
+            trade = Trade(self.symbols[sid], price, quantity, from_epoch_ns(ts_ns, self.tz))
+        window_start = TumblingWindow.get_window_start(trade.timestamp, self.window_size)
+        self.on_late(
+            LateData(
+                trade=trade,
+                window_start=window_start,
+                window_end=TumblingWindow.get_window_end(window_start, self.window_size),
+            )
+        )
+
+    def _slot_columns(self) -> tuple[array, ...]:
+        return (
+            self._first_ts,
+            self._last_ts,
+            self._opens,
+            self._highs,
+            self._lows,
+            self._closes,
+            self._volumes,
+            self._counts,
+        )
+
+    def _emit(self, candles: list[Candle]) -> None:
+        """캔들 emit: on_candle (캔들마다) 후 on_candles (묶음 한 번)"""
+        on_candle = self.on_candle
+        for candle in candles:
+            on_candle(candle)
+        if self.on_candles is not None:
+            self.on_candles(candles)
@@ -0,0 +1,83 @@
+"""심볼 / 윈도우 상태 한도: EvictionPolicy, WindowBudget
+
+CandleGenerator(eviction=EvictionPolicy(...))로 켠다.
+
+- idle_ttl: 마지막 거래(이벤트 시간)가 idle_ttl보다 오래된 심볼을 제거
+  캔들이 emit될 때 이벤트 시간 기준 idle_ttl / 4 마다 한 번 검사한다
+- max_symbols: 심볼 수가 넘치면 마지막 거래가 가장 오래된 심볼부터 제거 (LRU)
+  새 심볼이 생길 때만 검사한다
+- 마지막 거래 시간은 WindowManager.last_trade_ns (거래를 받을 때만 갱신)이다.
+  수동 watermark 진행 (advance_watermark / 파티션 입력 / 전역 watermark)은 영향이 없다
+- max_open_windows: 전체 열린 윈도우 수가 넘치면 종료 시간이 가장 이른 윈도우부터
+  강제로 닫는다 (한도의 1/16 여유를 만들 때까지)
+
+심볼 제거 시 열린 윈도우는 flush되어 on_candle로 emit된다.
+제거된 심볼의 거래가 다시 오면 새 심볼처럼 처리된다 (watermark 없음).
+
+강제로 닫힌 윈도우는 캔들이 바로 emit되고, 그 심볼의 watermark가
+윈도우 종료 직후로 올라간다. 따라서 그 윈도우에 늦게 도착한 거래는 Late가 된다.
+새 윈도우를 여는 심볼은 그 윈도우보다 이른 윈도우만 닫는다 (더 늦은 윈도우를 닫으면
+watermark가 새 윈도우를 지나쳐 심볼의 캔들 순서가 깨진다). 닫을 윈도우가 없으면
+한도를 잠시 넘긴 채로 두고 다음 reserve()에서 다시 줄인다.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class EvictionPolicy:
+    """심볼 / 윈도우 상태 한도 설정 (None이면 해당 한도 없음)
+
+    Attributes:
+        idle_ttl: 이 기간 동안 거래가 없는 심볼 제거 (이벤트 시간 기준)
+        max_symbols: 최대 심볼 수 (초과 시 LRU 제거)
+        max_open_windows: 전체 최대 열린 윈도우 수 (초과 시 가장 오래된 윈도우를 닫음)
+    """
+
+    idle_ttl: Optional[timedelta] = None
+    max_symbols: Optional[int] = None
+    max_open_windows: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.idle_ttl is not None and self.idle_ttl <= timedelta(0):
+            raise ValueError("idle_ttl must be positive")
+        if self.max_symbols is not None and self.max_symbols < 1:
+            raise ValueError("max_symbols must be >= 1")
+        if self.max_open_windows is not None and self.max_open_windows < 1:
+            raise ValueError("max_open_windows must be >= 1")
+
+
+class WindowBudget:
+    """여러 WindowManager가 공유하는 열린 윈도우 수 한도
+
+    WindowManager는 윈도우를 만들기 직전에 reserve(자신, 버킷)를,
+    윈도우를 꺼낼 때 release()를 호출한다 (거래마다가 아니라 윈도우마다).
+
+    Attributes:
+        limit: 최대 열린 윈도우 수
+        target: 한도 초과 시 줄일 목표 (limit - limit / 16)
+        open: 현재 열린 윈도우 수
+    """
+
+    def __init__(self, limit: int, on_full: Callable[[Any, int], None]):
+        self.limit = limit
+        self.target = limit - max(1, limit // 16)
+        self.open = 0
+        self._on_full = on_full
+
+    def reserve(self, owner: Any, bucket: int) -> None:
+        """윈도우 하나 생성 (한도를 넘으면 on_full(owner, bucket) 호출)
+
+        Args:
+            owner: 윈도우를 만드는 WindowManager
+            bucket: 만들 윈도우의 버킷 인덱스
+        """
+        self.open += 1
+        if self.open > self.limit:
+            self._on_full(owner, bucket)
+
+    def release(self, count: int) -> None:
+        """윈도우 count개 제거"""
+        self.open -= count
@@ -0,0 +1,405 @@
+"""캔들 히스토리 저장소: CandleHistory, HistoryView
+
+닫힌 캔들을 디스크에 오래 보관하고 시간 범위로 조회한다.
+
+    history = CandleHistory("history")
+    generator = CandleGenerator(
+        allowed_lateness=timedelta(seconds=10),
+        on_candles=history,          # 캔들 추가 (flush()도 전달됨)
+        on_update=history.amend,     # 수정된 캔들
+    )
+    ...
+    view = history.range("BTCUSDT", "1m", start, end)
+    rows = view.to_numpy()           # 파일 하나 범위면 복사 없음
+
+파일 구조: {root}/{symbol}/{interval}/{YYYYMMDD}.cndl (캔들 open_time의 UTC 날짜)
+
+    record: open_ns i64, close_ns i64, open / high / low / close / volume f64,
+            trade_count i64, utc_offset_s i64   (고정 폭 72 bytes, little endian)
+
+- .cndl 파일은 open_time 오름차순으로 끝에만 추가한다
+- 조회는 파일을 mmap하고, 파일마다 INDEX_STRIDE개 레코드 간격의 희소 시간 인덱스
+  (메모리)에서 블록을 찾은 뒤 블록 안에서 이분 탐색한다. 결과는 mmap memoryview
+- 수정된 캔들 (amend)과 이미 지난 open_time의 캔들은 {YYYYMMDD}.amend 로그에 추가하고,
+  compact()가 본 파일에 반영한다. 고정 폭 레코드라 같은 open_time 행은 제자리에서
+  덮어쓰고, 본 파일에 없는 open_time이 있을 때만 파일을 다시 쓴다.
+  조회 전에는 해당 파일의 로그를 먼저 compact하므로 결과에 항상 반영되어 있다.
+
+쓰기는 max_pending개까지 메모리에 모았다가 flush()에서 파일별로 한 번에 추가한다.
+
+레코드는 OHLCV만 담으므로 집계 커널 필드 (vwap, 분위수 등)가 있는 캔들은 TypeError로
+거부한다 (조용히 버리지 않음). 커널 필드는 ArrowCandleWriter / CandleStore에 보관한다.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+
+from .candle import Candle, has_kernel_fields
+from .window import from_epoch_ns, timedelta_to_ns, to_epoch_ns, window_time
+
+RECORD = struct.Struct("<qqdddddqq")
+RECORD_FIELDS = (
+    "open_time",
+    "close_time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "trade_count",
+    "utc_offset",
+)
+# 레코드 하나의 int64 칸 수 (open_ns는 각 레코드의 첫 칸)
+RECORD_WORDS = RECORD.size // 8
+
+# 희소 인덱스 간격 (레코드 수)
+INDEX_STRIDE = 64
+
+NS_PER_DAY = timedelta_to_ns(timedelta(days=1))
+
+DATA_SUFFIX = ".cndl"
+AMEND_SUFFIX = ".amend"
+
+
+@lru_cache(maxsize=4096)
+def day_name(day: int) -> str:
+    """epoch 일 번호 → 파일 이름 (YYYYMMDD)"""
+    return from_epoch_ns(day * NS_PER_DAY).strftime("%Y%m%d")
+
+
+@lru_cache(maxsize=64)
+def _timezone(offset: int) -> timezone:
+    return timezone.utc if offset == 0 else timezone(timedelta(seconds=offset))
+
+
+def pack_candle(candle: Candle) -> bytes:
+    """Candle → 고정 폭 레코드
+
+    Raises:
+        TypeError: 집계 커널 필드가 있는 캔들 (레코드에 담을 수 없음)
+    """
+    if has_kernel_fields(candle):
+        raise TypeError("CandleHistory does not store aggregation kernel fields")
+    offset = candle.open_time.utcoffset()
+    return RECORD.pack(
+        to_epoch_ns(candle.open_time),
+        to_epoch_ns(candle.close_time),
+        candle.open,
+        candle.high,
+        candle.low,
+        candle.close,
+        candle.volume,
+        candle.trade_count,
+        offset // timedelta(seconds=1) if offset else 0,
+    )
+
+
+class HistoryView:
+    """레코드 구간 뷰 (파일별 mmap memoryview, 복사 없음)
+
+    Attributes:
+        symbol: 심볼
+        interval: interval 문자열
+        segments: 파일별 레코드 bytes 구간 (memoryview, 시간순)
+    """
+
+    __slots__ = ("symbol", "interval", "segments")
+
+    def __init__(self, symbol: str, interval: str, segments: list[memoryview]):
+        self.symbol = symbol
+        self.interval = interval
+        self.segments = segments
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments) // RECORD.size
+
+    def __iter__(self) -> Iterator[Candle]:
+        symbol, interval = self.symbol, self.interval
+        for segment in self.segments:
+            for open_ns, close_ns, *ohlcv, count, offset in RECORD.iter_unpack(segment):
+                tz = _timezone(offset)
+                yield Candle(
+                    symbol,
+                    interval,
+                    window_time(open_ns, tz),
+                    window_time(close_ns, tz),
+                    *ohlcv,
+                    trade_count=count,
+                )
+
+    def to_numpy(self) -> Any:
+        """NumPy structured array (필드: RECORD_FIELDS)
+
+        파일 하나 범위면 mmap을 그대로 가리키고 (복사 없음), 여러 파일이면 이어 붙인다.
+        """
+        import numpy as np
+
+        dtype = np.dtype(
+            [
+                (name, "<i8" if code == "q" else "<f8")
+                for name, code in zip(RECORD_FIELDS, RECORD.format[1:])
+            ]
+        )
+        arrays = [np.frombuffer(segment, dtype=dtype) for segment in self.segments]
+        if len(arrays) == 1:
+            return arrays[0]
+        return np.concatenate(arrays) if arrays else np.zeros(0, dtype=dtype)
+
+
+class _DayFile:
+    """(symbol, interval, 날짜) 파일 하나의 상태
+
+    Attributes:
+        path: 본 파일 경로 (.cndl)
+        amend_path: 수정 로그 경로 (.amend)
+        count: 본 파일의 레코드 수
+        last_open_ns: 본 파일 마지막 레코드의 open_ns (없으면 None)
+        amend_count: 수정 로그의 레코드 수
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.amend_path = path[: -len(DATA_SUFFIX)] + AMEND_SUFFIX
+        self.count = _size(path) // RECORD.size
+        self.amend_count = _size(self.amend_path) // RECORD.size
+        self.last_open_ns: Optional[int] = None
+        if self.count:
+            with open(path, "rb") as f:
+                f.seek((self.count - 1) * RECORD.size)
+                self.last_open_ns = RECORD.unpack(f.read(RECORD.size))[0]
+        self._map: Optional[mmap.mmap] = None
+        self._times: Optional[memoryview] = None
+        self._index: Optional[array] = None
+
+    def append(self, records: list[bytes], last_open_ns: int) -> None:
+        """본 파일 끝에 레코드 추가"""
+        with open(self.path, "ab") as f:
+            f.write(b"".join(records))
+        self.count += len(records)
+        self.last_open_ns = last_open_ns
+        self._unmap()
+
+    def append_amends(self, records: list[bytes]) -> None:
+        """수정 로그에 레코드 추가"""
+        with open(self.amend_path, "ab") as f:
+            f.write(b"".join(records))
+        self.amend_count += len(records)
+
+    def view(self, start_ns: int, end_ns: int) -> memoryview:
+        """open_ns가 [start_ns, end_ns)인 레코드 구간 (mmap memoryview)"""
+        if not self.count:
+            return memoryview(b"")
+        self._ensure_map()
+        lo = self._search(start_ns)
+        hi = max(lo, self._search(end_ns))
+        return memoryview(self._map)[lo * RECORD.size : hi * RECORD.size]
+
+    def compact(self) -> None:
+        """수정 로그를 본 파일에 반영하고 로그 삭제"""
+        if not self.amend_count:
+            return
+        with open(self.amend_path, "rb") as f:
+            # 같은 open_time은 마지막 수정이 이김
+            amends = {RECORD.unpack_from(r)[0]: r for r in _chunks(f.read())}
+
+        self._ensure_map()
+        positions = {}
+        for open_ns in amends:
+            index = self._search(open_ns) if self.count else 0
+            if index == self.count or self._times[index] != open_ns:
+                positions = None
+                break
+            positions[open_ns] = index
+
+        if positions is not None:
+            # 모두 기존 행: 제자리에서 덮어씀
+            with open(self.path, "r+b") as f:
+                for open_ns, record in amends.items():
+                    f.seek(positions[open_ns] * RECORD.size)
+                    f.write(record)
+            self._unmap()
+        else:
+            # 새 open_time이 있음: 병합해 다시 씀
+            records = {}
+            if self.count:
+                for record in _chunks(bytes(self._map)):
+                    records[RECORD.unpack_from(record)[0]] = record
+            records.update(amends)
+            self._unmap()
+            tmp = self.path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(b"".join(records[key] for key in sorted(records)))
+            os.replace(tmp, self.path)
+            self.count = len(records)
+            self.last_open_ns = max(records)
+        os.remove(self.amend_path)
+        self.amend_count = 0
+
+    def close(self) -> None:
+        self._unmap()
+
+    def _search(self, open_ns: int) -> int:
+        """open_ns 이상인 첫 레코드 번호 (희소 인덱스 → 블록 이분 탐색)"""
+        block = bisect_left(self._index, open_ns)
+        lo = max(block - 1, 0) * INDEX_STRIDE
+        hi = min(block * INDEX_STRIDE, self.count)
+        return bisect_left(self._times, open_ns, lo, max(lo, hi))
+
+    def _ensure_map(self) -> None:
+        if self._map is not None or not self.count:
+            return
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(
+                f.fileno(), self.count * RECORD.size, access=mmap.ACCESS_READ
+            )
+        # 레코드별 open_ns 열 (strided memoryview) 과 희소 인덱스
+        self._times = memoryview(self._map).cast("q")[::RECORD_WORDS]
+        self._index = array("q", self._times[::INDEX_STRIDE])
+
+    def _unmap(self) -> None:
+        # 기존 mmap은 닫지 않는다 (이미 돌려준 뷰가 가리키고 있을 수 있음, GC가 정리)
+        self._map = None
+        self._times = None
+        self._index = None
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _chunks(data: bytes) -> list[bytes]:
+    size = RECORD.size
+    return [data[i : i + size] for i in range(0, len(data) - size + 1, size)]
+
+
+class CandleHistory:
+    """(symbol, interval, 날짜)별 고정 폭 레코드 파일 캔들 저장소
+
+    on_candles 콜백 (history(candles))과 on_update 콜백 (history.amend)으로 연결한다.
+    집계 커널을 쓰는 생성기의 캔들은 append / amend에서 TypeError로 거부한다.
+
+    Attributes:
+        root: 저장 디렉터리
+        max_pending: 메모리에 모아 둘 최대 레코드 수 (넘으면 flush)
+        compact_threshold: flush 시 수정 로그가 이 레코드 수 이상이면 compact
+    """
+
+    def __init__(self, root: str, max_pending: int = 1000, compact_threshold: int = 256):
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        if compact_threshold < 1:
+            raise ValueError("compact_threshold must be >= 1")
+        self.root = root
+        self.max_pending = max_pending
+        self.compact_threshold = compact_threshold
+        self._files: dict[str, _DayFile] = {}
+        # 파일 경로 → 대기 중인 (레코드, open_ns) 목록
+        self._appends: dict[str, list[tuple[bytes, int]]] = {}
+        self._amends: dict[str, list[bytes]] = {}
+        self._pending = 0
+
+    def __call__(self, candles: list[Candle]) -> None:
+        """닫힌 캔들 묶음 추가 (on_candles 콜백)"""
+        for candle in candles:
+            self.append(candle)
+
+    def append(self, candle: Candle) -> None:
+        """닫힌 캔들 추가 (on_candle 콜백, 이미 지난 open_time이면 수정으로 처리)"""
+        open_ns = to_epoch_ns(candle.open_time)
+        path = self._path(candle.symbol, candle.interval, open_ns)
+        pending = self._appends.get(path)
+        if pending:
+            last_ns = pending[-1][1]
+        else:
+            last_ns = self._file(path).last_open_ns
+        if last_ns is not None and open_ns <= last_ns:
+            self._amends.setdefault(path, []).append(pack_candle(candle))
+        else:
+            self._appends.setdefault(path, []).append((pack_candle(candle), open_ns))
+        self._pending += 1
+        if self._pending >= self.max_pending:
+            self.flush()
+
+    def amend(self, candle: Candle) -> None:
+        """수정된 캔들 기록 (on_update 콜백)"""
+        path = self._path(candle.symbol, candle.interval, to_epoch_ns(candle.open_time))
+        self._amends.setdefault(path, []).append(pack_candle(candle))
+        self._pending += 1
+        if self._pending >= self.max_pending:
+            self.flush()
+
+    def flush(self) -> None:
+        """대기 중인 레코드를 파일에 기록 (수정 로그가 길면 compact)"""
+        appends, self._appends = self._appends, {}
+        amends, self._amends = self._amends, {}
+        self._pending = 0
+        for path, pending in appends.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._file(path).append([record for record, _ in pending], pending[-1][1])
+        for path, records in amends.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            day_file = self._file(path)
+            day_file.append_amends(records)
+            if day_file.amend_count >= self.compact_threshold:
+                day_file.compact()
+
+    def compact(self) -> None:
+        """모든 수정 로그를 본 파일에 반영"""
+        self.flush()
+        for day_file in self._files.values():
+            day_file.compact()
+
+    def range(self, symbol: str, interval: str, start: datetime, end: datetime) -> HistoryView:
+        """open_time이 [start, end)인 캔들 (시간순, mmap 뷰)"""
+        return self.range_ns(symbol, interval, to_epoch_ns(start), to_epoch_ns(end))
+
+    def range_ns(self, symbol: str, interval: str, start_ns: int, end_ns: int) -> HistoryView:
+        """range()의 epoch ns 버전 (대기 중인 레코드를 먼저 flush)"""
+        if self._pending:
+            self.flush()
+        directory = os.path.join(self.root, symbol, interval)
+        segments = []
+        if end_ns > start_ns and os.path.isdir(directory):
+            first = day_name(start_ns // NS_PER_DAY) + DATA_SUFFIX
+            last = day_name((end_ns - 1) // NS_PER_DAY) + DATA_SUFFIX
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(DATA_SUFFIX) and first <= name <= last:
+                    day_file = self._file(os.path.join(directory, name))
+                    day_file.compact()
+                    segment = day_file.view(start_ns, end_ns)
+                    if len(segment):
+                        segments.append(segment)
+        return HistoryView(symbol, interval, segments)
+
+    def close(self) -> None:
+        """flush 후 파일 매핑 해제"""
+        self.flush()
+        for day_file in self._files.values():
+            day_file.close()
+        self._files.clear()
+
+    def __enter__(self) -> "CandleHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _path(self, symbol: str, interval: str, open_ns: int) -> str:
+        return os.path.join(
+            self.root, symbol, interval, day_name(open_ns // NS_PER_DAY) + DATA_SUFFIX
+        )
+
+    def _file(self, path: str) -> _DayFile:
+        day_file = self._files.get(path)
+        if day_file is None:
+            day_file = self._files[path] = _DayFile(path)
+        return day_file
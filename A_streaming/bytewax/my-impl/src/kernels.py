@@ -0,0 +1,285 @@
+"""집계 커널: OHLCV 외 캔들 통계 (VWAP, 거래대금, taker 매수 / 매도 거래량, 분위수)
+
+CandleGenerator(kernels=[VWAP, TAKER_VOLUME])로 켠다.
+커널은 거래마다 더하는 합계 누적값과, 누적값으로 Candle 추가 필드를 계산하는 함수로 정의한다.
+합계는 병합 가능하므로 allowed_lateness 수정 / 윈도우 병합에서도 그대로 맞다.
+
+생성기를 만들 때 compile_aggregator()가 선택된 커널의 누적식을 OHLCV 갱신 코드와 함께
+add() 하나로 생성한 CandleAggregator 하위 클래스를 만든다 (커널 조합마다 한 번, 캐시).
+거래마다 커널을 순회하거나 호출하지 않는다.
+
+    generator = CandleGenerator(kernels=[VWAP, TURNOVER, TAKER_VOLUME])
+    generator.process(Trade("BTCUSDT", 50000.0, 0.1, ts, is_buyer_maker=False))
+    # Candle.vwap / turnover / buy_volume / sell_volume
+
+새 커널은 Kernel(name, sums, outputs)로 만든다. sums의 식은 거래 값
+(price, quantity, ts_ns, is_buyer_maker)을 쓰는 파이썬 식이고,
+outputs가 돌려주는 키는 Candle 필드 이름이어야 한다.
+
+분위수는 합계 대신 윈도우마다 고정 크기 QuantileSketch (src.sketch)를 갱신한다.
+PRICE_QUANTILES / SIZE_QUANTILES는 p5 / p50 / p95를, quantile_kernel()은 다른 분위나
+정확도를 쓰는 커널을 만든다. 스케치도 병합 가능하므로 롤업 / 수정에서 그대로 맞다.
+
+    generator = CandleGenerator(kernels=[PRICE_QUANTILES, SIZE_QUANTILES])
+    # Candle.price_quantiles == {"p5": ..., "p50": ..., "p95": ...}
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from math import ceil, log
+from typing import Callable, Optional, Sequence
+
+from .candle_generator import CandleAggregator
+from .sketch import QuantileSketch
+
+# 생성되는 add(): CandleAggregator.add와 같은 OHLCV 갱신 + 커널 누적
+_ADD_SOURCE = """\
+def add(self, price, quantity, ts_ns, is_buyer_maker=None):
+    if self._first_timestamp is None or ts_ns < self._first_timestamp:
+        self._first_timestamp = ts_ns
+        self.open = price
+    if price > self.high:
+        self.high = price
+    if price < self.low:
+        self.low = price
+    if self._last_timestamp is None or ts_ns > self._last_timestamp:
+        self._last_timestamp = ts_ns
+        self.close = price
+    self.volume += quantity
+    self.trade_count += 1
+    self.dirty = True
+"""
+
+# 생성되는 add()의 스케치 갱신: QuantileSketch.add와 같은 계산 (메서드 호출 없이)
+_SKETCH_ADD_SOURCE = """\
+    _value = {expression}
+    if _value > 0:
+        _bins = self.{name}.bins
+        _key = ceil(log(_value) * {inv_log_gamma!r})
+        _bins[_key] = _bins.get(_key, 0) + 1
+        if len(_bins) > {max_bins}:
+            self.{name}.collapse()
+    else:
+        self.{name}.zero_count += 1
+"""
+
+
+@dataclass(frozen=True)
+class Kernel:
+    """거래마다 합계를 누적하는 캔들 통계
+
+    Attributes:
+        name: 커널 이름
+        sums: (누적값 이름, 거래 하나의 기여식) 목록. 같은 이름은 커널끼리 공유한다
+        outputs: 집계 (누적값은 같은 이름의 속성) → Candle 추가 필드 값
+        sketches: (스케치 이름, 거래 하나의 값 식, relative_accuracy, max_bins) 목록.
+            윈도우마다 QuantileSketch를 같은 이름의 속성으로 만든다
+    """
+
+    name: str
+    sums: tuple[tuple[str, str], ...]
+    outputs: Callable[[CandleAggregator], dict]
+    sketches: tuple[tuple[str, str, float, int], ...] = ()
+
+
+def _turnover(aggregator) -> dict[str, Optional[float]]:
+    return {"turnover": aggregator.turnover}
+
+
+def _vwap(aggregator) -> dict[str, Optional[float]]:
+    volume = aggregator.volume
+    return {"vwap": aggregator.turnover / volume if volume else None}
+
+
+def _taker_volume(aggregator) -> dict[str, Optional[float]]:
+    return {"buy_volume": aggregator.buy_volume, "sell_volume": aggregator.sell_volume}
+
+
+_NOTIONAL = ("turnover", "price * quantity")
+
+# 거래대금 (Σ price × quantity)
+TURNOVER = Kernel("turnover", (_NOTIONAL,), _turnover)
+
+# 거래량 가중 평균 가격 (거래대금 / 거래량)
+VWAP = Kernel("vwap", (_NOTIONAL,), _vwap)
+
+# taker 매수 / 매도 거래량 (is_buyer_maker: True면 매도, False면 매수, None이면 제외)
+TAKER_VOLUME = Kernel(
+    "taker_volume",
+    (
+        ("buy_volume", "quantity if is_buyer_maker is False else 0.0"),
+        ("sell_volume", "quantity if is_buyer_maker else 0.0"),
+    ),
+    _taker_volume,
+)
+
+# quantile_kernel() 기본 분위
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+
+def percentile_name(q: float) -> str:
+    """분위 → 출력 키 (0.05 → "p5", 0.999 → "p99.9")"""
+    return f"p{q * 100:g}"
+
+
+def quantile_kernel(
+    field: str,
+    expression: str,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    relative_accuracy: float = 0.01,
+    max_bins: int = 512,
+) -> Kernel:
+    """거래 값 분위수 커널 생성
+
+    Args:
+        field: 채울 Candle 필드 (값은 {"p5": ..., ...} dict, 거래가 없으면 None)
+        expression: 거래 하나의 값 식 (예: "price", "quantity", "price * quantity")
+        quantiles: 출력할 분위 (0 ~ 1)
+        relative_accuracy: 분위수 상대 오차 한도
+        max_bins: 윈도우당 최대 버킷 수 (스케치 메모리 한도)
+
+    Returns:
+        Kernel (스케치 이름은 "<field>_sketch", 같은 field / 식 / 설정이면 커널끼리 공유)
+
+    Raises:
+        ValueError: 분위가 0 ~ 1 밖이거나 스케치 설정이 잘못된 경우
+    """
+    quantiles = tuple(quantiles)
+    if not all(0 <= q <= 1 for q in quantiles):
+        raise ValueError("quantiles must be between 0 and 1")
+    # 스케치 설정 검증 (잘못되면 ValueError)
+    QuantileSketch(relative_accuracy, max_bins)
+
+    sketch_name = f"{field}_sketch"
+    names = tuple(percentile_name(q) for q in quantiles)
+
+    def outputs(aggregator) -> dict:
+        values = getattr(aggregator, sketch_name).quantiles(quantiles)
+        if not values or values[0] is None:
+            return {field: None}
+        return {field: dict(zip(names, values))}
+
+    return Kernel(
+        field, (), outputs, ((sketch_name, expression, relative_accuracy, max_bins),)
+    )
+
+
+# 가격 분위수 (p5 / p50 / p95, 상대 오차 1bp, 윈도우 안 가격 범위 약 ±10%까지 정확)
+PRICE_QUANTILES = quantile_kernel(
+    "price_quantiles", "price", relative_accuracy=0.0001, max_bins=1024
+)
+
+# 거래 크기 (수량) 분위수 (p5 / p50 / p95, 상대 오차 1%)
+SIZE_QUANTILES = quantile_kernel("size_quantiles", "quantity")
+
+
+@lru_cache(maxsize=None)
+def compile_aggregator(kernels: tuple[Kernel, ...]) -> type[CandleAggregator]:
+    """커널 누적을 add()에 넣은 CandleAggregator 하위 클래스 생성
+
+    Args:
+        kernels: 사용할 커널 (순서대로 누적 / 출력)
+
+    Returns:
+        CandleAggregator 하위 클래스 (state()는 OHLCV 튜플 뒤에 누적값, 스케치 state()를 붙임)
+
+    Raises:
+        ValueError: 누적값 / 스케치 이름이 식별자가 아니거나, 기존 속성 / 메서드와 겹치거나,
+            같은 이름에 다른 식 / 설정이 주어진 경우
+    """
+    # 인스턴스 속성과 메서드 / 클래스 속성 (add, merge, to_candle 등을 가리지 않도록)
+    reserved = set(vars(CandleAggregator.from_ns(0, 0))) | set(dir(CandleAggregator))
+    specs: dict[str, tuple] = {}
+    for kernel in kernels:
+        for spec in kernel.sums + kernel.sketches:
+            name = spec[0]
+            if not name.isidentifier() or name in reserved:
+                raise ValueError(f"invalid kernel sum name: {name!r}")
+            if specs.setdefault(name, spec) != spec:
+                raise ValueError(f"kernel sum {name!r} is defined twice")
+
+    sums = {name: spec[1] for name, spec in specs.items() if len(spec) == 2}
+    sketches = {name: spec[1:] for name, spec in specs.items() if len(spec) == 4}
+    source = _ADD_SOURCE + "".join(
+        f"    self.{name} += {expression}\n" for name, expression in sums.items()
+    ) + "".join(
+        _SKETCH_ADD_SOURCE.format(
+            name=name,
+            expression=expression,
+            inv_log_gamma=QuantileSketch(accuracy, max_bins).inv_log_gamma,
+            max_bins=max_bins,
+        )
+        for name, (expression, accuracy, max_bins) in sketches.items()
+    )
+    namespace: dict = {"ceil": ceil, "log": log}
+    exec(compile(source, f"<kernels {'+'.join(k.name for k in kernels)}>", "exec"), namespace)
+    return _aggregator_class(
+        kernels,
+        tuple(sums),
+        tuple((name, accuracy, bins) for name, (_, accuracy, bins) in sketches.items()),
+        namespace["add"],
+    )
+
+
+def _aggregator_class(
+    kernels: tuple[Kernel, ...],
+    names: tuple[str, ...],
+    sketches: tuple[tuple[str, float, int], ...],
+    add: Callable,
+) -> type[CandleAggregator]:
+    outputs = tuple(kernel.outputs for kernel in kernels)
+    base_state_size = 8
+    sketch_offset = base_state_size + len(names)
+    sketch_names = tuple(name for name, _, _ in sketches)
+
+    class KernelAggregator(CandleAggregator):
+        __doc__ = f"CandleAggregator + 커널 ({', '.join(k.name for k in kernels)})"
+        sum_names = names
+        sketch_specs = sketches
+
+        def _init(self, start_ns, end_ns, tz):
+            CandleAggregator._init(self, start_ns, end_ns, tz)
+            for name in names:
+                setattr(self, name, 0.0)
+            for name, accuracy, bins in sketches:
+                setattr(self, name, QuantileSketch(accuracy, bins))
+
+        def state(self) -> tuple:
+            return (
+                CandleAggregator.state(self)
+                + tuple(getattr(self, name) for name in names)
+                + tuple(getattr(self, name).state() for name in sketch_names)
+            )
+
+        def merge(self, other: CandleAggregator) -> None:
+            # state() 튜플을 만들지 않고 스케치끼리 바로 병합 (롤업 경로)
+            if other.is_empty():
+                return
+            CandleAggregator.merge(self, other)
+            for name in names:
+                setattr(self, name, getattr(self, name) + getattr(other, name))
+            for name in sketch_names:
+                getattr(self, name).merge(getattr(other, name))
+
+        def _merge(self, *state) -> None:
+            CandleAggregator._merge(self, *state[:base_state_size])
+            for name, value in zip(names, state[base_state_size:sketch_offset]):
+                setattr(self, name, getattr(self, name) + value)
+            for name, value in zip(sketch_names, state[sketch_offset:]):
+                getattr(self, name).merge_state(value)
+
+        def to_candle(self, symbol: str, interval: str):
+            candle = CandleAggregator.to_candle(self, symbol, interval)
+            for field, value in self.kernel_fields().items():
+                setattr(candle, field, value)
+            return candle
+
+        def kernel_fields(self) -> dict:
+            fields: dict = {}
+            for output in outputs:
+                fields.update(output(self))
+            return fields
+
+    KernelAggregator.add = add
+    return KernelAggregator
+
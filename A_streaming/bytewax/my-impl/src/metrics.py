@@ -0,0 +1,208 @@
+"""생성기 계측: GeneratorMetrics, Histogram
+
+CandleGenerator(metrics=GeneratorMetrics())로 켠다.
+metrics가 없으면 생성기는 계측 코드가 없는 원래 메서드를 그대로 사용한다.
+켜면 process / process_values / add_trade / advance_watermark_ns / flush 를 계측 버전으로
+교체한다. process_batch는 배치마다 metrics를 확인해 카운터 / 콜백 / watermark 진행 시간만
+기록한다.
+
+- 카운터 (거래, Late, 캔들)는 모든 거래에서 갱신
+- 처리 시간 / watermark 진행 시간 / watermark lag 히스토그램은 sample_every 건마다 1건 기록
+- 콜백 시간은 호출될 때마다 기록 (캔들 emit / Late 처리는 거래보다 드묾)
+- 심볼별 열린 윈도우 수는 snapshot() 시점에 계산 (pull 방식)
+
+시간 히스토그램은 나노초 log2 버킷이며, Prometheus 텍스트로 내보낼 때 초 단위로 바꾼다.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .candle_generator import CandleGenerator
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class Histogram:
+    """log2 버킷 히스토그램 (정수 값, 나노초)
+
+    버킷 k에는 bit_length가 k인 값 (2**(k-1) <= value < 2**k)이 들어간다.
+
+    Attributes:
+        counts: 버킷별 개수 (64개)
+        count: 전체 기록 수
+        sum: 기록된 값의 합
+        min_exp: 내보낼 가장 작은 버킷 상한 지수 (le = 2**min_exp)
+        max_exp: 내보낼 가장 큰 버킷 상한 지수
+    """
+
+    __slots__ = ("counts", "count", "sum", "min_exp", "max_exp")
+
+    def __init__(self, min_exp: int, max_exp: int):
+        self.counts = [0] * 64
+        self.count = 0
+        self.sum = 0
+        self.min_exp = min_exp
+        self.max_exp = max_exp
+
+    def record(self, value: int) -> None:
+        """값 기록 (음수는 0으로 기록, 2**63 미만)"""
+        if value < 0:
+            value = 0
+        self.counts[value.bit_length()] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[int]:
+        """q 분위수의 버킷 상한 (기록이 없으면 None)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for k, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return (1 << k) - 1
+        return (1 << 63) - 1
+
+    def buckets(self) -> list[tuple[int, int]]:
+        """(상한 le, 누적 개수) 리스트 (le = 2**min_exp .. 2**max_exp)
+
+        le보다 작은 값의 개수이므로 value < 2**k 인 버킷 k까지의 누적이다.
+        """
+        cumulative = sum(self.counts[: self.min_exp + 1])
+        result = [(1 << self.min_exp, cumulative)]
+        for k in range(self.min_exp + 1, self.max_exp + 1):
+            cumulative += self.counts[k]
+            result.append((1 << k, cumulative))
+        return result
+
+    def snapshot(self) -> dict:
+        """count / sum / mean / p50 / p99 / max 요약"""
+        top = max((k for k, n in enumerate(self.counts) if n), default=None)
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.50),
+            "p99": self.quantile(0.99),
+            "max": None if top is None else (1 << top) - 1,
+        }
+
+
+class GeneratorMetrics:
+    """CandleGenerator 카운터 / 히스토그램
+
+    사용 예시:
+        metrics = GeneratorMetrics()
+        generator = CandleGenerator(metrics=metrics)
+        ...
+        metrics.snapshot(generator)        # dict
+        metrics.to_prometheus(generator)   # Prometheus text exposition
+
+    Attributes:
+        sample_every: 이 건수마다 한 번 시간/lag 히스토그램 기록 (1이면 전부)
+        trades: 처리한 거래 수 (Late 포함)
+        late_trades: Late 거래 수 (allowed_lateness로 반영된 거래 포함)
+        candles: emit한 캔들 수
+        process_ns: process() / add_trade() 호출 시간 (샘플)
+        advance_watermark_ns: watermark 진행 및 윈도우 닫기 시간 (샘플 + 수동 진행)
+        callback_ns: 콜백 시간 (on_candle 묶음 / Late 처리 1건)
+        watermark_lag_ns: 거래 이벤트 시간 - watermark (샘플)
+    """
+
+    def __init__(self, sample_every: int = 64):
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.sample_every = sample_every
+
+        self.trades = 0
+        self.late_trades = 0
+        self.candles = 0
+
+        # 256ns ~ 1s
+        self.process_ns = Histogram(8, 30)
+        self.advance_watermark_ns = Histogram(8, 30)
+        self.callback_ns = Histogram(8, 30)
+        # ~1ms ~ ~73분
+        self.watermark_lag_ns = Histogram(20, 42)
+
+    def _histograms(self) -> dict[str, Histogram]:
+        return {
+            "process": self.process_ns,
+            "advance_watermark": self.advance_watermark_ns,
+            "callback": self.callback_ns,
+            "watermark_lag": self.watermark_lag_ns,
+        }
+
+    def snapshot(self, generator: Optional["CandleGenerator"] = None) -> dict:
+        """현재 값 (generator를 주면 심볼별 열린 윈도우 수 포함)
+
+        Returns:
+            {"trades", "late_trades", "candles", "histograms_ns": {...}, "open_windows": {...}}
+        """
+        result = {
+            "trades": self.trades,
+            "late_trades": self.late_trades,
+            "candles": self.candles,
+            "histograms_ns": {
+                name: histogram.snapshot()
+                for name, histogram in self._histograms().items()
+            },
+        }
+        if generator is not None:
+            result["open_windows"] = _open_windows(generator)
+        return result
+
+    def to_prometheus(
+        self,
+        generator: Optional["CandleGenerator"] = None,
+        prefix: str = "candle_generator_",
+    ) -> str:
+        """Prometheus text exposition format (시간은 초 단위)"""
+        lines: list[str] = []
+
+        def counter(name: str, help_text: str, value: int) -> None:
+            lines.append(f"# HELP {prefix}{name} {help_text}")
+            lines.append(f"# TYPE {prefix}{name} counter")
+            lines.append(f"{prefix}{name} {value}")
+
+        counter("trades_total", "Trades processed (including late trades).", self.trades)
+        counter("late_trades_total", "Trades that arrived behind the watermark.", self.late_trades)
+        counter("candles_total", "Candles emitted.", self.candles)
+
+        help_texts = {
+            "process": "Time spent in process() (sampled).",
+            "advance_watermark": "Time spent advancing the watermark and closing windows.",
+            "callback": "Time spent in on_candle / late handling callbacks.",
+            "watermark_lag": "Trade event time minus watermark (sampled).",
+        }
+        for name, histogram in self._histograms().items():
+            metric = f"{prefix}{name}_seconds"
+            lines.append(f"# HELP {metric} {help_texts[name]}")
+            lines.append(f"# TYPE {metric} histogram")
+            for le, cumulative in histogram.buckets():
+                lines.append(f'{metric}_bucket{{le="{le / NS_PER_SECOND:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+            lines.append(f"{metric}_sum {histogram.sum / NS_PER_SECOND:g}")
+            lines.append(f"{metric}_count {histogram.count}")
+
+        if generator is not None:
+            metric = f"{prefix}open_windows"
+            lines.append(f"# HELP {metric} Open windows per symbol.")
+            lines.append(f"# TYPE {metric} gauge")
+            for symbol, count in _open_windows(generator).items():
+                lines.append(f'{metric}{{symbol="{_escape_label(symbol)}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _open_windows(generator: "CandleGenerator") -> dict[str, int]:
+    """심볼별 열린 윈도우 수"""
+    return {
+        symbol: manager.open_window_count()
+        for symbol, manager in generator.window_managers.items()
+    }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,384 @@
+"""파티션 입력: PartitionWatermarks, PartitionedIngestor, MemoryPartitionSource, FilePartitionSource
+
+Kafka 토픽처럼 여러 파티션의 거래를 동시에 읽어 하나의 CandleGenerator로 집계한다.
+
+    partition 0 ──reader task──┐
+    partition 1 ──reader task──┼──▶ bounded queue ──▶ PartitionedIngestor ──▶ CandleGenerator
+    partition 2 ──reader task──┘                      (파티션별 watermark / offset)
+
+- watermark: 파티션마다 읽은 거래의 최대 이벤트 시간을 두고, 그 최소값으로만 생성기의
+  watermark를 진행한다 (advance_watermark_ns, delay는 생성기 설정 그대로).
+  빠른 파티션이 watermark를 앞당겨 느린 파티션의 거래를 Late로 만들지 않는다.
+  거래는 add_trade()로 넣는다 (심볼별 거래 시간으로 watermark를 진행하지 않음).
+- 아직 거래가 없는 파티션은 watermark를 붙잡는다. 끝난 파티션 (소스 종료 / finish())은
+  최소값에서 빠진다.
+- offset: 파티션마다 다음에 읽을 offset을 기록하고, checkpoint()가 생성기 snapshot과 함께
+  하나의 bytes로 직렬화한다. 재시작 시 restore() 후 그 offset부터 다시 읽으면 각 거래가
+  윈도우 상태에 정확히 한 번 반영된다. 마지막 체크포인트 이후 emit된 캔들은 다시 emit되므로
+  sink는 (심볼, 시작 시간) 기준으로 덮어써야 한다 (CandleStore / CandleHistory).
+- 최소 watermark는 최소값을 가진 파티션이 진행할 때만 다시 계산한다.
+  global_watermark=True 생성기를 권장한다 (watermark 진행 비용이 심볼 수와 무관).
+
+소스는 partitions()와 read(partition, offset) → AsyncIterator[(offset, Trade)]를 제공한다.
+
+체크포인트 포맷 (little endian):
+
+    header     : magic "PART", version u16, n_partitions u32
+    partitions : n_partitions × (partition i32, next_offset i64, max_ts_ns i64)
+    snapshot   : CandleGenerator.snapshot() bytes (src.checkpoint)
+"""
+
+import asyncio
+import json
+import struct
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Mapping, Optional, Sequence, Union
+
+from .candle import Trade
+from .candle_generator import CandleGenerator
+from .window import to_epoch_ns
+
+MAGIC = b"PART"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHI")
+# partition, next_offset, max_ts_ns
+PARTITION_RECORD = struct.Struct("<iqq")
+
+# 거래가 없는 파티션
+NO_TIMESTAMP = -(2**63)
+
+_END = None
+
+
+class PartitionWatermarks:
+    """파티션별 최대 이벤트 시간과 그 최소값
+
+    Attributes:
+        max_ts_ns: 파티션 → 읽은 거래의 최대 이벤트 시간 (epoch ns, 거래 전에는 None)
+        finished: 끝난 파티션 (최소값 계산에서 제외)
+        low_ns: 끝나지 않은 파티션 max_ts_ns의 최소값 (하나라도 None이면 None).
+            모든 파티션이 끝나면 max_ts_ns의 최대값. 감소하지 않는다.
+    """
+
+    def __init__(self, partitions: Iterable[int] = ()):
+        self.max_ts_ns: dict[int, Optional[int]] = dict.fromkeys(partitions)
+        self.finished: set[int] = set()
+        self.low_ns: Optional[int] = None
+
+    def add(self, partition: int) -> None:
+        """파티션 등록 (거래가 올 때까지 최소값을 붙잡음)"""
+        self.max_ts_ns.setdefault(partition, None)
+        self.finished.discard(partition)
+
+    def update(self, partition: int, ts_ns: int) -> bool:
+        """파티션 거래 시간 반영
+
+        Args:
+            partition: 등록된 파티션
+            ts_ns: 거래 시간 (epoch ns)
+
+        Returns:
+            최소값 (low_ns)이 진행했으면 True
+        """
+        current = self.max_ts_ns[partition]
+        if current is not None and ts_ns <= current:
+            return False
+        self.max_ts_ns[partition] = ts_ns
+        # 최소값을 붙잡고 있던 파티션이 진행한 경우만 다시 계산
+        if current is None or self.low_ns is None or current <= self.low_ns:
+            return self._recompute()
+        return False
+
+    def finish(self, partition: int) -> bool:
+        """파티션 종료 (최소값에서 제외)
+
+        Returns:
+            최소값이 진행했으면 True
+        """
+        self.finished.add(partition)
+        return self._recompute()
+
+    def _recompute(self) -> bool:
+        active = [ts for p, ts in self.max_ts_ns.items() if p not in self.finished]
+        if active:
+            low = None if None in active else min(active)
+        else:
+            low = max((ts for ts in self.max_ts_ns.values() if ts is not None), default=None)
+        if low is None or (self.low_ns is not None and low <= self.low_ns):
+            return False
+        self.low_ns = low
+        return True
+
+
+class PartitionedIngestor:
+    """여러 파티션의 거래를 파티션별 watermark / offset과 함께 CandleGenerator로 집계
+
+    사용 예시:
+        generator = CandleGenerator(global_watermark=True, on_candle=store.insert)
+        ingestor = PartitionedIngestor(generator)
+        if saved is not None:
+            ingestor.restore(saved)
+        await ingestor.run(source, on_checkpoint=save, checkpoint_every=10_000)
+
+    Attributes:
+        generator: 집계할 CandleGenerator (거래마다 watermark를 진행하지 않도록 add_trade 사용)
+        watermarks: 파티션별 최대 이벤트 시간 / 최소값
+        offsets: 파티션 → 다음에 읽을 offset (처리한 마지막 거래 offset + 1)
+        max_pending: reader task → 집계 큐 최대 항목 수 (가득 차면 reader가 멈춤)
+    """
+
+    def __init__(
+        self,
+        generator: Optional[CandleGenerator] = None,
+        partitions: Iterable[int] = (),
+        max_pending: int = 1000,
+    ):
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self.generator = generator or CandleGenerator(global_watermark=True)
+        self.watermarks = PartitionWatermarks()
+        self.offsets: dict[int, int] = {}
+        self.max_pending = max_pending
+        for partition in partitions:
+            self.add_partition(partition)
+
+    def add_partition(self, partition: int) -> None:
+        """파티션 등록 (이미 있으면 offset 유지)"""
+        self.offsets.setdefault(partition, 0)
+        self.watermarks.add(partition)
+
+    def process(self, partition: int, offset: int, trade: Trade) -> None:
+        """파티션 거래 하나 처리
+
+        이미 반영된 offset (체크포인트 이전 재전송)은 무시한다.
+
+        Args:
+            partition: 등록된 파티션
+            offset: 파티션 안 거래 offset
+            trade: 거래
+        """
+        if offset < self.offsets[partition]:
+            return
+        self.offsets[partition] = offset + 1
+        self.generator.add_trade(trade)
+        if self.watermarks.update(partition, to_epoch_ns(trade.timestamp)):
+            self.generator.advance_watermark_ns(self.watermarks.low_ns)
+
+    def finish(self, partition: int) -> None:
+        """파티션 종료 / idle 처리 (더 이상 watermark를 붙잡지 않음)"""
+        if self.watermarks.finish(partition):
+            self.generator.advance_watermark_ns(self.watermarks.low_ns)
+
+    def checkpoint(self, incremental: bool = False) -> bytes:
+        """파티션 offset / watermark와 생성기 윈도우 상태를 하나의 체크포인트로 직렬화
+
+        Args:
+            incremental: 생성기 snapshot을 증분으로 기록할지 여부
+
+        Returns:
+            체크포인트 bytes (restore()로 복원)
+
+        Raises:
+            TypeError: 생성기가 snapshot을 지원하지 않는 경우 (롤업 / 슬라이딩 윈도우)
+        """
+        snapshot = self.generator.snapshot(incremental)
+        max_ts_ns = self.watermarks.max_ts_ns
+        buf = bytearray(HEADER.size + len(self.offsets) * PARTITION_RECORD.size)
+        HEADER.pack_into(buf, 0, MAGIC, VERSION, len(self.offsets))
+        pos = HEADER.size
+        for partition, offset in self.offsets.items():
+            ts_ns = max_ts_ns.get(partition)
+            PARTITION_RECORD.pack_into(
+                buf, pos, partition, offset, NO_TIMESTAMP if ts_ns is None else ts_ns
+            )
+            pos += PARTITION_RECORD.size
+        return bytes(buf) + snapshot
+
+    def restore(self, data: bytes) -> None:
+        """체크포인트로 offset / watermark / 윈도우 상태 복원
+
+        체크포인트에 없는 등록 파티션은 그대로 둔다 (새 파티션은 offset 0부터).
+        복원된 파티션은 다시 끝나지 않은 상태가 된다.
+
+        Raises:
+            ValueError: 포맷이 다르거나 생성기 설정이 맞지 않는 경우
+        """
+        view = memoryview(data)
+        if len(view) < HEADER.size:
+            raise ValueError("checkpoint is truncated")
+        magic, version, n_partitions = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a partition checkpoint (or unsupported version)")
+        end = HEADER.size + n_partitions * PARTITION_RECORD.size
+        if len(view) < end:
+            raise ValueError("checkpoint is truncated")
+
+        self.generator.restore(bytes(view[end:]))
+        watermarks = self.watermarks
+        for partition, offset, ts_ns in PARTITION_RECORD.iter_unpack(view[HEADER.size : end]):
+            self.offsets[partition] = offset
+            watermarks.add(partition)
+            watermarks.max_ts_ns[partition] = None if ts_ns == NO_TIMESTAMP else ts_ns
+        watermarks.low_ns = None
+        watermarks._recompute()
+
+    async def run(
+        self,
+        source,
+        flush: bool = True,
+        on_checkpoint: Optional[Callable[[bytes], None]] = None,
+        checkpoint_every: int = 10_000,
+    ) -> None:
+        """소스의 모든 파티션을 동시에 읽어 처리
+
+        파티션마다 reader task가 offsets의 위치부터 읽어 bounded queue에 넣고,
+        이 task가 도착 순으로 process()한다. 파티션 안 순서는 유지된다.
+
+        Args:
+            source: partitions() / read(partition, offset)를 제공하는 소스
+            flush: 모든 파티션이 끝나면 열린 윈도우를 flush 할지 여부
+            on_checkpoint: 체크포인트 콜백 (checkpoint_every 거래마다, 끝날 때 한 번 더)
+            checkpoint_every: 체크포인트 간격 (처리한 거래 수)
+        """
+        for partition in source.partitions():
+            self.add_partition(partition)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        readers = [
+            asyncio.create_task(self._read(source, partition, queue))
+            for partition in list(self.offsets)
+        ]
+        remaining = len(readers)
+        count = 0
+        try:
+            while remaining:
+                item = await queue.get()
+                if isinstance(item, BaseException):
+                    raise item
+                partition, offset, trade = item
+                if trade is _END:
+                    remaining -= 1
+                    self.finish(partition)
+                    continue
+                self.process(partition, offset, trade)
+                count += 1
+                if on_checkpoint is not None and count % checkpoint_every == 0:
+                    on_checkpoint(self.checkpoint())
+        finally:
+            for reader in readers:
+                if not reader.done():
+                    reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+
+        if flush:
+            self.generator.flush()
+        if on_checkpoint is not None:
+            on_checkpoint(self.checkpoint())
+
+    async def _read(self, source, partition: int, queue: asyncio.Queue) -> None:
+        """파티션 하나를 읽어 (partition, offset, trade)를 큐에 넣음 (끝나면 trade=None)"""
+        try:
+            async for offset, trade in source.read(partition, self.offsets[partition]):
+                await queue.put((partition, offset, trade))
+            await queue.put((partition, -1, _END))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            await queue.put(exc)
+
+
+class MemoryPartitionSource:
+    """메모리 로그 파티션 소스 (offset = 리스트 인덱스, 테스트 / 재현용)
+
+    Kafka 로그처럼 읽어도 지워지지 않으므로 재시작 시 offset부터 다시 읽을 수 있다.
+    닫히지 않은 파티션의 read()는 append() / close()를 기다린다.
+
+    Attributes:
+        logs: 파티션 → 거래 리스트
+        closed: 닫힌 파티션 (끝까지 읽으면 read()가 끝남)
+    """
+
+    def __init__(self, logs: Optional[Mapping[int, Sequence[Trade]]] = None, closed: bool = True):
+        self.logs: dict[int, list[Trade]] = {p: list(t) for p, t in (logs or {}).items()}
+        self.closed: set[int] = set(self.logs) if closed else set()
+        self._waiters: dict[int, asyncio.Event] = {}
+
+    def partitions(self) -> list[int]:
+        """파티션 번호 리스트"""
+        return list(self.logs)
+
+    def append(self, partition: int, trade: Trade) -> None:
+        """파티션 끝에 거래 추가 (파티션이 없으면 생성)"""
+        self.logs.setdefault(partition, []).append(trade)
+        self._wake(partition)
+
+    def close(self, partition: int) -> None:
+        """파티션 종료 (남은 거래를 다 읽으면 read()가 끝남)"""
+        self.closed.add(partition)
+        self._wake(partition)
+
+    def _wake(self, partition: int) -> None:
+        waiter = self._waiters.pop(partition, None)
+        if waiter is not None:
+            waiter.set()
+
+    async def read(self, partition: int, offset: int) -> AsyncIterator[tuple[int, Trade]]:
+        """offset부터 (offset, 거래) 순서대로 읽기"""
+        log = self.logs.setdefault(partition, [])
+        while True:
+            while offset < len(log):
+                yield offset, log[offset]
+                offset += 1
+            if partition in self.closed:
+                return
+            waiter = self._waiters.setdefault(partition, asyncio.Event())
+            await waiter.wait()
+
+
+class FilePartitionSource:
+    """파티션마다 JSON lines 파일 하나인 소스 (offset = 줄 번호, 테스트 / 재현용)
+
+    한 줄은 Trade.to_dict() 형식이다. 파일은 chunk 줄씩 스레드에서 읽으므로
+    여러 파티션의 읽기가 이벤트 루프를 막지 않고 동시에 진행된다.
+
+    Attributes:
+        paths: 파티션 번호 순서의 파일 경로
+        chunk: 한 번에 읽는 줄 수
+    """
+
+    def __init__(self, paths: Sequence[Union[str, Path]], chunk: int = 1024):
+        if chunk < 1:
+            raise ValueError("chunk must be >= 1")
+        self.paths = [Path(path) for path in paths]
+        self.chunk = chunk
+
+    def partitions(self) -> list[int]:
+        """파티션 번호 리스트 (paths 인덱스)"""
+        return list(range(len(self.paths)))
+
+    @staticmethod
+    def write(path: Union[str, Path], trades: Iterable[Trade]) -> None:
+        """거래를 JSON lines 파일로 저장 (파티션 파일 생성용)"""
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(json.dumps(trade.to_dict()) + "\n" for trade in trades)
+
+    async def read(self, partition: int, offset: int) -> AsyncIterator[tuple[int, Trade]]:
+        """offset 번째 줄부터 (offset, 거래) 순서대로 읽기 (빈 줄은 건너뛰되 offset은 셈)"""
+        with open(self.paths[partition], encoding="utf-8") as file:
+            lines = await asyncio.to_thread(_read_lines, file, offset, self.chunk)
+            while lines:
+                for line in lines:
+                    if line.strip():
+                        yield offset, Trade.from_dict(json.loads(line))
+                    offset += 1
+                lines = await asyncio.to_thread(_read_lines, file, 0, self.chunk)
+
+
+def _read_lines(file, skip: int, count: int) -> list[str]:
+    """skip 줄을 건너뛰고 최대 count 줄 읽기"""
+    if skip:
+        for _ in islice(file, skip):
+            pass
+    return list(islice(file, count))
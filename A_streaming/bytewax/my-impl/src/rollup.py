@@ -0,0 +1,233 @@
+"""다중 interval 롤업: RollupWindowManager, MultiIntervalCandleGenerator
+
+거래는 가장 작은 단위(모든 interval의 최대공약수) 윈도우에서만 집계하고,
+더 큰 interval의 캔들은 닫힌 작은 윈도우의 CandleAggregator를 병합해 만든다.
+OHLCV는 병합 가능하므로 interval별로 따로 돌린 결과와 같다. 단 volume은 작은 윈도우의
+부분 합계를 더하므로 거래 순서대로 더한 값과 float 합산 순서만큼 (마지막 몇 bit) 다를 수 있다.
+집계 커널 (src.kernels)의 합계 / 분위수 스케치도 병합 가능하므로 그대로 롤업된다.
+
+    1m 윈도우 닫힘 ──┬── 1m 캔들 emit
+                    ├── 5m 집계에 merge  ── 5m 윈도우 닫히면 emit
+                    └── 15m 집계에 merge ── 15m 윈도우 닫히면 emit
+"""
+
+from datetime import datetime, timedelta, tzinfo
+from math import gcd
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+from .candle import Candle, LateData, Trade
+from .candle_generator import CandleAggregator, CandleGenerator, WindowManager
+from .metrics import GeneratorMetrics
+from .window import timedelta_to_ns, to_epoch_ns
+
+if TYPE_CHECKING:
+    from .kernels import Kernel
+    from .store import CandleStore
+
+
+class RollupWindowManager:
+    """심볼별 다중 interval 윈도우 관리
+
+    WindowManager와 같은 인터페이스(add, late_data, advance_watermark_ns, flush)를
+    제공하므로 CandleGenerator가 그대로 사용할 수 있다.
+
+    Attributes:
+        symbol: 관리하는 심볼
+        base: 가장 작은 단위 윈도우 (거래가 직접 들어가는 곳)
+        emit_base: base interval 캔들도 emit 하는지 여부
+        rollups: 상위 interval 윈도우 (base 집계를 병합받음, 작은 interval 순)
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        window_sizes: Sequence[timedelta],
+        watermark_delay: timedelta,
+        aggregator: type[CandleAggregator] = CandleAggregator,
+    ):
+        self.symbol = symbol
+        base_size = base_window_size(window_sizes)
+
+        self.base = WindowManager(symbol, base_size, watermark_delay, aggregator=aggregator)
+        self.emit_base = base_size in window_sizes
+        self.rollups = [
+            WindowManager(symbol, size, watermark_delay, aggregator=aggregator)
+            for size in sorted(set(window_sizes))
+            if size != base_size
+        ]
+
+        # 상위 interval 중 가장 먼저 닫힐 윈도우의 종료 시간 (없으면 None)
+        # 새로 닫힌 base 윈도우가 없으면 이 시간만 비교해 롤업 검사를 건너뛴다
+        self._rollup_deadline_ns: Optional[int] = None
+
+    @property
+    def watermark_ns(self) -> Optional[int]:
+        """현재 Watermark (epoch ns)"""
+        return self.base.watermark_ns
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """현재 Watermark (datetime, UTC)"""
+        return self.base.watermark
+
+    @property
+    def last_trade_ns(self) -> int:
+        """받은 거래의 최대 이벤트 시간 (epoch ns, 심볼 제거 기준)"""
+        return self.base.last_trade_ns
+
+    def add(
+        self,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        is_buyer_maker: Optional[bool] = None,
+        trade_id: Optional[int] = None,
+    ) -> bool:
+        """거래 추가 (base 윈도우에만 집계)"""
+        return self.base.add(price, quantity, ts_ns, tz, is_buyer_maker, trade_id)
+
+    def add_trade(self, trade: Trade) -> Optional[LateData]:
+        """거래 추가"""
+        return self.base.add_trade(trade)
+
+    def get_window(self, bucket: int) -> Optional[CandleAggregator]:
+        """base 버킷의 열린 윈도우 (없으면 None)"""
+        return self.base.get_window(bucket)
+
+    def get_or_create_window(
+        self, bucket: int, tz: Optional[tzinfo] = None
+    ) -> CandleAggregator:
+        """base 버킷의 CandleAggregator 조회/생성"""
+        return self.base.get_or_create_window(bucket, tz)
+
+    def late_data(self, trade: Trade) -> LateData:
+        """Late 거래의 LateData 생성 (base 윈도우 기준)"""
+        return self.base.late_data(trade)
+
+    def open_window_count(self) -> int:
+        """열린 윈도우 수 (base + 상위 interval)"""
+        return len(self.base.windows) + sum(len(r.windows) for r in self.rollups)
+
+    def advance_watermark(self, timestamp: datetime) -> list[Candle]:
+        """Watermark 진행 및 닫힌 윈도우의 캔들 반환"""
+        return self.advance_watermark_ns(to_epoch_ns(timestamp))
+
+    def advance_watermark_ns(self, ts_ns: int) -> list[Candle]:
+        """Watermark 진행 (epoch ns)
+
+        Returns:
+            닫힌 윈도우들의 캔들 리스트 (interval 오름차순, 각 interval 내 시간순)
+        """
+        base = self.base
+        closed = base.close_windows_ns(ts_ns)
+        if not closed:
+            deadline = self._rollup_deadline_ns
+            if deadline is None or base.watermark_ns <= deadline:
+                return []
+        return self._roll(closed, base.watermark_ns)
+
+    def flush(self) -> list[Candle]:
+        """모든 열린 윈도우 강제 닫기"""
+        return self._roll(self.base.drain(), None)
+
+    def _roll(
+        self, closed: list[CandleAggregator], watermark_ns: Optional[int]
+    ) -> list[Candle]:
+        """닫힌 base 집계를 상위 interval에 병합하고 닫힌 캔들 수집
+
+        Args:
+            closed: 닫힌 base 윈도우 집계 (시간순)
+            watermark_ns: 현재 watermark (None이면 모두 flush)
+        """
+        candles: list[Candle] = []
+        if self.emit_base:
+            base = self.base
+            candles.extend(a.to_candle(self.symbol, base.interval) for a in closed)
+
+        for rollup in self.rollups:
+            size_ns = rollup.window_size_ns
+            for aggregator in closed:
+                rollup.get_or_create_window(
+                    aggregator.start_ns // size_ns, aggregator.tz
+                ).merge(aggregator)
+
+            if watermark_ns is None:
+                expired = rollup.drain()
+            else:
+                expired = rollup.pop_expired(watermark_ns)
+            candles.extend(a.to_candle(self.symbol, rollup.interval) for a in expired)
+
+        deadlines = [r.next_close_ns() for r in self.rollups]
+        self._rollup_deadline_ns = min(
+            (d for d in deadlines if d is not None), default=None
+        )
+        return candles
+
+
+def base_window_size(window_sizes: Sequence[timedelta]) -> timedelta:
+    """모든 interval을 나누어떨어지게 하는 가장 큰 윈도우 크기 (최대공약수)
+
+    Raises:
+        ValueError: interval이 없거나 0 이하인 경우
+    """
+    if not window_sizes:
+        raise ValueError("window_sizes must not be empty")
+    sizes_ns = [timedelta_to_ns(size) for size in window_sizes]
+    if min(sizes_ns) <= 0:
+        raise ValueError("window sizes must be positive")
+    return timedelta(microseconds=gcd(*sizes_ns) // 1000)
+
+
+class MultiIntervalCandleGenerator(CandleGenerator):
+    """여러 interval 캔들을 한 번의 집계로 생성
+
+    사용 예시:
+        generator = MultiIntervalCandleGenerator(
+            window_sizes=[
+                timedelta(minutes=1),
+                timedelta(minutes=5),
+                timedelta(hours=1),
+            ],
+            on_candle=lambda candle: print(candle.interval, candle),
+        )
+
+    거래별 비용은 base interval 하나를 집계하는 것과 같고,
+    interval을 추가하면 base 윈도우가 닫힐 때의 병합 비용만 늘어난다.
+    kernels (src.kernels)를 주면 모든 interval 캔들에 같은 커널 필드가 채워진다.
+
+    Attributes:
+        window_sizes: 생성할 interval 목록 (오름차순)
+        window_size: base 윈도우 크기 (window_sizes의 최대공약수)
+    """
+
+    def __init__(
+        self,
+        window_sizes: Sequence[timedelta],
+        watermark_delay: timedelta = timedelta(seconds=5),
+        on_candle: Optional[Callable[[Candle], None]] = None,
+        on_late: Optional[Callable[[LateData], None]] = None,
+        metrics: Optional[GeneratorMetrics] = None,
+        on_candles: Optional[Callable[[list[Candle]], None]] = None,
+        store: Optional["CandleStore"] = None,
+        kernels: Sequence["Kernel"] = (),
+    ):
+        super().__init__(
+            window_size=base_window_size(window_sizes),
+            watermark_delay=watermark_delay,
+            on_candle=on_candle,
+            on_late=on_late,
+            metrics=metrics,
+            on_candles=on_candles,
+            store=store,
+            kernels=kernels,
+        )
+        self.window_sizes = sorted(set(window_sizes))
+
+    def _create_manager(self, symbol: str) -> RollupWindowManager:
+        return RollupWindowManager(
+            symbol=symbol,
+            window_sizes=self.window_sizes,
+            watermark_delay=self.watermark_delay,
+            aggregator=self._aggregator,
+        )
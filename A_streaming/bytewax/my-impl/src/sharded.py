@@ -0,0 +1,361 @@
+"""심볼 샤딩 멀티 프로세스 실행기: ShardedCandleGenerator
+
+심볼을 해시로 worker 프로세스에 나눠 CPU 코어 여러 개를 사용한다.
+각 worker는 자기 심볼들의 WindowManager를 소유하는 CandleGenerator를 돌린다.
+
+    parent ──(shared memory slot ring)──▶ worker 0: CandleGenerator
+           ──(shared memory slot ring)──▶ worker 1: CandleGenerator
+           ◀────────(result pipe)──────── candles / late data
+
+- 거래는 고정 폭 레코드로 shared memory slot에 배치 단위로 기록한다
+  (Trade 객체를 pickle 하지 않음). 명령 pipe로는 slot 번호만 보낸다.
+- slot은 세마포어로 관리하는 ring이다. worker가 다 읽은 slot만 재사용한다.
+- 한 심볼은 항상 같은 worker에서 처리되므로 심볼별 캔들 순서가 유지된다.
+- worker에서 예외가 나면 ("error", repr, ...)를 보내고 종료한다. parent는 결과를 기다리는
+  동안 worker 생존을 확인하므로, 예외나 비정상 종료 모두 다음 호출에서 RuntimeError가 된다.
+"""
+
+import multiprocessing as mp
+import struct
+import zlib
+from datetime import datetime, timedelta
+from multiprocessing import shared_memory
+from typing import Callable, Optional
+
+from .candle import Candle, LateData, Trade
+from .candle_generator import CandleGenerator
+from .window import to_epoch_ns
+
+# 거래 레코드: symbol_id(u32), price(f64), quantity(f64), ts_ns(i64)
+TRADE_RECORD = struct.Struct("<Iddq")
+
+
+def shard_for(symbol: str, num_shards: int) -> int:
+    """심볼 → shard 번호 (프로세스와 무관하게 고정된 해시)"""
+    return zlib.crc32(symbol.encode()) % num_shards
+
+
+def _worker_main(
+    conn,
+    shm_name: str,
+    slot_bytes: int,
+    free_slots,
+    window_size: timedelta,
+    watermark_delay: timedelta,
+) -> None:
+    """worker 프로세스 메인 루프
+
+    명령:
+        ("batch", slot, nbytes, new_symbols) → slot의 거래 처리
+        ("advance", ts_ns)                   → 수동 watermark 진행
+        ("flush",)                           → 모든 윈도우 flush 후 ("flushed", ...) 응답
+        ("stop",)                            → 종료
+
+    처리 중 예외가 나면 ("error", repr(exc), []) 를 보내고 종료한다.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    candles: list[Candle] = []
+    late: list[LateData] = []
+    generator = CandleGenerator(
+        window_size=window_size,
+        watermark_delay=watermark_delay,
+        on_candle=candles.append,
+        on_late=late.append,
+    )
+    symbols: dict[int, str] = {}
+    process_values = generator.process_values
+
+    try:
+        while True:
+            command = conn.recv()
+            kind = command[0]
+
+            if kind == "batch":
+                _, slot, nbytes, new_symbols = command
+                symbols.update(new_symbols)
+                offset = slot * slot_bytes
+                view = shm.buf[offset : offset + nbytes]
+                try:
+                    for sid, price, quantity, ts_ns in TRADE_RECORD.iter_unpack(view):
+                        process_values(symbols[sid], price, quantity, ts_ns)
+                finally:
+                    view.release()
+                free_slots.release()
+            elif kind == "advance":
+                generator.advance_watermark_ns(command[1])
+            elif kind == "flush":
+                generator.flush()
+            elif kind == "stop":
+                break
+
+            if candles or late or kind == "flush":
+                conn.send(("flushed" if kind == "flush" else "out", candles, late))
+                candles.clear()
+                late.clear()
+    except Exception as exc:
+        try:
+            conn.send(("error", repr(exc), []))
+        except OSError:
+            pass
+    finally:
+        shm.close()
+        conn.close()
+
+
+class _Shard:
+    """worker 프로세스 하나와 그 shared memory slot ring"""
+
+    def __init__(
+        self,
+        ctx,
+        num_slots: int,
+        slot_bytes: int,
+        window_size: timedelta,
+        watermark_delay: timedelta,
+    ):
+        self.num_slots = num_slots
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=num_slots * slot_bytes)
+        self.free_slots = ctx.Semaphore(num_slots)
+        self.next_slot = 0
+
+        # 아직 보내지 않은 배치 (slot에 쓰기 전 버퍼)
+        self.buffer = bytearray(slot_bytes)
+        self.nbytes = 0
+        self.known_symbols: set[int] = set()
+        self.new_symbols: list[tuple[int, str]] = []
+
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                self.shm.name,
+                slot_bytes,
+                self.free_slots,
+                window_size,
+                watermark_delay,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+
+class ShardedCandleGenerator:
+    """심볼 샤딩 멀티 프로세스 캔들 생성기
+
+    사용 예시:
+        with ShardedCandleGenerator(
+            num_workers=4,
+            window_size=timedelta(minutes=1),
+            on_candle=lambda candle: print(candle),
+        ) as generator:
+            for trade in trades:
+                generator.process(trade)
+            generator.flush()
+
+    on_candle / on_candles / on_late는 parent 프로세스에서 호출된다.
+    on_candles는 worker 결과 메시지 하나의 캔들 묶음을 받는다.
+    심볼별 캔들은 순서대로 전달되지만, 심볼 간 순서는 보장하지 않는다.
+    결과는 배치를 보낼 때와 flush() 때 수거한다.
+
+    Attributes:
+        num_workers: worker 프로세스 수
+        batch_size: 한 번에 보내는 거래 수 (slot 크기)
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 4,
+        window_size: timedelta = timedelta(minutes=1),
+        watermark_delay: timedelta = timedelta(seconds=5),
+        on_candle: Optional[Callable[[Candle], None]] = None,
+        on_late: Optional[Callable[[LateData], None]] = None,
+        batch_size: int = 4096,
+        slots_per_worker: int = 8,
+        on_candles: Optional[Callable[[list[Candle]], None]] = None,
+    ):
+        if num_workers < 1:
+            raise ValueError("num_workers must be >= 1")
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.window_size = window_size
+        self.watermark_delay = watermark_delay
+        self.on_candle = on_candle or (lambda c: None)
+        self.on_candles = on_candles
+        self.on_late = on_late
+
+        self._symbol_ids: dict[str, int] = {}
+        self._symbol_shards: list[_Shard] = []
+
+        ctx = mp.get_context()
+        slot_bytes = batch_size * TRADE_RECORD.size
+        self._shards = [
+            _Shard(ctx, slots_per_worker, slot_bytes, window_size, watermark_delay)
+            for _ in range(num_workers)
+        ]
+        self._closed = False
+
+    def __enter__(self) -> "ShardedCandleGenerator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def process(self, trade: Trade) -> None:
+        """Trade 처리 (shard 버퍼에 추가, 배치가 차면 전송)"""
+        self.process_values(
+            trade.symbol, trade.price, trade.quantity, to_epoch_ns(trade.timestamp)
+        )
+
+    def process_values(
+        self, symbol: str, price: float, quantity: float, ts_ns: int
+    ) -> None:
+        """값으로 Trade 처리 (시간은 epoch ns)"""
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = self._register(symbol)
+        shard = self._symbol_shards[sid]
+
+        if sid not in shard.known_symbols:
+            shard.known_symbols.add(sid)
+            shard.new_symbols.append((sid, symbol))
+
+        TRADE_RECORD.pack_into(shard.buffer, shard.nbytes, sid, price, quantity, ts_ns)
+        shard.nbytes += TRADE_RECORD.size
+        if shard.nbytes == shard.slot_bytes:
+            self._send_batch(shard)
+
+    def advance_watermark(self, timestamp: datetime) -> None:
+        """수동 watermark 진행 (모든 shard)"""
+        ts_ns = to_epoch_ns(timestamp)
+        for shard in self._shards:
+            self._send_batch(shard)
+            self._send(shard, ("advance", ts_ns))
+        self.poll()
+
+    def flush(self) -> None:
+        """모든 shard의 버퍼를 보내고 열린 윈도우를 flush
+
+        모든 worker가 처리를 마칠 때까지 기다리며,
+        반환 시점에는 모든 캔들이 on_candle / on_candles로 전달되어 있다
+        (on_candles에 flush()가 있으면 호출한다).
+        """
+        for shard in self._shards:
+            self._send_batch(shard)
+            self._send(shard, ("flush",))
+        for shard in self._shards:
+            while True:
+                self._wait(shard)
+                if not self._receive(shard):
+                    break
+        flush = getattr(self.on_candles, "flush", None)
+        if flush is not None:
+            flush()
+
+    def poll(self) -> None:
+        """도착한 결과를 기다리지 않고 전달"""
+        for shard in self._shards:
+            while shard.conn.poll():
+                self._receive(shard)
+
+    def close(self) -> None:
+        """worker 종료 및 shared memory 해제 (남은 윈도우는 flush하지 않음)"""
+        if self._closed:
+            return
+        self._closed = True
+        for shard in self._shards:
+            try:
+                shard.conn.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+        for shard in self._shards:
+            shard.process.join(timeout=5)
+            if shard.process.is_alive():
+                shard.process.terminate()
+            shard.conn.close()
+            shard.shm.close()
+            shard.shm.unlink()
+
+    def _register(self, symbol: str) -> int:
+        """새 심볼에 id와 shard 배정"""
+        sid = len(self._symbol_ids)
+        self._symbol_ids[symbol] = sid
+        self._symbol_shards.append(self._shards[shard_for(symbol, self.num_workers)])
+        return sid
+
+    def _send_batch(self, shard: _Shard) -> None:
+        """버퍼를 빈 slot에 복사하고 worker에 알림"""
+        if shard.nbytes == 0:
+            return
+
+        # 빈 slot을 기다리는 동안 결과를 수거해 worker가 막히지 않게 함
+        while not shard.free_slots.acquire(timeout=0.01):
+            while shard.conn.poll():
+                self._receive(shard)
+            self._check_alive(shard)
+
+        slot = shard.next_slot
+        shard.next_slot = (slot + 1) % shard.num_slots
+        offset = slot * shard.slot_bytes
+        shard.shm.buf[offset : offset + shard.nbytes] = shard.buffer[: shard.nbytes]
+        self._send(shard, ("batch", slot, shard.nbytes, shard.new_symbols))
+
+        shard.nbytes = 0
+        shard.new_symbols = []
+
+        while shard.conn.poll():
+            self._receive(shard)
+
+    def _send(self, shard: _Shard, command: tuple) -> None:
+        """worker에 명령 전송 (worker가 죽었으면 RuntimeError)"""
+        try:
+            shard.conn.send(command)
+        except (BrokenPipeError, OSError):
+            self._raise_dead(shard)
+
+    def _wait(self, shard: _Shard) -> None:
+        """결과 메시지가 올 때까지 대기 (worker가 메시지 없이 죽으면 RuntimeError)"""
+        while not shard.conn.poll(0.01):
+            self._check_alive(shard)
+
+    def _check_alive(self, shard: _Shard) -> None:
+        if not shard.process.is_alive():
+            self._raise_dead(shard)
+
+    def _raise_dead(self, shard: _Shard) -> None:
+        """죽은 worker의 남은 결과 / 오류 메시지를 받고 RuntimeError"""
+        while shard.conn.poll():
+            self._receive(shard)
+        self._raise_exited(shard)
+
+    def _raise_exited(self, shard: _Shard) -> None:
+        raise RuntimeError(
+            f"shard worker exited unexpectedly (exit code {shard.process.exitcode})"
+        )
+
+    def _receive(self, shard: _Shard) -> bool:
+        """결과 메시지 하나를 받아 콜백 호출
+
+        Returns:
+            flush 응답이 아니면 True (계속 받아야 함)
+
+        Raises:
+            RuntimeError: worker에서 예외가 난 경우
+        """
+        try:
+            message = shard.conn.recv()
+        except EOFError:
+            self._raise_exited(shard)
+        if message[0] == "error":
+            raise RuntimeError(f"shard worker failed: {message[1]}")
+        kind, candles, late = message
+        if self.on_late:
+            for item in late:
+                self.on_late(item)
+        for candle in candles:
+            self.on_candle(candle)
+        if candles and self.on_candles is not None:
+            self.on_candles(candles)
+        return kind != "flushed"
@@ -0,0 +1,122 @@
+"""캔들 묶음 sink: BufferedCandleSink
+
+CandleGenerator(on_candles=...)는 한 번에 닫힌 캔들을 리스트로 넘긴다
+(거래 하나, watermark 진행 한 번, process_batch 한 번, flush 한 번 단위).
+BufferedCandleSink는 이 묶음들을 다시 모아 다음 중 하나를 만족하면 write()를 한 번 호출한다.
+
+- max_count: 버퍼된 캔들 수
+- max_bytes: 버퍼된 캔들의 추정 크기 합 (size_of로 계산)
+- max_delay: 버퍼의 첫 캔들 이후 경과 시간 (monotonic 시계)
+
+경과 시간은 캔들이 들어올 때와 poll()에서만 검사한다 (백그라운드 스레드 없음).
+입력이 끊겨도 제때 내보내려면 주기적으로 poll()을 호출한다.
+CandleGenerator.flush()는 sink.flush()를 호출하므로 종료 시 남은 캔들이 모두 write된다.
+
+    sink = BufferedCandleSink(db.insert_many, max_count=5000, max_delay=timedelta(seconds=1))
+    generator = CandleGenerator(on_candles=sink)
+"""
+
+from datetime import timedelta
+from time import monotonic
+from typing import Callable, Optional
+
+from .candle import Candle
+
+# CandleBatch 한 행 (76 bytes) + 심볼 문자열
+CANDLE_RECORD_BYTES = 76
+
+
+def estimate_candle_bytes(candle: Candle) -> int:
+    """캔들 하나의 추정 크기 (고정 폭 레코드 + 심볼 길이)"""
+    return CANDLE_RECORD_BYTES + len(candle.symbol)
+
+
+class BufferedCandleSink:
+    """캔들을 모아 묶음으로 내보내는 sink
+
+    on_candles 콜백으로 사용한다 (sink(candles)). 캔들 하나씩 넣을 때는 append().
+
+    Attributes:
+        write: 묶음 쓰기 함수 (캔들 리스트를 받음)
+        max_count: 이 수 이상 모이면 write (None이면 제한 없음)
+        max_bytes: 추정 크기 합이 이 값 이상이면 write (None이면 제한 없음)
+        max_delay: 첫 캔들 이후 이 시간이 지나면 write (None이면 제한 없음)
+        size_of: 캔들 추정 크기 함수 (max_bytes가 있을 때만 사용)
+        pending: 버퍼된 캔들
+        pending_bytes: 버퍼된 캔들의 추정 크기 합
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[Candle]], None],
+        max_count: Optional[int] = 1000,
+        max_bytes: Optional[int] = None,
+        max_delay: Optional[timedelta] = None,
+        size_of: Callable[[Candle], int] = estimate_candle_bytes,
+        clock: Callable[[], float] = monotonic,
+    ):
+        if max_count is not None and max_count < 1:
+            raise ValueError("max_count must be >= 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        if max_delay is not None and max_delay < timedelta(0):
+            raise ValueError("max_delay must not be negative")
+        self.write = write
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.size_of = size_of
+        self._clock = clock
+        self._max_delay_s = None if max_delay is None else max_delay.total_seconds()
+
+        self.pending: list[Candle] = []
+        self.pending_bytes = 0
+        # 버퍼가 비어 있지 않을 때 첫 캔들이 들어온 시각
+        self._first_at = 0.0
+
+    def __call__(self, candles: list[Candle]) -> None:
+        """캔들 묶음 추가 (on_candles 콜백)"""
+        if not candles:
+            return
+        if not self.pending and self._max_delay_s is not None:
+            self._first_at = self._clock()
+        self.pending.extend(candles)
+        if self.max_bytes is not None:
+            size_of = self.size_of
+            self.pending_bytes += sum(size_of(candle) for candle in candles)
+        if self._due():
+            self.flush()
+
+    def append(self, candle: Candle) -> None:
+        """캔들 하나 추가 (on_candle 콜백)"""
+        self([candle])
+
+    def poll(self) -> bool:
+        """max_delay가 지났으면 write
+
+        Returns:
+            write했으면 True
+        """
+        if self.pending and self._due():
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """버퍼된 캔들을 모두 write (비어 있으면 아무것도 하지 않음)"""
+        if not self.pending:
+            return
+        candles = self.pending
+        self.pending = []
+        self.pending_bytes = 0
+        self.write(candles)
+
+    def _due(self) -> bool:
+        if self.max_count is not None and len(self.pending) >= self.max_count:
+            return True
+        if self.max_bytes is not None and self.pending_bytes >= self.max_bytes:
+            return True
+        return (
+            self._max_delay_s is not None
+            and self._clock() - self._first_at >= self._max_delay_s
+        )
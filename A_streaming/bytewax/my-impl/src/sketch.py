@@ -0,0 +1,120 @@
+"""분위수 스케치: QuantileSketch
+
+윈도우마다 거래를 모두 보관하지 않고 가격 / 수량 분위수를 근사하는 고정 크기 요약.
+로그 버킷 방식 (DDSketch)이다: 양수 값 x는 키 ceil(log_γ x) 버킷의 개수만 센다.
+γ = (1 + α) / (1 - α)이므로 버킷 대표값은 버킷 안의 모든 값과 상대 오차 α 이내다.
+
+- 메모리: 버킷 수가 max_bins를 넘으면 가장 작은 버킷부터 합친다 (작은 값 쪽 정확도만 잃음)
+- 병합: 같은 키의 개수를 더하면 되므로 순서와 무관하게 정확하다
+  (롤업 / allowed_lateness 수정 / 윈도우 병합에 그대로 사용)
+- 0 이하 값은 별도 개수로 센다 (가격 / 수량은 양수)
+- 값 하나 추가는 키 계산과 dict 갱신뿐이다 (개수 / 최솟값 / 최댓값은 따로 세지 않음).
+  집계 커널은 이 갱신을 CandleAggregator.add()에 직접 생성해 넣는다 (src.kernels)
+
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for price in prices:
+        sketch.add(price)
+    sketch.quantiles((0.05, 0.5, 0.95))
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from math import ceil, log
+from typing import Optional, Sequence
+
+
+class QuantileSketch:
+    """상대 오차가 보장되는 병합 가능한 분위수 스케치
+
+    Attributes:
+        relative_accuracy: 분위수 추정값의 상대 오차 한도 α (가장 작은 버킷이 합쳐지기 전까지)
+        max_bins: 최대 버킷 수 (메모리 한도)
+        bins: 버킷 키 → 개수 (키 k 버킷은 γ^(k-1) < x <= γ^k)
+        zero_count: 0 이하 값 수
+        inv_log_gamma: 1 / ln γ (키 = ceil(ln x × inv_log_gamma))
+    """
+
+    __slots__ = ("relative_accuracy", "max_bins", "bins", "zero_count", "inv_log_gamma", "_gamma")
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 512):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_bins < 1:
+            raise ValueError("max_bins must be >= 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.inv_log_gamma = 1 / log(self._gamma)
+
+    @property
+    def count(self) -> int:
+        """전체 값 수"""
+        return self.zero_count + sum(self.bins.values())
+
+    def add(self, value: float) -> None:
+        """값 하나 추가"""
+        if value > 0:
+            bins = self.bins
+            key = ceil(log(value) * self.inv_log_gamma)
+            bins[key] = bins.get(key, 0) + 1
+            if len(bins) > self.max_bins:
+                self.collapse()
+        else:
+            self.zero_count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """다른 스케치 병합 (같은 relative_accuracy)"""
+        self._merge(other.zero_count, other.bins.items())
+
+    def state(self) -> tuple:
+        """(zero_count, ((키, 개수), ...)) 튜플 (merge_state()로 병합)"""
+        return (self.zero_count, tuple(self.bins.items()))
+
+    def merge_state(self, state: tuple) -> None:
+        """state() 튜플 병합"""
+        self._merge(*state)
+
+    def _merge(self, zero_count: int, items) -> None:
+        self.zero_count += zero_count
+        bins = self.bins
+        for key, n in items:
+            bins[key] = bins.get(key, 0) + n
+        if len(bins) > self.max_bins:
+            self.collapse()
+
+    def collapse(self) -> None:
+        """가장 작은 버킷들을 합쳐 버킷 수를 max_bins로 줄임"""
+        bins = self.bins
+        keys = sorted(bins)[: len(bins) - self.max_bins + 1]
+        bins[keys[-1]] += sum(bins.pop(key) for key in keys[:-1])
+
+    def quantiles(self, qs: Sequence[float]) -> list[Optional[float]]:
+        """분위수 추정값 (값이 없으면 None)
+
+        Args:
+            qs: 0 ~ 1 분위
+
+        Returns:
+            qs 순서의 추정값 (값이 속한 버킷의 대표값, 0 이하 값이면 0.0)
+        """
+        keys = sorted(self.bins)
+        cumulative = list(accumulate(self.bins[key] for key in keys))
+        count = self.zero_count + (cumulative[-1] if cumulative else 0)
+        if not count:
+            return [None] * len(qs)
+        gamma = self._gamma
+        result: list[Optional[float]] = []
+        for q in qs:
+            rank = q * (count - 1) - self.zero_count
+            if rank < 0:
+                result.append(0.0)
+            else:
+                index = min(bisect_right(cumulative, rank), len(keys) - 1)
+                result.append(2 * gamma ** keys[index] / (gamma + 1))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수 추정값 (값이 없으면 None)"""
+        return self.quantiles((q,))[0]
@@ -0,0 +1,329 @@
+"""Sliding(Hopping) 윈도우 캔들: TwoStackAggregator, SlidingWindowManager, SlidingCandleGenerator
+
+예: 5분 캔들을 10초마다 emit
+
+겹치는 윈도우마다 거래를 다시 집계하면 비용이 (윈도우 / hop)배가 된다.
+대신 거래는 hop 크기 pane(tumbling 윈도우)에 한 번만 집계하고,
+윈도우는 닫힌 pane 집계를 two-stack 큐로 합쳐 만든다.
+
+    pane:    [p0][p1][p2][p3][p4] ...      ← 거래는 pane 하나에만 반영
+    window0: [p0  p1  p2]
+    window1:     [p1  p2  p3]              ← 닫힌 pane을 push/evict
+    window2:         [p2  p3  p4]
+
+high/low는 빼기(역연산)가 안 되므로, 큐에서 pane을 제거해도
+상각 O(1)로 전체 집계를 유지하는 two-stack 방식을 사용한다.
+"""
+
+from collections import deque
+from datetime import datetime, timedelta, tzinfo
+from typing import Callable, Optional
+
+from .candle import Candle, LateData, Trade
+from .candle_generator import (
+    CandleAggregator,
+    CandleGenerator,
+    WindowManager,
+    format_interval,
+)
+from .metrics import GeneratorMetrics
+from .window import WINDOW_END_OFFSET_NS, SlidingWindow, to_epoch_ns
+
+
+class TwoStackAggregator:
+    """FIFO 큐 전체의 CandleAggregator 병합 결과를 상각 O(1)로 유지
+
+    - back: 새로 push된 pane들 (+ 전체 병합값 back_agg)
+    - front: pop 대상 pane들, 각 원소는 자신~front 바닥까지의 병합값을 가짐
+    - front가 비면 back을 뒤집어 옮기면서 누적 병합값을 다시 계산
+
+    Attributes:
+        front: (pane 인덱스, 누적 병합값) 스택, 맨 위가 가장 오래된 pane
+        back: (pane 인덱스, pane 집계) 리스트, 마지막이 가장 최근 pane
+    """
+
+    def __init__(self) -> None:
+        self.front: list[tuple[int, CandleAggregator]] = []
+        self.back: list[tuple[int, CandleAggregator]] = []
+        self._back_agg: Optional[CandleAggregator] = None
+        self._tz: Optional[tzinfo] = None
+
+    def __len__(self) -> int:
+        return len(self.front) + len(self.back)
+
+    def oldest(self) -> int:
+        """가장 오래된 pane 인덱스"""
+        if self.front:
+            return self.front[-1][0]
+        return self.back[0][0]
+
+    def push(self, pane: int, aggregator: CandleAggregator) -> None:
+        """가장 최근 pane 추가"""
+        self.back.append((pane, aggregator))
+        self._tz = aggregator.tz
+        if self._back_agg is None:
+            self._back_agg = aggregator.copy()
+        else:
+            self._back_agg.merge(aggregator)
+
+    def pop(self) -> None:
+        """가장 오래된 pane 제거"""
+        if not self.front:
+            running: Optional[CandleAggregator] = None
+            for pane, aggregator in reversed(self.back):
+                if running is None:
+                    running = aggregator.copy()
+                else:
+                    running = _combine(aggregator, running)
+                self.front.append((pane, running))
+            self.back.clear()
+            self._back_agg = None
+        self.front.pop()
+
+    def query(self, start_ns: int, end_ns: int) -> CandleAggregator:
+        """큐 전체의 병합 결과를 주어진 윈도우 경계로 생성
+
+        timezone은 가장 최근에 push된 pane을 따른다.
+        """
+        result = CandleAggregator.from_ns(start_ns, end_ns, self._tz)
+        if self.front:
+            result.merge(self.front[-1][1])
+        if self._back_agg is not None:
+            result.merge(self._back_agg)
+        return result
+
+
+def _combine(older: CandleAggregator, newer: CandleAggregator) -> CandleAggregator:
+    """두 집계의 병합 결과 (입력은 변경하지 않음)"""
+    combined = older.copy()
+    combined.merge(newer)
+    return combined
+
+
+class SlidingWindowManager:
+    """심볼별 Sliding 윈도우 관리
+
+    거래는 hop 크기 pane(WindowManager)에 집계하고, pane이 닫히면
+    two-stack 큐로 겹치는 윈도우의 캔들을 만든다.
+    윈도우 k(시작 = k * hop)는 마지막 pane k + n - 1 이 닫힐 때 닫힌다.
+    거래가 하나도 없는 윈도우는 emit하지 않는다.
+
+    WindowManager와 같은 인터페이스(add, late_data, advance_watermark_ns, flush)를
+    제공하므로 CandleGenerator가 그대로 사용할 수 있다.
+
+    Attributes:
+        symbol: 관리하는 심볼
+        window_size: 윈도우 크기
+        hop: 윈도우 시작 간격
+        panes: hop 크기 pane 관리 (watermark, Late 판별 포함)
+        panes_per_window: 윈도우 하나의 pane 수
+        interval: 캔들 interval 문자열 (예: "5m@10s")
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        window_size: timedelta,
+        hop: timedelta,
+        watermark_delay: timedelta,
+    ):
+        self.symbol = symbol
+        self.window_size = window_size
+        self.hop = hop
+        self.panes_per_window = SlidingWindow.panes_per_window(window_size, hop)
+        self.panes = WindowManager(symbol, hop, watermark_delay)
+        self.interval = f"{format_interval(window_size)}@{format_interval(hop)}"
+
+        self._queue = TwoStackAggregator()
+        # 닫혔지만 아직 윈도우 범위에 들어오지 않은 pane
+        self._pending: deque[tuple[int, CandleAggregator]] = deque()
+        # 다음에 emit할 윈도우 인덱스
+        self._next_window: Optional[int] = None
+        # 지금까지 닫힌 마지막 pane 인덱스
+        self._last_pane: Optional[int] = None
+
+    @property
+    def watermark_ns(self) -> Optional[int]:
+        """현재 Watermark (epoch ns)"""
+        return self.panes.watermark_ns
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """현재 Watermark (datetime, UTC)"""
+        return self.panes.watermark
+
+    @property
+    def last_trade_ns(self) -> int:
+        """받은 거래의 최대 이벤트 시간 (epoch ns, 심볼 제거 기준)"""
+        return self.panes.last_trade_ns
+
+    def add(
+        self,
+        price: float,
+        quantity: float,
+        ts_ns: int,
+        tz: Optional[tzinfo] = None,
+        is_buyer_maker: Optional[bool] = None,
+        trade_id: Optional[int] = None,
+    ) -> bool:
+        """거래 추가 (pane 하나에만 집계)"""
+        return self.panes.add(price, quantity, ts_ns, tz, is_buyer_maker, trade_id)
+
+    def add_trade(self, trade: Trade) -> Optional[LateData]:
+        """거래 추가"""
+        return self.panes.add_trade(trade)
+
+    def get_window(self, bucket: int) -> Optional[CandleAggregator]:
+        """pane 버킷의 열린 윈도우 (없으면 None)"""
+        return self.panes.get_window(bucket)
+
+    def get_or_create_window(
+        self, bucket: int, tz: Optional[tzinfo] = None
+    ) -> CandleAggregator:
+        """pane 버킷의 CandleAggregator 조회/생성"""
+        return self.panes.get_or_create_window(bucket, tz)
+
+    def late_data(self, trade: Trade) -> LateData:
+        """Late 거래의 LateData 생성 (거래가 속했던 pane 기준)"""
+        return self.panes.late_data(trade)
+
+    def open_window_count(self) -> int:
+        """열린 pane 수 (닫혔지만 아직 윈도우 emit에 쓰이는 pane 포함)"""
+        return len(self.panes.windows) + len(self._queue) + len(self._pending)
+
+    def advance_watermark(self, timestamp: datetime) -> list[Candle]:
+        """Watermark 진행 및 닫힌 윈도우의 캔들 반환"""
+        return self.advance_watermark_ns(to_epoch_ns(timestamp))
+
+    def advance_watermark_ns(self, ts_ns: int) -> list[Candle]:
+        """Watermark 진행 (epoch ns)
+
+        Returns:
+            닫힌 윈도우들의 캔들 리스트 (시간순 정렬)
+        """
+        closed = self.panes.close_windows_ns(ts_ns)
+        if self._last_pane is None and not closed:
+            return []
+
+        # 닫힌 pane 인덱스 상한: pane < limit 이면 닫힘
+        # 윈도우 k는 마지막 pane k + n - 1 이 닫히면 닫힌다
+        hop_ns = self.panes.window_size_ns
+        limit = (self.panes.watermark_ns + WINDOW_END_OFFSET_NS - 1) // hop_ns
+        last_window = limit - self.panes_per_window
+        if not closed and self._next_window > last_window:
+            return []
+        return self._emit(closed, last_window)
+
+    def flush(self) -> list[Candle]:
+        """모든 열린 pane을 닫고 남은 데이터가 포함된 윈도우를 모두 emit"""
+        closed = self.panes.drain()
+        if self._last_pane is None and not closed:
+            return []
+
+        hop_ns = self.panes.window_size_ns
+        last_pane = closed[-1].start_ns // hop_ns if closed else self._last_pane
+        candles = self._emit(closed, last_window=last_pane)
+
+        self._queue = TwoStackAggregator()
+        self._pending.clear()
+        self._next_window = None
+        self._last_pane = None
+        return candles
+
+    def _emit(self, closed: list[CandleAggregator], last_window: int) -> list[Candle]:
+        """닫힌 pane을 큐에 반영하고 윈도우 last_window까지 캔들 생성
+
+        Args:
+            closed: 새로 닫힌 pane 집계 (시간순)
+            last_window: emit 가능한 마지막 윈도우 인덱스
+        """
+        hop_ns = self.panes.window_size_ns
+        n = self.panes_per_window
+        pending = self._pending
+        queue = self._queue
+        for aggregator in closed:
+            pending.append((aggregator.start_ns // hop_ns, aggregator))
+        if closed:
+            self._last_pane = pending[-1][0]
+
+        k = self._next_window
+        if k is None:
+            k = pending[0][0] - n + 1
+
+        candles: list[Candle] = []
+        while k <= last_window:
+            # 윈도우 k 범위 [k, k + n - 1] 에 들어온 pane push
+            while pending and pending[0][0] <= k + n - 1:
+                pane, aggregator = pending.popleft()
+                queue.push(pane, aggregator)
+            # 범위를 벗어난 pane 제거
+            while len(queue) and queue.oldest() < k:
+                queue.pop()
+
+            if not len(queue):
+                if not pending:
+                    k = last_window + 1
+                    break
+                # 빈 윈도우 구간 건너뛰기
+                k = max(k + 1, pending[0][0] - n + 1)
+                continue
+
+            start_ns = k * hop_ns
+            candles.append(
+                queue.query(
+                    start_ns, start_ns + n * hop_ns - WINDOW_END_OFFSET_NS
+                ).to_candle(self.symbol, self.interval)
+            )
+            k += 1
+
+        self._next_window = k
+        return candles
+
+
+class SlidingCandleGenerator(CandleGenerator):
+    """Sliding(Hopping) 윈도우 캔들 생성기
+
+    사용 예시:
+        # 5분 캔들을 10초마다 emit
+        generator = SlidingCandleGenerator(
+            window_size=timedelta(minutes=5),
+            hop=timedelta(seconds=10),
+            on_candle=lambda candle: print(candle),
+        )
+
+    거래별 비용은 hop 크기 tumbling 윈도우 하나를 집계하는 것과 같으며
+    윈도우/hop 비율과 무관하다.
+
+    Attributes:
+        sliding_window_size: 윈도우 크기
+        hop: 윈도우 시작 간격
+        window_size: pane 크기 (= hop)
+    """
+
+    def __init__(
+        self,
+        window_size: timedelta = timedelta(minutes=5),
+        hop: timedelta = timedelta(minutes=1),
+        watermark_delay: timedelta = timedelta(seconds=5),
+        on_candle: Optional[Callable[[Candle], None]] = None,
+        on_late: Optional[Callable[[LateData], None]] = None,
+        metrics: Optional[GeneratorMetrics] = None,
+    ):
+        SlidingWindow.panes_per_window(window_size, hop)
+        super().__init__(
+            window_size=hop,
+            watermark_delay=watermark_delay,
+            on_candle=on_candle,
+            on_late=on_late,
+            metrics=metrics,
+        )
+        self.sliding_window_size = window_size
+        self.hop = hop
+
+    def _create_manager(self, symbol: str) -> SlidingWindowManager:
+        return SlidingWindowManager(
+            symbol=symbol,
+            window_size=self.sliding_window_size,
+            hop=self.hop,
+            watermark_delay=self.watermark_delay,
+        )
@@ -0,0 +1,349 @@
+"""최근 캔들 저장소: CandleStore, CandleView
+
+CandleGenerator(store=CandleStore(...))로 켠다.
+(symbol, interval)마다 고정 용량 링 버퍼 하나에 emit된 캔들을 typed array 컬럼으로 보관한다.
+
+- append: O(1). 링 버퍼는 용량의 두 배 길이 배열에 같은 값을 두 번 (i, i + capacity) 써서
+  보관 중인 구간이 항상 배열에서 연속이 되게 한다
+- last(n) / range(start, end): 연속 구간의 memoryview 슬라이스를 돌려준다 (복사 없음).
+  range는 open_time 이분 탐색이므로 O(log n)
+- current(): 아직 열린 윈도우의 부분 캔들 (생성기의 윈도우 상태에서 바로 계산)
+- allowed_lateness로 수정된 캔들 (on_update)은 같은 open_time 행을 덮어쓴다
+- 집계 커널 필드 (vwap, 분위수 등)는 그런 캔들이 처음 들어올 때 링마다 컬럼을 만든다.
+  float 필드는 None을 NaN으로 둔 float64 컬럼 (memoryview), 분위수 dict는 list 컬럼
+  (뷰를 만들 때 구간을 복사)이다
+
+뷰는 링 버퍼를 직접 가리키므로 capacity개 이상의 캔들이 더 들어오면 내용이 바뀐다.
+오래 보관하려면 list(view) 또는 np.array(view.closes)처럼 복사한다.
+
+    store = CandleStore(capacity=1440)
+    generator = CandleGenerator(store=store)
+    ...
+    view = store.last("BTCUSDT", "1m", 100)
+    closes = np.frombuffer(view.closes)       # 복사 없이 NumPy 배열
+    live = store.current("BTCUSDT", "1m")      # 진행 중인 캔들
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone, tzinfo
+from math import isnan, nan
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+from .candle import KERNEL_FIELDS, QUANTILE_FIELDS, Candle, has_kernel_fields
+from .window import WINDOW_END_OFFSET_NS, to_epoch_ns, window_time
+
+if TYPE_CHECKING:
+    from .candle_generator import CandleAggregator, CandleGenerator
+
+# (타입 코드, 컬럼 이름) - CandleView 속성 순서
+COLUMNS = (
+    ("q", "open_times"),
+    ("d", "opens"),
+    ("d", "highs"),
+    ("d", "lows"),
+    ("d", "closes"),
+    ("d", "volumes"),
+    ("q", "trade_counts"),
+)
+
+
+class CandleView:
+    """링 버퍼 구간의 컬럼 뷰 (memoryview, 복사 없음)
+
+    Attributes:
+        symbol: 심볼
+        interval: interval 문자열
+        open_times: 캔들 시작 epoch ns 컬럼 (int64)
+        opens / highs / lows / closes / volumes: OHLCV 컬럼 (float64)
+        trade_counts: 거래 수 컬럼 (int64)
+        kernel_columns: 집계 커널 필드 이름 → 컬럼 (float64 memoryview는 None이 NaN,
+            분위수는 dict list). 커널 필드가 있는 캔들이 없었으면 비어 있음
+    """
+
+    __slots__ = ("symbol", "interval", "_tz", "_close_offset_ns", "kernel_columns") + tuple(
+        name for _, name in COLUMNS
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        interval: str,
+        tz: tzinfo,
+        close_offset_ns: int,
+        columns: Iterable[memoryview],
+        kernel_columns: Optional[dict[str, Union[memoryview, list]]] = None,
+    ):
+        self.symbol = symbol
+        self.interval = interval
+        self._tz = tz
+        self._close_offset_ns = close_offset_ns
+        self.kernel_columns = kernel_columns or {}
+        for (_, name), column in zip(COLUMNS, columns):
+            setattr(self, name, column)
+
+    def __len__(self) -> int:
+        return len(self.open_times)
+
+    def __getitem__(self, index: int) -> Candle:
+        """index번째 Candle (새 Candle 객체)"""
+        open_ns = self.open_times[index]
+        candle = Candle(
+            symbol=self.symbol,
+            interval=self.interval,
+            open_time=window_time(open_ns, self._tz),
+            close_time=window_time(open_ns + self._close_offset_ns, self._tz),
+            open=self.opens[index],
+            high=self.highs[index],
+            low=self.lows[index],
+            close=self.closes[index],
+            volume=self.volumes[index],
+            trade_count=self.trade_counts[index],
+        )
+        for name, column in self.kernel_columns.items():
+            value = column[index]
+            if value is not None and (name in QUANTILE_FIELDS or not isnan(value)):
+                setattr(candle, name, value)
+        return candle
+
+    def __iter__(self) -> Iterator[Candle]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class CandleRing:
+    """(symbol, interval) 하나의 고정 용량 링 버퍼
+
+    open_time 오름차순으로 보관한다. 마지막 캔들보다 이르거나 같은 open_time의 캔들은
+    같은 행이 있으면 덮어쓰고, 없으면 (이미 밀려난 시간) 무시한다.
+
+    Attributes:
+        symbol: 심볼
+        interval: interval 문자열
+        capacity: 최대 보관 캔들 수
+        tz: 캔들 시간의 timezone (마지막 캔들 기준)
+    """
+
+    def __init__(self, symbol: str, interval: str, capacity: int):
+        self.symbol = symbol
+        self.interval = interval
+        self.capacity = capacity
+        self.tz: tzinfo = timezone.utc
+        # 두 배 길이로 미리 할당 (크기가 바뀌지 않으므로 memoryview를 계속 쓸 수 있음)
+        self._columns = [array(code, bytes(8 * 2 * capacity)) for code, _ in COLUMNS]
+        self._views = [memoryview(column) for column in self._columns]
+        # 집계 커널 필드 컬럼 (커널 필드가 있는 캔들이 처음 들어올 때 만듦)
+        self._kernel_columns: dict[str, Union[array, list]] = {}
+        self._kernel_views: dict[str, Union[memoryview, list]] = {}
+        self._head = 0
+        self._size = 0
+        self._close_offset_ns = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, candle: Candle) -> None:
+        """캔들 추가 (O(1), 이미 지난 open_time이면 갱신)"""
+        open_ns = to_epoch_ns(candle.open_time)
+        if self._size and open_ns <= self._views[0][self._head + self.capacity - 1]:
+            self.update(candle)
+            return
+        if not self._size:
+            self._close_offset_ns = to_epoch_ns(candle.close_time) - open_ns
+        self._write(self._head, open_ns, candle)
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def update(self, candle: Candle) -> bool:
+        """같은 open_time의 행을 덮어씀
+
+        Returns:
+            해당 행이 있어 갱신했으면 True
+        """
+        open_ns = to_epoch_ns(candle.open_time)
+        start, end = self._bounds()
+        index = bisect_left(self._views[0], open_ns, start, end)
+        if index == end or self._views[0][index] != open_ns:
+            return False
+        self._write(index % self.capacity, open_ns, candle)
+        return True
+
+    def last(self, n: int) -> CandleView:
+        """최근 n개 (시간순)"""
+        start, end = self._bounds()
+        return self._view(max(start, end - max(n, 0)), end)
+
+    def range_ns(self, start_ns: int, end_ns: int) -> CandleView:
+        """open_time이 [start_ns, end_ns)인 캔들 (시간순, 이분 탐색)"""
+        start, end = self._bounds()
+        times = self._views[0]
+        lo = bisect_left(times, start_ns, start, end)
+        return self._view(lo, max(lo, bisect_left(times, end_ns, lo, end)))
+
+    def _bounds(self) -> tuple[int, int]:
+        """보관 중인 캔들의 배열 구간 [start, end)"""
+        end = self._head + self.capacity
+        return end - self._size, end
+
+    def _view(self, start: int, end: int) -> CandleView:
+        return CandleView(
+            self.symbol,
+            self.interval,
+            self.tz,
+            self._close_offset_ns,
+            (view[start:end] for view in self._views),
+            {name: view[start:end] for name, view in self._kernel_views.items()},
+        )
+
+    def _write(self, slot: int, open_ns: int, candle: Candle) -> None:
+        self.tz = candle.open_time.tzinfo or timezone.utc
+        values = (
+            open_ns,
+            candle.open,
+            candle.high,
+            candle.low,
+            candle.close,
+            candle.volume,
+            candle.trade_count,
+        )
+        mirror = slot + self.capacity
+        for column, value in zip(self._columns, values):
+            column[slot] = value
+            column[mirror] = value
+        if self._kernel_columns or has_kernel_fields(candle):
+            self._write_kernel_fields(slot, mirror, candle)
+
+    def _write_kernel_fields(self, slot: int, mirror: int, candle: Candle) -> None:
+        columns = self._kernel_columns
+        if not columns:
+            size = 2 * self.capacity
+            for name in KERNEL_FIELDS:
+                if name in QUANTILE_FIELDS:
+                    columns[name] = self._kernel_views[name] = [None] * size
+                else:
+                    columns[name] = array("d", [nan]) * size
+                    self._kernel_views[name] = memoryview(columns[name])
+        for name, column in columns.items():
+            value = getattr(candle, name)
+            if value is None and name not in QUANTILE_FIELDS:
+                value = nan
+            column[slot] = value
+            column[mirror] = value
+
+
+class CandleStore:
+    """(symbol, interval)별 최근 캔들 저장소
+
+    CandleGenerator(store=...)에 넘기면 emit / 수정된 캔들이 자동으로 들어온다.
+    on_candle 콜백으로 직접 채울 수도 있다 (store.append).
+
+    Attributes:
+        capacity: (symbol, interval)마다 보관할 최대 캔들 수
+        rings: (symbol, interval)별 링 버퍼
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.rings: dict[tuple[str, str], CandleRing] = {}
+        self._generator: Optional["CandleGenerator"] = None
+
+    def attach(self, generator: "CandleGenerator") -> None:
+        """current()가 열린 윈도우를 조회할 생성기 연결 (CandleGenerator가 호출)"""
+        self._generator = generator
+
+    def append(self, candle: Candle) -> None:
+        """캔들 추가"""
+        key = (candle.symbol, candle.interval)
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = self.rings[key] = CandleRing(candle.symbol, candle.interval, self.capacity)
+        ring.append(candle)
+
+    def extend(self, candles: Iterable[Candle]) -> None:
+        """캔들 여러 개 추가 (on_candles 콜백으로도 사용 가능)"""
+        for candle in candles:
+            self.append(candle)
+
+    def update(self, candle: Candle) -> bool:
+        """수정된 캔들로 같은 open_time 행을 덮어씀 (없으면 False)"""
+        ring = self.rings.get((candle.symbol, candle.interval))
+        return ring is not None and ring.update(candle)
+
+    def last(self, symbol: str, interval: str, n: int) -> CandleView:
+        """최근 n개 닫힌 캔들 (시간순, 복사 없음)"""
+        ring = self.rings.get((symbol, interval))
+        if ring is None:
+            return self._empty(symbol, interval)
+        return ring.last(n)
+
+    def range(self, symbol: str, interval: str, start: datetime, end: datetime) -> CandleView:
+        """open_time이 [start, end)인 닫힌 캔들 (시간순, 복사 없음)"""
+        return self.range_ns(symbol, interval, to_epoch_ns(start), to_epoch_ns(end))
+
+    def range_ns(self, symbol: str, interval: str, start_ns: int, end_ns: int) -> CandleView:
+        """range()의 epoch ns 버전"""
+        ring = self.rings.get((symbol, interval))
+        if ring is None:
+            return self._empty(symbol, interval)
+        return ring.range_ns(start_ns, end_ns)
+
+    def current(self, symbol: str, interval: str) -> Optional[Candle]:
+        """진행 중인 (가장 최근에 열린) 윈도우의 부분 캔들
+
+        연결된 생성기의 윈도우 상태에서 계산한다
+        (WindowManager / RollupWindowManager, 없으면 None).
+        """
+        if self._generator is None:
+            return None
+        manager = self._generator.window_managers.get(symbol)
+        if manager is None:
+            return None
+        aggregator = _open_aggregator(manager, interval)
+        if aggregator is None or aggregator.is_empty():
+            return None
+        return aggregator.to_candle(symbol, interval)
+
+    @staticmethod
+    def _empty(symbol: str, interval: str) -> CandleView:
+        return CandleView(
+            symbol, interval, timezone.utc, 0, (memoryview(array(code)) for code, _ in COLUMNS)
+        )
+
+
+def _open_aggregator(manager, interval: str) -> Optional["CandleAggregator"]:
+    """manager에서 interval의 가장 최근 열린 윈도우 집계 (롤업은 base 윈도우까지 병합)"""
+    rollups = getattr(manager, "rollups", None)
+    if rollups is None:
+        windows = getattr(manager, "windows", None)
+        if not windows or getattr(manager, "interval", None) != interval:
+            return None
+        return windows[max(windows)]
+
+    base = manager.base
+    if base.interval == interval:
+        return _open_aggregator(base, interval)
+    rollup = next((r for r in rollups if r.interval == interval), None)
+    if rollup is None:
+        return None
+
+    size_ns = rollup.window_size_ns
+    buckets = [b * base.window_size_ns // size_ns for b in base.windows]
+    bucket = max(list(rollup.windows) + buckets, default=None)
+    if bucket is None:
+        return None
+    # 집계 커널 필드도 채우도록 base 윈도우와 같은 집계 클래스로 병합
+    start_ns = bucket * size_ns
+    partial = base.aggregator.from_ns(start_ns, start_ns + size_ns - WINDOW_END_OFFSET_NS)
+    closed = rollup.windows.get(bucket)
+    if closed is not None:
+        partial.tz = closed.tz
+        partial.merge(closed)
+    for base_bucket in sorted(base.windows):
+        if base_bucket * base.window_size_ns // size_ns == bucket:
+            aggregator = base.windows[base_bucket]
+            partial.tz = aggregator.tz
+            partial.merge(aggregator)
+    return partial
@@ -1,6 +1,44 @@
-"""윈도우 처리 유틸리티: TumblingWindow"""
+"""윈도우 처리 유틸리티: TumblingWindow, SlidingWindow, epoch 나노초 변환"""
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# 윈도우 종료 = 시작 + 크기 - 1ms
+WINDOW_END_OFFSET_NS = 1_000_000
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """datetime → epoch 나노초 (정수 연산, 오차 없음)
+
+    timezone 정보가 없는 datetime은 UTC로 간주한다.
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    # datetime 해상도는 마이크로초이므로 timedelta 정수 나눗셈 한 번으로 충분
+    return (timestamp - EPOCH) // _MICROSECOND * 1000
+
+
+def timedelta_to_ns(delta: timedelta) -> int:
+    """timedelta → 나노초 (정수 연산)"""
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+def from_epoch_ns(ns: int, tz: tzinfo = timezone.utc) -> datetime:
+    """epoch 나노초 → tz-aware datetime (마이크로초 미만은 버림)"""
+    return (EPOCH + timedelta(microseconds=ns // 1000)).astimezone(tz)
+
+
+@lru_cache(maxsize=4096)
+def window_time(ns: int, tz: tzinfo = timezone.utc) -> datetime:
+    """윈도우 경계 시간 (from_epoch_ns + 캐시)
+
+    같은 시각에 닫히는 여러 심볼의 캔들이 같은 datetime 객체를 공유한다 (immutable).
+    """
+    return from_epoch_ns(ns, tz)
 
 
 class TumblingWindow:
@@ -25,16 +63,24 @@ class TumblingWindow:
             window_size=1분, ts=10:30:45 → 10:30:00
             window_size=5분, ts=10:33:20 → 10:30:00
         """
-        # Unix timestamp로 변환
-        ts_seconds = timestamp.timestamp()
-        window_seconds = window_size.total_seconds()
-
-        # 내림 처리로 윈도우 시작 계산
-        window_start_seconds = int(ts_seconds // window_seconds) * window_seconds
+        window_ns = timedelta_to_ns(window_size)
+        bucket = TumblingWindow.get_bucket(to_epoch_ns(timestamp), window_ns)
 
         # timezone 유지
         tz = timestamp.tzinfo or timezone.utc
-        return datetime.fromtimestamp(window_start_seconds, tz=tz)
+        return from_epoch_ns(bucket * window_ns, tz)
+
+    @staticmethod
+    def get_bucket(ts_ns: int, window_size_ns: int) -> int:
+        """epoch 나노초 타임스탬프가 속하는 윈도우의 버킷 인덱스
+
+        정수 내림 나눗셈이므로 경계에서도 오차가 없다.
+        윈도우 시작 = bucket * window_size_ns
+
+        예시:
+            window_size=1분, ts=10:30:45 → 10:30:00 // 1분
+        """
+        return ts_ns // window_size_ns
 
     @staticmethod
     def get_window_end(window_start: datetime, window_size: timedelta) -> datetime:
@@ -51,3 +97,43 @@ class TumblingWindow:
             start=10:30:00, size=1분 → 10:30:59.999
         """
         return window_start + window_size - timedelta(milliseconds=1)
+
+
+class SlidingWindow:
+    """Sliding(Hopping) Window 경계 계산 유틸리티
+
+    Sliding Window: 고정 크기, hop 간격으로 시작하는 겹치는 윈도우
+    예: 5분 윈도우, 1분 hop → 10:00-10:05, 10:01-10:06, ...
+
+    윈도우 크기는 hop의 배수여야 한다. hop 크기의 pane(= hop 길이의 tumbling
+    윈도우) 단위로 집계하고, 윈도우 k는 pane k ~ k + size/hop - 1 로 구성된다.
+    """
+
+    @staticmethod
+    def panes_per_window(window_size: timedelta, hop: timedelta) -> int:
+        """윈도우 하나를 구성하는 pane 수
+
+        Raises:
+            ValueError: hop이 0 이하이거나 윈도우 크기가 hop의 배수가 아닌 경우
+        """
+        window_ns = timedelta_to_ns(window_size)
+        hop_ns = timedelta_to_ns(hop)
+        if hop_ns <= 0 or window_ns < hop_ns or window_ns % hop_ns:
+            raise ValueError("window_size must be a positive multiple of hop")
+        return window_ns // hop_ns
+
+    @staticmethod
+    def get_window_starts(
+        timestamp: datetime, window_size: timedelta, hop: timedelta
+    ) -> list[datetime]:
+        """주어진 타임스탬프를 포함하는 모든 윈도우의 시작 시간 (시간순)
+
+        예시:
+            window_size=5분, hop=1분, ts=10:03:20
+            → 09:59, 10:00, 10:01, 10:02, 10:03
+        """
+        panes = SlidingWindow.panes_per_window(window_size, hop)
+        hop_ns = timedelta_to_ns(hop)
+        pane = TumblingWindow.get_bucket(to_epoch_ns(timestamp), hop_ns)
+        tz = timestamp.tzinfo or timezone.utc
+        return [from_epoch_ns(k * hop_ns, tz) for k in range(pane - panes + 1, pane + 1)]
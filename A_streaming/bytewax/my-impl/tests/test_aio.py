@@ -0,0 +1,114 @@
+"""aio.py asyncio 스트리밍 인터페이스 테스트"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.aio import AsyncCandleGenerator
+from src.candle import Candle, LateData, Trade
+from src.candle_generator import CandleGenerator
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+async def trade_source(trades, consumed=None):
+    for trade in trades:
+        if consumed is not None:
+            consumed.append(trade)
+        yield trade
+
+
+def minute_trades(n: int) -> list[Trade]:
+    """분마다 거래 1건 → 거래마다 캔들 1개씩 닫힘"""
+    return [
+        Trade("BTCUSDT", 100.0 + i, 1.0, BASE + timedelta(minutes=i, seconds=30))
+        for i in range(n)
+    ]
+
+
+class TestAsyncCandleGenerator:
+    """AsyncCandleGenerator 테스트"""
+
+    def test_stream_candles_and_late(self):
+        """캔들과 Late 이벤트를 순서대로 내보내고 마지막에 flush"""
+        trades = minute_trades(3) + [Trade("BTCUSDT", 1.0, 1.0, BASE)]
+
+        async def main():
+            stream = AsyncCandleGenerator(CandleGenerator(window_size=timedelta(minutes=1)))
+            return [event async for event in stream.stream(trade_source(trades))]
+
+        events = asyncio.run(main())
+
+        kinds = [type(e).__name__ for e in events]
+        assert kinds == ["Candle", "Candle", "LateData", "Candle"]
+        assert [e.open_time.minute for e in events if isinstance(e, Candle)] == [0, 1, 2]
+
+    def test_backpressure_bounds_memory(self):
+        """느린 소비자 앞에서 producer가 max_pending 이상 앞서가지 않음"""
+        trades = minute_trades(500)
+        consumed: list[Trade] = []
+
+        async def main():
+            stream = AsyncCandleGenerator(
+                CandleGenerator(window_size=timedelta(minutes=1)),
+                max_pending=10,
+            )
+            lead = 0
+            received = 0
+            async for _ in stream.stream(trade_source(trades, consumed)):
+                received += 1
+                lead = max(lead, len(consumed) - received)
+                await asyncio.sleep(0.001)
+            return lead, received
+
+        lead, received = asyncio.run(main())
+
+        assert received == 500
+        # 큐(10) + 처리 중인 이벤트 정도만 앞설 수 있음
+        assert lead <= 12
+
+    def test_yields_during_large_advance(self):
+        """대량 캔들 emit 중에도 다른 task가 실행됨"""
+        trades = [
+            Trade(f"SYM{i}", 1.0, 1.0, BASE + timedelta(seconds=10)) for i in range(2000)
+        ]
+
+        async def main():
+            generator = CandleGenerator(window_size=timedelta(minutes=1))
+            stream = AsyncCandleGenerator(generator, max_pending=5000, yield_every=100)
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.create_task(ticker())
+            events = [e async for e in stream.stream(trade_source(trades))]
+            task.cancel()
+            return len(events), ticks
+
+        n_events, ticks = asyncio.run(main())
+
+        assert n_events == 2000
+        assert ticks >= 20
+
+    def test_source_error_propagates(self):
+        """입력 스트림 예외는 소비자에게 전달"""
+
+        async def broken():
+            yield Trade("BTCUSDT", 1.0, 1.0, BASE)
+            raise ConnectionError("socket closed")
+
+        async def main():
+            stream = AsyncCandleGenerator()
+            return [e async for e in stream.stream(broken())]
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(main())
+
+    def test_invalid_max_pending(self):
+        with pytest.raises(ValueError):
+            AsyncCandleGenerator(max_pending=0)
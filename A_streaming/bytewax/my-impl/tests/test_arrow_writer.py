@@ -0,0 +1,293 @@
+"""arrow_writer.py 컬럼 파일 출력 테스트"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from src.arrow_writer import ArrowCandleWriter, candle_batch_to_arrow  # noqa: E402
+from src.candle import Candle, Trade  # noqa: E402
+from src.candle_generator import CandleAggregator, CandleGenerator  # noqa: E402
+from src.columns import CandleBatch  # noqa: E402
+from src.eviction import EvictionPolicy  # noqa: E402
+from src.kernels import PRICE_QUANTILES, VWAP  # noqa: E402
+from src.rollup import MultiIntervalCandleGenerator  # noqa: E402
+from src.window import to_epoch_ns  # noqa: E402
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+KST = timezone(timedelta(hours=9))
+
+
+def trade(symbol: str, seconds: float, price: float = 100.0, tz=timezone.utc) -> Trade:
+    return Trade(symbol, price, 1.5, (BASE + timedelta(seconds=seconds)).astimezone(tz))
+
+
+def generate(writer, minutes: int = 5, n_symbols: int = 3) -> list[Candle]:
+    candles: list[Candle] = []
+    generator = CandleGenerator(on_candle=candles.append, on_candles=writer)
+    for minute in range(minutes):
+        for i in range(n_symbols):
+            generator.process(trade(f"S{i}", minute * 60 + i, 100.0 + minute + i))
+    generator.flush()
+    return candles
+
+
+def rows(candles: list[Candle]) -> list[tuple]:
+    return [
+        (
+            c.symbol,
+            c.interval,
+            to_epoch_ns(c.open_time),
+            to_epoch_ns(c.close_time),
+            c.open,
+            c.high,
+            c.low,
+            c.close,
+            c.volume,
+            c.trade_count,
+        )
+        for c in candles
+    ]
+
+
+def table_rows(table) -> list[tuple]:
+    columns = [
+        table.column(name).cast(pa.int64()) if name.endswith("_time") else table.column(name)
+        for name in (
+            "symbol",
+            "interval",
+            "open_time",
+            "close_time",
+            "open",
+            "high",
+            "low",
+            "close",
+            "volume",
+            "trade_count",
+        )
+    ]
+    return list(zip(*(column.to_pylist() for column in columns)))
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCandleBatchToArrow:
+    def test_columns(self):
+        candles = []
+        generator = CandleGenerator(on_candle=candles.append)
+        generator.process(trade("BTCUSDT", 1, tz=KST))
+        generator.process(trade("ETHUSDT", 2))
+        generator.flush()
+
+        record = candle_batch_to_arrow(CandleBatch(candles))
+        assert record.num_rows == 2
+        assert table_rows(pa.Table.from_batches([record])) == rows(candles)
+        assert record.column("utc_offset").to_pylist() == [9 * 3600, 0]
+
+
+    def test_kernel_columns(self, tmp_path):
+        candles = []
+        generator = CandleGenerator(on_candle=candles.append, kernels=[VWAP, PRICE_QUANTILES])
+        generator.process(trade("BTCUSDT", 1, 100.0))
+        generator.process(trade("BTCUSDT", 2, 102.0))
+        generator.flush()
+        plain = generate(lambda candles: None, minutes=1, n_symbols=1)
+
+        with ArrowCandleWriter(str(tmp_path)) as writer:
+            writer(plain + candles)
+        table = pq.read_table(writer.paths[0])
+
+        assert table.column("vwap").to_pylist() == [None, candles[0].vwap]
+        assert table.column("vwap").to_pylist()[1] == 101.0
+        assert table.column("buy_volume").null_count == 2
+        [[*quantiles]] = table.column("price_quantiles").drop_null().to_pylist()
+        assert dict(quantiles) == candles[0].price_quantiles
+
+
+class TestArrowCandleWriter:
+    """ArrowCandleWriter 파일 / row group / partition"""
+
+    def test_parquet_round_trip(self, tmp_path):
+        with ArrowCandleWriter(str(tmp_path)) as writer:
+            candles = generate(writer)
+
+        assert writer.paths == [os.path.join(str(tmp_path), "1m", "20260126T000000Z.parquet")]
+        assert writer.rows_written == len(candles) == 15
+        assert table_rows(pq.read_table(writer.paths[0])) == rows(candles)
+
+    def test_arrow_ipc(self, tmp_path):
+        with ArrowCandleWriter(str(tmp_path), format="arrow", max_rows=4) as writer:
+            candles = generate(writer)
+
+        with pa.ipc.open_stream(writer.paths[0]) as reader:
+            batches = list(reader)
+        assert [b.num_rows for b in batches] == [4, 4, 4, 3]
+        assert table_rows(pa.Table.from_batches(batches)) == rows(candles)
+
+    def test_row_groups_by_count(self, tmp_path):
+        with ArrowCandleWriter(str(tmp_path), max_rows=4) as writer:
+            generate(writer)
+
+        metadata = pq.ParquetFile(writer.paths[0]).metadata
+        assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [
+            4,
+            4,
+            4,
+            3,
+        ]
+
+    def test_row_groups_by_delay(self, tmp_path):
+        clock = FakeClock()
+        writer = ArrowCandleWriter(str(tmp_path), max_delay=timedelta(seconds=1), clock=clock)
+        candles = []
+        generator = CandleGenerator(on_candle=candles.append, on_candles=writer)
+
+        generator.process(trade("BTCUSDT", 0))
+        generator.process(trade("BTCUSDT", 70))
+        assert writer.rows_written == 0 and not writer.poll()
+
+        clock.now = 1.0
+        assert writer.poll()
+        assert writer.rows_written == 1
+        generator.flush()
+        writer.close()
+
+        assert pq.ParquetFile(writer.paths[0]).metadata.num_row_groups == 2
+        assert table_rows(pq.read_table(writer.paths[0])) == rows(candles)
+
+    def test_file_per_interval_and_partition(self, tmp_path):
+        candles = []
+        with ArrowCandleWriter(str(tmp_path), partition=timedelta(hours=1)) as writer:
+            generator = MultiIntervalCandleGenerator(
+                window_sizes=[timedelta(minutes=1), timedelta(minutes=30)],
+                on_candle=candles.append,
+                on_candles=writer,
+            )
+            for minute in range(0, 150, 10):
+                generator.process(trade("BTCUSDT", minute * 60))
+            generator.flush()
+
+        relative = sorted(os.path.relpath(p, str(tmp_path)) for p in writer.paths)
+        assert relative == [
+            os.path.join(interval, f"20260126T{hour}0000Z.parquet")
+            for interval in ("1m", "30m")
+            for hour in ("10", "11", "12")
+        ]
+        for path in writer.paths:
+            interval, name = os.path.relpath(path, str(tmp_path)).split(os.sep)
+            expected = [
+                c
+                for c in candles
+                if c.interval == interval and c.open_time.strftime("%H") == name[9:11]
+            ]
+            assert table_rows(pq.read_table(path)) == rows(expected)
+
+    def test_closed_partition_gets_new_part(self, tmp_path):
+        candles = []
+        with ArrowCandleWriter(
+            str(tmp_path), partition=timedelta(hours=1), open_partitions=1
+        ) as writer:
+            generator = CandleGenerator(on_candle=candles.append, on_candles=writer)
+            generator.process(trade("BTCUSDT", 0))
+            generator.process(trade("ETHUSDT", 0))
+            generator.process(trade("BTCUSDT", 3600))
+            generator.process(trade("BTCUSDT", 3700))  # BTC 11:00 캔들 → 10시 partition 닫힘
+            generator.process(trade("ETHUSDT", 3700))  # ETH 10:00 캔들 → 새 part 파일
+
+        names = [os.path.basename(p) for p in writer.paths]
+        assert names == [
+            "20260126T100000Z.parquet",
+            "20260126T110000Z.parquet",
+            "20260126T100000Z-1.parquet",
+        ]
+        assert [r[0] for r in table_rows(pq.read_table(writer.paths[2]))] == ["ETHUSDT"]
+        assert writer.rows_written == len(candles)
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"format": "csv"},
+            {"partition": timedelta(0)},
+            {"max_rows": 0},
+            {"max_delay": timedelta(seconds=-1)},
+            {"open_partitions": 0},
+        ],
+    )
+    def test_invalid(self, tmp_path, kwargs):
+        with pytest.raises(ValueError):
+            ArrowCandleWriter(str(tmp_path), **kwargs)
+
+
+def replay(tmp_path, name: str, **kwargs):
+    """같은 거래열을 생성기 설정만 바꿔 기록하고 파일 테이블 반환"""
+    with ArrowCandleWriter(str(tmp_path / name)) as writer:
+        if "column_writer" in kwargs:
+            kwargs["column_writer"] = writer
+        else:
+            kwargs["on_candles"] = writer
+        generator = CandleGenerator(allowed_lateness=timedelta(seconds=30), **kwargs)
+        for minute in range(4):
+            for i in range(3):
+                tz = KST if i == 1 else timezone.utc
+                generator.process(trade(f"S{i}", minute * 60 + i * 7, 100.0 + minute + i, tz))
+        generator.process(trade("S0", 170, 90.0))  # Late, 닫힌 윈도우 수정 (on_update)
+        generator.flush()
+    return writer, pa.concat_tables(pq.read_table(path) for path in writer.paths)
+
+
+class TestColumnWriter:
+    """CandleGenerator(column_writer=...): 집계 상태에서 바로 기록"""
+
+    def test_same_table_as_candle_path(self, tmp_path):
+        _, expected = replay(tmp_path, "candles")
+        writer, table = replay(tmp_path, "windows", column_writer=True)
+
+        assert table.equals(expected)
+        assert writer.rows_written == 12
+        assert set(table.column("utc_offset").to_pylist()) == {0, 9 * 3600}
+
+    def test_kernel_fields(self, tmp_path):
+        kernels = [VWAP, PRICE_QUANTILES]
+        _, expected = replay(tmp_path, "candles", kernels=kernels)
+        _, table = replay(tmp_path, "windows", column_writer=True, kernels=kernels)
+
+        assert table.equals(expected)
+        assert table.column("vwap").null_count == 0
+
+    def test_does_not_build_candles(self, tmp_path, monkeypatch):
+        def fail(*args):
+            raise AssertionError("to_candle called")
+
+        monkeypatch.setattr(CandleAggregator, "to_candle", fail)
+        _, table = replay(tmp_path, "windows", column_writer=True)
+        assert table.num_rows == 12
+
+    def test_evicted_windows_are_written(self, tmp_path):
+        eviction = EvictionPolicy(max_open_windows=1)
+        _, expected = replay(tmp_path, "candles", eviction=eviction)
+        _, table = replay(tmp_path, "windows", column_writer=True, eviction=eviction)
+
+        assert table.equals(expected)
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"on_candle": print},
+            {"on_candles": print},
+            {"global_watermark": True},
+            {"eviction": EvictionPolicy(idle_ttl=timedelta(minutes=1))},
+        ],
+    )
+    def test_unsupported(self, tmp_path, kwargs):
+        with ArrowCandleWriter(str(tmp_path)) as writer:
+            with pytest.raises(TypeError):
+                CandleGenerator(column_writer=writer, **kwargs)
@@ -0,0 +1,141 @@
+"""backfill.py 오프라인 백필 테스트
+
+정렬된 입력에서 BackfillCandleGenerator가 interval별 CandleGenerator와
+비트 단위로 같은 캔들을 내는지 검증
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.backfill import BackfillCandleGenerator, read_json_lines  # noqa: E402
+from src.candle import Trade  # noqa: E402
+from src.candle_generator import CandleGenerator  # noqa: E402
+from src.columns import TradeBatch  # noqa: E402
+from src.sink import BufferedCandleSink  # noqa: E402
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+SIZES = [timedelta(seconds=10), timedelta(minutes=1), timedelta(hours=1)]
+
+
+def make_trades(n: int, seed: int = 3) -> list[Trade]:
+    """시간순 거래 (같은 타임스탬프 포함, 수량은 부동소수 합산 순서에 민감한 값)"""
+    rng = random.Random(seed)
+    trades = []
+    t = BASE
+    for _ in range(n):
+        t += timedelta(microseconds=rng.choice([0, 0, rng.randint(1, 400_000)]))
+        trades.append(
+            Trade(rng.choice(SYMBOLS), float(rng.randint(90, 110)), rng.random() * 3.3, t)
+        )
+    return trades
+
+
+def streaming(trades: list[Trade]) -> dict:
+    """interval / 심볼별 거래별 경로의 캔들 (emit 순서)"""
+    result: dict = {}
+    for size in SIZES:
+        candles = []
+        generator = CandleGenerator(window_size=size, on_candle=candles.append)
+        for trade in trades:
+            generator.process(trade)
+        generator.flush()
+        for candle in candles:
+            result.setdefault((candle.interval, candle.symbol), []).append(candle)
+    return result
+
+
+def group(candles) -> dict:
+    result: dict = {}
+    for candle in candles:
+        result.setdefault((candle.interval, candle.symbol), []).append(candle)
+    return result
+
+
+class TestBackfillCandleGenerator:
+    """BackfillCandleGenerator 테스트"""
+
+    @pytest.mark.parametrize("chunk_size", [13, 500, 5000])
+    def test_matches_streaming(self, chunk_size):
+        trades = make_trades(5000)
+        candles = []
+        generator = BackfillCandleGenerator(SIZES, on_candle=candles.append)
+        count = generator.run(
+            TradeBatch(trades[i : i + chunk_size]) for i in range(0, len(trades), chunk_size)
+        )
+
+        assert count == len(candles)
+        assert group(candles) == streaming(trades)
+
+    def test_candles_per_chunk(self):
+        """완료된 윈도우는 chunk마다 바로 emit, 마지막 윈도우는 flush에서"""
+        trades = [Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=s)) for s in (1, 61, 62)]
+        batches = []
+        generator = BackfillCandleGenerator(on_candles=batches.append)
+
+        assert generator.process_trades(TradeBatch(trades[:2]))[0].open_time == BASE
+        assert generator.process_trades(TradeBatch(trades[2:])) == []
+        [candle] = generator.flush()
+
+        assert candle.trade_count == 2 and candle.open_time == BASE + timedelta(minutes=1)
+        assert [len(b) for b in batches] == [1, 1]
+        assert generator.flush() == []
+
+    def test_flushes_sink(self):
+        written = []
+        sink = BufferedCandleSink(written.append, max_count=100)
+        generator = BackfillCandleGenerator(on_candles=sink)
+        generator.run([TradeBatch(make_trades(200))])
+
+        assert sum(len(w) for w in written) > 0 and sink.pending == []
+
+    def test_unsorted_input(self):
+        generator = BackfillCandleGenerator()
+        trades = [Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=s)) for s in (10, 5)]
+        with pytest.raises(ValueError):
+            generator.process_trades(TradeBatch(trades))
+
+        # chunk 경계를 넘어 거꾸로 가도 거부하고 상태는 유지
+        generator.process_trades(TradeBatch(trades[:1]))
+        with pytest.raises(ValueError):
+            generator.process_trades(TradeBatch(trades[1:]))
+        assert [c.trade_count for c in generator.flush()] == [1]
+
+    def test_interleaved_symbols_sorted_per_symbol(self):
+        """심볼별로만 시간순이어도 (심볼 간 역전) 결과가 같음"""
+        trades = make_trades(3000)
+        shifted = [
+            Trade(t.symbol, t.price, t.quantity, t.timestamp + timedelta(seconds=30))
+            if t.symbol == "ETHUSDT"
+            else t
+            for t in trades
+        ]
+        candles = []
+        generator = BackfillCandleGenerator(SIZES, on_candle=candles.append)
+        generator.run([TradeBatch(shifted[i : i + 400]) for i in range(0, 3000, 400)])
+
+        assert group(candles) == streaming(shifted)
+
+    def test_read_json_lines(self, tmp_path):
+        trades = make_trades(1000)
+        path = tmp_path / "trades.jsonl"
+        path.write_text("".join(json.dumps(t.to_dict()) + "\n" for t in trades))
+
+        batches = list(read_json_lines(str(path), chunk_lines=300))
+        assert [len(b) for b in batches] == [300, 300, 300, 100]
+
+        candles = []
+        generator = BackfillCandleGenerator(SIZES, on_candle=candles.append)
+        generator.run(batches)
+        assert group(candles) == streaming(trades)
+
+    def test_invalid_window_sizes(self):
+        with pytest.raises(ValueError):
+            BackfillCandleGenerator([])
+        with pytest.raises(ValueError):
+            BackfillCandleGenerator([timedelta(0)])
@@ -0,0 +1,193 @@
+"""batch.py 컬럼 배치 처리 테스트
+
+process_batch()가 거래별 process()와 같은 결과를 내는지 검증
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.window import from_epoch_ns, to_epoch_ns
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def make_columns(n: int, seed: int = 7):
+    """순서가 섞인 거래 컬럼 생성 (수량은 부동소수 오차 없는 값)"""
+    rng = random.Random(seed)
+    symbol_ids, prices, quantities, timestamps = [], [], [], []
+    t = to_epoch_ns(BASE)
+    for _ in range(n):
+        t += rng.randint(0, 3_000) * 1_000_000
+        jitter = rng.choice([0, 0, 0, -8_000, -20_000]) * 1_000_000
+        symbol_ids.append(rng.randrange(len(SYMBOLS)))
+        prices.append(float(rng.randint(49_000, 51_000)))
+        quantities.append(rng.choice([0.25, 0.5, 1.0, 2.0]))
+        timestamps.append(t + jitter)
+    return symbol_ids, prices, quantities, timestamps
+
+
+def run_per_trade(columns):
+    candles, late = [], []
+    generator = CandleGenerator(
+        window_size=timedelta(seconds=10),
+        watermark_delay=timedelta(seconds=5),
+        on_candle=candles.append,
+        on_late=late.append,
+    )
+    for sid, price, qty, ts in zip(*columns):
+        generator.process(Trade(SYMBOLS[sid], price, qty, from_epoch_ns(ts)))
+    return generator, candles, late
+
+
+def run_batch(columns, batch_size: int):
+    candles, late = [], []
+    generator = CandleGenerator(
+        window_size=timedelta(seconds=10),
+        watermark_delay=timedelta(seconds=5),
+        on_candle=candles.append,
+        on_late=late.append,
+    )
+    n = len(columns[0])
+    for i in range(0, n, batch_size):
+        generator.process_batch(
+            np.array(columns[0][i : i + batch_size]),
+            np.array(columns[1][i : i + batch_size]),
+            np.array(columns[2][i : i + batch_size]),
+            np.array(columns[3][i : i + batch_size], dtype=np.int64),
+            SYMBOLS,
+        )
+    return generator, candles, late
+
+
+def by_symbol(candles):
+    return {s: [c for c in candles if c.symbol == s] for s in SYMBOLS}
+
+
+class TestProcessBatch:
+    """process_batch() 동등성 테스트"""
+
+    @pytest.mark.parametrize("batch_size", [1, 7, 100, 5000])
+    def test_matches_per_trade_path(self, batch_size):
+        """캔들/Late 분류가 거래별 경로와 동일"""
+        columns = make_columns(2000)
+
+        gen_a, candles_a, late_a = run_per_trade(columns)
+        gen_b, candles_b, late_b = run_batch(columns, batch_size)
+
+        assert by_symbol(candles_a) == by_symbol(candles_b)
+        assert late_a == late_b
+        assert len(late_a) > 0
+
+        gen_a.flush()
+        gen_b.flush()
+        assert by_symbol(candles_a) == by_symbol(candles_b)
+
+    def test_merges_into_open_window(self):
+        """배치 부분 집계가 기존 윈도우 상태에 병합됨"""
+        candles = []
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=5),
+            on_candle=candles.append,
+        )
+        generator.process(Trade("BTCUSDT", 50000.0, 1.0, BASE + timedelta(seconds=20)))
+
+        t0 = to_epoch_ns(BASE)
+        generator.process_batch(
+            np.array([0, 0]),
+            np.array([49000.0, 51000.0]),
+            np.array([1.0, 2.0]),
+            np.array([t0 + 16 * 10**9, t0 + 50 * 10**9], dtype=np.int64),
+            ["BTCUSDT"],
+        )
+        generator.flush()
+
+        assert len(candles) == 1
+        candle = candles[0]
+        assert candle.open == 49000.0  # 16초 (배치)
+        assert candle.close == 51000.0  # 50초 (배치)
+        assert candle.high == 51000.0
+        assert candle.low == 49000.0
+        assert candle.volume == 4.0
+        assert candle.trade_count == 3
+
+    def test_long_window_volume_is_bit_identical(self):
+        """한 윈도우에 거래가 많아도 volume이 거래별 volume += quantity와 비트 단위로 같음"""
+        rng = random.Random(5)
+        t0 = to_epoch_ns(BASE)
+        columns = (
+            [0] * 5000,
+            [50000.0 + rng.random() for _ in range(5000)],
+            [rng.random() * 3.7 for _ in range(5000)],
+            sorted(t0 + rng.randrange(9 * 10**9) for _ in range(5000)),
+        )
+
+        gen_a, candles_a, _ = run_per_trade(columns)
+        gen_a.flush()
+        # 기존 윈도우 volume에서 이어 더하는 경우도 포함 (배치 여러 개)
+        for batch_size in (5000, 1200):
+            gen_b, candles_b, _ = run_batch(columns, batch_size)
+            gen_b.flush()
+            assert [c.volume for c in candles_b] == [c.volume for c in candles_a]
+            assert candles_b[0].trade_count == 5000
+
+    def test_late_in_batch(self):
+        """배치 내에서 앞선 거래가 진행시킨 watermark 기준으로 Late 판별"""
+        late = []
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=5),
+            on_late=late.append,
+        )
+        t0 = to_epoch_ns(BASE)
+        generator.process_batch(
+            np.array([0, 0]),
+            np.array([50000.0, 49000.0]),
+            np.array([0.1, 0.5]),
+            np.array([t0 + 126 * 10**9, t0 + 90 * 10**9], dtype=np.int64),
+            ["BTCUSDT"],
+        )
+
+        assert len(late) == 1
+        assert late[0].trade.price == 49000.0
+        assert late[0].window_start.minute == 1
+
+    def test_empty_batch(self):
+        """빈 배치는 아무것도 하지 않음"""
+        generator = CandleGenerator()
+        generator.process_batch([], [], [], [], ["BTCUSDT"])
+
+        assert generator.window_managers == {}
+
+
+class TestSegmentSums:
+    """segment_sums()가 거래별 volume += quantity와 같은 값"""
+
+    def test_matches_sequential_sum(self):
+        from src.batch import segment_sums
+
+        rng = random.Random(11)
+        lengths = [rng.choice([1, 2, 5, 255, 256, 700]) for _ in range(200)]
+        values = np.array([rng.random() * 3.7 for _ in range(sum(lengths))])
+        starts = np.cumsum([0] + lengths[:-1])
+
+        initial = np.array([rng.random() * 100 for _ in lengths])
+
+        def sequential(start_values):
+            result = []
+            for total, start, length in zip(start_values, starts.tolist(), lengths):
+                for value in values[start : start + length].tolist():
+                    total += value
+                result.append(total)
+            return result
+
+        assert segment_sums(values, starts).tolist() == sequential([0.0] * len(lengths))
+        assert segment_sums(values, starts, initial).tolist() == sequential(initial.tolist())
+        assert len(segment_sums(values[:0], starts[:0])) == 0
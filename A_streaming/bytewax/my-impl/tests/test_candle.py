@@ -51,6 +51,18 @@ class TestTrade:
         assert trade.price == 50000.5
         assert trade.quantity == 0.15
 
+    def test_from_dict_epoch_millis(self):
+        """epoch 밀리초 숫자 timestamp"""
+        data = {
+            "symbol": "BTCUSDT",
+            "price": 50000.0,
+            "quantity": 0.1,
+            "timestamp": 1769423415123,
+        }
+        trade = Trade.from_dict(data)
+
+        assert trade.timestamp == datetime(2026, 1, 26, 10, 30, 15, 123000, tzinfo=timezone.utc)
+
     def test_to_dict(self):
         """Trade → dict 변환"""
         trade = Trade(
@@ -0,0 +1,251 @@
+"""checkpoint.py snapshot / restore 테스트"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.checkpoint import HEADER, WINDOW_RECORD
+from src.kernels import PRICE_QUANTILES, SIZE_QUANTILES, TAKER_VOLUME, VWAP
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+def make_trades(n: int, seed: int) -> list[Trade]:
+    rng = random.Random(seed)
+    trades = []
+    t = BASE
+    for _ in range(n):
+        t += timedelta(milliseconds=rng.randint(0, 800))
+        trades.append(
+            Trade(rng.choice(SYMBOLS), float(rng.randint(1, 100)), 0.5, t - timedelta(seconds=rng.choice([0, 0, 3])))
+        )
+    return trades
+
+
+def new_generator(candles):
+    return CandleGenerator(
+        window_size=timedelta(seconds=1),
+        watermark_delay=timedelta(seconds=30),
+        on_candle=candles.append,
+    )
+
+
+class TestSnapshotRestore:
+    """snapshot() / restore() 테스트"""
+
+    def test_restore_continues_identically(self):
+        """복원한 생성기가 원본과 같은 캔들을 이어서 생성"""
+        trades = make_trades(4000, seed=1)
+        head, tail = trades[:2000], trades[2000:]
+
+        expected = []
+        original = new_generator(expected)
+        for trade in trades:
+            original.process(trade)
+        original.flush()
+
+        before = []
+        first = new_generator(before)
+        for trade in head:
+            first.process(trade)
+        data = first.snapshot()
+
+        after = []
+        restored = new_generator(after)
+        restored.restore(data)
+        for trade in tail:
+            restored.process(trade)
+        restored.flush()
+
+        assert before + after == expected
+
+    def test_fixed_width_records(self):
+        """열린 윈도우 하나당 고정 폭 레코드 하나"""
+        generator = new_generator([])
+        for trade in make_trades(200, seed=2):
+            generator.process(trade)
+        n_windows = sum(len(m.windows) for m in generator.window_managers.values())
+
+        data = generator.snapshot()
+
+        symbols_size = sum(2 + len(s) + 8 for s in generator.window_managers)
+        assert len(data) == HEADER.size + symbols_size + n_windows * WINDOW_RECORD.size
+
+    def test_incremental_only_changed_windows(self):
+        """증분 체크포인트는 변경/닫힌 윈도우만 기록하고 순서대로 적용하면 원본과 같음"""
+        trades = make_trades(3000, seed=3)
+        source = new_generator([])
+        replica = new_generator([])
+
+        for trade in trades[:1000]:
+            source.process(trade)
+        full = source.snapshot()
+        replica.restore(full)
+
+        for trade in trades[1000:1010]:
+            source.process(trade)
+        incremental = source.snapshot(incremental=True)
+        assert len(incremental) < len(full) / 5
+        replica.restore(incremental)
+
+        for trade in trades[1010:]:
+            source.process(trade)
+        replica.restore(source.snapshot(incremental=True))
+
+        assert source.window_managers.keys() == replica.window_managers.keys()
+        for symbol, manager in source.window_managers.items():
+            other = replica.window_managers[symbol]
+            assert other.watermark_ns == manager.watermark_ns
+            assert {b: a.state() for b, a in other.windows.items()} == {
+                b: a.state() for b, a in manager.windows.items()
+            }
+            assert sorted(other._expiry) == sorted(manager._expiry)
+
+    def test_incremental_detects_recreated_window_with_same_count(self):
+        """제거 후 다시 만들어져 trade_count가 같아진 윈도우도 증분 체크포인트에 기록"""
+        source = new_generator([])
+        replica = new_generator([])
+        source.process(Trade("BTCUSDT", 100.0, 1.0, BASE))
+        replica.restore(source.snapshot())
+
+        source.evict("BTCUSDT")
+        source.process(Trade("BTCUSDT", 200.0, 3.0, BASE))
+        replica.restore(source.snapshot(incremental=True))
+
+        (window,) = replica.window_managers["BTCUSDT"].windows.values()
+        (expected,) = source.window_managers["BTCUSDT"].windows.values()
+        assert window.state() == expected.state()
+        assert window.close == 200.0
+
+        # 변경이 없으면 다음 증분 체크포인트에는 윈도우 레코드가 없음
+        assert HEADER.unpack_from(source.snapshot(incremental=True))[6] == 0
+
+    def test_keeps_fixed_offset_timezone(self):
+        """고정 offset timezone은 복원 후에도 유지"""
+        kst = timezone(timedelta(hours=9))
+        generator = new_generator([])
+        generator.process(Trade("BTCUSDT", 1.0, 1.0, datetime(2026, 1, 26, 19, 0, 0, tzinfo=kst)))
+
+        candles = []
+        restored = new_generator(candles)
+        restored.restore(generator.snapshot())
+        restored.flush()
+
+        assert candles[0].open_time.tzinfo == kst
+
+    def test_rejects_mismatched_settings(self):
+        data = new_generator([]).snapshot()
+
+        with pytest.raises(ValueError):
+            CandleGenerator(window_size=timedelta(minutes=1)).restore(data)
+        with pytest.raises(ValueError):
+            new_generator([]).restore(b"garbage" * 10)
+
+    def test_rejects_truncated_checkpoint(self):
+        """잘린 체크포인트는 ValueError이고 현재 상태를 바꾸지 않음"""
+        source = new_generator([])
+        for trade in make_trades(200, seed=4):
+            source.process(trade)
+        data = source.snapshot()
+
+        replica = new_generator([])
+        replica.restore(data)
+        for size in (HEADER.size + 1, HEADER.size + 12, len(data) - 1, len(data) - 40):
+            with pytest.raises(ValueError):
+                replica.restore(data[:size])
+        assert replica.window_managers.keys() == source.window_managers.keys()
+
+    def test_restores_retained_windows(self):
+        """allowed_lateness로 보관 중인 닫힌 윈도우도 복원되어 수정 가능"""
+        base = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+        def lateness_generator(updates):
+            return CandleGenerator(
+                window_size=timedelta(minutes=1),
+                watermark_delay=timedelta(seconds=1),
+                allowed_lateness=timedelta(seconds=30),
+                on_update=updates.append,
+            )
+
+        source = lateness_generator([])
+        source.process(Trade("BTCUSDT", 100.0, 1.0, base + timedelta(seconds=10)))
+        source.process(Trade("BTCUSDT", 101.0, 1.0, base + timedelta(seconds=65)))
+        full = source.snapshot()
+
+        updates = []
+        replica = lateness_generator(updates)
+        replica.restore(full)
+        manager = replica.window_managers["BTCUSDT"]
+        assert list(manager.retained) == [int(base.timestamp()) // 60]
+        assert len(manager.windows) == 1
+
+        # 보관 윈도우 수정 → 증분 체크포인트에 반영
+        source.process(Trade("BTCUSDT", 90.0, 1.0, base + timedelta(seconds=20)))
+        replica.restore(source.snapshot(incremental=True))
+        assert manager.retained == source.window_managers["BTCUSDT"].retained
+
+        replica.process(Trade("BTCUSDT", 95.0, 1.0, base + timedelta(seconds=30)))
+        assert updates[0].trade_count == 3
+        assert updates[0].low == 90.0
+
+
+class TestKernelCheckpoint:
+    """집계 커널 누적값 / 분위수 스케치 section"""
+
+    KERNELS = [VWAP, TAKER_VOLUME, PRICE_QUANTILES, SIZE_QUANTILES]
+
+    def kernel_generator(self, candles, kernels=KERNELS):
+        return CandleGenerator(
+            window_size=timedelta(seconds=1),
+            watermark_delay=timedelta(seconds=30),
+            on_candle=candles.append,
+            kernels=kernels,
+        )
+
+    def test_round_trip_keeps_quantiles(self):
+        """full → 증분 체크포인트로 복원한 생성기가 같은 vwap / 분위수 캔들을 생성"""
+        trades = [
+            Trade(t.symbol, t.price, t.quantity * (i % 7 + 1), t.timestamp, i % 3 == 0)
+            for i, t in enumerate(make_trades(3000, seed=6))
+        ]
+        expected = []
+        original = self.kernel_generator(expected)
+        for trade in trades:
+            original.process(trade)
+        original.flush()
+
+        before = []
+        source = self.kernel_generator(before)
+        for trade in trades[:1000]:
+            source.process(trade)
+        full = source.snapshot()
+        for trade in trades[1000:2000]:
+            source.process(trade)
+        incremental = source.snapshot(incremental=True)
+
+        after = []
+        replica = self.kernel_generator(after)
+        replica.restore(full)
+        replica.restore(incremental)
+        for trade in trades[2000:]:
+            replica.process(trade)
+        replica.flush()
+
+        assert before + after == expected
+        assert all(c.price_quantiles is not None and c.vwap is not None for c in after)
+
+    def test_rejects_mismatched_kernels(self):
+        data = self.kernel_generator([]).snapshot()
+
+        with pytest.raises(ValueError):
+            new_generator([]).restore(data)
+        with pytest.raises(ValueError):
+            self.kernel_generator([], kernels=[VWAP]).restore(data)
+        with pytest.raises(ValueError):
+            self.kernel_generator([]).restore(new_generator([]).snapshot())
+        with pytest.raises(ValueError):
+            self.kernel_generator([]).restore(data[:-1])
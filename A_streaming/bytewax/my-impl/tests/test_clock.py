@@ -0,0 +1,213 @@
+"""clock.py 전역 watermark / timer wheel 테스트"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.clock import TimerWheel
+from src.window import from_epoch_ns, to_epoch_ns
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def trade(symbol: str, seconds: float, price: float = 100.0) -> Trade:
+    return Trade(symbol, price, 1.0, BASE + timedelta(seconds=seconds))
+
+
+def new_generator(candles, late_items=None, **kwargs):
+    return CandleGenerator(
+        window_size=timedelta(minutes=1),
+        watermark_delay=timedelta(seconds=5),
+        on_candle=candles.append,
+        on_late=late_items.append if late_items is not None else None,
+        global_watermark=True,
+        **kwargs,
+    )
+
+
+class TestTimerWheel:
+    """TimerWheel 만료 순서"""
+
+    @pytest.mark.parametrize("levels,bits", [(1, 2), (2, 3), (4, 6)])
+    def test_matches_sorted_deadlines(self, levels, bits):
+        """임의의 등록 / 진행 순서에서 정확히 tick <= now 인 항목만 만료"""
+        rng = random.Random(levels * 31 + bits)
+        wheel = TimerWheel(now=1_000, levels=levels, bits=bits)
+        pending: list[tuple[int, int]] = []
+        item = 0
+        for _ in range(300):
+            for _ in range(rng.randint(0, 5)):
+                tick = wheel.now + rng.choice([0, 1, 2, 7, 60, 500, 5_000, 100_000])
+                wheel.schedule(tick, item)
+                pending.append((tick, item))
+                item += 1
+            target = wheel.now + rng.choice([0, 1, 3, 64, 1_000, 70_000])
+            fired = wheel.advance(target)
+
+            assert sorted(fired) == sorted(i for tick, i in pending if tick <= target)
+            pending = [p for p in pending if p[0] > target]
+            assert len(wheel) == len(pending)
+
+    def test_fires_in_deadline_order(self):
+        wheel = TimerWheel(now=0, levels=3, bits=2)
+        for tick in [40, 3, 17, 5, 63, 1]:
+            wheel.schedule(tick, tick)
+        assert wheel.advance(100) == [1, 3, 5, 17, 40, 63]
+
+    def test_past_deadline_fires_on_next_advance(self):
+        wheel = TimerWheel(now=10)
+        wheel.schedule(5, "late")
+        assert wheel.advance(10) == ["late"]
+        assert wheel.advance(11) == []
+
+    def test_large_jump_with_empty_wheel(self):
+        wheel = TimerWheel(now=0, levels=2, bits=2)
+        assert wheel.advance(10**15) == []
+        assert wheel.now == 10**15
+
+
+class TestGlobalWatermark:
+    """global_watermark=True: 모든 심볼이 watermark를 공유"""
+
+    def test_idle_symbol_window_closes(self):
+        """거래가 없는 심볼의 윈도우도 다른 심볼의 거래로 닫힘"""
+        candles = []
+        generator = new_generator(candles)
+        generator.process(trade("ILLIQUID", 10))
+        generator.process(trade("BTCUSDT", 20))
+        assert candles == []
+
+        generator.process(trade("BTCUSDT", 66))
+        assert [(c.symbol, c.trade_count) for c in candles] == [
+            ("ILLIQUID", 1),
+            ("BTCUSDT", 1),
+        ]
+
+    def test_per_symbol_mode_keeps_idle_window_open(self):
+        candles = []
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=5),
+            on_candle=candles.append,
+        )
+        generator.process(trade("ILLIQUID", 10))
+        generator.process(trade("BTCUSDT", 66))
+        assert candles == []
+        assert generator.window_managers["ILLIQUID"].windows
+
+    def test_late_against_global_watermark(self):
+        """다른 심볼이 진행시킨 watermark 이전 거래는 Late"""
+        late_items = []
+        generator = new_generator([], late_items)
+        generator.process(trade("BTCUSDT", 120))
+        generator.process(trade("ETHUSDT", 100))
+
+        assert len(late_items) == 1
+        assert late_items[0].trade.symbol == "ETHUSDT"
+
+    def test_single_symbol_matches_per_symbol_mode(self):
+        rng = random.Random(3)
+        trades = [
+            trade("BTCUSDT", i * 2.5 + rng.choice([0, 0, -3, -20]), float(i))
+            for i in range(500)
+        ]
+        results = []
+        for global_watermark in (False, True):
+            candles, late_items = [], []
+            generator = CandleGenerator(
+                window_size=timedelta(seconds=30),
+                watermark_delay=timedelta(seconds=5),
+                on_candle=candles.append,
+                on_late=late_items.append,
+                global_watermark=global_watermark,
+            )
+            for t in trades:
+                generator.process(t)
+            generator.flush()
+            results.append((candles, late_items))
+
+        assert results[0] == results[1]
+
+    def test_manual_advance_closes_only_expired_windows(self):
+        candles = []
+        generator = new_generator(candles)
+        for i in range(100):
+            generator.process(trade(f"SYM{i}", i * 60))
+        candles.clear()
+
+        wheel = generator.clock.wheel
+        pending = len(wheel)
+        generator.advance_watermark(BASE + timedelta(seconds=100 * 60 + 5))
+        assert [c.symbol for c in candles] == ["SYM98", "SYM99"]
+        assert len(wheel) == pending - 2
+
+    def test_allowed_lateness_amends_idle_symbol(self):
+        candles, updates = [], []
+        generator = new_generator(
+            candles, on_update=updates.append, allowed_lateness=timedelta(minutes=1)
+        )
+        generator.process(trade("ILLIQUID", 10, 100.0))
+        generator.process(trade("BTCUSDT", 70))
+        assert [c.symbol for c in candles] == ["ILLIQUID"]
+
+        generator.process(trade("ILLIQUID", 20, 110.0))
+        assert len(updates) == 1
+        assert updates[0].high == 110.0
+        assert updates[0].trade_count == 2
+
+    def test_snapshot_restore(self):
+        candles_a = []
+        generator = new_generator(candles_a)
+        generator.process(trade("ILLIQUID", 10))
+        generator.process(trade("BTCUSDT", 50))
+        data = generator.snapshot()
+
+        candles_b = []
+        restored = new_generator(candles_b)
+        restored.restore(data)
+        assert restored.clock.watermark_ns == generator.clock.watermark_ns
+
+        for g in (generator, restored):
+            g.process(trade("BTCUSDT", 70))
+        assert candles_a == candles_b
+        assert {c.symbol for c in candles_b} == {"ILLIQUID", "BTCUSDT"}
+
+    def test_batch_matches_per_trade(self):
+        np = pytest.importorskip("numpy")
+        symbols = ["BTCUSDT", "ETHUSDT", "ILLIQUID"]
+        rng = random.Random(11)
+        columns = ([], [], [], [])
+        t = to_epoch_ns(BASE)
+        for _ in range(1500):
+            t += rng.randint(0, 3_000) * 1_000_000
+            sid = rng.choice([0, 0, 1, 1, 2]) if rng.random() < 0.95 else 2
+            columns[0].append(sid)
+            columns[1].append(float(rng.randint(100, 200)))
+            columns[2].append(rng.choice([0.5, 1.0, 2.0]))
+            columns[3].append(t + rng.choice([0, 0, -4_000, -9_000]) * 1_000_000)
+
+        candles_a, late_a = [], []
+        per_trade = new_generator(candles_a, late_a)
+        for sid, price, qty, ts in zip(*columns):
+            per_trade.process(Trade(symbols[sid], price, qty, from_epoch_ns(ts)))
+
+        candles_b, late_b = [], []
+        batched = new_generator(candles_b, late_b)
+        for i in range(0, 1500, 100):
+            batched.process_batch(
+                np.array(columns[0][i : i + 100]),
+                np.array(columns[1][i : i + 100]),
+                np.array(columns[2][i : i + 100]),
+                np.array(columns[3][i : i + 100], dtype=np.int64),
+                symbols,
+            )
+
+        def by_symbol(candles):
+            return {s: [c for c in candles if c.symbol == s] for s in symbols}
+
+        assert late_a == late_b
+        assert len(late_a) > 0
+        assert by_symbol(candles_a) == by_symbol(candles_b)
@@ -0,0 +1,154 @@
+"""columns.py 컬럼 배치 컨테이너 테스트"""
+
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Candle, LateData, Trade
+from src.candle_generator import CandleGenerator
+from src.columns import CandleBatch, TradeBatch
+from src.kernels import PRICE_QUANTILES, TAKER_VOLUME, VWAP
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+KST = timezone(timedelta(hours=9))
+
+
+def trade(symbol: str, seconds: float, price: float = 100.0, tz=timezone.utc) -> Trade:
+    return Trade(symbol, price, 1.5, (BASE + timedelta(seconds=seconds)).astimezone(tz))
+
+
+def generate_candles(n_symbols: int = 20, minutes: int = 5) -> list[Candle]:
+    candles: list[Candle] = []
+    generator = CandleGenerator(on_candle=candles.append)
+    for minute in range(minutes):
+        for i in range(n_symbols):
+            generator.process(trade(f"S{i}", minute * 60 + i * 0.5, 100.0 + i))
+    generator.flush()
+    return candles
+
+
+class TestSlots:
+    """모델은 __slots__ dataclass"""
+
+    @pytest.mark.parametrize("cls", [Trade, Candle, LateData])
+    def test_no_instance_dict(self, cls):
+        assert "__dict__" not in dir(cls)
+        assert hasattr(cls, "__slots__")
+
+    def test_to_dict_unchanged(self):
+        candle = generate_candles(1, 1)[0]
+        assert candle.to_dict()["open_time"] == "2026-01-26T10:00:00+00:00"
+        assert trade("BTCUSDT", 0).to_dict()["timestamp"] == "2026-01-26T10:00:00+00:00"
+
+
+class TestCandleBatch:
+    """CandleBatch 저장 / 뷰"""
+
+    def test_round_trip(self):
+        candles = generate_candles()
+        batch = CandleBatch(candles)
+
+        assert len(batch) == len(candles)
+        assert list(batch) == candles
+        assert batch.to_dicts() == [c.to_dict() for c in candles]
+
+    def test_keeps_timezone(self):
+        candles: list[Candle] = []
+        generator = CandleGenerator(on_candle=candles.append)
+        generator.process(trade("BTCUSDT", 10, tz=KST))
+        generator.flush()
+
+        batch = CandleBatch(candles)
+        assert batch[0] == candles[0]
+        assert batch[0].open_time.utcoffset() == timedelta(hours=9)
+
+    def test_as_on_candle_sink(self):
+        batch = CandleBatch()
+        generator = CandleGenerator(on_candle=batch.append)
+        generator.process(trade("BTCUSDT", 10))
+        generator.flush()
+
+        assert [c.symbol for c in batch] == ["BTCUSDT"]
+        batch.clear()
+        assert len(batch) == 0
+
+    def test_smaller_than_candle_objects(self):
+        candles = generate_candles(50, 4)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        batch = CandleBatch(candles)
+        per_record = (tracemalloc.get_traced_memory()[0] - before) / len(batch)
+        tracemalloc.stop()
+
+        assert batch.nbytes == 76 * len(batch)
+        assert per_record < 150
+
+
+class TestKernelColumns:
+    """집계 커널 필드 컬럼"""
+
+    def test_round_trip(self):
+        candles: list[Candle] = []
+        generator = CandleGenerator(
+            on_candle=candles.append, kernels=[VWAP, TAKER_VOLUME, PRICE_QUANTILES]
+        )
+        for i in range(40):
+            generator.process(trade("BTCUSDT", i * 7, 100.0 + i))
+        generator.flush()
+
+        batch = CandleBatch(candles)
+        assert list(batch) == candles
+        assert batch.to_dicts() == [c.to_dict() for c in candles]
+        assert batch.nbytes == (76 + 4 * 8) * len(batch)
+
+    def test_added_after_plain_candles(self):
+        """커널 필드가 없는 캔들 뒤에 들어오면 이전 행은 None"""
+        plain = generate_candles(2, 1)
+        with_vwap = replace(plain[0], vwap=100.5, price_quantiles={"p50": 100.0})
+        batch = CandleBatch(plain)
+        assert batch.kernel_columns == {}
+
+        batch.append(with_vwap)
+        assert list(batch) == plain + [with_vwap]
+        assert batch[0].vwap is None and batch[2].turnover is None
+        batch.clear()
+        assert batch.kernel_columns == {} and len(batch) == 0
+
+
+class TestTradeBatch:
+    """TradeBatch 저장 / 뷰"""
+
+    def test_round_trip(self):
+        trades = [trade("BTCUSDT", 1.25), trade("ETHUSDT", 2, tz=KST), trade("BTCUSDT", 3)]
+        batch = TradeBatch(trades)
+
+        assert batch.symbols == ["BTCUSDT", "ETHUSDT"]
+        assert list(batch.symbol_ids) == [0, 1, 0]
+        assert list(batch) == trades
+        assert batch[1].timestamp.utcoffset() == timedelta(hours=9)
+        assert batch.to_dicts() == [t.to_dict() for t in trades]
+        assert batch.nbytes == 32 * 3
+
+    def test_feeds_process_batch(self):
+        pytest.importorskip("numpy")
+        trades = [trade(f"S{i % 3}", i * 2.0, 100.0 + i) for i in range(200)]
+
+        expected: list[Candle] = []
+        generator = CandleGenerator(on_candle=expected.append)
+        for t in trades:
+            generator.process(t)
+        generator.flush()
+
+        batch = TradeBatch(trades)
+        candles: list[Candle] = []
+        generator = CandleGenerator(on_candle=candles.append)
+        generator.process_batch(
+            batch.symbol_ids, batch.prices, batch.quantities, batch.timestamps, batch.symbols
+        )
+        generator.flush()
+
+        assert sorted(candles, key=lambda c: (c.symbol, c.open_time)) == sorted(
+            expected, key=lambda c: (c.symbol, c.open_time)
+        )
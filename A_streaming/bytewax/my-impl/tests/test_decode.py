@@ -0,0 +1,183 @@
+"""decode.py 거래 메시지 디코딩 테스트"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.decode import TradeDecoder, parse_timestamp_ns
+from src.dedup import DedupPolicy
+from src.kernels import TAKER_VOLUME
+from src.window import to_epoch_ns
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def message(symbol: str, seconds: float, price: float = 100.0, **overrides) -> dict:
+    data = {
+        "symbol": symbol,
+        "price": price,
+        "quantity": 1.0,
+        "timestamp": (BASE + timedelta(seconds=seconds)).isoformat().replace("+00:00", "Z"),
+    }
+    data.update(overrides)
+    return data
+
+
+class TestParseTimestamp:
+    """parse_timestamp_ns() - Trade.from_dict와 같은 시간"""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "2026-01-26T10:00:30Z",
+            "2026-01-26T10:00:30.123456Z",
+            "2026-01-26T10:00:30.123+00:00",
+            "2026-01-26T19:00:30.5+09:00",
+            "2026-01-26T05:00:30-05:00",
+            "2026-01-26T10:00:30",
+            "2026-01-26 10:00:30.250",
+        ],
+    )
+    def test_matches_from_dict(self, text):
+        trade = Trade.from_dict({"symbol": "X", "price": 1, "quantity": 1, "timestamp": text})
+        ts_ns, tz = parse_timestamp_ns(text)
+
+        assert ts_ns == to_epoch_ns(trade.timestamp)
+        assert tz == trade.timestamp.tzinfo
+
+    def test_epoch_millis(self):
+        expected = to_epoch_ns(BASE) + 123_000_000
+        millis = expected // 1_000_000
+
+        assert parse_timestamp_ns(millis) == (expected, timezone.utc)
+        assert parse_timestamp_ns(float(millis)) == (expected, timezone.utc)
+        assert parse_timestamp_ns(str(millis)) == (expected, timezone.utc)
+        assert parse_timestamp_ns(millis + 0.5)[0] == expected + 500_000
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_timestamp_ns("not a timestamp")
+
+
+class TestTradeDecoder:
+    """TradeDecoder JSON / JSON-lines 디코딩"""
+
+    @pytest.mark.parametrize("backend", ["json", "orjson"])
+    def test_decode(self, backend):
+        if backend == "orjson":
+            pytest.importorskip("orjson")
+        decoder = TradeDecoder(backend)
+        data = json.dumps(message("BTCUSDT", 30, price="50000.5")).encode()
+
+        assert decoder.backend == backend
+        assert decoder.decode(data) == (
+            "BTCUSDT",
+            50000.5,
+            1.0,
+            to_epoch_ns(BASE) + 30 * 10**9,
+            timezone.utc,
+            None,
+            None,
+        )
+
+    def test_decode_lines(self):
+        decoder = TradeDecoder("json")
+        buffer = "\n".join(
+            [json.dumps(message("BTCUSDT", 1)), "", json.dumps(message("ETHUSDT", 2)), ""]
+        )
+        values = list(decoder.decode_lines(buffer.encode()))
+
+        assert [v[0] for v in values] == ["BTCUSDT", "ETHUSDT"]
+        assert [v[5:] for v in values] == [(None, None), (None, None)]
+        assert list(decoder.decode_lines(b"\n\n")) == []
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            TradeDecoder("yaml")
+
+
+class TestGeneratorDecoding:
+    """process_dict / process_json / process_json_lines가 process(Trade)와 같은 결과"""
+
+    def messages(self):
+        msgs = [message(f"S{i % 3}", i * 7.5, 100.0 + i) for i in range(40)]
+        msgs.insert(20, message("S0", 0, 1.0))  # Late
+        msgs.append(message("S1", 300, timestamp=to_epoch_ns(BASE) // 1_000_000 + 301_000))
+        return msgs
+
+    def run(self, feed):
+        candles, late = [], []
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=5),
+            on_candle=candles.append,
+            on_late=late.append,
+        )
+        feed(generator)
+        generator.flush()
+        return candles, late
+
+    def test_paths_match_trade_path(self):
+        msgs = self.messages()
+        expected = self.run(lambda g: [g.process(Trade.from_dict(m)) for m in msgs])
+        buffer = "\n".join(json.dumps(m) for m in msgs).encode()
+
+        assert self.run(lambda g: [g.process_dict(m) for m in msgs]) == expected
+        assert self.run(lambda g: [g.process_json(json.dumps(m)) for m in msgs]) == expected
+        assert self.run(lambda g: g.process_json_lines(buffer)) == expected
+        assert len(expected[1]) == 1
+
+    def test_trade_id_matches_trade_path(self):
+        # dict / JSON 경로도 trade_id를 넘겨야 dedup이 재전송을 버림
+        msgs = [message("BTCUSDT", i, 100.0 + i, trade_id=i % 3) for i in range(6)]
+        buffer = "\n".join(json.dumps(m) for m in msgs).encode()
+
+        def run(feed):
+            candles = []
+            generator = CandleGenerator(on_candle=candles.append, dedup=DedupPolicy())
+            feed(generator)
+            generator.flush()
+            return candles
+
+        expected = run(lambda g: [g.process(Trade.from_dict(m)) for m in msgs])
+        assert run(lambda g: [g.process_dict(m) for m in msgs]) == expected
+        assert run(lambda g: [g.process_json(json.dumps(m)) for m in msgs]) == expected
+        assert run(lambda g: g.process_json_lines(buffer)) == expected
+        assert expected[0].trade_count == 3
+
+    def test_taker_volume_kernel_matches_trade_path(self):
+        # taker 방향 커널은 dict / JSON 경로에서도 is_buyer_maker를 받아야 함
+        msgs = [
+            message("BTCUSDT", i, 100.0 + i, trade_id=i % 3, is_buyer_maker=i % 2 == 0)
+            for i in range(6)
+        ]
+        buffer = "\n".join(json.dumps(m) for m in msgs).encode()
+
+        def run(feed):
+            candles = []
+            generator = CandleGenerator(
+                on_candle=candles.append, dedup=DedupPolicy(), kernels=[TAKER_VOLUME]
+            )
+            feed(generator)
+            generator.flush()
+            return candles
+
+        expected = run(lambda g: [g.process(Trade.from_dict(m)) for m in msgs])
+        assert run(lambda g: [g.process_dict(m) for m in msgs]) == expected
+        assert run(lambda g: [g.process_json(json.dumps(m)) for m in msgs]) == expected
+        assert run(lambda g: g.process_json_lines(buffer)) == expected
+        assert expected[0].trade_count == 3
+        assert (expected[0].buy_volume, expected[0].sell_volume) == (1.0, 2.0)
+
+    def test_keeps_timezone(self):
+        candles = []
+        generator = CandleGenerator(on_candle=candles.append)
+        generator.process_json(
+            json.dumps(message("BTCUSDT", 0, timestamp="2026-01-26T19:00:10+09:00"))
+        )
+        generator.flush()
+
+        assert candles[0].open_time.utcoffset() == timedelta(hours=9)
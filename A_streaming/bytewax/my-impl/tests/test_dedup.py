@@ -0,0 +1,251 @@
+"""dedup.py 거래 id 중복 제거 테스트"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Candle, Trade
+from src.candle_generator import CandleGenerator
+from src.dedup import DedupPolicy, SymbolDedup, TradeIdFilter
+from src.window import to_epoch_ns
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+SECOND_NS = 1_000_000_000
+MINUTE_NS = 60 * SECOND_NS
+
+
+def trade(trade_id: int, seconds: float, price: float = 100.0, symbol: str = "BTCUSDT") -> Trade:
+    return Trade(
+        symbol, price, 1.0, BASE + timedelta(seconds=seconds), None, trade_id=trade_id
+    )
+
+
+def stream(n: int, step: float = 0.5, symbol: str = "BTCUSDT") -> list[Trade]:
+    return [trade(i, i * step, 100.0 + i % 7, symbol) for i in range(n)]
+
+
+def run(trades: list[Trade], **kwargs) -> tuple[list[Candle], list, CandleGenerator]:
+    candles: list[Candle] = []
+    lates: list = []
+    generator = CandleGenerator(on_candle=candles.append, on_late=lates.append, **kwargs)
+    for t in trades:
+        generator.process(t)
+    generator.flush()
+    return candles, lates, generator
+
+
+class TestCandleGeneratorDedup:
+    """재연결 재전송 거래가 캔들에 두 번 더해지지 않음"""
+
+    def test_replay_matches_original(self):
+        trades = stream(600)
+        # 재연결: 마지막 40초 분량을 다시 받은 뒤 이어서 진행
+        replayed = trades[:400] + trades[320:400] + trades[400:]
+
+        expected, _, _ = run(trades)
+        candles, lates, generator = run(replayed, dedup=DedupPolicy())
+
+        assert candles == expected
+        assert lates == []
+        assert generator.trade_id_filter.duplicates == 80
+
+    def test_without_dedup_counts_twice(self):
+        trades = stream(200)
+        candles, _, _ = run(trades[:100] + trades[90:100] + trades[100:])
+        assert sum(c.trade_count for c in candles) == 210
+
+    def test_trades_without_id_are_not_checked(self):
+        trades = [Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=1))] * 3
+        candles, _, generator = run(trades, dedup=DedupPolicy())
+        assert candles[0].trade_count == 3
+        assert generator.trade_id_filter.duplicates == 0
+
+    def test_ids_are_per_symbol(self):
+        trades = stream(100) + stream(100, symbol="ETHUSDT")
+        trades.sort(key=lambda t: t.timestamp)
+        candles, _, generator = run(trades, dedup=DedupPolicy())
+        assert sum(c.trade_count for c in candles) == 200
+        assert generator.trade_id_filter.duplicates == 0
+
+    def test_old_replay_is_caught_by_fingerprints(self):
+        trades = stream(1200)
+        # 몇 분 지난 구간 재전송: 정확한 집합은 정리됐고 fingerprint로 검사
+        replayed = trades[:1000] + trades[100:150] + trades[1000:]
+
+        expected, _, _ = run(trades)
+        candles, lates, generator = run(replayed, dedup=DedupPolicy())
+
+        assert candles == expected
+        assert lates == []
+        assert generator.trade_id_filter.duplicates == 50
+
+    def test_first_seen_late_trade_is_reported(self):
+        trades = stream(400)
+        late = trade(10_000, 30.0)
+        candles, lates, _ = run(trades[:300] + [late] + trades[300:], dedup=DedupPolicy())
+
+        assert [l.trade for l in lates] == [late]
+        assert sum(c.trade_count for c in candles) == 400
+
+    def test_amend_path_does_not_double_count(self):
+        trades = stream(400)
+        updates: list[Candle] = []
+        # 최근 윈도우 재전송: allowed_lateness 안이라 수정 대상이지만 중복이므로 수정하지 않음
+        replayed = trades[:200] + trades[100:130] + trades[200:]
+
+        expected, _, _ = run(trades, allowed_lateness=timedelta(minutes=2))
+        candles, lates, _ = run(
+            replayed,
+            allowed_lateness=timedelta(minutes=2),
+            dedup=DedupPolicy(),
+            on_update=updates.append,
+        )
+
+        assert candles == expected
+        assert lates == []
+        assert updates == []
+
+    def test_global_watermark(self):
+        trades = stream(300) + stream(300, symbol="ETHUSDT")
+        trades.sort(key=lambda t: t.timestamp)
+        replayed = trades[:400] + trades[300:360] + trades[400:]
+
+        expected, _, _ = run(trades, global_watermark=True)
+        candles, lates, generator = run(replayed, global_watermark=True, dedup=DedupPolicy())
+
+        assert candles == expected
+        assert lates == []
+        assert generator.trade_id_filter.duplicates == 60
+
+    def test_process_values(self):
+        candles: list[Candle] = []
+        generator = CandleGenerator(on_candle=candles.append, dedup=DedupPolicy())
+        start = to_epoch_ns(BASE)
+        for trade_id in (1, 2, 2, 3, 1):
+            generator.process_values("BTCUSDT", 100.0, 1.0, start + trade_id, trade_id=trade_id)
+        generator.flush()
+
+        assert candles[0].trade_count == 3
+        assert generator.trade_id_filter.duplicates == 2
+
+
+class TestUnsupported:
+    def test_process_batch_rejected(self):
+        # 배치에는 거래 id가 없어 재전송을 걸러낼 수 없으므로 조용히 받지 않음
+        generator = CandleGenerator(dedup=DedupPolicy())
+        with pytest.raises(TypeError):
+            generator.process_batch([0], [100.0], [1.0], [to_epoch_ns(BASE)], ["BTCUSDT"])
+
+
+class TestSequentialRun:
+    """연속 id 구간: set에 넣지 않은 id도 중복으로 판정"""
+
+    def test_replay_inside_run(self):
+        start = to_epoch_ns(BASE)
+        candles: list[Candle] = []
+        generator = CandleGenerator(on_candle=candles.append, dedup=DedupPolicy())
+        for trade_id in (*range(100, 110), 105, 109, 100, 110):
+            generator.process_values("BTCUSDT", 100.0, 1.0, start + trade_id, trade_id=trade_id)
+        generator.flush()
+
+        assert candles[0].trade_count == 11
+        assert generator.trade_id_filter.duplicates == 3
+
+    def test_out_of_order_ids_then_replay(self):
+        # 작은 id 뒤에서 구간을 열면 이미 기록한 id (5)를 구간으로 받아들이게 됨
+        start = to_epoch_ns(BASE)
+        candles: list[Candle] = []
+        generator = CandleGenerator(on_candle=candles.append, dedup=DedupPolicy())
+        for trade_id in (5, 3, 4, 5, 4, 3, 6, 7, 6):
+            generator.process_values("BTCUSDT", 100.0, 1.0, start + trade_id, trade_id=trade_id)
+        generator.flush()
+
+        assert candles[0].trade_count == 5
+        assert generator.trade_id_filter.duplicates == 4
+
+    def test_replay_after_run_moves_bucket(self):
+        # 연속 id가 다음 윈도우로 넘어가도 이전 윈도우 구간의 id는 중복
+        trades = stream(240) + stream(240)[100:140]
+        candles, lates, generator = run(trades, dedup=DedupPolicy())
+        plain, _, _ = run(stream(240))
+
+        assert candles == plain
+        assert lates == []
+        assert generator.trade_id_filter.duplicates == 40
+
+    def test_run_survives_pruning(self):
+        dedup = SymbolDedup(TradeIdFilter(DedupPolicy()), MINUTE_NS)
+        assert not dedup.seen(0, 0, None)
+        # add 인라인 경로처럼 구간 끝만 올림
+        dedup.next_id = 120
+        assert dedup.id_count() == 120
+        assert not dedup.seen(120, MINUTE_NS, 2 * MINUTE_NS)
+
+        assert dedup.filter.count == 120
+        assert dedup.seen(60, SECOND_NS, None)
+
+    def test_non_int_ids(self):
+        start = to_epoch_ns(BASE)
+        candles: list[Candle] = []
+        generator = CandleGenerator(on_candle=candles.append, dedup=DedupPolicy())
+        for trade_id in ("a", "b", "a", 1.0, 1, 2):
+            generator.process_values("BTCUSDT", 100.0, 1.0, start, trade_id=trade_id)
+        generator.flush()
+
+        assert candles[0].trade_count == 4
+        assert generator.trade_id_filter.duplicates == 2
+
+
+class TestSymbolDedup:
+    """정확한 집합 정리 / fingerprint 한도"""
+
+    def test_pruning_bounds_exact_set(self):
+        dedup = SymbolDedup(TradeIdFilter(DedupPolicy()), MINUTE_NS)
+        for i in range(10 * 120):
+            ts_ns = i * SECOND_NS // 2
+            assert not dedup.seen(i, ts_ns, ts_ns - 5 * SECOND_NS)
+            # 열린 윈도우 (현재 + watermark 지연 중인 직전 윈도우) id만 보관
+            assert dedup.id_count() <= 240
+
+        assert dedup.filter.count + dedup.id_count() == 10 * 120
+        assert dedup.seen(5, 5 * SECOND_NS // 2, None)
+
+    def test_eviction_of_oldest_buckets(self):
+        id_filter = TradeIdFilter(DedupPolicy(max_pruned_ids=250))
+        dedup = SymbolDedup(id_filter, MINUTE_NS)
+        for i in range(6 * 120):
+            ts_ns = i * SECOND_NS // 2
+            dedup.seen(i, ts_ns, ts_ns)
+
+        assert id_filter.count <= 250
+        assert id_filter.state_bytes() == id_filter.count * 4
+        # 가장 오래된 버킷은 버려져 더 이상 중복으로 판정하지 않음, 최근 정리 버킷은 판정
+        assert sorted(dedup.pruned) == [3, 4]
+        assert not dedup.seen(0, 0, None)
+        assert dedup.seen(4 * 120, 4 * MINUTE_NS, None)
+
+    def test_zero_cap_keeps_only_exact_set(self):
+        id_filter = TradeIdFilter(DedupPolicy(max_pruned_ids=0))
+        dedup = SymbolDedup(id_filter, MINUTE_NS)
+        for i in range(3 * 120):
+            ts_ns = i * SECOND_NS // 2
+            dedup.seen(i, ts_ns, ts_ns)
+        assert id_filter.count == 0
+        assert dedup.pruned == {}
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            DedupPolicy(max_pruned_ids=-1)
+
+
+class TestTradeId:
+    def test_dict_round_trip(self):
+        t = trade(42, 1.5)
+        data = t.to_dict()
+        assert data["trade_id"] == 42
+        assert Trade.from_dict(data) == t
+
+    def test_dict_without_id(self):
+        t = Trade("BTCUSDT", 100.0, 1.0, BASE)
+        assert "trade_id" not in t.to_dict()
+        assert Trade.from_dict(t.to_dict()).trade_id is None
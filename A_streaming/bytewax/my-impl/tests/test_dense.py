@@ -0,0 +1,160 @@
+"""dense.py 배열 상태 캔들 생성기 테스트"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.columns import TradeBatch
+from src.dense import DenseCandleGenerator
+from src.sink import BufferedCandleSink
+from src.window import to_epoch_ns
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def trade(symbol: str, seconds: float, price: float = 100.0, quantity: float = 1.0) -> Trade:
+    return Trade(symbol, price, quantity, BASE + timedelta(seconds=seconds))
+
+
+def random_trades(n: int, seed: int, jitter: float = 8.0) -> list[Trade]:
+    rng = random.Random(seed)
+    symbols = [f"SYM{i}" for i in range(7)]
+    trades = []
+    t = BASE
+    for _ in range(n):
+        t += timedelta(milliseconds=rng.randint(0, 400))
+        late = timedelta(seconds=rng.random() * jitter)
+        trades.append(Trade(rng.choice(symbols), 100 + rng.random(), rng.random(), t - late))
+    return trades
+
+
+def run_both(trades: list[Trade], **kwargs):
+    """같은 거래를 CandleGenerator / DenseCandleGenerator로 처리한 (캔들, Late) 결과"""
+    results = []
+    for cls in (CandleGenerator, DenseCandleGenerator):
+        candles, late = [], []
+        generator = cls(on_candle=candles.append, on_late=late.append, **kwargs)
+        for t in trades:
+            generator.process(t)
+        generator.flush()
+        results.append((candles, late))
+    return results
+
+
+class TestParity:
+    """CandleGenerator와 같은 캔들 / Late 데이터"""
+
+    @pytest.mark.parametrize("delay", [0, 5, 200])
+    def test_random_out_of_order(self, delay):
+        trades = random_trades(5000, seed=delay)
+        expected, dense = run_both(trades, watermark_delay=timedelta(seconds=delay))
+        assert dense == expected
+        assert expected[0] and (expected[1] or delay == 200)
+
+    def test_sparse_trades_skip_buckets(self):
+        # 거래 사이 간격이 슬롯 수보다 훨씬 큰 버킷을 건너뜀
+        trades = [trade("BTCUSDT", s, 100.0 + s) for s in (0, 30, 3600, 3601, 86400, 86401.5)]
+        expected, dense = run_both(trades, window_size=timedelta(seconds=10))
+        assert dense == expected
+
+    @pytest.mark.parametrize("delay", [timedelta(0), timedelta(microseconds=500)])
+    def test_delay_below_window_end_offset(self, delay):
+        # watermark_delay < 1ms: 윈도우 종료 (59.999초) 뒤의 거래는 자기 윈도우를 바로 닫음
+        trades = [trade("BTCUSDT", s, 100.0 + s) for s in (10, 59.9995, 61)]
+        expected, dense = run_both(trades, watermark_delay=delay)
+        assert dense == expected
+        assert [c.trade_count for c in expected[0]] == [2, 1]
+
+    def test_bitwise_volume(self):
+        trades = [trade("BTCUSDT", i * 0.01, quantity=0.1 + i * 1e-7) for i in range(5000)]
+        expected, dense = run_both(trades)
+        assert [c.volume for c in dense[0]] == [c.volume for c in expected[0]]
+
+    def test_advance_watermark(self):
+        candles = []
+        generator = DenseCandleGenerator(on_candle=candles.append)
+        generator.process(trade("BTCUSDT", 10))
+        generator.process(trade("ETHUSDT", 20))
+        assert generator.open_window_count() == 2
+
+        generator.advance_watermark_ns(to_epoch_ns(BASE + timedelta(minutes=1, seconds=5)))
+        assert generator.open_window_count() == 0
+        assert [c.symbol for c in candles] == ["BTCUSDT", "ETHUSDT"]
+        assert generator.watermark_ns("BTCUSDT") == to_epoch_ns(BASE + timedelta(minutes=1))
+        assert generator.watermark_ns("XRPUSDT") is None
+
+
+class TestDenseCandleGenerator:
+    """intern / 입력 경로 / 상태 크기"""
+
+    def test_intern(self):
+        generator = DenseCandleGenerator(watermark_delay=timedelta(minutes=3))
+        assert generator.slots == 5
+        assert generator.intern("BTCUSDT") == 0
+        assert generator.intern("ETHUSDT") == 1
+        assert generator.intern("BTCUSDT") == 0
+        assert generator.symbols == ["BTCUSDT", "ETHUSDT"]
+        # 심볼당 슬롯 5개 × 9 컬럼 + 심볼별 3 컬럼
+        assert generator.state_bytes() == 2 * (5 * 9 + 3) * 8
+
+    def test_process_id_and_values(self):
+        trades = random_trades(2000, seed=3)
+        expected, _ = run_both(trades)
+
+        by_id, by_values = [], []
+        generator = DenseCandleGenerator(on_candle=by_id.append)
+        values = DenseCandleGenerator(on_candle=by_values.append)
+        ids = {symbol: generator.intern(symbol) for symbol in sorted({t.symbol for t in trades})}
+        for t in trades:
+            ts_ns = to_epoch_ns(t.timestamp)
+            generator.process_id(ids[t.symbol], t.price, t.quantity, ts_ns)
+            values.process_values(t.symbol, t.price, t.quantity, ts_ns)
+        generator.flush()
+        values.flush()
+
+        assert by_values == expected[0]
+        # intern 순서가 달라도 심볼별 캔들은 같음
+        assert sorted(by_id, key=lambda c: (c.symbol, c.open_time)) == sorted(
+            expected[0], key=lambda c: (c.symbol, c.open_time)
+        )
+
+    def test_process_trades(self):
+        trades = random_trades(3000, seed=4)
+        expected, _ = run_both(trades)
+
+        batched = []
+        late = []
+        generator = DenseCandleGenerator(on_candle=batched.append, on_late=late.append)
+        for start in range(0, len(trades), 700):
+            generator.process_trades(TradeBatch(trades[start : start + 700]))
+        generator.flush()
+        assert batched == expected[0]
+        assert [item.trade for item in late] == [item.trade for item in expected[1]]
+
+    def test_on_candles_sink_flush(self):
+        batches = []
+        sink = BufferedCandleSink(batches.append, max_count=100)
+        generator = DenseCandleGenerator(on_candles=sink)
+        generator.process(trade("BTCUSDT", 10))
+        generator.process(trade("BTCUSDT", 70))
+        assert batches == []
+        generator.flush()
+        assert [len(batch) for batch in batches] == [2]
+
+    def test_keeps_tz(self):
+        kst = timezone(timedelta(hours=9))
+        candles = []
+        generator = DenseCandleGenerator(on_candle=candles.append, tz=kst)
+        generator.process(trade("BTCUSDT", 10))
+        generator.flush()
+        assert candles[0].open_time == BASE
+        assert candles[0].open_time.utcoffset() == timedelta(hours=9)
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            DenseCandleGenerator(window_size=timedelta(0))
+        with pytest.raises(ValueError):
+            DenseCandleGenerator(watermark_delay=timedelta(seconds=-1))
@@ -0,0 +1,195 @@
+"""eviction.py 심볼 / 열린 윈도우 한도 테스트"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.eviction import EvictionPolicy
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def trade(symbol: str, seconds: float, price: float = 100.0) -> Trade:
+    return Trade(symbol, price, 1.0, BASE + timedelta(seconds=seconds))
+
+
+def new_generator(candles, late_items=None, **policy):
+    return CandleGenerator(
+        window_size=timedelta(minutes=1),
+        watermark_delay=timedelta(seconds=5),
+        on_candle=candles.append,
+        on_late=late_items.append if late_items is not None else None,
+        eviction=EvictionPolicy(**policy),
+    )
+
+
+class TestIdleTtl:
+    """idle_ttl: 오래 거래가 없는 심볼 제거"""
+
+    def test_evicts_idle_symbol_and_flushes_windows(self):
+        candles = []
+        generator = new_generator(candles, idle_ttl=timedelta(minutes=10))
+        generator.process(trade("OLDUSDT", 10))
+        for minute in range(0, 30):
+            generator.process(trade("BTCUSDT", minute * 60 + 1))
+
+        assert "OLDUSDT" not in generator.window_managers
+        old = [c for c in candles if c.symbol == "OLDUSDT"]
+        assert len(old) == 1
+        assert old[0].trade_count == 1
+
+    def test_active_symbols_kept(self):
+        generator = new_generator([], idle_ttl=timedelta(minutes=10))
+        for minute in range(0, 30):
+            generator.process(trade("BTCUSDT", minute * 60 + 1))
+            generator.process(trade("ETHUSDT", minute * 60 + 2))
+
+        assert set(generator.window_managers) == {"BTCUSDT", "ETHUSDT"}
+
+    def test_manual_sweep(self):
+        generator = new_generator([], idle_ttl=timedelta(minutes=1))
+        generator.process(trade("BTCUSDT", 0))
+
+        assert generator.evict_idle(generator.window_managers["BTCUSDT"].watermark_ns) == []
+        now = BASE + timedelta(minutes=5)
+        assert generator.evict_idle(int(now.timestamp()) * 10**9) == ["BTCUSDT"]
+
+    def test_manual_watermark_does_not_keep_symbol_alive(self):
+        """advance_watermark()는 watermark만 올리고 마지막 거래 시간은 그대로"""
+        candles = []
+        generator = new_generator(candles, idle_ttl=timedelta(minutes=5))
+        generator.process(trade("BTCUSDT", 0))
+        for minute in range(1, 61):
+            generator.advance_watermark(BASE + timedelta(minutes=minute))
+
+        assert generator.window_managers == {}
+        assert [c.trade_count for c in candles] == [1]
+
+
+class TestMaxSymbols:
+    """max_symbols: LRU 제거"""
+
+    def test_evicts_least_recent_symbol(self):
+        candles = []
+        generator = new_generator(candles, max_symbols=2)
+        generator.process(trade("AUSDT", 10))
+        generator.process(trade("BUSDT", 20))
+        generator.process(trade("AUSDT", 30))
+        generator.process(trade("CUSDT", 40))
+
+        assert set(generator.window_managers) == {"AUSDT", "CUSDT"}
+        assert [c.symbol for c in candles] == ["BUSDT"]
+
+    def test_lru_uses_last_trade_with_global_watermark(self):
+        """전역 watermark로 모든 심볼의 watermark가 같아도 마지막 거래 순으로 제거"""
+        generator = CandleGenerator(
+            global_watermark=True, eviction=EvictionPolicy(max_symbols=2)
+        )
+        generator.process(trade("AUSDT", 10))
+        generator.process(trade("BUSDT", 20))
+        generator.process(trade("AUSDT", 30))
+        # 윈도우 만료로 두 심볼의 watermark가 같아짐
+        generator.advance_watermark(BASE + timedelta(minutes=2))
+        generator.process(trade("CUSDT", 130))
+
+        assert set(generator.window_managers) == {"AUSDT", "CUSDT"}
+
+    def test_returning_symbol_starts_fresh(self):
+        generator = new_generator([], max_symbols=1)
+        generator.process(trade("AUSDT", 10))
+        generator.process(trade("BUSDT", 20))
+        generator.process(trade("AUSDT", 5))
+
+        assert set(generator.window_managers) == {"AUSDT"}
+        assert generator.window_managers["AUSDT"].watermark_ns is not None
+
+
+class TestMaxOpenWindows:
+    """max_open_windows: 가장 오래된 윈도우 강제 닫기"""
+
+    def test_closes_oldest_windows_early(self):
+        candles, late_items = [], []
+        generator = CandleGenerator(
+            window_size=timedelta(seconds=1),
+            watermark_delay=timedelta(minutes=10),
+            on_candle=candles.append,
+            on_late=late_items.append,
+            eviction=EvictionPolicy(max_open_windows=16),
+        )
+        for sec in range(40):
+            generator.process(trade("BTCUSDT" if sec % 2 else "ETHUSDT", sec))
+            open_windows = sum(len(m.windows) for m in generator.window_managers.values())
+            assert open_windows <= 16
+            assert generator._window_budget.open == open_windows
+
+        # 시간순으로 가장 오래된 윈도우부터 닫힘
+        closed_at = [c.open_time for c in candles]
+        assert closed_at == sorted(closed_at)
+        assert closed_at[0] == BASE
+
+        # 강제로 닫힌 윈도우의 거래는 Late
+        generator.process(trade("ETHUSDT", 0.5))
+        assert len(late_items) == 1
+
+        generator.flush()
+        assert len(candles) == 40
+        assert generator._window_budget.open == 0
+
+    def test_out_of_order_window_keeps_symbol_order(self):
+        """지연 안의 순서 뒤바뀐 거래가 같은 심볼의 더 늦은 윈도우를 닫지 않음"""
+        candles, late_items = [], []
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(minutes=5),
+            on_candle=candles.append,
+            on_late=late_items.append,
+            eviction=EvictionPolicy(max_open_windows=1),
+        )
+        for seconds in (120, 60, 90):
+            generator.process(trade("BTCUSDT", seconds))
+        generator.flush()
+
+        assert late_items == []
+        assert [c.open_time.minute for c in candles] == [1, 2]
+        assert [c.trade_count for c in candles] == [2, 1]
+
+    def test_other_symbols_still_closed_for_out_of_order_window(self):
+        candles = []
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(minutes=5),
+            on_candle=candles.append,
+            eviction=EvictionPolicy(max_open_windows=2),
+        )
+        generator.process(trade("ETHUSDT", 0))
+        generator.process(trade("BTCUSDT", 120))
+        generator.process(trade("BTCUSDT", 60))
+
+        # 다른 심볼의 가장 오래된 윈도우만 닫힘
+        assert [(c.symbol, c.open_time.minute) for c in candles] == [("ETHUSDT", 0)]
+        assert generator._window_budget.open == 2
+
+
+class TestEvictionCheckpoint:
+    """제거된 심볼이 증분 체크포인트로 전달됨"""
+
+    def test_incremental_snapshot_removes_evicted_symbol(self):
+        source = new_generator([], max_symbols=2)
+        replica = new_generator([], max_symbols=2)
+        source.process(trade("AUSDT", 10))
+        source.process(trade("BUSDT", 20))
+        replica.restore(source.snapshot())
+
+        source.process(trade("CUSDT", 30))
+        replica.restore(source.snapshot(incremental=True))
+
+        assert set(replica.window_managers) == {"BUSDT", "CUSDT"}
+
+
+def test_rejects_invalid_policy():
+    with pytest.raises(ValueError):
+        EvictionPolicy(max_symbols=0)
+    with pytest.raises(ValueError):
+        EvictionPolicy(idle_ttl=timedelta(0))
@@ -121,6 +121,36 @@ class TestWindowManager:
         assert manager_5m._format_interval() == "5m"
         assert manager_1h._format_interval() == "1h"
 
+    def test_windows_keyed_by_bucket(self):
+        """윈도우는 정수 버킷 인덱스로 관리"""
+        manager = WindowManager("BTCUSDT", timedelta(minutes=1), timedelta(seconds=5))
+        ts = datetime(2026, 1, 26, 10, 30, 15, tzinfo=timezone.utc)
+        manager.add_trade(Trade("BTCUSDT", 50000.0, 0.1, ts))
+
+        bucket = int(ts.timestamp()) // 60
+        assert list(manager.windows) == [bucket]
+        assert manager.windows[bucket].open_time == datetime(2026, 1, 26, 10, 30, tzinfo=timezone.utc)
+
+    def test_watermark_datetime_view(self):
+        """watermark는 ns로 관리하고 datetime으로도 조회 가능"""
+        manager = WindowManager("BTCUSDT", timedelta(minutes=1), timedelta(seconds=5))
+        assert manager.watermark is None
+
+        manager.advance_watermark(datetime(2026, 1, 26, 10, 30, 15, tzinfo=timezone.utc))
+
+        assert manager.watermark == datetime(2026, 1, 26, 10, 30, 10, tzinfo=timezone.utc)
+
+    def test_candle_keeps_trade_timezone(self):
+        """캔들 시간은 거래의 timezone으로 생성"""
+        kst = timezone(timedelta(hours=9))
+        manager = WindowManager("BTCUSDT", timedelta(minutes=1), timedelta(seconds=5))
+        manager.add_trade(Trade("BTCUSDT", 50000.0, 0.1, datetime(2026, 1, 26, 19, 30, 15, tzinfo=kst)))
+
+        candle = manager.flush()[0]
+
+        assert candle.open_time.tzinfo == kst
+        assert candle.open_time == datetime(2026, 1, 26, 19, 30, tzinfo=kst)
+
 
 class TestCandleGeneratorTC001:
     """TC-001: 기본 캔들 생성
@@ -372,3 +402,133 @@ class TestProcessDict:
 
         assert len(candles) == 1
         assert candles[0].symbol == "BTCUSDT"
+
+
+class TestWindowExpiry:
+    """heap 기반 윈도우 만료 테스트"""
+
+    def test_expires_only_closed_windows_in_order(self):
+        """순서 없이 열린 윈도우도 만료 시 시간순으로 닫힘"""
+        manager = WindowManager("BTCUSDT", timedelta(seconds=1), timedelta(seconds=10))
+        base = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+        for sec in (5, 2, 8, 0, 3):
+            manager.add_trade(Trade("BTCUSDT", 50000.0 + sec, 0.1, base + timedelta(seconds=sec)))
+
+        # watermark = 10:00:04 → 0, 2, 3초 윈도우만 닫힘
+        candles = manager.advance_watermark(base + timedelta(seconds=14))
+
+        assert [c.open_time.second for c in candles] == [0, 2, 3]
+        assert sorted(manager.windows) == sorted(manager._expiry)
+        assert len(manager.windows) == 2
+
+    def test_window_end_boundary(self):
+        """윈도우 종료 시간(시작 + 크기 - 1ms)과 watermark가 같으면 아직 열림"""
+        manager = WindowManager("BTCUSDT", timedelta(seconds=1), timedelta(0))
+        base = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+        manager.add_trade(Trade("BTCUSDT", 50000.0, 0.1, base))
+
+        assert manager.advance_watermark(base + timedelta(milliseconds=999)) == []
+        assert len(manager.advance_watermark(base + timedelta(milliseconds=999, microseconds=1))) == 1
+
+
+class TestAllowedLateness:
+    """allowed_lateness: 제때 emit한 캔들을 Late 거래로 수정"""
+
+    def make_generator(self, candles, updates, late_items):
+        return CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=1),
+            allowed_lateness=timedelta(seconds=30),
+            on_candle=candles.append,
+            on_update=updates.append,
+            on_late=late_items.append,
+        )
+
+    def test_late_trade_amends_emitted_candle(self):
+        """allowed_lateness 안의 Late 거래는 수정된 캔들로 on_update"""
+        candles, updates, late_items = [], [], []
+        generator = self.make_generator(candles, updates, late_items)
+        base = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+        generator.process(Trade("BTCUSDT", 100.0, 1.0, base + timedelta(seconds=10)))
+        generator.process(Trade("BTCUSDT", 101.0, 1.0, base + timedelta(seconds=50)))
+        # watermark = 10:01:09 → 10:00 캔들 emit
+        generator.process(Trade("BTCUSDT", 102.0, 1.0, base + timedelta(seconds=70)))
+        assert len(candles) == 1 and candles[0].trade_count == 2
+
+        # 10:00 윈도우 종료 후 9초 → 수정
+        generator.process(Trade("BTCUSDT", 90.0, 0.5, base + timedelta(seconds=5)))
+
+        assert late_items == []
+        assert len(updates) == 1
+        amended = updates[0]
+        assert amended.open_time == candles[0].open_time
+        assert amended.open == 90.0
+        assert amended.low == 90.0
+        assert amended.close == 101.0
+        assert amended.volume == 2.5
+        assert amended.trade_count == 3
+
+    def test_trade_beyond_allowed_lateness_is_late(self):
+        """보관 기간이 지난 윈도우의 거래는 LateData"""
+        candles, updates, late_items = [], [], []
+        generator = self.make_generator(candles, updates, late_items)
+        base = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+        generator.process(Trade("BTCUSDT", 100.0, 1.0, base + timedelta(seconds=10)))
+        # watermark = 10:01:40 → 10:00 윈도우 종료 후 40초 (> 30초)
+        generator.process(Trade("BTCUSDT", 102.0, 1.0, base + timedelta(seconds=101)))
+        generator.process(Trade("BTCUSDT", 90.0, 0.5, base + timedelta(seconds=5)))
+
+        assert updates == []
+        assert len(late_items) == 1
+        assert generator.window_managers["BTCUSDT"].retained == {}
+
+    def test_late_trade_for_open_window_is_aggregated(self):
+        """watermark 이전이지만 아직 열린 윈도우의 거래는 그대로 집계"""
+        candles, updates, late_items = [], [], []
+        generator = self.make_generator(candles, updates, late_items)
+        base = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+        generator.process(Trade("BTCUSDT", 100.0, 1.0, base + timedelta(seconds=30)))
+        generator.process(Trade("BTCUSDT", 99.0, 1.0, base + timedelta(seconds=10)))
+        generator.flush()
+
+        assert updates == [] and late_items == []
+        assert candles[0].open == 99.0
+        assert candles[0].trade_count == 2
+
+    def test_matches_large_watermark_delay(self):
+        """최종 캔들(마지막 수정 반영)은 큰 watermark_delay로 만든 캔들과 같음"""
+        base = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+        offsets = [3, 20, 15, 62, 40, 75, 130, 70, 125, 190, 181, 250]
+        trades = [
+            Trade("BTCUSDT", 100.0 + i, 1.0, base + timedelta(seconds=sec))
+            for i, sec in enumerate(offsets)
+        ]
+
+        reference = []
+        slow = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=60),
+            on_candle=reference.append,
+        )
+        candles, updates, late_items = [], [], []
+        fast = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=1),
+            allowed_lateness=timedelta(seconds=59),
+            on_candle=candles.append,
+            on_update=updates.append,
+            on_late=late_items.append,
+        )
+        for trade in trades:
+            slow.process(trade)
+            fast.process(trade)
+        slow.flush()
+        fast.flush()
+
+        latest = {c.open_time: c for c in candles + updates}
+        assert updates
+        assert late_items == []
+        assert [latest[c.open_time] for c in reference] == reference
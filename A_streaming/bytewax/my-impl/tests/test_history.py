@@ -0,0 +1,199 @@
+"""history.py 캔들 히스토리 저장소 테스트"""
+
+import os
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Candle, Trade
+from src.candle_generator import CandleGenerator
+from src.kernels import VWAP
+from src.history import INDEX_STRIDE, RECORD, CandleHistory
+
+BASE = datetime(2026, 1, 26, 23, 0, 0, tzinfo=timezone.utc)
+KST = timezone(timedelta(hours=9))
+
+
+def trade(symbol: str, seconds: float, price: float = 100.0, tz=timezone.utc) -> Trade:
+    return Trade(symbol, price, 1.5, (BASE + timedelta(seconds=seconds)).astimezone(tz))
+
+
+def at(minute: float) -> datetime:
+    return BASE + timedelta(minutes=minute)
+
+
+def run(history: CandleHistory, minutes: int, symbols=("BTCUSDT", "ETHUSDT")) -> list[Candle]:
+    candles: list[Candle] = []
+    generator = CandleGenerator(on_candle=candles.append, on_candles=history)
+    for minute in range(minutes):
+        for i, symbol in enumerate(symbols):
+            generator.process(trade(symbol, minute * 60 + i, 100.0 + minute))
+    generator.flush()
+    return candles
+
+
+def of(candles: list[Candle], symbol: str) -> list[Candle]:
+    return [c for c in candles if c.symbol == symbol]
+
+
+class TestCandleHistory:
+    """CandleHistory 저장 / 범위 조회 / compact"""
+
+    def test_round_trip_across_days(self, tmp_path):
+        history = CandleHistory(str(tmp_path), max_pending=7)
+        candles = of(run(history, 90), "BTCUSDT")
+
+        # 23:00 ~ 00:29 → 두 날짜 파일
+        directory = tmp_path / "BTCUSDT" / "1m"
+        assert sorted(os.listdir(directory)) == ["20260126.cndl", "20260127.cndl"]
+        assert os.path.getsize(directory / "20260126.cndl") == 60 * RECORD.size
+
+        view = history.range("BTCUSDT", "1m", at(0), at(100))
+        assert len(view) == 90 and len(view.segments) == 2
+        assert list(view) == candles
+        assert list(history.range("BTCUSDT", "1m", at(58), at(62))) == candles[58:62]
+        assert list(history.range("BTCUSDT", "1m", at(10) + timedelta(seconds=1), at(11))) == []
+        assert len(history.range("BTCUSDT", "1m", at(10), at(5))) == 0
+        assert len(history.range("XRPUSDT", "1m", at(0), at(10))) == 0
+
+    def test_sparse_index_search(self, tmp_path):
+        history = CandleHistory(str(tmp_path))
+        minutes = 3 * INDEX_STRIDE + 5
+        generator = CandleGenerator(on_candles=history)
+        start = datetime(2026, 1, 26, tzinfo=timezone.utc)
+        for minute in range(minutes):
+            timestamp = start + timedelta(minutes=minute)
+            generator.process(Trade("BTCUSDT", 1.0 + minute, 1.0, timestamp))
+        generator.flush()
+
+        for lo, hi in [(0, 1), (63, 65), (64, 128), (100, minutes), (minutes - 1, minutes + 10)]:
+            view = history.range(
+                "BTCUSDT", "1m", start + timedelta(minutes=lo), start + timedelta(minutes=hi)
+            )
+            assert [c.open for c in view] == [1.0 + m for m in range(lo, min(hi, minutes))]
+
+    def test_views_are_zero_copy(self, tmp_path):
+        np = pytest.importorskip("numpy")
+        history = CandleHistory(str(tmp_path))
+        candles = of(run(history, 30), "ETHUSDT")
+
+        view = history.range("ETHUSDT", "1m", at(5), at(15))
+        assert isinstance(view.segments[0], memoryview)
+        rows = view.to_numpy()
+        assert not rows.flags.owndata
+        assert rows["close"].tolist() == [c.close for c in candles[5:15]]
+        assert rows["trade_count"].tolist() == [1] * 10
+
+        # 두 날짜에 걸치면 이어 붙인 배열
+        assert len(history.range("ETHUSDT", "1m", at(0), at(100)).to_numpy()) == 30
+        assert len(history.range("ETHUSDT", "1m", at(200), at(300)).to_numpy()) == 0
+
+    def test_reopen_from_disk(self, tmp_path):
+        with CandleHistory(str(tmp_path)) as history:
+            candles = of(run(history, 70), "BTCUSDT")
+
+        reopened = CandleHistory(str(tmp_path))
+        assert list(reopened.range("BTCUSDT", "1m", at(0), at(100))) == candles
+
+        # 재시작 후에도 이어서 추가
+        later = replace(
+            candles[-1], open_time=at(70), close_time=at(71) - timedelta(milliseconds=1)
+        )
+        reopened.append(later)
+        assert list(reopened.range("BTCUSDT", "1m", at(65), at(100))) == candles[65:] + [later]
+
+    def test_keeps_timezone(self, tmp_path):
+        history = CandleHistory(str(tmp_path))
+        generator = CandleGenerator(on_candles=history)
+        generator.process(trade("BTCUSDT", 10, tz=KST))
+        generator.flush()
+
+        [candle] = history.range("BTCUSDT", "1m", at(0), at(1))
+        assert candle.open_time.utcoffset() == timedelta(hours=9)
+        assert candle.close_time == candle.open_time + timedelta(seconds=59, milliseconds=999)
+
+
+class TestAmend:
+    """수정 로그와 compact"""
+
+    def test_amended_candle_from_generator(self, tmp_path):
+        history = CandleHistory(str(tmp_path))
+        generator = CandleGenerator(
+            watermark_delay=timedelta(seconds=1),
+            allowed_lateness=timedelta(seconds=30),
+            on_candles=history,
+            on_update=history.amend,
+        )
+        generator.process(trade("BTCUSDT", 10, 100.0))
+        generator.process(trade("BTCUSDT", 65, 101.0))  # 23:00 캔들 emit
+        generator.process(trade("BTCUSDT", 20, 200.0))  # Late → 수정
+        generator.flush()
+
+        candles = list(history.range("BTCUSDT", "1m", at(0), at(2)))
+        assert (candles[0].high, candles[0].trade_count) == (200.0, 2)
+        assert candles[1].open == 101.0
+        assert not os.path.exists(tmp_path / "BTCUSDT" / "1m" / "20260126.amend")
+
+    def test_compact_in_place(self, tmp_path):
+        history = CandleHistory(str(tmp_path))
+        candles = of(run(history, 20, symbols=("BTCUSDT",)), "BTCUSDT")
+        view = history.range("BTCUSDT", "1m", at(0), at(20))
+
+        history.amend(replace(candles[3], close=1.0))
+        history.amend(replace(candles[3], close=2.0))  # 마지막 수정이 이김
+        history.amend(replace(candles[12], volume=9.0))
+        history.flush()
+        amend_path = tmp_path / "BTCUSDT" / "1m" / "20260126.amend"
+        assert os.path.getsize(amend_path) == 3 * RECORD.size
+
+        history.compact()
+        assert not os.path.exists(amend_path)
+        result = list(history.range("BTCUSDT", "1m", at(0), at(20)))
+        assert result[3].close == 2.0 and result[12].volume == 9.0
+        assert result[:3] == candles[:3] and len(result) == 20
+        # 제자리 덮어쓰기: 이전에 돌려준 mmap 뷰에도 보임
+        assert list(view)[3].close == 2.0
+
+    def test_compact_rewrites_for_new_open_time(self, tmp_path):
+        history = CandleHistory(str(tmp_path))
+        candles = of(run(history, 10, symbols=("BTCUSDT",)), "BTCUSDT")
+        view = history.range("BTCUSDT", "1m", at(0), at(10))
+
+        # 빈 분 (거래 없음)에 들어온 늦은 캔들: 중간에 끼워 넣음
+        missing = replace(candles[0], open_time=at(4.5), close_time=at(5))
+        history.append(replace(candles[9], close=7.0))
+        history.append(missing)
+        result = list(history.range("BTCUSDT", "1m", at(0), at(10)))
+
+        assert result == candles[:5] + [missing] + candles[5:9] + [replace(candles[9], close=7.0)]
+        # 다시 쓴 파일은 새 파일: 이전 뷰는 그대로
+        assert list(view) == candles
+
+    def test_compact_threshold(self, tmp_path):
+        history = CandleHistory(str(tmp_path), compact_threshold=2)
+        candles = of(run(history, 5, symbols=("BTCUSDT",)), "BTCUSDT")
+        amend_path = tmp_path / "BTCUSDT" / "1m" / "20260126.amend"
+
+        history.amend(replace(candles[0], close=1.0))
+        history.flush()
+        assert os.path.exists(amend_path)
+        history.amend(replace(candles[1], close=1.0))
+        history.flush()
+        assert not os.path.exists(amend_path)
+
+    def test_rejects_kernel_fields(self, tmp_path):
+        """레코드에 없는 커널 필드는 조용히 버리지 않고 거부"""
+        history = CandleHistory(str(tmp_path))
+        generator = CandleGenerator(on_candles=history, kernels=[VWAP])
+        generator.process(trade("BTCUSDT", 0))
+        with pytest.raises(TypeError):
+            generator.flush()
+        with pytest.raises(TypeError):
+            history.amend(replace(run(history, 1)[0], vwap=100.0))
+
+    def test_invalid_parameters(self, tmp_path):
+        with pytest.raises(ValueError):
+            CandleHistory(str(tmp_path), max_pending=0)
+        with pytest.raises(ValueError):
+            CandleHistory(str(tmp_path), compact_threshold=0)
@@ -0,0 +1,313 @@
+"""kernels.py 집계 커널 테스트"""
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Candle, Trade
+from src.candle_generator import CandleAggregator, CandleGenerator
+from src.kernels import (
+    PRICE_QUANTILES,
+    SIZE_QUANTILES,
+    TAKER_VOLUME,
+    TURNOVER,
+    VWAP,
+    Kernel,
+    compile_aggregator,
+    quantile_kernel,
+)
+from src.rollup import MultiIntervalCandleGenerator
+from src.sketch import QuantileSketch
+from src.window import to_epoch_ns
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+SIDES = (True, False, None)
+
+
+def trade(seconds: float, price: float = 100.0, quantity: float = 1.0, side=None) -> Trade:
+    return Trade("BTCUSDT", price, quantity, BASE + timedelta(seconds=seconds), side)
+
+
+def random_trades(n: int, seed: int) -> list[Trade]:
+    rng = random.Random(seed)
+    trades = []
+    t = BASE
+    for _ in range(n):
+        t += timedelta(milliseconds=rng.randint(0, 300))
+        late = timedelta(seconds=rng.random() * 3)
+        trades.append(
+            Trade(
+                rng.choice(["BTCUSDT", "ETHUSDT"]),
+                100 + rng.random(),
+                rng.random(),
+                t - late,
+                rng.choice(SIDES),
+            )
+        )
+    return trades
+
+
+def run(trades: list[Trade], **kwargs) -> list[Candle]:
+    candles: list[Candle] = []
+    generator = CandleGenerator(on_candle=candles.append, **kwargs)
+    for t in trades:
+        generator.process(t)
+    generator.flush()
+    return candles
+
+
+def expected_sums(trades: list[Trade], candle: Candle) -> tuple[float, float, float, float]:
+    """캔들 윈도우에 속한 거래의 (거래량, 거래대금, 매수, 매도) 도착 순서 합"""
+    volume = turnover = buy = sell = 0.0
+    for t in trades:
+        if t.symbol == candle.symbol and candle.open_time <= t.timestamp <= candle.close_time:
+            volume += t.quantity
+            turnover += t.price * t.quantity
+            buy += t.quantity if t.is_buyer_maker is False else 0.0
+            sell += t.quantity if t.is_buyer_maker else 0.0
+    return volume, turnover, buy, sell
+
+
+class TestKernels:
+    """커널 값 / OHLCV 보존"""
+
+    def test_values_match_brute_force(self):
+        trades = random_trades(3000, seed=1)
+        candles = run(
+            trades, watermark_delay=timedelta(seconds=5), kernels=[VWAP, TURNOVER, TAKER_VOLUME]
+        )
+        assert candles
+        for candle in candles:
+            volume, turnover, buy, sell = expected_sums(trades, candle)
+            assert candle.turnover == turnover
+            assert candle.vwap == pytest.approx(turnover / volume)
+            assert (candle.buy_volume, candle.sell_volume) == (buy, sell)
+            assert buy + sell <= volume + 1e-9
+
+    def test_ohlcv_unchanged(self):
+        trades = random_trades(2000, seed=2)
+        plain = run(trades)
+        with_kernels = run(trades, kernels=[VWAP, TAKER_VOLUME])
+        stripped = [
+            replace(c, vwap=None, turnover=None, buy_volume=None, sell_volume=None)
+            for c in with_kernels
+        ]
+        assert stripped == plain
+        assert all(c.vwap is None and c.buy_volume is None for c in plain)
+
+    def test_selected_fields_only(self):
+        [candle] = run([trade(1, 100.0, 2.0, side=False)], kernels=[TAKER_VOLUME])
+        assert (candle.buy_volume, candle.sell_volume) == (2.0, 0.0)
+        assert candle.vwap is None and candle.turnover is None
+
+    def test_vwap_of_zero_volume(self):
+        [candle] = run([trade(1, 100.0, 0.0)], kernels=[VWAP])
+        assert candle.vwap is None
+
+    def test_process_values_side(self):
+        candles = []
+        generator = CandleGenerator(on_candle=candles.append, kernels=[TAKER_VOLUME])
+        ts_ns = to_epoch_ns(BASE)
+        generator.process_values("BTCUSDT", 100.0, 1.0, ts_ns, is_buyer_maker=True)
+        generator.process_values("BTCUSDT", 101.0, 0.5, ts_ns + 1, is_buyer_maker=False)
+        generator.process_values("BTCUSDT", 102.0, 0.25, ts_ns + 2)
+        generator.flush()
+        assert (candles[0].buy_volume, candles[0].sell_volume) == (0.5, 1.0)
+        assert candles[0].volume == 1.75
+
+    def test_allowed_lateness_amend(self):
+        updates = []
+        candles = run(
+            [trade(10, 100.0, 1.0, False), trade(65, 101.0), trade(20, 200.0, 2.0, True)],
+            watermark_delay=timedelta(seconds=1),
+            allowed_lateness=timedelta(seconds=30),
+            on_update=updates.append,
+            kernels=[VWAP, TURNOVER, TAKER_VOLUME],
+        )
+        [amended] = updates
+        assert amended.open_time == candles[0].open_time == BASE
+        assert candles[0].vwap == 100.0
+        assert amended.turnover == 500.0 and amended.vwap == pytest.approx(500.0 / 3)
+        assert (amended.buy_volume, amended.sell_volume) == (1.0, 2.0)
+
+    def test_global_watermark(self):
+        trades = random_trades(1500, seed=3)
+        expected = run(trades, kernels=[VWAP])
+        clocked = run(trades, global_watermark=True, kernels=[VWAP])
+        by_key = {(c.symbol, c.open_time): c.vwap for c in expected}
+        assert clocked and all(by_key.get((c.symbol, c.open_time)) == c.vwap for c in clocked)
+
+    def test_unsupported_paths(self):
+        generator = CandleGenerator(kernels=[VWAP])
+        with pytest.raises(TypeError):
+            generator.process_batch([0], [100.0], [1.0], [to_epoch_ns(BASE)], ["BTCUSDT"])
+
+
+class TestCompileAggregator:
+    """생성된 집계 클래스"""
+
+    def test_cached_and_shared_sums(self):
+        cls = compile_aggregator((VWAP, TURNOVER))
+        assert compile_aggregator((VWAP, TURNOVER)) is cls
+        assert issubclass(cls, CandleAggregator)
+        # VWAP와 TURNOVER는 거래대금 합계 하나를 공유
+        assert cls.sum_names == ("turnover",)
+
+    def test_state_merge_copy(self):
+        cls = compile_aggregator((VWAP, TAKER_VOLUME))
+        left = cls.from_ns(0, 59_999_999_999)
+        right = cls.from_ns(0, 59_999_999_999)
+        left.add(10.0, 1.0, 1, True)
+        right.add(20.0, 3.0, 2, False)
+        assert left.state()[8:] == (10.0, 0.0, 1.0)
+
+        restored = cls.from_state(0, 59_999_999_999, None, left.state())
+        assert restored.state() == left.state()
+
+        merged = left.copy()
+        merged.merge(right)
+        merged.merge(cls.from_ns(0, 59_999_999_999))
+        candle = merged.to_candle("BTCUSDT", "1m")
+        assert (candle.vwap, candle.buy_volume, candle.sell_volume) == (17.5, 3.0, 1.0)
+        assert left.state()[8:] == (10.0, 0.0, 1.0)
+
+    def test_custom_kernel(self):
+        large = Kernel(
+            "large_buy",
+            (("large_buy", "quantity if quantity >= 1.0 and is_buyer_maker is False else 0.0"),),
+            lambda aggregator: {"buy_volume": aggregator.large_buy},
+        )
+        candles = run(
+            [trade(1, quantity=0.5, side=False), trade(2, quantity=2.0, side=False)],
+            kernels=[large],
+        )
+        assert candles[0].buy_volume == 2.0
+
+    @pytest.mark.parametrize(
+        "sums",
+        [
+            (("volume", "quantity"),),
+            (("not a name", "quantity"),),
+            (("turnover", "price"),),  # VWAP의 turnover와 다른 식
+            (("add", "quantity"),),  # 메서드 이름
+            (("to_candle", "quantity"),),
+            (("sum_names", "quantity"),),
+        ],
+    )
+    def test_invalid_sums(self, sums):
+        with pytest.raises(ValueError):
+            compile_aggregator((VWAP, Kernel("bad", sums, lambda aggregator: {})))
+
+
+def window_values(trades: list[Trade], candle: Candle) -> list[Trade]:
+    return [
+        t
+        for t in trades
+        if t.symbol == candle.symbol and candle.open_time <= t.timestamp <= candle.close_time
+    ]
+
+
+class TestQuantileKernels:
+    """윈도우별 분위수 스케치"""
+
+    def test_generated_add_matches_sketch(self):
+        trades = random_trades(3000, seed=5)
+        candles = run(trades, kernels=[PRICE_QUANTILES, SIZE_QUANTILES])
+        assert candles
+        for candle in candles:
+            prices = QuantileSketch(0.0001, 1024)
+            sizes = QuantileSketch()
+            for t in window_values(trades, candle):
+                prices.add(t.price)
+                sizes.add(t.quantity)
+            assert list(candle.price_quantiles.values()) == prices.quantiles((0.05, 0.5, 0.95))
+            assert list(candle.size_quantiles.values()) == sizes.quantiles((0.05, 0.5, 0.95))
+
+    def test_price_accuracy(self):
+        trades = random_trades(3000, seed=6)
+        for candle in run(trades, kernels=[PRICE_QUANTILES]):
+            prices = sorted(t.price for t in window_values(trades, candle))
+            assert list(candle.price_quantiles) == ["p5", "p50", "p95"]
+            for q, estimate in zip((0.05, 0.5, 0.95), candle.price_quantiles.values()):
+                assert estimate == pytest.approx(prices[int(q * (len(prices) - 1))], rel=1e-4)
+
+    def test_custom_quantiles(self):
+        kernel = quantile_kernel("size_quantiles", "quantity", quantiles=(0.25, 0.999))
+        [candle] = run([trade(i, quantity=1.0 + i) for i in range(40)], kernels=[kernel])
+        assert list(candle.size_quantiles) == ["p25", "p99.9"]
+        assert candle.size_quantiles["p25"] == pytest.approx(10.0, rel=0.01)
+        assert candle.size_quantiles["p99.9"] == pytest.approx(39.0, rel=0.01)
+        with pytest.raises(ValueError):
+            quantile_kernel("size_quantiles", "quantity", quantiles=(1.5,))
+
+    def test_rollup_matches_direct(self):
+        trades = random_trades(4000, seed=7)
+        kernels = [VWAP, PRICE_QUANTILES, SIZE_QUANTILES]
+        rolled: list[Candle] = []
+        generator = MultiIntervalCandleGenerator(
+            [timedelta(minutes=1), timedelta(minutes=5)], on_candle=rolled.append, kernels=kernels
+        )
+        for t in trades:
+            generator.process(t)
+        generator.flush()
+
+        direct = run(trades, window_size=timedelta(minutes=5), kernels=kernels)
+        five = [c for c in rolled if c.interval == "5m"]
+        assert five and len(five) == len(direct)
+        key = lambda c: (c.symbol, c.open_time)  # noqa: E731
+        for got, expected in zip(sorted(five, key=key), sorted(direct, key=key)):
+            assert got.price_quantiles == expected.price_quantiles
+            assert got.size_quantiles == expected.size_quantiles
+            assert got.vwap == pytest.approx(expected.vwap)
+
+    def test_allowed_lateness_amend(self):
+        updates = []
+        candles = run(
+            [trade(10, 100.0), trade(11, 101.0), trade(65, 102.0), trade(20, 110.0)],
+            watermark_delay=timedelta(seconds=1),
+            allowed_lateness=timedelta(seconds=30),
+            on_update=updates.append,
+            kernels=[PRICE_QUANTILES],
+        )
+        [amended] = updates
+        assert candles[0].price_quantiles["p50"] == pytest.approx(100.0, rel=1e-4)
+        # 늦은 110.0이 반영되어 중앙값이 101.0으로
+        assert amended.price_quantiles["p50"] == pytest.approx(101.0, rel=1e-4)
+        assert amended.price_quantiles["p5"] == pytest.approx(100.0, rel=1e-4)
+
+    def test_bounded_state(self):
+        cls = compile_aggregator((quantile_kernel("size_quantiles", "quantity", max_bins=32),))
+        aggregator = cls.from_ns(0, 59_999_999_999)
+        for i in range(10000):
+            aggregator.add(100.0, 1.0001**i, i)
+        assert len(aggregator.size_quantiles_sketch.bins) == 32
+        assert aggregator.size_quantiles_sketch.count == 10000
+
+
+class TestTradeSide:
+    """Trade.is_buyer_maker / Candle 추가 필드 직렬화"""
+
+    def test_trade_round_trip(self):
+        sell = Trade.from_dict(
+            {
+                "symbol": "BTCUSDT",
+                "price": 1.0,
+                "quantity": 2.0,
+                "timestamp": "2026-01-26T10:00:00Z",
+                "is_buyer_maker": True,
+            }
+        )
+        assert sell.is_buyer_maker is True
+        assert Trade.from_dict(sell.to_dict()) == sell
+        assert "is_buyer_maker" not in trade(1).to_dict()
+
+    def test_candle_to_dict(self):
+        [plain] = run([trade(1)])
+        [candle] = run([trade(1, side=True)], kernels=[VWAP])
+        assert set(candle.to_dict()) - set(plain.to_dict()) == {"vwap"}
+        assert candle.to_dict()["vwap"] == 100.0
+
+        [candle] = run([trade(1)], kernels=[PRICE_QUANTILES])
+        assert candle.to_dict()["price_quantiles"] == candle.price_quantiles
@@ -0,0 +1,154 @@
+"""metrics.py 계측 테스트"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.metrics import GeneratorMetrics, Histogram
+from src.partitions import PartitionedIngestor
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def run_trades(generator):
+    for sec in (1, 30, 61, 75, 10, 130):
+        generator.process(Trade("BTCUSDT", 100.0 + sec, 0.1, BASE + timedelta(seconds=sec)))
+    generator.process_values("ETHUSDT", 10.0, 1.0, int(BASE.timestamp()) * 10**9)
+
+
+class TestHistogram:
+    """log2 버킷 히스토그램"""
+
+    def test_record_and_quantile(self):
+        histogram = Histogram(0, 16)
+        for value in (1, 3, 3, 100, -5):
+            histogram.record(value)
+
+        assert histogram.count == 5
+        assert histogram.sum == 107
+        assert histogram.quantile(0.5) == 3
+        assert histogram.quantile(0.99) == 127
+        assert Histogram(0, 16).quantile(0.5) is None
+
+    def test_cumulative_buckets(self):
+        histogram = Histogram(2, 4)
+        for value in (0, 1, 5, 9, 1000):
+            histogram.record(value)
+
+        # le = 4, 8, 16 (value < le)
+        assert histogram.buckets() == [(4, 2), (8, 3), (16, 4)]
+
+
+class TestGeneratorMetrics:
+    """CandleGenerator 계측"""
+
+    def test_disabled_keeps_plain_methods(self):
+        generator = CandleGenerator()
+        assert generator.metrics is None
+        assert "process" not in vars(generator)
+
+    def test_counts_match_callbacks(self):
+        candles, late_items = [], []
+        metrics = GeneratorMetrics(sample_every=1)
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=5),
+            on_candle=candles.append,
+            on_late=late_items.append,
+            metrics=metrics,
+        )
+        run_trades(generator)
+        generator.flush()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["trades"] == 7
+        assert snapshot["late_trades"] == len(late_items) == 1
+        assert snapshot["candles"] == len(candles) == 4
+        histograms = snapshot["histograms_ns"]
+        assert histograms["process"]["count"] == 7
+        assert histograms["watermark_lag"]["count"] == 6
+        assert histograms["callback"]["count"] >= 2
+
+    def test_same_candles_as_uninstrumented(self):
+        plain, measured = [], []
+        run_trades(CandleGenerator(on_candle=plain.append))
+        generator = CandleGenerator(on_candle=measured.append, metrics=GeneratorMetrics())
+        run_trades(generator)
+        generator.advance_watermark(BASE + timedelta(hours=1))
+
+        assert measured == plain + measured[len(plain):]
+        assert len(measured) > len(plain)
+
+    def test_sampling(self):
+        metrics = GeneratorMetrics(sample_every=3)
+        generator = CandleGenerator(metrics=metrics)
+        run_trades(generator)
+
+        assert metrics.trades == 7
+        assert metrics.process_ns.count == 2
+
+    def test_open_windows_and_prometheus(self):
+        metrics = GeneratorMetrics()
+        generator = CandleGenerator(
+            window_size=timedelta(minutes=1),
+            watermark_delay=timedelta(minutes=10),
+            metrics=metrics,
+        )
+        run_trades(generator)
+
+        assert metrics.snapshot(generator)["open_windows"] == {"BTCUSDT": 3, "ETHUSDT": 1}
+        text = metrics.to_prometheus(generator)
+        assert "candle_generator_trades_total 7\n" in text
+        assert 'candle_generator_open_windows{symbol="BTCUSDT"} 3\n' in text
+        assert 'candle_generator_process_seconds_bucket{le="+Inf"} 0\n' in text
+        assert "# TYPE candle_generator_watermark_lag_seconds histogram" in text
+
+    def test_partitioned_ingestor_counts_trades(self):
+        candles, late_items = [], []
+        metrics = GeneratorMetrics(sample_every=1)
+        generator = CandleGenerator(
+            on_candle=candles.append,
+            on_late=late_items.append,
+            global_watermark=True,
+            metrics=metrics,
+        )
+        ingestor = PartitionedIngestor(generator, partitions=[0])
+        for offset, sec in enumerate((1, 30, 61, 75, 10, 130)):
+            trade = Trade("BTCUSDT", 100.0, 0.1, BASE + timedelta(seconds=sec))
+            ingestor.process(0, offset, trade)
+        generator.flush()
+
+        assert metrics.trades == 6
+        assert metrics.late_trades == len(late_items) == 1
+        assert metrics.candles == len(candles) == 3
+        assert metrics.process_ns.count == 6
+        assert metrics.advance_watermark_ns.count > 0
+
+    def test_process_batch_counts(self):
+        np = pytest.importorskip("numpy")
+        candles, late_items = [], []
+        metrics = GeneratorMetrics()
+        generator = CandleGenerator(
+            on_candle=candles.append, on_late=late_items.append, metrics=metrics
+        )
+        base_ns = int(BASE.timestamp()) * 10**9
+        timestamps = np.array([1, 30, 61, 75, 10, 130], dtype=np.int64) * 10**9 + base_ns
+        generator.process_batch(
+            np.zeros(6, dtype=np.int64),
+            np.full(6, 100.0),
+            np.full(6, 0.1),
+            timestamps,
+            ["BTCUSDT"],
+        )
+        generator.flush()
+
+        assert metrics.trades == 6
+        assert metrics.late_trades == len(late_items) == 1
+        assert metrics.candles == len(candles) == 3
+        assert metrics.advance_watermark_ns.count == 1
+
+    def test_rejects_invalid_sample_every(self):
+        with pytest.raises(ValueError):
+            GeneratorMetrics(sample_every=0)
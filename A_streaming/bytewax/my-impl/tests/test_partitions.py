@@ -0,0 +1,300 @@
+"""partitions.py 파티션 입력 테스트"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Candle, Trade
+from src.candle_generator import CandleGenerator
+from src.kernels import PRICE_QUANTILES, VWAP
+from src.partitions import (
+    FilePartitionSource,
+    MemoryPartitionSource,
+    PartitionedIngestor,
+    PartitionWatermarks,
+)
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+SYMBOLS = ("BTCUSDT", "ETHUSDT", "SOLUSDT")
+
+
+def partition_logs(n_partitions: int, n: int, seed: int) -> dict[int, list[Trade]]:
+    """파티션별 시간순 거래 (심볼은 파티션 사이에 섞임, 수량은 합산 순서와 무관하게 정확)"""
+    rng = random.Random(seed)
+    logs = {}
+    for p in range(n_partitions):
+        t = BASE
+        trades = []
+        for _ in range(n):
+            t += timedelta(milliseconds=rng.randint(0, 800))
+            quantity = rng.randint(1, 64) / 8
+            trades.append(Trade(rng.choice(SYMBOLS), 100 + rng.random(), quantity, t))
+        logs[p] = trades
+    return logs
+
+
+def skewed_arrival(logs: dict[int, list[Trade]]) -> list[tuple[int, int, Trade]]:
+    """파티션 0이 다른 파티션보다 훨씬 먼저 읽히는 도착 순서"""
+    arrival = []
+    for p, trades in logs.items():
+        arrival.extend((p, i, t) for i, t in enumerate(trades))
+    arrival.sort(key=lambda item: (item[0] != 0, item[1]))
+    return arrival
+
+
+def in_time_order(logs: dict[int, list[Trade]], **kwargs) -> list[Candle]:
+    """모든 거래를 시간순으로 처리한 기준 결과"""
+    candles: list[Candle] = []
+    generator = CandleGenerator(on_candle=candles.append, **kwargs)
+    for trade in sorted((t for ts in logs.values() for t in ts), key=lambda t: t.timestamp):
+        generator.process(trade)
+    generator.flush()
+    return candles
+
+
+def by_key(candles: list[Candle]) -> dict[tuple, Candle]:
+    """(심볼, 시작 시간) 기준으로 덮어쓴 결과 (재시작 시 다시 emit된 캔들 포함)"""
+    return {(c.symbol, c.open_time): c for c in candles}
+
+
+class TestPartitionWatermarks:
+    """파티션별 최대 이벤트 시간의 최소값"""
+
+    def test_minimum_across_partitions(self):
+        watermarks = PartitionWatermarks([0, 1])
+        assert not watermarks.update(0, 100)
+        assert watermarks.low_ns is None
+        assert watermarks.update(1, 50)
+        assert watermarks.low_ns == 50
+        # 최소가 아닌 파티션의 진행은 최소값을 바꾸지 않음
+        assert not watermarks.update(0, 200)
+        assert watermarks.update(1, 150)
+        assert watermarks.low_ns == 150
+        assert not watermarks.update(1, 120)
+
+    def test_finished_partition_releases(self):
+        watermarks = PartitionWatermarks([0, 1, 2])
+        watermarks.update(0, 100)
+        watermarks.update(1, 300)
+        assert watermarks.low_ns is None
+        assert watermarks.finish(2)
+        assert watermarks.low_ns == 100
+        assert watermarks.finish(0)
+        assert watermarks.low_ns == 300
+        assert not watermarks.finish(1)
+        assert watermarks.low_ns == 300
+
+
+class TestPartitionedIngestor:
+    """파티션별 watermark / offset 체크포인트 / 동시 읽기"""
+
+    def test_fast_partition_does_not_make_late(self):
+        logs = partition_logs(3, 400, seed=1)
+        expected = in_time_order(logs)
+
+        # 기존 방식: 하나의 interleaved 스트림이면 느린 파티션 거래가 Late
+        lates: list = []
+        plain = CandleGenerator(on_late=lates.append)
+        for _, _, trade in skewed_arrival(logs):
+            plain.process(trade)
+        assert lates
+
+        for global_watermark in (False, True):
+            candles: list[Candle] = []
+            lates = []
+            ingestor = PartitionedIngestor(
+                CandleGenerator(
+                    on_candle=candles.append,
+                    on_late=lates.append,
+                    global_watermark=global_watermark,
+                ),
+                partitions=logs,
+            )
+            for p, offset, trade in skewed_arrival(logs):
+                ingestor.process(p, offset, trade)
+            for p in logs:
+                ingestor.finish(p)
+            ingestor.generator.flush()
+
+            assert lates == []
+            assert by_key(candles) == by_key(expected)
+            assert ingestor.offsets == {p: 400 for p in logs}
+
+    def test_empty_partition_holds_watermark(self):
+        candles: list[Candle] = []
+        ingestor = PartitionedIngestor(CandleGenerator(on_candle=candles.append), [0, 1])
+        for i in range(10):
+            ingestor.process(0, i, Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(minutes=i)))
+        assert candles == []
+
+        # watermark = 마지막 거래 - delay → 마지막 두 윈도우만 열림
+        ingestor.finish(1)
+        assert len(candles) == 8
+
+    def test_run_reads_partitions_concurrently(self):
+        logs = partition_logs(4, 300, seed=2)
+        expected = in_time_order(logs)
+        candles: list[Candle] = []
+        checkpoints: list[bytes] = []
+        ingestor = PartitionedIngestor(
+            CandleGenerator(on_candle=candles.append, global_watermark=True), max_pending=16
+        )
+
+        asyncio.run(
+            ingestor.run(
+                MemoryPartitionSource(logs),
+                on_checkpoint=checkpoints.append,
+                checkpoint_every=250,
+            )
+        )
+
+        assert by_key(candles) == by_key(expected)
+        assert ingestor.offsets == {p: 300 for p in logs}
+        assert len(checkpoints) == 1200 // 250 + 1
+
+    def test_restart_from_checkpoint_is_exactly_once(self):
+        logs = partition_logs(3, 500, seed=3)
+        expected = in_time_order(logs, global_watermark=True)
+        arrival = skewed_arrival(logs)
+        arrival.sort(key=lambda item: item[1])
+
+        # 첫 실행: 체크포인트 후 더 처리하다 중단 (체크포인트 이후 캔들은 다시 emit됨)
+        candles: list[Candle] = []
+        first = PartitionedIngestor(
+            CandleGenerator(on_candle=candles.append, global_watermark=True), partitions=logs
+        )
+        for p, offset, trade in arrival[:700]:
+            first.process(p, offset, trade)
+        saved = first.checkpoint()
+        for p, offset, trade in arrival[700:1000]:
+            first.process(p, offset, trade)
+
+        # 재시작: 체크포인트 복원 후 저장된 offset부터 다시 읽음
+        second = PartitionedIngestor(
+            CandleGenerator(on_candle=candles.append, global_watermark=True)
+        )
+        second.restore(saved)
+        assert second.offsets == first_offsets(arrival[:700])
+        asyncio.run(second.run(MemoryPartitionSource(logs)))
+
+        result = by_key(candles)
+        assert result == by_key(expected)
+        assert sum(c.trade_count for c in result.values()) == 1500
+
+    def test_checkpoint_with_kernels(self):
+        """집계 커널 누적값 / 스케치도 파티션 체크포인트로 복원"""
+        logs = partition_logs(2, 300, seed=5)
+        expected = in_time_order(logs, kernels=[VWAP, PRICE_QUANTILES])
+        arrival = sorted(skewed_arrival(logs), key=lambda item: item[1])
+
+        candles: list[Candle] = []
+        first = PartitionedIngestor(
+            CandleGenerator(on_candle=candles.append, kernels=[VWAP, PRICE_QUANTILES]),
+            partitions=logs,
+        )
+        for p, offset, trade in arrival[:300]:
+            first.process(p, offset, trade)
+        saved = first.checkpoint()
+
+        second = PartitionedIngestor(
+            CandleGenerator(on_candle=candles.append, kernels=[VWAP, PRICE_QUANTILES])
+        )
+        second.restore(saved)
+        asyncio.run(second.run(MemoryPartitionSource(logs)))
+
+        # turnover는 파티션 도착 순서에 따라 합산 순서가 달라짐
+        result = by_key(candles)
+        assert result.keys() == by_key(expected).keys()
+        for key, candle in by_key(expected).items():
+            assert result[key].trade_count == candle.trade_count
+            assert result[key].price_quantiles == candle.price_quantiles
+            assert result[key].vwap == pytest.approx(candle.vwap)
+
+    def test_already_committed_offsets_are_skipped(self):
+        candles: list[Candle] = []
+        ingestor = PartitionedIngestor(CandleGenerator(on_candle=candles.append), [0])
+        trades = [Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=i)) for i in range(5)]
+        for offset, trade in enumerate(trades):
+            ingestor.process(0, offset, trade)
+        for offset, trade in enumerate(trades[:3]):
+            ingestor.process(0, offset, trade)
+        ingestor.generator.flush()
+
+        assert candles[0].trade_count == 5
+
+    def test_live_source(self):
+        source = MemoryPartitionSource({0: [], 1: []}, closed=False)
+        candles: list[Candle] = []
+        ingestor = PartitionedIngestor(CandleGenerator(on_candle=candles.append))
+
+        async def produce():
+            for i in range(120):
+                source.append(i % 2, Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=i)))
+                await asyncio.sleep(0)
+            source.close(0)
+            source.close(1)
+
+        async def main():
+            await asyncio.gather(ingestor.run(source), produce())
+
+        asyncio.run(main())
+        assert [c.trade_count for c in candles] == [60, 60]
+        assert ingestor.offsets == {0: 60, 1: 60}
+
+    def test_reader_error_propagates(self):
+        class Broken(MemoryPartitionSource):
+            async def read(self, partition, offset):
+                yield offset, Trade("BTCUSDT", 100.0, 1.0, BASE)
+                raise RuntimeError("connection lost")
+
+        ingestor = PartitionedIngestor(CandleGenerator())
+        with pytest.raises(RuntimeError, match="connection lost"):
+            asyncio.run(ingestor.run(Broken({0: []})))
+
+    def test_invalid_checkpoint(self):
+        ingestor = PartitionedIngestor(CandleGenerator())
+        with pytest.raises(ValueError):
+            ingestor.restore(b"CNDL" + bytes(40))
+        with pytest.raises(ValueError):
+            PartitionedIngestor(max_pending=0)
+
+
+class TestFilePartitionSource:
+    """JSON lines 파일 파티션"""
+
+    def test_run_and_resume_from_offset(self, tmp_path):
+        logs = partition_logs(2, 200, seed=4)
+        paths = [tmp_path / f"trades-{p}.jsonl" for p in logs]
+        for path, trades in zip(paths, logs.values()):
+            FilePartitionSource.write(path, trades)
+
+        candles: list[Candle] = []
+        checkpoints: list[bytes] = []
+        ingestor = PartitionedIngestor(
+            CandleGenerator(on_candle=candles.append, global_watermark=True)
+        )
+        source = FilePartitionSource(paths, chunk=32)
+        asyncio.run(
+            ingestor.run(
+                source, flush=False, on_checkpoint=checkpoints.append, checkpoint_every=150
+            )
+        )
+
+        # 중간 체크포인트에서 재시작해도 같은 결과
+        resumed = PartitionedIngestor(
+            CandleGenerator(on_candle=candles.append, global_watermark=True)
+        )
+        resumed.restore(checkpoints[1])
+        asyncio.run(resumed.run(source))
+
+        assert by_key(candles) == by_key(in_time_order(logs))
+        assert resumed.offsets == {0: 200, 1: 200}
+
+
+def first_offsets(arrival: list[tuple[int, int, Trade]]) -> dict[int, int]:
+    offsets: dict[int, int] = {}
+    for p, offset, _ in arrival:
+        offsets[p] = offset + 1
+    return offsets
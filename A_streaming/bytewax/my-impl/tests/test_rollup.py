@@ -0,0 +1,149 @@
+"""rollup.py 다중 interval 롤업 테스트"""
+
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator, format_interval
+from src.rollup import MultiIntervalCandleGenerator, base_window_size
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def make_trades(n: int, seed: int = 11) -> list[Trade]:
+    """순서가 약간 섞인 두 심볼의 거래 (수량은 합산 순서에 따라 반올림이 달라지는 값)"""
+    rng = random.Random(seed)
+    trades = []
+    t = BASE
+    for _ in range(n):
+        t += timedelta(milliseconds=rng.randint(0, 4000))
+        jitter = timedelta(seconds=rng.choice([0, 0, 0, -3, -30]))
+        trades.append(
+            Trade(
+                rng.choice(["BTCUSDT", "ETHUSDT"]),
+                float(rng.randint(100, 200)),
+                rng.choice([0.1, 0.3, 1.7]),
+                t + jitter,
+            )
+        )
+    return trades
+
+
+def assert_same_candles(got, expected):
+    """volume은 float 합산 순서만큼 다를 수 있으므로 허용 오차로 비교, 나머지는 정확히"""
+    assert [replace(c, volume=0.0) for c in got] == [replace(c, volume=0.0) for c in expected]
+    assert [c.volume for c in got] == pytest.approx([c.volume for c in expected], rel=1e-12)
+
+
+def run_single(trades, window_size):
+    candles, late = [], []
+    generator = CandleGenerator(
+        window_size=window_size,
+        watermark_delay=timedelta(seconds=5),
+        on_candle=candles.append,
+        on_late=late.append,
+    )
+    for trade in trades:
+        generator.process(trade)
+    generator.flush()
+    return candles, late
+
+
+class TestBaseWindowSize:
+    """base 윈도우 크기 계산"""
+
+    def test_gcd(self):
+        assert base_window_size([timedelta(minutes=5), timedelta(minutes=1)]) == timedelta(minutes=1)
+        assert base_window_size([timedelta(minutes=2), timedelta(minutes=3)]) == timedelta(minutes=1)
+        assert base_window_size([timedelta(seconds=90), timedelta(minutes=1)]) == timedelta(seconds=30)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            base_window_size([])
+        with pytest.raises(ValueError):
+            base_window_size([timedelta(0)])
+
+
+class TestMultiIntervalCandleGenerator:
+    """MultiIntervalCandleGenerator 테스트"""
+
+    @pytest.mark.parametrize(
+        "window_sizes",
+        [
+            [timedelta(seconds=1), timedelta(minutes=1), timedelta(minutes=5), timedelta(minutes=15)],
+            [timedelta(minutes=2), timedelta(minutes=3)],  # base(1m)는 emit 안 함
+        ],
+    )
+    def test_matches_single_interval_generators(self, window_sizes):
+        """interval별 단일 생성기와 같은 캔들/Late 결과 (volume은 float 합산 순서 오차 안)"""
+        trades = make_trades(3000)
+
+        candles, late = [], []
+        generator = MultiIntervalCandleGenerator(
+            window_sizes=window_sizes,
+            watermark_delay=timedelta(seconds=5),
+            on_candle=candles.append,
+            on_late=late.append,
+        )
+        for trade in trades:
+            generator.process(trade)
+        generator.flush()
+
+        for size in window_sizes:
+            expected, expected_late = run_single(trades, size)
+            label = expected[0].interval
+            got = [c for c in candles if c.interval == label]
+
+            for symbol in ("BTCUSDT", "ETHUSDT"):
+                assert_same_candles(
+                    [c for c in got if c.symbol == symbol],
+                    [c for c in expected if c.symbol == symbol],
+                )
+            assert [l.trade for l in late] == [l.trade for l in expected_late]
+
+        assert {c.interval for c in candles} == {format_interval(s) for s in window_sizes}
+
+    def test_emission_timing(self):
+        """상위 interval은 자기 윈도우가 닫힐 때 emit"""
+        candles = []
+        generator = MultiIntervalCandleGenerator(
+            window_sizes=[timedelta(minutes=1), timedelta(minutes=5)],
+            watermark_delay=timedelta(seconds=5),
+            on_candle=candles.append,
+        )
+
+        generator.process(Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=30)))
+        generator.process(Trade("BTCUSDT", 110.0, 1.0, BASE + timedelta(minutes=1, seconds=30)))
+        generator.process(Trade("BTCUSDT", 105.0, 1.0, BASE + timedelta(minutes=2, seconds=6)))
+
+        # 1m 캔들 2개, 5m은 아직
+        assert [(c.interval, c.open_time.minute) for c in candles] == [("1m", 0), ("1m", 1)]
+
+        # 10:05:06 → 10:02 1m 캔들 + 10:00 5m 캔들
+        generator.process(Trade("BTCUSDT", 120.0, 1.0, BASE + timedelta(minutes=5, seconds=6)))
+        assert [(c.interval, c.open_time.minute) for c in candles[2:]] == [("1m", 2), ("5m", 0)]
+
+        five = candles[3]
+        assert five.open == 100.0
+        assert five.high == 110.0
+        assert five.close == 105.0
+        assert five.volume == 3.0
+        assert five.trade_count == 3
+        assert five.close_time == BASE + timedelta(minutes=5) - timedelta(milliseconds=1)
+
+    def test_flush_rolls_up_open_windows(self):
+        """flush 시 열린 base 윈도우도 상위 interval에 병합"""
+        candles = []
+        generator = MultiIntervalCandleGenerator(
+            window_sizes=[timedelta(minutes=1), timedelta(minutes=5)],
+            on_candle=candles.append,
+        )
+        generator.process(Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=10)))
+        generator.process(Trade("BTCUSDT", 101.0, 1.0, BASE + timedelta(seconds=40)))
+
+        generator.flush()
+
+        assert [(c.interval, c.trade_count) for c in candles] == [("1m", 2), ("5m", 2)]
@@ -0,0 +1,119 @@
+"""sharded.py 멀티 프로세스 실행기 테스트"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleGenerator
+from src.sharded import ShardedCandleGenerator, shard_for
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+SYMBOLS = [f"SYM{i}USDT" for i in range(12)]
+
+
+def make_trades(n: int, seed: int = 5) -> list[Trade]:
+    rng = random.Random(seed)
+    trades = []
+    t = BASE
+    for _ in range(n):
+        t += timedelta(milliseconds=rng.randint(0, 500))
+        jitter = timedelta(seconds=rng.choice([0, 0, 0, -2, -20]))
+        trades.append(Trade(rng.choice(SYMBOLS), float(rng.randint(1, 100)), 0.5, t + jitter))
+    return trades
+
+
+class TestShardFor:
+    def test_stable_and_in_range(self):
+        for symbol in SYMBOLS:
+            shard = shard_for(symbol, 4)
+            assert 0 <= shard < 4
+            assert shard == shard_for(symbol, 4)
+
+
+class TestShardedCandleGenerator:
+    """ShardedCandleGenerator 테스트"""
+
+    @pytest.mark.parametrize("num_workers", [1, 3])
+    def test_matches_single_process(self, num_workers):
+        """심볼별 캔들/Late가 단일 프로세스 결과와 같고 순서도 유지"""
+        trades = make_trades(5000)
+
+        expected, expected_late = [], []
+        single = CandleGenerator(
+            window_size=timedelta(seconds=10),
+            on_candle=expected.append,
+            on_late=expected_late.append,
+        )
+        for trade in trades:
+            single.process(trade)
+        single.flush()
+
+        candles, late = [], []
+        with ShardedCandleGenerator(
+            num_workers=num_workers,
+            window_size=timedelta(seconds=10),
+            on_candle=candles.append,
+            on_late=late.append,
+            batch_size=64,
+            slots_per_worker=2,
+        ) as generator:
+            for trade in trades:
+                generator.process(trade)
+            generator.flush()
+
+        for symbol in SYMBOLS:
+            assert [c for c in candles if c.symbol == symbol] == [
+                c for c in expected if c.symbol == symbol
+            ]
+            assert [l.trade for l in late if l.trade.symbol == symbol] == [
+                l.trade for l in expected_late if l.trade.symbol == symbol
+            ]
+
+    def test_advance_watermark_and_flush(self):
+        """수동 watermark 진행과 flush 후 모든 캔들 수거"""
+        candles, batches = [], []
+        with ShardedCandleGenerator(
+            num_workers=2,
+            window_size=timedelta(minutes=1),
+            on_candle=candles.append,
+            on_candles=batches.append,
+        ) as generator:
+            generator.process(Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=10)))
+            generator.process(Trade("ETHUSDT", 10.0, 1.0, BASE + timedelta(seconds=20)))
+            generator.process(Trade("ETHUSDT", 11.0, 1.0, BASE + timedelta(minutes=1, seconds=20)))
+
+            generator.advance_watermark(BASE + timedelta(minutes=1, seconds=6))
+            generator.flush()
+
+        assert sorted((c.symbol, c.open_time.minute) for c in candles) == [
+            ("BTCUSDT", 0),
+            ("ETHUSDT", 0),
+            ("ETHUSDT", 1),
+        ]
+        assert [c for batch in batches for c in batch] == candles
+
+    def test_worker_exception_raises(self):
+        """worker 예외는 flush()에서 RuntimeError (멈추지 않음)"""
+        with ShardedCandleGenerator(num_workers=1) as generator:
+            generator.process(Trade("BTCUSDT", 100.0, 1.0, BASE))
+            generator._shards[0].conn.send(("advance", "not a timestamp"))
+            with pytest.raises(RuntimeError, match="TypeError"):
+                generator.flush()
+
+    def test_killed_worker_raises(self):
+        """메시지 없이 죽은 worker도 flush() / 배치 전송에서 RuntimeError"""
+        with ShardedCandleGenerator(num_workers=1, batch_size=1, slots_per_worker=1) as generator:
+            shard = generator._shards[0]
+            shard.process.kill()
+            shard.process.join()
+            with pytest.raises(RuntimeError, match="exited"):
+                generator.flush()
+            with pytest.raises(RuntimeError, match="exited"):
+                for i in range(3):
+                    generator.process(Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=i)))
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            ShardedCandleGenerator(num_workers=0)
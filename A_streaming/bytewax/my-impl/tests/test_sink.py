@@ -0,0 +1,122 @@
+"""sink.py 캔들 묶음 sink 및 on_candles 테스트"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Candle, Trade
+from src.candle_generator import CandleGenerator
+from src.metrics import GeneratorMetrics
+from src.sink import BufferedCandleSink, estimate_candle_bytes
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def trade(symbol: str, seconds: float) -> Trade:
+    return Trade(symbol, 100.0, 1.0, BASE + timedelta(seconds=seconds))
+
+
+def candle(symbol: str = "BTCUSDT") -> Candle:
+    return Candle(symbol, "1m", BASE, BASE, 1.0, 1.0, 1.0, 1.0, 1.0, 1)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestOnCandles:
+    """CandleGenerator on_candles 묶음 콜백"""
+
+    def test_minute_rollover_is_one_call(self):
+        """여러 심볼의 윈도우가 한 번에 닫히면 콜백도 한 번"""
+        batches, singles = [], []
+        generator = CandleGenerator(on_candle=singles.append, on_candles=batches.append)
+        for i in range(50):
+            generator.process(trade(f"S{i}", 10))
+        generator.advance_watermark(BASE + timedelta(seconds=70))
+
+        assert len(batches) == 1
+        assert len(batches[0]) == 50
+        assert batches[0] == singles
+
+    def test_flush_is_one_call(self):
+        batches = []
+        generator = CandleGenerator(on_candles=batches.append)
+        for i in range(10):
+            generator.process(trade(f"S{i}", 10))
+        generator.flush()
+
+        assert [len(b) for b in batches] == [10]
+
+    def test_with_metrics(self):
+        batches = []
+        metrics = GeneratorMetrics(sample_every=1)
+        generator = CandleGenerator(on_candles=batches.append, metrics=metrics)
+        generator.process(trade("BTCUSDT", 10))
+        generator.process(trade("BTCUSDT", 70))
+        generator.flush()
+
+        assert [len(b) for b in batches] == [1, 1]
+        assert metrics.candles == 2
+
+
+class TestBufferedCandleSink:
+    """BufferedCandleSink 묶음 조건"""
+
+    def test_max_count(self):
+        writes = []
+        sink = BufferedCandleSink(writes.append, max_count=3)
+        sink([candle(), candle()])
+        assert writes == []
+        sink([candle(), candle()])
+        assert [len(w) for w in writes] == [4]
+        assert sink.pending == []
+
+    def test_max_bytes(self):
+        writes = []
+        size = estimate_candle_bytes(candle())
+        sink = BufferedCandleSink(writes.append, max_count=None, max_bytes=size * 2)
+        sink.append(candle())
+        assert writes == []
+        sink.append(candle())
+        assert [len(w) for w in writes] == [2]
+        assert sink.pending_bytes == 0
+
+    def test_max_delay(self):
+        writes = []
+        clock = FakeClock()
+        sink = BufferedCandleSink(
+            writes.append, max_count=None, max_delay=timedelta(seconds=1), clock=clock
+        )
+        sink.append(candle())
+        clock.now = 0.5
+        assert not sink.poll()
+        sink.append(candle())
+        clock.now = 1.0
+        assert sink.poll()
+        assert [len(w) for w in writes] == [2]
+        assert not sink.poll()
+
+    def test_generator_flush_drains_buffer(self):
+        writes = []
+        sink = BufferedCandleSink(writes.append, max_count=1000)
+        generator = CandleGenerator(on_candles=sink)
+        for minute in range(3):
+            for i in range(5):
+                generator.process(trade(f"S{i}", minute * 60 + 10))
+        assert writes == []
+
+        generator.flush()
+        assert [len(w) for w in writes] == [15]
+        generator.flush()
+        assert len(writes) == 1
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            BufferedCandleSink(print, max_count=0)
+        with pytest.raises(ValueError):
+            BufferedCandleSink(print, max_delay=timedelta(seconds=-1))
@@ -0,0 +1,86 @@
+"""sketch.py 분위수 스케치 테스트"""
+
+import random
+
+import pytest
+
+from src.sketch import QuantileSketch
+
+
+def exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def lognormal(n: int, seed: int, sigma: float = 1.0) -> list[float]:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(0, sigma) for _ in range(n)]
+
+
+class TestQuantileSketch:
+    """상대 오차 / 병합 / 메모리 한도"""
+
+    @pytest.mark.parametrize("accuracy", [0.01, 0.001])
+    def test_relative_accuracy(self, accuracy):
+        values = lognormal(20000, seed=1)
+        sketch = QuantileSketch(relative_accuracy=accuracy, max_bins=10_000)
+        for value in values:
+            sketch.add(value)
+
+        qs = (0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 1.0)
+        for q, estimate in zip(qs, sketch.quantiles(qs)):
+            assert estimate == pytest.approx(exact(values, q), rel=accuracy)
+        assert sketch.count == len(values)
+
+    def test_merge_is_order_independent(self):
+        values = lognormal(6000, seed=2)
+        whole = QuantileSketch()
+        parts = [QuantileSketch() for _ in range(3)]
+        for i, value in enumerate(values):
+            whole.add(value)
+            parts[i % 3].add(value)
+
+        merged = QuantileSketch()
+        for part in reversed(parts):
+            merged.merge(part)
+        restored = QuantileSketch()
+        restored.merge_state(merged.state())
+
+        assert merged.bins == whole.bins
+        assert restored.quantiles((0.05, 0.5, 0.95)) == whole.quantiles((0.05, 0.5, 0.95))
+
+    def test_bounded_bins(self):
+        values = lognormal(50000, seed=3)
+        sketch = QuantileSketch(relative_accuracy=0.01, max_bins=256)
+        for value in values[:25000]:
+            sketch.add(value)
+        other = QuantileSketch(relative_accuracy=0.01, max_bins=256)
+        for value in values[25000:]:
+            other.add(value)
+        sketch.merge(other)
+
+        assert len(sketch.bins) == 256
+        assert sketch.count == len(values)
+        # 가장 작은 버킷만 합쳐지므로 중앙값 이상은 여전히 정확
+        for q in (0.5, 0.95, 1.0):
+            assert sketch.quantile(q) == pytest.approx(exact(values, q), rel=0.01)
+        assert sketch.quantile(0.0) > exact(values, 0.0)
+
+    def test_zero_and_empty(self):
+        sketch = QuantileSketch()
+        assert sketch.quantiles((0.5, 0.9)) == [None, None]
+        assert sketch.quantile(0.5) is None
+
+        for value in (0.0, 0.0, 0.0, 5.0):
+            sketch.add(value)
+        assert sketch.zero_count == 3
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(5.0, rel=0.01)
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(relative_accuracy=0)
+        with pytest.raises(ValueError):
+            QuantileSketch(relative_accuracy=1)
+        with pytest.raises(ValueError):
+            QuantileSketch(max_bins=0)
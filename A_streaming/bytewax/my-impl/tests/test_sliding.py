@@ -0,0 +1,146 @@
+"""sliding.py Sliding(Hopping) 윈도우 테스트"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Trade
+from src.candle_generator import CandleAggregator, format_interval
+from src.sliding import SlidingCandleGenerator, TwoStackAggregator
+from src.window import SlidingWindow, to_epoch_ns
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+
+
+class TestSlidingWindow:
+    """SlidingWindow 경계 계산 테스트"""
+
+    def test_get_window_starts(self):
+        """거래를 포함하는 모든 윈도우 시작"""
+        ts = datetime(2026, 1, 26, 10, 3, 20, tzinfo=timezone.utc)
+
+        starts = SlidingWindow.get_window_starts(ts, timedelta(minutes=5), timedelta(minutes=1))
+
+        assert [s.strftime("%H:%M") for s in starts] == ["09:59", "10:00", "10:01", "10:02", "10:03"]
+
+    def test_window_must_be_multiple_of_hop(self):
+        with pytest.raises(ValueError):
+            SlidingWindow.panes_per_window(timedelta(minutes=5), timedelta(minutes=2))
+        with pytest.raises(ValueError):
+            SlidingCandleGenerator(window_size=timedelta(seconds=30), hop=timedelta(minutes=1))
+
+
+class TestTwoStackAggregator:
+    """TwoStackAggregator 테스트"""
+
+    def test_sliding_max_min(self):
+        """push/pop을 섞어도 큐 전체 high/low/volume 유지"""
+        rng = random.Random(3)
+        queue = TwoStackAggregator()
+        window = []
+        for pane in range(200):
+            agg = CandleAggregator.from_ns(pane, pane)
+            price = float(rng.randint(1, 1000))
+            agg.add(price, 1.0, pane)
+            queue.push(pane, agg)
+            window.append(price)
+            if len(window) > 7:
+                queue.pop()
+                window.pop(0)
+
+            result = queue.query(0, 0)
+            assert result.high == max(window)
+            assert result.low == min(window)
+            assert result.open == window[0]
+            assert result.close == window[-1]
+            assert result.trade_count == len(window)
+
+
+def brute_force(trades, window_size, hop):
+    """윈도우별로 거래를 다시 모아 직접 집계"""
+    hop_ns = int(hop.total_seconds()) * 10**9
+    size_ns = int(window_size.total_seconds()) * 10**9
+    windows = {}
+    for trade in trades:
+        ts = to_epoch_ns(trade.timestamp)
+        for start in SlidingWindow.get_window_starts(trade.timestamp, window_size, hop):
+            start_ns = to_epoch_ns(start)
+            agg = windows.setdefault(
+                start_ns, CandleAggregator.from_ns(start_ns, start_ns + size_ns - 1_000_000)
+            )
+            agg.add(trade.price, trade.quantity, ts)
+    return [windows[k].to_candle("BTCUSDT", "x") for k in sorted(windows)]
+
+
+class TestSlidingCandleGenerator:
+    """SlidingCandleGenerator 테스트"""
+
+    @pytest.mark.parametrize("hop_seconds", [10, 60, 300])
+    def test_matches_brute_force(self, hop_seconds):
+        """pane 병합 결과가 윈도우별 재집계와 같음"""
+        rng = random.Random(hop_seconds)
+        window_size, hop = timedelta(minutes=5), timedelta(seconds=hop_seconds)
+        trades = []
+        t = BASE
+        for _ in range(2000):
+            # 가끔 긴 공백을 두어 빈 윈도우 구간도 생기게 함
+            t += timedelta(seconds=rng.choice([1, 2, 3, 5, 900]))
+            trades.append(Trade("BTCUSDT", float(rng.randint(1, 500)), rng.choice([0.5, 1.0]), t))
+
+        candles, late = [], []
+        generator = SlidingCandleGenerator(
+            window_size=window_size,
+            hop=hop,
+            watermark_delay=timedelta(seconds=5),
+            on_candle=candles.append,
+            on_late=late.append,
+        )
+        for trade in trades:
+            generator.process(trade)
+        generator.flush()
+
+        assert late == []
+        expected = brute_force(trades, window_size, hop)
+        assert len(candles) == len(expected)
+        for got, want in zip(candles, expected):
+            assert got.open_time == want.open_time
+            assert got.close_time == want.close_time
+            assert (got.open, got.high, got.low, got.close) == (want.open, want.high, want.low, want.close)
+            assert got.volume == want.volume
+            assert got.trade_count == want.trade_count
+            assert got.interval == f"5m@{format_interval(hop)}"
+
+    def test_emits_every_hop(self):
+        """5분 윈도우를 1분마다 emit"""
+        candles = []
+        generator = SlidingCandleGenerator(
+            window_size=timedelta(minutes=5),
+            hop=timedelta(minutes=1),
+            watermark_delay=timedelta(seconds=5),
+            on_candle=candles.append,
+        )
+        generator.process(Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(seconds=30)))
+        generator.process(Trade("BTCUSDT", 120.0, 1.0, BASE + timedelta(minutes=2, seconds=30)))
+
+        # 10:03:06 → watermark 10:03:01: 윈도우 09:56 ~ 09:58 시작분이 닫힘 (10:00 pane 포함)
+        generator.process(Trade("BTCUSDT", 110.0, 1.0, BASE + timedelta(minutes=3, seconds=6)))
+
+        assert [c.open_time.strftime("%H:%M") for c in candles] == ["09:56", "09:57", "09:58"]
+        assert [c.trade_count for c in candles] == [1, 1, 2]
+        assert candles[2].high == 120.0
+        assert candles[0].interval == "5m@1m"
+        assert candles[0].close_time == BASE + timedelta(minutes=1) - timedelta(milliseconds=1)
+
+    def test_late_data(self):
+        """watermark 이전 거래는 Late"""
+        late = []
+        generator = SlidingCandleGenerator(
+            window_size=timedelta(minutes=5),
+            hop=timedelta(minutes=1),
+            on_late=late.append,
+        )
+        generator.process(Trade("BTCUSDT", 100.0, 1.0, BASE + timedelta(minutes=2)))
+        generator.process(Trade("BTCUSDT", 90.0, 1.0, BASE))
+
+        assert len(late) == 1
@@ -0,0 +1,188 @@
+"""store.py 최근 캔들 저장소 테스트"""
+
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.candle import Candle, Trade
+from src.candle_generator import CandleGenerator
+from src.kernels import PRICE_QUANTILES, VWAP
+from src.rollup import MultiIntervalCandleGenerator
+from src.store import CandleStore
+from src.window import to_epoch_ns
+
+BASE = datetime(2026, 1, 26, 10, 0, 0, tzinfo=timezone.utc)
+KST = timezone(timedelta(hours=9))
+
+
+def trade(symbol: str, seconds: float, price: float = 100.0, tz=timezone.utc) -> Trade:
+    return Trade(symbol, price, 1.5, (BASE + timedelta(seconds=seconds)).astimezone(tz))
+
+
+def run(store: CandleStore, minutes: int, symbols=("BTCUSDT", "ETHUSDT")) -> list[Candle]:
+    candles: list[Candle] = []
+    generator = CandleGenerator(store=store, on_candle=candles.append)
+    for minute in range(minutes):
+        for i, symbol in enumerate(symbols):
+            generator.process(trade(symbol, minute * 60 + i, 100.0 + minute))
+    generator.flush()
+    return candles
+
+
+def of(candles: list[Candle], symbol: str) -> list[Candle]:
+    return [c for c in candles if c.symbol == symbol]
+
+
+class TestCandleStore:
+    """CandleStore 링 버퍼 / 조회"""
+
+    def test_last_n(self):
+        store = CandleStore(capacity=100)
+        candles = run(store, 10)
+
+        assert list(store.last("BTCUSDT", "1m", 3)) == of(candles, "BTCUSDT")[-3:]
+        assert list(store.last("ETHUSDT", "1m", 50)) == of(candles, "ETHUSDT")
+        assert len(store.last("BTCUSDT", "1m", 0)) == 0
+        assert len(store.last("XRPUSDT", "1m", 5)) == 0
+        assert len(store.last("BTCUSDT", "5m", 5)) == 0
+
+    def test_ring_wraps(self):
+        store = CandleStore(capacity=4)
+        candles = run(store, 11)
+
+        view = store.last("BTCUSDT", "1m", 10)
+        assert list(view) == of(candles, "BTCUSDT")[-4:]
+        assert list(view.open_times) == [
+            to_epoch_ns(BASE + timedelta(minutes=m)) for m in range(7, 11)
+        ]
+
+    def test_range(self):
+        store = CandleStore(capacity=5)
+        candles = of(run(store, 12), "BTCUSDT")
+
+        at = lambda minute: BASE + timedelta(minutes=minute)  # noqa: E731
+        assert list(store.range("BTCUSDT", "1m", at(8), at(10))) == candles[8:10]
+        assert list(store.range("BTCUSDT", "1m", at(0), at(100))) == candles[-5:]
+        assert list(store.range("BTCUSDT", "1m", at(8) + timedelta(seconds=1), at(9))) == []
+        assert len(store.range("BTCUSDT", "1m", at(10), at(8))) == 0
+
+    def test_views_are_zero_copy(self):
+        np = pytest.importorskip("numpy")
+        store = CandleStore(capacity=8)
+        candles = of(run(store, 5), "BTCUSDT")
+
+        view = store.last("BTCUSDT", "1m", 5)
+        closes = np.frombuffer(view.closes)
+        assert closes.tolist() == [c.close for c in candles]
+        assert isinstance(view.closes, memoryview)
+
+        # 뷰는 링 버퍼를 직접 가리킴: 같은 행이 갱신되면 보임
+        ring = store.rings[("BTCUSDT", "1m")]
+        amended = replace(candles[-1], close=1.0)
+        assert ring.update(amended)
+        assert closes[-1] == 1.0
+
+    def test_keeps_timezone(self):
+        store = CandleStore()
+        generator = CandleGenerator(store=store)
+        generator.process(trade("BTCUSDT", 10, tz=KST))
+        generator.flush()
+
+        [candle] = store.last("BTCUSDT", "1m", 1)
+        assert candle.open_time.utcoffset() == timedelta(hours=9)
+        assert candle.close_time == candle.open_time + timedelta(seconds=59, milliseconds=999)
+
+    def test_updates_amended_candle(self):
+        store = CandleStore()
+        updates = []
+        generator = CandleGenerator(
+            watermark_delay=timedelta(seconds=1),
+            allowed_lateness=timedelta(seconds=30),
+            store=store,
+            on_update=lambda c: updates.append(store.last(c.symbol, c.interval, 1)[0]),
+        )
+        generator.process(trade("BTCUSDT", 10, 100.0))
+        generator.process(trade("BTCUSDT", 65, 101.0))  # 10:00 캔들 emit
+        generator.process(trade("BTCUSDT", 20, 200.0))  # Late → 수정
+
+        [candle] = store.last("BTCUSDT", "1m", 1)
+        assert candle.high == 200.0 and candle.trade_count == 2
+        assert updates == [candle]
+
+    def test_current_partial_candle(self):
+        store = CandleStore()
+        generator = CandleGenerator(store=store)
+        assert store.current("BTCUSDT", "1m") is None
+
+        generator.process(trade("BTCUSDT", 5, 100.0))
+        generator.process(trade("BTCUSDT", 30, 105.0))
+        live = store.current("BTCUSDT", "1m")
+        assert (live.open, live.high, live.close, live.trade_count) == (100.0, 105.0, 105.0, 2)
+        assert live.open_time == BASE
+
+        generator.process(trade("BTCUSDT", 70, 99.0))
+        assert store.current("BTCUSDT", "1m").open_time == BASE + timedelta(minutes=1)
+        assert store.current("BTCUSDT", "5m") is None
+
+    def test_current_rollup(self):
+        store = CandleStore()
+        candles = []
+        generator = MultiIntervalCandleGenerator(
+            window_sizes=[timedelta(minutes=1), timedelta(minutes=5)],
+            on_candle=candles.append,
+            store=store,
+        )
+        for second in range(0, 200, 20):
+            generator.process(trade("BTCUSDT", second, 100.0 + second))
+
+        live = store.current("BTCUSDT", "5m")
+        assert live.open_time == BASE
+        assert (live.open, live.high, live.trade_count) == (100.0, 280.0, 10)
+        assert store.current("BTCUSDT", "1m").open_time == BASE + timedelta(minutes=3)
+
+        generator.flush()
+        assert list(store.last("BTCUSDT", "5m", 1)) == [c for c in candles if c.interval == "5m"]
+
+    def test_kernel_fields(self):
+        """링 뷰와 롤업 current()에도 집계 커널 필드가 채워짐"""
+        store = CandleStore(capacity=3)
+        candles = []
+        generator = MultiIntervalCandleGenerator(
+            window_sizes=[timedelta(minutes=1), timedelta(minutes=5)],
+            on_candle=candles.append,
+            store=store,
+            kernels=[VWAP, PRICE_QUANTILES],
+        )
+        for second in range(0, 200, 20):
+            generator.process(trade("BTCUSDT", second, 100.0 + second))
+
+        live = store.current("BTCUSDT", "5m")
+        assert live.vwap == pytest.approx(sum(100.0 + s for s in range(0, 200, 20)) / 10)
+        assert live.price_quantiles is not None
+
+        generator.flush()
+        for interval in ("1m", "5m"):
+            expected = [c for c in candles if c.interval == interval][-3:]
+            assert list(store.last("BTCUSDT", interval, 3)) == expected
+            assert all(c.vwap is not None for c in expected)
+
+    def test_kernel_fields_after_plain_candles(self):
+        """커널 필드가 없던 행은 None으로 유지"""
+        store = CandleStore(capacity=4)
+        plain = run(store, 2, symbols=("BTCUSDT",))
+        with_vwap = replace(
+            plain[-1],
+            open_time=plain[-1].open_time + timedelta(minutes=1),
+            close_time=plain[-1].close_time + timedelta(minutes=1),
+            vwap=101.5,
+        )
+        store.append(with_vwap)
+
+        view = store.last("BTCUSDT", "1m", 3)
+        assert list(view) == plain + [with_vwap]
+        assert list(view.kernel_columns["vwap"][2:]) == [101.5]
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            CandleStore(capacity=0)
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from src.window import TumblingWindow
+from src.window import TumblingWindow, from_epoch_ns, timedelta_to_ns, to_epoch_ns
 
 
 class TestTumblingWindow:
@@ -104,3 +104,41 @@ class TestTumblingWindow:
         start = TumblingWindow.get_window_start(ts, window_size)
 
         assert start.tzinfo == kst
+
+    def test_sub_second_boundary_exact(self):
+        """1초 미만 윈도우도 경계가 정확함 (부동소수 오차 없음)"""
+        window_size = timedelta(milliseconds=100)
+
+        for ms in range(0, 1000, 10):
+            ts = datetime(2026, 1, 26, 10, 30, 0, ms * 1000, tzinfo=timezone.utc)
+            start = TumblingWindow.get_window_start(ts, window_size)
+
+            assert start.microsecond == (ms // 100) * 100_000
+
+    def test_get_bucket(self):
+        """epoch ns 버킷 인덱스"""
+        ts = datetime(2026, 1, 26, 10, 30, 45, tzinfo=timezone.utc)
+        window_ns = timedelta_to_ns(timedelta(minutes=1))
+
+        bucket = TumblingWindow.get_bucket(to_epoch_ns(ts), window_ns)
+
+        assert from_epoch_ns(bucket * window_ns) == datetime(2026, 1, 26, 10, 30, 0, tzinfo=timezone.utc)
+
+
+class TestEpochNs:
+    """epoch 나노초 변환 테스트"""
+
+    def test_round_trip(self):
+        """datetime → ns → datetime 왕복"""
+        ts = datetime(2026, 1, 26, 10, 30, 45, 123456, tzinfo=timezone.utc)
+
+        assert from_epoch_ns(to_epoch_ns(ts)) == ts
+
+    def test_timezone_independent(self):
+        """같은 시각이면 timezone과 무관하게 같은 ns"""
+        kst = timezone(timedelta(hours=9))
+        utc_ts = datetime(2026, 1, 26, 10, 30, tzinfo=timezone.utc)
+        kst_ts = datetime(2026, 1, 26, 19, 30, tzinfo=kst)
+
+        assert to_epoch_ns(utc_ts) == to_epoch_ns(kst_ts)
+        assert from_epoch_ns(to_epoch_ns(utc_ts), kst).tzinfo == kst